@@ -72,6 +72,11 @@ class PluginContext(IPluginContext):
         self._data_path.mkdir(parents=True, exist_ok=True)
         return self._data_path
 
+    @property
+    def data_path(self) -> Path:
+        """Plugin data path, without creating it."""
+        return self._data_path
+
     def get_service_proxy(self) -> ServiceProxy:
         return self._service_proxy
 
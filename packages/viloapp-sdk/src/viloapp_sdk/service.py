@@ -197,6 +197,13 @@ class IThemeService(IService):
         """Register theme change listener."""
         pass
 
+    def on_colors_changed(self, callback: callable) -> None:
+        """Register listener for changed theme colors only.
+
+        The default implementation passes all colors on every change.
+        """
+        self.on_theme_changed(callback)
+
 
 class INotificationService(IService):
     """Service for showing notifications."""
@@ -11,6 +11,7 @@ class ActivationEventType(Enum):
     """Plugin activation event types."""
 
     ON_STARTUP = "onStartup"
+    ON_STARTUP_FINISHED = "onStartupFinished"
     ON_COMMAND = "onCommand"
     ON_FILE_SYSTEM = "onFileSystem"
     ON_WORKSPACE_OPEN = "onWorkspaceOpen"
@@ -18,6 +19,8 @@ class ActivationEventType(Enum):
     ON_LANGUAGE = "onLanguage"
     ON_SCHEME = "onScheme"
     ON_UI = "onUI"
+    ON_VIEW = "onView"
+    ON_WIDGET = "onWidget"
     ON_DEBUG = "onDebug"
     ON_TASK = "onTask"
 
@@ -141,6 +141,25 @@ class IWidget(ABC):
         """
         pass
 
+    def suspend_instance(self, instance_id: str) -> None:
+        """
+        Called when an instance is hidden and may stop rendering.
+
+        Background work of the instance should keep running; only its
+        display needs to pause until resume_instance() is called.
+
+        Args:
+            instance_id: Instance identifier
+        """
+
+    def resume_instance(self, instance_id: str) -> None:
+        """
+        Called when a suspended instance is shown again.
+
+        Args:
+            instance_id: Instance identifier
+        """
+
     def on_close(self) -> bool:
         """
         Called when widget is about to close.
@@ -70,6 +70,7 @@ class AppWidgetMetadata:
     can_suspend: bool = (
         True  # Can be suspended when hidden (False for widgets with background processes)
     )
+    can_suspend_rendering: bool = False  # Stop rendering when hidden, background work continues
 
     # === Default Widget Support ===
     can_be_default: bool = False  # Can this widget be used as a default widget
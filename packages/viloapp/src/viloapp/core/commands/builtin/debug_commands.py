@@ -47,6 +47,10 @@ def reset_app_state_command(context: CommandContext) -> CommandResult:
         settings.clear()
         settings.sync()
 
+        from viloapp.core.settings.config import clear_cached_values
+
+        clear_cached_values()
+
         # Reset model state if available
         if context.model:
             # Reset to default state - get default terminal widget
@@ -288,15 +292,12 @@ def toggle_dev_mode_command(context: CommandContext) -> CommandResult:
         # This would toggle development features like extra logging,
         # debug panels, etc. For now, just a placeholder
 
-        # Toggle development features directly via QSettings
-        from PySide6.QtCore import QSettings
-
-        settings = QSettings("ViloxTerm", "ViloxTerm")
+        # Toggle development features via the cached settings values
+        from viloapp.core.settings.config import get_cached_value, set_cached_value
 
-        current_dev_mode = settings.value("dev_mode", False, type=bool)
+        current_dev_mode = get_cached_value("dev_mode", False, bool)
         new_dev_mode = not current_dev_mode
-        settings.setValue("dev_mode", new_dev_mode)
-        settings.sync()
+        set_cached_value("dev_mode", new_dev_mode)
 
         # Show status
         if context.main_window and hasattr(context.main_window, "status_bar"):
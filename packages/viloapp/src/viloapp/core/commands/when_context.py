@@ -89,11 +89,10 @@ class WhenContext:
                 else False
             )
 
-        # Development mode
-        from PySide6.QtCore import QSettings
+        # Development mode (cached - read from QSettings only once)
+        from viloapp.core.settings.config import get_cached_value
 
-        settings = QSettings("ViloxTerm", "ViloxTerm")
-        variables["isDevelopment"] = settings.value("dev_mode", False, type=bool)
+        variables["isDevelopment"] = get_cached_value("dev_mode", False, bool)
 
         return variables
 
@@ -34,6 +34,15 @@ class EnvironmentInfo:
 class EnvironmentDetector:
     """Detects the runtime environment and its capabilities."""
 
+    _current: Optional[EnvironmentInfo] = None
+
+    @classmethod
+    def current(cls) -> EnvironmentInfo:
+        """Get the environment detected at startup, detecting it on first use."""
+        if cls._current is None:
+            cls._current = cls.detect()
+        return cls._current
+
     @staticmethod
     def detect() -> EnvironmentInfo:
         """Detect the current environment."""
@@ -335,11 +344,64 @@ SSH Session Detected:
 """
 
 
+CHROMIUM_FLAGS_VARIABLE = "QTWEBENGINE_CHROMIUM_FLAGS"
+
+
+def merge_chromium_flags(
+    flags: str, process_per_site: bool = True, renderer_process_limit: int = 0
+) -> str:
+    """
+    Add renderer process flags to a Chromium flags string.
+
+    Flags already present are kept as they are, so the user's own
+    QTWEBENGINE_CHROMIUM_FLAGS always win.
+
+    Args:
+        flags: Existing flags
+        process_per_site: Let all pages of one site share a renderer process
+        renderer_process_limit: Maximum renderer processes, 0 for Chromium's default
+
+    Returns:
+        Combined flags
+    """
+    result = flags.split()
+    names = {flag.split("=", 1)[0] for flag in result}
+
+    if process_per_site and "--process-per-site" not in names:
+        result.append("--process-per-site")
+    if renderer_process_limit > 0 and "--renderer-process-limit" not in names:
+        result.append(f"--renderer-process-limit={renderer_process_limit}")
+
+    return " ".join(result)
+
+
+def apply_renderer_settings(process_per_site: bool = True, renderer_process_limit: int = 0) -> str:
+    """
+    Add renderer process flags to the environment.
+
+    Chromium reads its flags once, when Qt WebEngine starts, so this must
+    run before the QApplication is created.
+
+    Args:
+        process_per_site: Let all pages of one site share a renderer process
+        renderer_process_limit: Maximum renderer processes, 0 for Chromium's default
+
+    Returns:
+        Chromium flags now in effect
+    """
+    flags = merge_chromium_flags(
+        os.environ.get(CHROMIUM_FLAGS_VARIABLE, ""), process_per_site, renderer_process_limit
+    )
+    os.environ[CHROMIUM_FLAGS_VARIABLE] = flags
+    logger.debug(f"Set {CHROMIUM_FLAGS_VARIABLE}={flags}")
+    return flags
+
+
 class EnvironmentConfigurator:
     """Main configurator that applies the appropriate strategy."""
 
     def __init__(self):
-        self.env_info = EnvironmentDetector.detect()
+        self.env_info = EnvironmentDetector.current()
         self.strategy = self._select_strategy()
 
     def _select_strategy(self) -> EnvironmentStrategy:
@@ -119,6 +119,35 @@ class DependencyResolver:
 
         return load_order, unmet
 
+    def get_dependency_map(self, plugin_ids: Optional[List[str]] = None) -> Dict[str, Set[str]]:
+        """
+        Get the plugin dependencies of each plugin.
+
+        Only dependencies that are registered plugins are included.
+
+        Args:
+            plugin_ids: Specific plugins to include (None for all)
+
+        Returns:
+            Dictionary of plugin ID to the IDs of plugins it depends on
+        """
+        if plugin_ids is None:
+            plugins = self.registry.get_all_plugins()
+        else:
+            plugins = [self.registry.get_plugin(pid) for pid in plugin_ids]
+            plugins = [p for p in plugins if p]
+
+        dependency_map: Dict[str, Set[str]] = {}
+        for plugin in plugins:
+            plugin_deps = set()
+            for dep_str in plugin.metadata.dependencies:
+                dep = self._parse_dependency(dep_str)
+                # Requirements that are not plugins (e.g. the SDK) are not registered
+                if dep and not dep.optional and self.registry.get_plugin(dep.plugin_id):
+                    plugin_deps.add(dep.plugin_id)
+            dependency_map[plugin.metadata.id] = plugin_deps
+        return dependency_map
+
     def _build_dependency_graph(self, plugins) -> Dict[str, Set[str]]:
         """Build dependency graph from plugins."""
         graph = {}
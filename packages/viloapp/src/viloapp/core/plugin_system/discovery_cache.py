@@ -0,0 +1,202 @@
+"""Persistent cache for plugin discovery results."""
+
+import json
+import logging
+import os
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from viloapp_sdk import PluginCapability, PluginMetadata
+
+from .plugin_registry import LifecycleState, PluginInfo
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached format or the way manifests are parsed changes
+CACHE_VERSION = 1
+
+# Returned by DiscoveryCache.get when there is no valid entry
+MISS = object()
+
+
+def file_fingerprint(path: Path) -> List[Any]:
+    """
+    Get a cheap fingerprint of a file.
+
+    Args:
+        path: File path
+
+    Returns:
+        [path, mtime_ns, size], or [path, None, None] if the file does not exist
+    """
+    try:
+        stat = os.stat(path)
+        return [str(path), stat.st_mtime_ns, stat.st_size]
+    except OSError:
+        return [str(path), None, None]
+
+
+def serialize_plugin_info(plugin_info: PluginInfo) -> Dict[str, Any]:
+    """Convert discovered plugin information to JSON-compatible data."""
+    metadata = asdict(plugin_info.metadata)
+    metadata["capabilities"] = [cap.value for cap in plugin_info.metadata.capabilities]
+    return {"metadata": metadata, "path": str(plugin_info.path)}
+
+
+def deserialize_plugin_info(data: Dict[str, Any]) -> PluginInfo:
+    """Create fresh plugin information from cached data."""
+    metadata = dict(data["metadata"])
+    metadata["capabilities"] = [PluginCapability(cap) for cap in metadata["capabilities"]]
+    return PluginInfo(
+        metadata=PluginMetadata(**metadata),
+        path=Path(data["path"]),
+        state=LifecycleState.DISCOVERED,
+    )
+
+
+class DiscoveryCache:
+    """
+    Discovery results persisted between runs.
+
+    Each entry stores the discovered plugin together with fingerprints of
+    the files it was read from. An entry is only reused while all of those
+    files are unchanged, so a warm start reads manifests from the cache and
+    imports nothing, and a changed plugin is rediscovered on its own.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Cache file, defaults to plugin_discovery.json in the user cache dir
+        """
+        if path is None:
+            import platformdirs
+
+            path = Path(platformdirs.user_cache_dir("ViloxTerm")) / "plugin_discovery.json"
+
+        self.path = path
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._used: set = set()
+        self._dirty = False
+        self._loaded = False
+
+    def get(self, key: str, files: Optional[Iterable[Path]] = None) -> Any:
+        """
+        Get a cached discovery result.
+
+        Args:
+            key: Entry key
+            files: Files the result depends on; defaults to the files stored with the entry
+
+        Returns:
+            PluginInfo, None if the source was cached as not being a plugin,
+            or MISS if there is no valid entry
+        """
+        self._ensure_loaded()
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISS
+
+        if files is None:
+            files = [Path(fingerprint[0]) for fingerprint in entry["files"]]
+        if [file_fingerprint(path) for path in files] != entry["files"]:
+            return MISS
+
+        self._used.add(key)
+        if entry["plugin"] is None:
+            return None
+
+        try:
+            return deserialize_plugin_info(entry["plugin"])
+        except Exception as e:
+            logger.debug(f"Discarding unreadable discovery cache entry {key}: {e}")
+            return MISS
+
+    def put(self, key: str, plugin_info: Optional[PluginInfo], files: Iterable[Path]) -> None:
+        """
+        Store a discovery result.
+
+        Args:
+            key: Entry key
+            plugin_info: Discovered plugin, or None if the source is not a plugin
+            files: Files the result was read from
+        """
+        self._ensure_loaded()
+
+        try:
+            plugin_data = serialize_plugin_info(plugin_info) if plugin_info else None
+            # Make sure the entry survives a JSON round trip before storing it
+            json.dumps(plugin_data)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Not caching discovery result for {key}: {e}")
+            self._entries.pop(key, None)
+            return
+
+        self._entries[key] = {
+            "files": [file_fingerprint(path) for path in files],
+            "plugin": plugin_data,
+        }
+        self._used.add(key)
+        self._dirty = True
+
+    def save(self) -> bool:
+        """
+        Persist the cache, dropping entries not used since the last save.
+
+        Returns:
+            True if saved successfully or nothing changed
+        """
+        stale = set(self._entries) - self._used
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            self._dirty = True
+        # The next scan decides again which entries are still live
+        self._used = set()
+
+        if not self._dirty:
+            return True
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({"version": CACHE_VERSION, "entries": self._entries}, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to save plugin discovery cache: {e}")
+            return False
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._entries.clear()
+        self._used.clear()
+        self._loaded = True
+        self._dirty = True
+
+    def _ensure_loaded(self) -> None:
+        """Read the cache file on first use."""
+        if self._loaded:
+            return
+        self._loaded = True
+
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable plugin discovery cache: {e}")
+            return
+
+        if data.get("version") != CACHE_VERSION:
+            logger.debug("Plugin discovery cache version changed, rebuilding")
+            return
+
+        self._entries = data.get("entries", {})
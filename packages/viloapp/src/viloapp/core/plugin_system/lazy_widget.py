@@ -0,0 +1,105 @@
+"""Placeholder widget factory for plugins that have not been activated yet."""
+
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from PySide6.QtWidgets import QWidget
+from viloapp_sdk import IWidget
+
+logger = logging.getLogger(__name__)
+
+
+class LazyWidgetFactory(IWidget):
+    """
+    Widget factory declared in a plugin manifest.
+
+    Lets the widget appear in menus and be restored from saved state while
+    its plugin is still unloaded. The plugin is activated, and the real
+    factory resolved, the first time an instance is created.
+    """
+
+    def __init__(
+        self,
+        plugin_id: str,
+        contribution: Dict[str, Any],
+        resolver: Callable[[], Optional[IWidget]],
+    ):
+        """
+        Initialize the placeholder.
+
+        Args:
+            plugin_id: ID of the plugin contributing the widget
+            contribution: Widget entry from the manifest's contributes.widgets
+            resolver: Activates the plugin and returns its real widget factory
+        """
+        self.plugin_id = plugin_id
+        self._widget_id = contribution["id"]
+        self._title = contribution.get("title", self._widget_id.replace("-", " ").title())
+        self._icon = contribution.get("icon")
+        self._resolver = resolver
+        self._factory: Optional[IWidget] = None
+
+    @property
+    def resolved(self) -> bool:
+        """Whether the real factory has been resolved."""
+        return self._factory is not None
+
+    def resolve(self) -> Optional[IWidget]:
+        """
+        Activate the plugin and get its real widget factory.
+
+        Returns:
+            The plugin's widget factory or None if activation failed
+        """
+        if self._factory is None:
+            self._factory = self._resolver()
+            if self._factory is None:
+                logger.error(f"Plugin {self.plugin_id} did not provide widget {self._widget_id}")
+        return self._factory
+
+    def get_widget_id(self) -> str:
+        """Get unique widget identifier."""
+        return self._widget_id
+
+    def get_title(self) -> str:
+        """Get widget display title."""
+        if self._factory:
+            return self._factory.get_title()
+        return self._title
+
+    def get_icon(self) -> Optional[str]:
+        """Get widget icon identifier."""
+        if self._factory:
+            return self._factory.get_icon()
+        return self._icon
+
+    def create_instance(self, instance_id: str) -> QWidget:
+        """Create widget instance, activating the plugin if needed."""
+        factory = self.resolve()
+        if factory is None:
+            raise RuntimeError(f"Widget {self._widget_id} is not available")
+        return factory.create_instance(instance_id)
+
+    def destroy_instance(self, instance_id: str) -> None:
+        """Destroy widget instance."""
+        if self._factory:
+            self._factory.destroy_instance(instance_id)
+
+    def handle_command(self, command: str, args: Dict[str, Any]) -> Any:
+        """Forward widget command to the real factory."""
+        factory = self.resolve()
+        if factory is None:
+            return None
+        return factory.handle_command(command, args)
+
+    def get_state(self) -> Dict[str, Any]:
+        """Get widget state."""
+        if self._factory:
+            return self._factory.get_state()
+        return {}
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """Restore widget state."""
+        factory = self.resolve()
+        if factory:
+            factory.restore_state(state)
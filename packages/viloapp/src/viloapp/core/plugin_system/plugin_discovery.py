@@ -1,13 +1,15 @@
 """Plugin discovery system."""
 
 import importlib.metadata
+import importlib.util
 import json
 import logging
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import Callable, List, Optional, Set
 
 from viloapp_sdk import PluginMetadata
 
+from .discovery_cache import MISS, DiscoveryCache
 from .plugin_registry import LifecycleState, PluginInfo
 
 logger = logging.getLogger(__name__)
@@ -16,9 +18,11 @@ logger = logging.getLogger(__name__)
 class PluginDiscovery:
     """Discovers plugins from various sources."""
 
-    def __init__(self, registry):
+    def __init__(self, registry, cache: Optional[DiscoveryCache] = None):
         self.registry = registry
         self.discovered_paths: Set[Path] = set()
+        # Results are reused from the cache while their source files are unchanged
+        self.cache = cache
 
     def discover_all(self) -> List[PluginInfo]:
         """
@@ -45,6 +49,10 @@ class PluginDiscovery:
         # Discover built-in plugins
         plugins.extend(self.discover_builtin_plugins())
 
+        # Persist new results and drop entries for plugins that are gone
+        if self.cache:
+            self.cache.save()
+
         logger.info(f"Discovered {len(plugins)} plugins")
         return plugins
 
@@ -76,21 +84,20 @@ class PluginDiscovery:
 
             for entry_point in entry_points:
                 try:
-                    # Get plugin metadata without loading the plugin
-                    plugin_path = self._get_entry_point_path(entry_point)
-
-                    # Create minimal metadata from entry point
-                    metadata = PluginMetadata(
-                        id=entry_point.name,
-                        name=entry_point.name.replace("-", " ").title(),
-                        version="0.0.0",  # Will be updated when loaded
-                        description=f"Plugin from {entry_point.value}",
-                        author="Unknown",
-                    )
-
-                    plugin_info = PluginInfo(
-                        metadata=metadata, path=plugin_path, state=LifecycleState.DISCOVERED
-                    )
+                    # The key changes whenever the providing distribution is
+                    # reinstalled or upgraded; the stored manifest
+                    # fingerprints catch edits to an editable install
+                    cache_key = self._entry_point_cache_key(entry_point)
+                    plugin_info = self.cache.get(cache_key) if self.cache else MISS
+
+                    if plugin_info is MISS:
+                        plugin_info = self._discover_entry_point(entry_point)
+                        if self.cache:
+                            self.cache.put(
+                                cache_key,
+                                plugin_info,
+                                self._entry_point_manifest_paths(plugin_info.path),
+                            )
 
                     plugins.append(plugin_info)
                     logger.debug(f"Discovered entry point plugin: {entry_point.name}")
@@ -121,7 +128,11 @@ class PluginDiscovery:
         # Look for plugin manifests
         for manifest_path in directory.glob("*/plugin.json"):
             try:
-                plugin_info = self._load_plugin_manifest(manifest_path)
+                plugin_info = self._discover_cached(
+                    f"manifest:{manifest_path}",
+                    [manifest_path],
+                    lambda path=manifest_path: self._load_plugin_manifest(path),
+                )
                 if plugin_info:
                     plugins.append(plugin_info)
                     logger.debug(f"Discovered plugin from: {manifest_path}")
@@ -134,7 +145,11 @@ class PluginDiscovery:
                 marker_file = plugin_dir / "__plugin__.py"
                 if marker_file.exists():
                     try:
-                        plugin_info = self._load_python_plugin(plugin_dir)
+                        plugin_info = self._discover_cached(
+                            f"python:{plugin_dir}",
+                            [marker_file],
+                            lambda path=plugin_dir: self._load_python_plugin(path),
+                        )
                         if plugin_info:
                             plugins.append(plugin_info)
                             logger.debug(f"Discovered Python plugin from: {plugin_dir}")
@@ -181,6 +196,56 @@ class PluginDiscovery:
 
         return plugins
 
+    def _discover_cached(
+        self, key: str, files: List[Path], load: Callable[[], Optional[PluginInfo]]
+    ) -> Optional[PluginInfo]:
+        """Get a discovery result from the cache, or load and cache it."""
+        if not self.cache:
+            return load()
+
+        plugin_info = self.cache.get(key, files)
+        if plugin_info is MISS:
+            plugin_info = load()
+            self.cache.put(key, plugin_info, files)
+        return plugin_info
+
+    def _discover_entry_point(self, entry_point) -> PluginInfo:
+        """Build plugin information for an entry point without importing it."""
+        plugin_path = self._get_entry_point_path(entry_point)
+
+        # Prefer the manifest so activation events and contributions
+        # are known before the plugin module is imported
+        plugin_info = self._load_entry_point_manifest(entry_point, plugin_path)
+        if plugin_info:
+            return plugin_info
+
+        # Create minimal metadata from entry point. Without a manifest
+        # nothing is known about its contributions, so it is activated on
+        # startup.
+        metadata = PluginMetadata(
+            id=entry_point.name,
+            name=entry_point.name.replace("-", " ").title(),
+            version="0.0.0",  # Will be updated when loaded
+            description=f"Plugin from {entry_point.value}",
+            author="Unknown",
+            activation_events=["*"],
+        )
+
+        return PluginInfo(metadata=metadata, path=plugin_path, state=LifecycleState.DISCOVERED)
+
+    def _entry_point_cache_key(self, entry_point) -> str:
+        """Get the discovery cache key for an entry point."""
+        dist = getattr(entry_point, "dist", None)
+        dist_id = f"{dist.name}=={dist.version}" if dist else "unknown"
+        return f"entry_point:{entry_point.name}={entry_point.value}:{dist_id}"
+
+    def _entry_point_manifest_paths(self, plugin_path: Path) -> List[Path]:
+        """Get the locations an entry point plugin's manifest may live."""
+        if not plugin_path.is_dir():
+            return []
+        # Manifest inside the package, or at the project root for src layouts
+        return [plugin_path / "plugin.json", plugin_path.parent.parent / "plugin.json"]
+
     def _load_plugin_manifest(self, manifest_path: Path) -> Optional[PluginInfo]:
         """Load plugin metadata from manifest file."""
         try:
@@ -201,7 +266,7 @@ class PluginDiscovery:
                 keywords=data.get("keywords", []),
                 engines=data.get("engines", {}),
                 dependencies=data.get("dependencies", []),
-                activation_events=data.get("activationEvents", []),
+                activation_events=data.get("activationEvents", data.get("activation_events", [])),
                 contributes=data.get("contributes", {}),
             )
 
@@ -249,14 +314,28 @@ class PluginDiscovery:
             logger.error(f"Failed to load Python plugin {plugin_dir}: {e}")
             return None
 
+    def _load_entry_point_manifest(self, entry_point, plugin_path: Path) -> Optional[PluginInfo]:
+        """Load the manifest shipped with an entry point plugin, if any."""
+        for manifest_path in self._entry_point_manifest_paths(plugin_path):
+            if not manifest_path.exists():
+                continue
+
+            plugin_info = self._load_plugin_manifest(manifest_path)
+            if plugin_info and plugin_info.metadata.id == entry_point.name:
+                plugin_info.path = plugin_path
+                return plugin_info
+
+        return None
+
     def _get_entry_point_path(self, entry_point) -> Path:
-        """Get path for an entry point."""
-        # Try to determine the package location
+        """Get path for an entry point without importing it."""
+        # Locate the top-level package; find_spec does not execute it, so
+        # heavy plugin imports are deferred until activation
         try:
-            module_name = entry_point.value.split(":")[0]
-            module = importlib.import_module(module_name)
-            if hasattr(module, "__file__"):
-                return Path(module.__file__).parent
+            package_name = entry_point.value.split(":")[0].split(".")[0]
+            spec = importlib.util.find_spec(package_name)
+            if spec and spec.origin and spec.origin not in ("built-in", "frozen"):
+                return Path(spec.origin).parent
         except Exception:
             pass
 
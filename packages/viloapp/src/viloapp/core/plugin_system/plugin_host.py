@@ -0,0 +1,786 @@
+"""Out-of-process plugin hosting.
+
+A plugin host is a child process that imports and runs plugin code, so a
+plugin's CPU and memory use can be measured and limited on its own and
+heavy work does not stall the UI. The host and the app talk over a pipe
+with a small symmetric message protocol:
+
+    (CALL, seq, target, method, args, kwargs)   seq 0 asks for no reply
+    (REPLY, seq, ok, value)
+
+Either side can call the other and serves incoming calls while it waits
+for its own reply, so a plugin's activate() can use host services and a
+service can call back into the plugin. The app makes the calls that can
+run long, activate() and commands, without waiting, and gets their
+replies from its event loop. Callables passed as arguments, such as
+command handlers or event subscribers, are replaced by references the
+other side calls back through the pipe until it releases them.
+
+Hosted plugins run without a QApplication: they can use services and
+events but cannot contribute widgets.
+"""
+
+import itertools
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from viloapp_sdk import (
+    EventBus,
+    EventType,
+    IPlugin,
+    IService,
+    PluginContext,
+    PluginError,
+    PluginEvent,
+    PluginMetadata,
+    ServiceNotAvailableError,
+    ServiceProxy,
+)
+
+logger = logging.getLogger(__name__)
+
+# Message kinds
+CALL = 0
+REPLY = 1
+
+# Targets are tuples such as ("service", plugin_id, service_id)
+Target = Tuple[Any, ...]
+
+
+class PluginHostError(PluginError):
+    """Raised when a plugin host fails or a call cannot cross the pipe."""
+
+    pass
+
+
+class _CallbackRef:
+    """Stands in for a callable sent to the other side of a channel."""
+
+    __slots__ = ("number",)
+
+    def __init__(self, number: int):
+        self.number = number
+
+    def __reduce__(self):
+        return (_CallbackRef, (self.number,))
+
+
+class _RemoteCallable:
+    """Calls a callable that lives on the other side of a channel."""
+
+    def __init__(self, channel: "Channel", number: int):
+        self._channel = channel
+        self._number = number
+
+    def __call__(self, *args, **kwargs):
+        return self._channel.call(("callback", self._number), "__call__", *args, **kwargs)
+
+    def __del__(self):
+        self._channel.release_callback(self._number)
+
+
+class Channel:
+    """
+    One end of the message pipe between the app and a plugin host.
+
+    call() sends a request and reads messages until its reply arrives,
+    serving the other side's calls in the meantime; call_async() returns a
+    future that is resolved when process_pending() or another call reads
+    the reply. Calls from several threads are serialized.
+    """
+
+    def __init__(self, connection, handler: Callable[[Target, str, tuple, dict], Any]):
+        """
+        Initialize the channel.
+
+        Args:
+            connection: multiprocessing Connection to the other side
+            handler: Serves incoming calls as handler(target, method, args, kwargs)
+        """
+        self.connection = connection
+        self._handler = handler
+        self._lock = threading.RLock()
+        self._seq = itertools.count(1)
+        self._callbacks: Dict[int, Callable] = {}
+        self._callback_numbers = itertools.count(1)
+        # Callbacks of the other side no longer referenced here, released
+        # with the next message since they are found by the garbage collector
+        self._released: List[int] = []
+        # Sequence number -> future, method and deadline of calls awaiting a reply
+        self._replies: Dict[int, Tuple[Future, str, Optional[float]]] = {}
+        # Calls given up on, whose replies may still arrive
+        self._expired: Set[int] = set()
+        # Per thread: calls in progress, whose replies must not be read elsewhere
+        self._local = threading.local()
+        self.closed = False
+
+    def call(self, target: Target, method: str, *args, **kwargs) -> Any:
+        """Call a method on the other side and return its result."""
+        with self._lock:
+            seq = next(self._seq)
+            self._send((CALL, seq, target, method, self._encode(args), self._encode(kwargs)))
+            self._local.depth = getattr(self._local, "depth", 0) + 1
+            try:
+                while True:
+                    message = self._receive()
+                    if message[0] == REPLY and message[1] == seq:
+                        _, _, ok, value = message
+                        if ok:
+                            return self._decode(value)
+                        raise value
+                    self._serve(message)
+            finally:
+                self._local.depth -= 1
+
+    def call_async(
+        self, target: Target, method: str, args: tuple = (), timeout: Optional[float] = None
+    ) -> Future:
+        """
+        Call a method on the other side without waiting for its reply.
+
+        Args:
+            target: Object to call
+            method: Method name
+            args: Positional arguments
+            timeout: Seconds after which process_pending() fails the call
+
+        Returns:
+            Future resolved with the result on the thread that reads the reply
+        """
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._lock:
+            seq = next(self._seq)
+            self._replies[seq] = (future, method, deadline)
+            try:
+                self._send((CALL, seq, target, method, self._encode(args), {}))
+            except PluginHostError:
+                del self._replies[seq]
+                raise
+        return future
+
+    def notify(self, target: Target, method: str, *args, **kwargs) -> None:
+        """Call a method on the other side without waiting for it."""
+        with self._lock:
+            self._send((CALL, 0, target, method, self._encode(args), self._encode(kwargs)))
+
+    def process_pending(self, timeout: float = 0.0) -> bool:
+        """
+        Serve the messages that have arrived.
+
+        Args:
+            timeout: Seconds to wait for a first message
+
+        Returns:
+            False once the other side has gone away
+        """
+        if self.closed:
+            return False
+        self._expire_calls()
+        if getattr(self._local, "depth", 0):
+            # A nested event loop inside a call; the call reads the messages
+            return True
+        try:
+            if not self.connection.poll(timeout):
+                return True
+            with self._lock:
+                while self.connection.poll(0):
+                    self._serve(self._receive())
+        except PluginHostError:
+            return False
+        return True
+
+    def register_callback(self, callback: Callable) -> _CallbackRef:
+        """Keep a callable so the other side can call it."""
+        number = next(self._callback_numbers)
+        self._callbacks[number] = callback
+        return _CallbackRef(number)
+
+    def release_callback(self, number: int) -> None:
+        """Tell the other side a callable it sent is no longer used."""
+        self._released.append(number)
+
+    def close(self) -> None:
+        """Mark the connection closed and fail the calls awaiting a reply."""
+        self.closed = True
+        replies, self._replies = self._replies, {}
+        for future, method, _ in replies.values():
+            future.set_exception(PluginHostError(f"Plugin host connection closed during {method}"))
+
+    def _expire_calls(self) -> None:
+        """Fail asynchronous calls whose reply is overdue."""
+        now = time.monotonic()
+        expired = [
+            seq
+            for seq, (_, _, deadline) in self._replies.items()
+            if deadline is not None and now >= deadline
+        ]
+        for seq in expired:
+            future, method, _ = self._replies.pop(seq)
+            self._expired.add(seq)
+            future.set_exception(PluginHostError(f"No reply to {method} from plugin host"))
+
+    def _resolve(self, message: tuple) -> None:
+        """Complete an asynchronous call with its reply."""
+        _, seq, ok, value = message
+        pending = self._replies.pop(seq, None)
+        if pending is None:
+            if seq in self._expired:
+                self._expired.discard(seq)
+                logger.debug(f"Dropping late reply {seq} from plugin host pipe")
+            else:
+                logger.warning(f"Ignoring unexpected reply {seq} from plugin host pipe")
+            return
+        future = pending[0]
+        if ok:
+            future.set_result(self._decode(value))
+        else:
+            future.set_exception(value)
+
+    def _serve(self, message: tuple) -> None:
+        """Run an incoming call and send its reply."""
+        if message[0] != CALL:
+            self._resolve(message)
+            return
+        _, seq, target, method, args, kwargs = message
+        if target[0] == "callback" and method == "release":
+            self._callbacks.pop(target[1], None)
+            return
+        try:
+            if target[0] == "callback":
+                result = self._callbacks[target[1]](*self._decode(args), **self._decode(kwargs))
+            else:
+                result = self._handler(target, method, self._decode(args), self._decode(kwargs))
+        except Exception as e:
+            if seq:
+                self._reply(seq, False, e)
+            else:
+                logger.error(f"Error handling {method} on {target}: {e}")
+            return
+        if seq:
+            self._reply(seq, True, self._encode(result))
+
+    def _reply(self, seq: int, ok: bool, value: Any) -> None:
+        try:
+            self._send((REPLY, seq, ok, value))
+        except PluginHostError as e:
+            if self.closed:
+                raise
+            # The value could not be pickled; report that instead
+            self._send((REPLY, seq, False, e))
+
+    def _send(self, message: tuple) -> None:
+        if self.closed:
+            raise PluginHostError("Plugin host connection is closed")
+        try:
+            while self._released:
+                number = self._released.pop()
+                self.connection.send((CALL, 0, ("callback", number), "release", (), {}))
+            self.connection.send(message)
+        except (ConnectionError, EOFError, OSError) as e:
+            self.close()
+            raise PluginHostError(f"Plugin host connection lost: {e}") from e
+        except Exception as e:
+            # Connection.send pickles before writing, so nothing was sent
+            what = message[3] if message[0] == CALL else type(message[3]).__name__
+            raise PluginHostError(f"Cannot send {what} to the other process: {e}") from e
+
+    def _receive(self) -> tuple:
+        if self.closed:
+            raise PluginHostError("Plugin host connection is closed")
+        try:
+            return self.connection.recv()
+        except (ConnectionError, EOFError, OSError) as e:
+            self.close()
+            raise PluginHostError(f"Plugin host connection lost: {e}") from e
+
+    def _encode(self, value: Any) -> Any:
+        """Replace callables in call arguments or results by references."""
+        if callable(value) and not isinstance(value, type):
+            return self.register_callback(value)
+        if isinstance(value, tuple):
+            return tuple(self._encode(item) for item in value)
+        if isinstance(value, list):
+            return [self._encode(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._encode(item) for key, item in value.items()}
+        return value
+
+    def _decode(self, value: Any) -> Any:
+        """Replace callback references in call arguments or results by callables."""
+        if isinstance(value, _CallbackRef):
+            return _RemoteCallable(self, value.number)
+        if isinstance(value, tuple):
+            return tuple(self._decode(item) for item in value)
+        if isinstance(value, list):
+            return [self._decode(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._decode(item) for key, item in value.items()}
+        return value
+
+
+# App side
+
+
+class PluginHost:
+    """
+    App-side handle of a plugin host process.
+
+    A host runs one plugin or a group of plugins that trust each other.
+    Service calls from a plugin are served through the service proxy of
+    the context it was activated with, so a PermissionAwareServiceProxy
+    checks them exactly as it would in process. Events are forwarded both
+    ways for the event types the plugin subscribed to.
+
+    Messages arriving outside of a call are read by a QSocketNotifier when
+    a Qt application is running, or by process_messages().
+    """
+
+    # Seconds to wait for the process to exit on stop()
+    STOP_TIMEOUT = 5.0
+
+    # Seconds a plugin gets to reply to activate() or a command
+    CALL_TIMEOUT = 30.0
+
+    def __init__(self, group: str):
+        """
+        Initialize the host; the process starts with start().
+
+        Args:
+            group: Name of the plugin group the host runs
+        """
+        self.group = group
+        self.process: Optional[multiprocessing.Process] = None
+        self.channel: Optional[Channel] = None
+        self._notifier = None
+        # Plugin ID -> service proxy, event bus and event subscriptions
+        self._proxies: Dict[str, ServiceProxy] = {}
+        self._event_buses: Dict[str, EventBus] = {}
+        self._subscriptions: Dict[str, List[Any]] = {}
+        self._services: Dict[Tuple[str, str], Any] = {}
+
+    @property
+    def pid(self) -> Optional[int]:
+        """Process ID of the host, for resource accounting."""
+        return self.process.pid if self.process else None
+
+    def is_running(self) -> bool:
+        """Check if the host process is alive."""
+        return bool(self.process and self.process.is_alive() and not self.channel.closed)
+
+    def start(self) -> None:
+        """Start the host process."""
+        if self.is_running():
+            return
+        # Never fork a process that runs Qt
+        context = multiprocessing.get_context("spawn")
+        app_end, host_end = context.Pipe()
+        self.process = context.Process(
+            target=run_host, args=(host_end,), name=f"plugin-host-{self.group}", daemon=True
+        )
+        self.process.start()
+        host_end.close()
+        self.channel = Channel(app_end, self._handle_call)
+        self._watch_channel()
+        logger.info(f"Started plugin host '{self.group}' (pid {self.pid})")
+
+    def stop(self) -> None:
+        """Stop the host process."""
+        if not self.process:
+            return
+        if self._notifier:
+            self._notifier.setEnabled(False)
+            self._notifier.deleteLater()
+            self._notifier = None
+        if not self.channel.closed:
+            try:
+                self.channel.notify(("host",), "shutdown")
+            except PluginHostError:
+                pass
+        self.process.join(self.STOP_TIMEOUT)
+        if self.process.is_alive():
+            logger.warning(f"Plugin host '{self.group}' did not stop, terminating")
+            self.process.terminate()
+            self.process.join(self.STOP_TIMEOUT)
+        self.channel.connection.close()
+        self.channel.close()
+        for plugin_id in list(self._proxies):
+            self._forget_plugin(plugin_id)
+        logger.info(f"Stopped plugin host '{self.group}'")
+        self.process = None
+
+    def load(self, plugin_info) -> "HostedPlugin":
+        """
+        Import and instantiate a plugin in the host.
+
+        Args:
+            plugin_info: Registry information of the plugin
+
+        Returns:
+            Stand-in for the plugin instance in the app
+        """
+        self.start()
+        plugin_id = plugin_info.metadata.id
+        metadata = self.channel.call(("host",), "load", plugin_id, plugin_info.path)
+        return HostedPlugin(self, plugin_id, metadata)
+
+    def unload(self, plugin_id: str) -> None:
+        """Drop a plugin from the host."""
+        self._forget_plugin(plugin_id)
+        if self.is_running():
+            self.channel.call(("host",), "unload", plugin_id)
+
+    def call_plugin(self, plugin_id: str, method: str, *args) -> Any:
+        """Call a method of a hosted plugin."""
+        if not self.is_running():
+            raise PluginHostError(f"Plugin host '{self.group}' is not running")
+        return self.channel.call(("plugin", plugin_id), method, *args)
+
+    def call_plugin_async(
+        self, plugin_id: str, method: str, *args, timeout: Optional[float] = None
+    ) -> Future:
+        """
+        Call a method of a hosted plugin without waiting for it.
+
+        Args:
+            plugin_id: Plugin identifier
+            method: Method name
+            timeout: Seconds to wait for the reply, CALL_TIMEOUT by default
+
+        Returns:
+            Future resolved from the event loop, or from process_messages()
+            when there is none
+        """
+        if not self.is_running():
+            raise PluginHostError(f"Plugin host '{self.group}' is not running")
+        timeout = self.CALL_TIMEOUT if timeout is None else timeout
+        future = self.channel.call_async(("plugin", plugin_id), method, args, timeout)
+        self._schedule_expiry(timeout)
+        return future
+
+    def activate(self, plugin_id: str, context: PluginContext) -> Future:
+        """
+        Start activating a hosted plugin with the app-side context.
+
+        Returns:
+            Future resolved once the plugin's activate() has returned
+        """
+        self._proxies[plugin_id] = context.get_service_proxy()
+        self._event_buses[plugin_id] = context.get_event_bus()
+        try:
+            future = self.call_plugin_async(
+                plugin_id,
+                "activate",
+                context.get_plugin_path(),
+                context.data_path,
+                context.get_configuration(),
+            )
+        except Exception:
+            self._forget_plugin(plugin_id)
+            raise
+
+        def activated(future: Future) -> None:
+            if future.exception() is not None:
+                self._forget_plugin(plugin_id)
+
+        future.add_done_callback(activated)
+        return future
+
+    def deactivate(self, plugin_id: str) -> None:
+        """Deactivate a hosted plugin."""
+        try:
+            self.call_plugin(plugin_id, "deactivate")
+        finally:
+            self._forget_plugin(plugin_id)
+
+    def process_messages(self, timeout: float = 0.0) -> None:
+        """Serve messages from the host that arrived outside of a call."""
+        if self.channel and not self.channel.process_pending(timeout):
+            logger.error(f"Plugin host '{self.group}' exited")
+            if self._notifier:
+                self._notifier.setEnabled(False)
+
+    def _schedule_expiry(self, timeout: float) -> None:
+        """Check for overdue replies once a call's timeout has passed."""
+        from PySide6.QtCore import QCoreApplication, QTimer
+
+        if QCoreApplication.instance() is not None:
+            QTimer.singleShot(int(timeout * 1000) + 1, self._check_replies)
+
+    def _check_replies(self) -> None:
+        if self.is_running():
+            self.process_messages()
+
+    def _watch_channel(self) -> None:
+        """Read messages from the Qt event loop when there is one."""
+        from PySide6.QtCore import QCoreApplication, QSocketNotifier
+
+        if QCoreApplication.instance() is None:
+            return
+        self._notifier = QSocketNotifier(self.channel.connection.fileno(), QSocketNotifier.Read)
+        self._notifier.activated.connect(lambda *_: self.process_messages())
+
+    def _forget_plugin(self, plugin_id: str) -> None:
+        self._proxies.pop(plugin_id, None)
+        event_bus = self._event_buses.pop(plugin_id, None)
+        for subscription in self._subscriptions.pop(plugin_id, []):
+            event_bus.unsubscribe(subscription)
+        for key in [key for key in self._services if key[0] == plugin_id]:
+            del self._services[key]
+
+    def _handle_call(self, target: Target, method: str, args: tuple, kwargs: dict) -> Any:
+        """Serve a call from a hosted plugin."""
+        kind, plugin_id = target[0], target[1]
+        proxy = self._proxies.get(plugin_id)
+        if proxy is None:
+            raise PluginHostError(f"Plugin {plugin_id} is not active")
+
+        if kind == "service":
+            service = self._get_service(plugin_id, target[2])
+            return getattr(service, method)(*args, **kwargs)
+
+        if kind == "proxy" and method in ("has_service", "list_services"):
+            return getattr(proxy, method)(*args)
+
+        if kind == "events":
+            return self._handle_event_call(plugin_id, method, *args)
+
+        raise PluginHostError(f"Unknown call {method} on {target}")
+
+    def _get_service(self, plugin_id: str, service_id: str) -> Any:
+        key = (plugin_id, service_id)
+        service = self._services.get(key)
+        if service is None:
+            service = self._proxies[plugin_id].get_service(service_id)
+            if service is None:
+                raise ServiceNotAvailableError(f"Service '{service_id}' is not available")
+            self._services[key] = service
+        return service
+
+    def _handle_event_call(self, plugin_id: str, method: str, *args) -> None:
+        event_bus = self._event_buses[plugin_id]
+        if method == "emit":
+            event_bus.emit(args[0])
+        elif method == "subscribe":
+            subscription = event_bus.subscribe(
+                args[0], self._make_event_forwarder(plugin_id), subscriber_id=plugin_id
+            )
+            self._subscriptions.setdefault(plugin_id, []).append(subscription)
+        else:
+            raise PluginHostError(f"Unknown event call {method}")
+
+    def _make_event_forwarder(self, plugin_id: str) -> Callable[[PluginEvent], None]:
+        def forward(event: PluginEvent) -> None:
+            # The plugin already delivered its own events locally
+            if event.source == plugin_id or not self.is_running():
+                return
+            try:
+                self.channel.notify(("events", plugin_id), "dispatch", event)
+            except Exception as e:
+                logger.warning(f"Could not forward event {event.type} to {plugin_id}: {e}")
+
+        return forward
+
+
+class HostedPlugin(IPlugin):
+    """App-side stand-in for a plugin running in a plugin host."""
+
+    def __init__(self, host: PluginHost, plugin_id: str, metadata: PluginMetadata):
+        self.host = host
+        self.plugin_id = plugin_id
+        self._metadata = metadata
+
+    @property
+    def pid(self) -> Optional[int]:
+        """Process ID the plugin runs in."""
+        return self.host.pid
+
+    def get_metadata(self) -> PluginMetadata:
+        return self._metadata
+
+    def activate(self, context: PluginContext) -> Future:
+        """Start activation in the host; see PluginHost.activate."""
+        return self.host.activate(self.plugin_id, context)
+
+    def deactivate(self) -> None:
+        self.host.deactivate(self.plugin_id)
+
+    def on_configuration_changed(self, config: Dict[str, Any]) -> None:
+        self.host.call_plugin(self.plugin_id, "on_configuration_changed", config)
+
+    def on_command(self, command_id: str, args: Dict[str, Any]) -> Future:
+        """Run a command in the host; the future resolves to its result."""
+        return self.host.call_plugin_async(self.plugin_id, "on_command", command_id, args)
+
+
+# Host side
+
+
+class RemoteService(IService):
+    """Host-side proxy that forwards method calls to an app service."""
+
+    def __init__(self, channel: Channel, plugin_id: str, service_id: str):
+        self._channel = channel
+        self._target = ("service", plugin_id, service_id)
+        self._service_id = service_id
+
+    def get_service_id(self) -> str:
+        return self._service_id
+
+    def get_service_version(self) -> str:
+        return self._channel.call(self._target, "get_service_version")
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def method(*args, **kwargs):
+            return self._channel.call(self._target, name, *args, **kwargs)
+
+        method.__name__ = name
+        return method
+
+
+class RemoteServiceProxy(ServiceProxy):
+    """Host-side service proxy whose services live in the app."""
+
+    def __init__(self, channel: Channel, plugin_id: str):
+        super().__init__({})
+        self._channel = channel
+        self._plugin_id = plugin_id
+
+    def get_service(self, service_id: str) -> Optional[IService]:
+        if service_id not in self._service_cache:
+            if not self.has_service(service_id):
+                return None
+            self._service_cache[service_id] = RemoteService(
+                self._channel, self._plugin_id, service_id
+            )
+        return self._service_cache[service_id]
+
+    def get_service_typed(self, service_type):
+        # Service types cannot be checked across processes
+        return None
+
+    def has_service(self, service_id: str) -> bool:
+        return self._channel.call(("proxy", self._plugin_id), "has_service", service_id)
+
+    def list_services(self) -> List[str]:
+        return self._channel.call(("proxy", self._plugin_id), "list_services")
+
+
+class RemoteEventBus(EventBus):
+    """Host-side event bus that shares events with the app's bus."""
+
+    def __init__(self, channel: Channel, plugin_id: str):
+        super().__init__()
+        self._channel = channel
+        self._plugin_id = plugin_id
+        self._forwarded_types = set()
+
+    def subscribe(self, event_type: EventType, handler, *args, **kwargs):
+        subscription = super().subscribe(event_type, handler, *args, **kwargs)
+        if event_type not in self._forwarded_types:
+            self._forwarded_types.add(event_type)
+            self._channel.call(("events", self._plugin_id), "subscribe", event_type)
+        return subscription
+
+    def emit(self, event: PluginEvent) -> None:
+        super().emit(event)
+        self._channel.notify(("events", self._plugin_id), "emit", event)
+
+    def deliver(self, event: PluginEvent) -> None:
+        """Deliver an event from the app to local subscribers."""
+        super().emit(event)
+
+
+class _HostServer:
+    """Runs plugins inside the host process."""
+
+    def __init__(self, connection):
+        self.channel = Channel(connection, self.handle_call)
+        self.plugins: Dict[str, IPlugin] = {}
+        self.event_buses: Dict[str, RemoteEventBus] = {}
+        self.running = True
+
+    def serve_forever(self) -> None:
+        while self.running and self.channel.process_pending(timeout=0.1):
+            pass
+
+    def handle_call(self, target: Target, method: str, args: tuple, kwargs: dict) -> Any:
+        if target[0] == "host":
+            return getattr(self, f"_{method}")(*args)
+
+        plugin_id = target[1]
+        if target[0] == "events":
+            bus = self.event_buses.get(plugin_id)
+            if bus is not None:
+                bus.deliver(args[0])
+            return None
+
+        plugin = self.plugins.get(plugin_id)
+        if plugin is None:
+            raise PluginHostError(f"Plugin {plugin_id} is not loaded in this host")
+        if method == "activate":
+            return self._activate(plugin_id, plugin, *args)
+        if method in ("deactivate", "on_configuration_changed", "on_command"):
+            return getattr(plugin, method)(*args)
+        raise PluginHostError(f"Unknown plugin call {method}")
+
+    def _load(self, plugin_id: str, plugin_path) -> PluginMetadata:
+        from .plugin_loader import PluginLoader
+        from .plugin_registry import PluginInfo
+
+        metadata = PluginMetadata(
+            id=plugin_id, name=plugin_id, version="0.0.0", description="", author=""
+        )
+        loader = PluginLoader(None, None, {})
+        plugin_info = PluginInfo(metadata, plugin_path)
+        loader._prepare_plugin_import(plugin_info)
+        plugin_class, _ = loader._import_plugin_class(plugin_info)
+        plugin = plugin_class()
+        if not isinstance(plugin, IPlugin):
+            raise PluginError(f"Plugin {plugin_id} does not implement IPlugin")
+        self.plugins[plugin_id] = plugin
+        return plugin.get_metadata()
+
+    def _unload(self, plugin_id: str) -> None:
+        self.plugins.pop(plugin_id, None)
+        self.event_buses.pop(plugin_id, None)
+
+    def _shutdown(self) -> None:
+        self.running = False
+
+    def _activate(self, plugin_id: str, plugin: IPlugin, plugin_path, data_path, config) -> None:
+        event_bus = RemoteEventBus(self.channel, plugin_id)
+        self.event_buses[plugin_id] = event_bus
+        context = PluginContext(
+            plugin_id=plugin_id,
+            plugin_path=plugin_path,
+            data_path=data_path,
+            service_proxy=RemoteServiceProxy(self.channel, plugin_id),
+            event_bus=event_bus,
+            configuration=config,
+        )
+        plugin.activate(context)
+
+
+def run_host(connection) -> None:
+    """Entry point of a plugin host process."""
+    logging.basicConfig(level=logging.INFO)
+    server = _HostServer(connection)
+    try:
+        server.serve_forever()
+    finally:
+        # Plugins still active when the app went away
+        for plugin_id in list(server.event_buses):
+            try:
+                server.plugins[plugin_id].deactivate()
+            except Exception as e:
+                logger.error(f"Error deactivating {plugin_id} on host shutdown: {e}")
+        connection.close()
@@ -4,11 +4,23 @@ import importlib
 import importlib.util
 import logging
 import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, Optional
-
-from viloapp_sdk import EventBus, IPlugin, LifecycleState, PluginContext, PluginLoadError
-
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from viloapp_sdk import (
+    EventBus,
+    IPlugin,
+    LifecycleState,
+    PluginCapability,
+    PluginContext,
+    PluginLoadError,
+)
+
+from .plugin_host import HostedPlugin, PluginHost
 from .plugin_registry import PluginInfo
 from .service_proxy_impl import ServiceProxyImpl
 
@@ -23,6 +35,48 @@ class PluginLoader:
         self.event_bus = event_bus
         self.services = services
         self.loaded_modules = {}
+        # Guards loaded_modules and sys.modules against the import threads
+        self._modules_lock = threading.Lock()
+        # Plugin ID -> {"import_ms": ..., "init_ms": ...}
+        self.load_timings: Dict[str, Dict[str, float]] = {}
+        # Plugin ID -> name of the plugin host process it runs in
+        self.process_groups: Dict[str, str] = {}
+        self.hosts: Dict[str, PluginHost] = {}
+
+    def set_process_group(self, plugin_id: str, group: Optional[str]) -> None:
+        """
+        Run a plugin out of process.
+
+        Plugins in the same group share a plugin host process; give each
+        plugin its own group to account for its resources separately.
+        Takes effect the next time the plugin is loaded.
+
+        Args:
+            plugin_id: Plugin identifier
+            group: Plugin host to run it in, or None to run it in process
+        """
+        if group:
+            self.process_groups[plugin_id] = group
+        else:
+            self.process_groups.pop(plugin_id, None)
+
+    def get_process_id(self, plugin_id: str) -> Optional[int]:
+        """
+        Get the ID of the process a loaded plugin runs in.
+
+        Returns:
+            The plugin host's process ID, or None for in-process plugins
+        """
+        plugin_info = self.registry.get_plugin(plugin_id)
+        if plugin_info and isinstance(plugin_info.instance, HostedPlugin):
+            return plugin_info.instance.pid
+        return None
+
+    def shutdown_hosts(self) -> None:
+        """Stop all plugin host processes."""
+        for host in self.hosts.values():
+            host.stop()
+        self.hosts.clear()
 
     def load_plugin(self, plugin_id: str) -> bool:
         """
@@ -34,26 +88,193 @@ class PluginLoader:
         Returns:
             True if loaded successfully
         """
+        plugin_info = self._get_loadable_plugin(plugin_id)
+        if not plugin_info:
+            return False
+
+        if plugin_id in self.process_groups:
+            return self._load_hosted_plugin(plugin_info)
+
+        self._prepare_plugin_import(plugin_info)
+        try:
+            plugin_class, import_ms = self._import_plugin_class(plugin_info)
+        except Exception as e:
+            return self._fail_load(plugin_id, e)
+
+        return self._instantiate_plugin(plugin_id, plugin_class, import_ms)
+
+    def load_plugins(
+        self,
+        plugin_ids: List[str],
+        dependencies: Optional[Dict[str, Set[str]]] = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, bool]:
+        """
+        Load several plugins, importing independent plugin modules concurrently.
+
+        Module imports run in a thread pool; a plugin is only submitted once
+        the plugins it depends on have been imported, so the total time is
+        bounded by the slowest dependency chain. Plugins that provide widgets
+        import Qt modules and, like instantiation, stay on the calling (UI)
+        thread.
+
+        Args:
+            plugin_ids: Plugins to load
+            dependencies: Plugin ID -> IDs of plugins it depends on
+            max_workers: Maximum number of import threads
+
+        Returns:
+            Dictionary of plugin ID to load success
+        """
+        results: Dict[str, bool] = {}
+        requested = set(plugin_ids)
+        dependencies = dependencies or {}
+
+        # Plugin ID -> dependencies among the requested plugins not imported yet
+        waiting = {
+            plugin_id: set(dependencies.get(plugin_id, ())) & requested - {plugin_id}
+            for plugin_id in plugin_ids
+        }
+        if not waiting:
+            return results
+
+        started = time.perf_counter()
+        workers = max_workers or min(len(waiting), 8)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="plugin-import") as pool:
+            running: Dict[Future, str] = {}
+
+            def submit_ready() -> None:
+                ready = [pid for pid, deps in waiting.items() if not deps]
+                while ready:
+                    for plugin_id in ready:
+                        del waiting[plugin_id]
+                        plugin_info = self.registry.get_plugin(plugin_id)
+                        if plugin_info and plugin_info.state in (
+                            LifecycleState.LOADED,
+                            LifecycleState.ACTIVATED,
+                        ):
+                            finish(plugin_id, True)
+                        elif plugin_id in self.process_groups and plugin_info:
+                            finish(plugin_id, self.load_plugin(plugin_id))
+                        elif not self._get_loadable_plugin(plugin_id):
+                            finish(plugin_id, False)
+                        elif self._imports_qt(plugin_info):
+                            finish(plugin_id, self.load_plugin(plugin_id))
+                        else:
+                            self._prepare_plugin_import(plugin_info)
+                            future = pool.submit(self._import_plugin_class, plugin_info)
+                            running[future] = plugin_id
+                    # Finishing a plugin here may have unblocked its dependents
+                    ready = [pid for pid, deps in waiting.items() if not deps]
+
+            def finish(plugin_id: str, success: bool) -> None:
+                results[plugin_id] = success
+                for dependent, deps in list(waiting.items()):
+                    if plugin_id not in deps:
+                        continue
+                    if success:
+                        deps.discard(plugin_id)
+                    else:
+                        del waiting[dependent]
+                        self.registry.set_error(dependent, f"Dependency {plugin_id} failed to load")
+                        finish(dependent, False)
+
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    plugin_id = running.pop(future)
+                    try:
+                        plugin_class, import_ms = future.result()
+                    except Exception as e:
+                        finish(plugin_id, self._fail_load(plugin_id, e))
+                        continue
+                    finish(plugin_id, self._instantiate_plugin(plugin_id, plugin_class, import_ms))
+                submit_ready()
+
+        # Anything still waiting is part of a dependency cycle
+        for plugin_id in waiting:
+            results[plugin_id] = False
+
+        wall_ms = (time.perf_counter() - started) * 1000
+        import_total = sum(self.load_timings.get(pid, {}).get("import_ms", 0.0) for pid in results)
+        logger.info(
+            f"Loaded {sum(results.values())}/{len(results)} plugins in {wall_ms:.1f} ms "
+            f"({import_total:.1f} ms of imports, {workers} threads)"
+        )
+        return results
+
+    def get_load_timings(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get per-plugin load timings.
+
+        Returns:
+            Dictionary of plugin ID to {"import_ms", "init_ms"}
+        """
+        return {plugin_id: dict(timing) for plugin_id, timing in self.load_timings.items()}
+
+    def _get_loadable_plugin(self, plugin_id: str) -> Optional[PluginInfo]:
+        """Get plugin info if the plugin can be loaded."""
         plugin_info = self.registry.get_plugin(plugin_id)
         if not plugin_info:
             logger.error(f"Plugin {plugin_id} not found in registry")
-            return False
+            return None
 
         if plugin_info.state not in [LifecycleState.DISCOVERED, LifecycleState.UNLOADED]:
             logger.warning(f"Plugin {plugin_id} is in state {plugin_info.state}, cannot load")
-            return False
+            return None
 
-        try:
-            # Load plugin module
-            module = self._load_plugin_module(plugin_info)
-            if not module:
-                raise PluginLoadError(f"Failed to load module for {plugin_id}")
+        return plugin_info
+
+    def _import_plugin_class(self, plugin_info: PluginInfo) -> Tuple[type, float]:
+        """
+        Import a plugin module and find its plugin class.
 
-            # Find plugin class
-            plugin_class = self._find_plugin_class(module)
-            if not plugin_class:
-                raise PluginLoadError(f"No plugin class found in {plugin_id}")
+        Runs on the import threads of load_plugins, so it must not touch the
+        registry or Qt; call _prepare_plugin_import on the calling thread
+        first to make the plugin's package importable.
 
+        Returns:
+            Tuple of (plugin class, import time in ms)
+        """
+        plugin_id = plugin_info.metadata.id
+        started = time.perf_counter()
+
+        # Load plugin module
+        module = self._load_plugin_module(plugin_info)
+        if not module:
+            raise PluginLoadError(f"Failed to load module for {plugin_id}")
+
+        # Find plugin class
+        plugin_class = self._find_plugin_class(module)
+        if not plugin_class:
+            raise PluginLoadError(f"No plugin class found in {plugin_id}")
+
+        return plugin_class, (time.perf_counter() - started) * 1000
+
+    def _prepare_plugin_import(self, plugin_info: PluginInfo) -> None:
+        """Add the src directory of a plugin package to sys.path."""
+        plugin_path = plugin_info.path
+        if str(plugin_path).startswith(("builtin", "entry_points")) or not plugin_path.is_dir():
+            return
+
+        # For viloxterm/src/viloxterm this is viloxterm/src
+        package_src = plugin_path.parent
+        if package_src.name == "src" and str(package_src) not in sys.path:
+            sys.path.insert(0, str(package_src))
+
+    def _imports_qt(self, plugin_info: PluginInfo) -> bool:
+        """Check whether importing a plugin pulls in Qt widget modules."""
+        metadata = plugin_info.metadata
+        return PluginCapability.WIDGETS in metadata.capabilities or bool(
+            metadata.contributes.get("widgets")
+        )
+
+    def _instantiate_plugin(self, plugin_id: str, plugin_class: type, import_ms: float) -> bool:
+        """Instantiate an imported plugin class and mark the plugin loaded."""
+        started = time.perf_counter()
+        try:
             # Instantiate plugin
             plugin_instance = plugin_class()
 
@@ -62,21 +283,52 @@ class PluginLoader:
                 raise PluginLoadError(f"Plugin {plugin_id} does not implement IPlugin")
 
             # Update metadata from actual plugin
-            actual_metadata = plugin_instance.get_metadata()
-            plugin_info.metadata = actual_metadata
+            plugin_info = self.registry.get_plugin(plugin_id)
+            plugin_info.metadata = plugin_instance.get_metadata()
 
             # Store instance
             self.registry.set_instance(plugin_id, plugin_instance)
             self.registry.update_state(plugin_id, LifecycleState.LOADED)
 
-            logger.info(f"Loaded plugin: {plugin_id}")
-            return True
+        except Exception as e:
+            return self._fail_load(plugin_id, e)
 
+        init_ms = (time.perf_counter() - started) * 1000
+        self.load_timings[plugin_id] = {"import_ms": import_ms, "init_ms": init_ms}
+        logger.info(
+            f"Loaded plugin: {plugin_id} (import {import_ms:.1f} ms, init {init_ms:.1f} ms)"
+        )
+        return True
+
+    def _load_hosted_plugin(self, plugin_info: PluginInfo) -> bool:
+        """Import and instantiate a plugin in its plugin host process."""
+        plugin_id = plugin_info.metadata.id
+        group = self.process_groups[plugin_id]
+        started = time.perf_counter()
+        try:
+            host = self.hosts.get(group)
+            if host is None:
+                host = self.hosts[group] = PluginHost(group)
+            plugin_instance = host.load(plugin_info)
+            plugin_info.metadata = plugin_instance.get_metadata()
+            self.registry.set_instance(plugin_id, plugin_instance)
+            self.registry.update_state(plugin_id, LifecycleState.LOADED)
         except Exception as e:
-            error_msg = f"Failed to load plugin {plugin_id}: {e}"
-            logger.error(error_msg, exc_info=True)
-            self.registry.set_error(plugin_id, str(e))
-            return False
+            return self._fail_load(plugin_id, e)
+
+        load_ms = (time.perf_counter() - started) * 1000
+        self.load_timings[plugin_id] = {"import_ms": load_ms, "init_ms": 0.0}
+        logger.info(
+            f"Loaded plugin: {plugin_id} in plugin host '{group}' (pid {host.pid}, {load_ms:.1f} ms)"
+        )
+        return True
+
+    def _fail_load(self, plugin_id: str, error: Exception) -> bool:
+        """Record a load failure."""
+        error_msg = f"Failed to load plugin {plugin_id}: {error}"
+        logger.error(error_msg, exc_info=error)
+        self.registry.set_error(plugin_id, str(error))
+        return False
 
     def activate_plugin(self, plugin_id: str) -> bool:
         """
@@ -106,7 +358,11 @@ class PluginLoader:
             self.registry.set_context(plugin_id, context)
 
             # Activate plugin
-            plugin_info.instance.activate(context)
+            activation = plugin_info.instance.activate(context)
+            if isinstance(activation, Future):
+                # Hosted plugins activate in their own process and report
+                # failures once it replies
+                activation.add_done_callback(partial(self._on_activation_done, plugin_id))
 
             # Register plugin widgets if it has any
             if hasattr(plugin_info.instance, "get_widgets"):
@@ -154,6 +410,13 @@ class PluginLoader:
             self.registry.set_error(plugin_id, str(e))
             return False
 
+    def _on_activation_done(self, plugin_id: str, activation: Future) -> None:
+        """Record the failure of an activation that completed later."""
+        error = activation.exception()
+        if error is not None:
+            logger.error(f"Failed to activate plugin {plugin_id}: {error}")
+            self.registry.set_error(plugin_id, str(error))
+
     def deactivate_plugin(self, plugin_id: str) -> bool:
         """
         Deactivate a plugin.
@@ -228,16 +491,18 @@ class PluginLoader:
             return False
 
         try:
+            if isinstance(plugin_info.instance, HostedPlugin):
+                self._unload_hosted_plugin(plugin_info.instance)
+
             # Clear instance and context
             self.registry.set_instance(plugin_id, None)
             self.registry.set_context(plugin_id, None)
 
             # Remove from loaded modules
-            if plugin_id in self.loaded_modules:
-                module_name = self.loaded_modules[plugin_id]
-                if module_name in sys.modules:
-                    del sys.modules[module_name]
-                del self.loaded_modules[plugin_id]
+            with self._modules_lock:
+                module_name = self.loaded_modules.pop(plugin_id, None)
+                if module_name:
+                    sys.modules.pop(module_name, None)
 
             # Update state
             self.registry.update_state(plugin_id, LifecycleState.UNLOADED)
@@ -260,6 +525,23 @@ class PluginLoader:
             logger.error(f"Failed to unload plugin {plugin_id}: {e}")
             return False
 
+    def _unload_hosted_plugin(self, plugin: HostedPlugin) -> None:
+        """Drop a plugin from its host and stop the host once it is empty."""
+        host = plugin.host
+        try:
+            host.unload(plugin.plugin_id)
+        finally:
+            remaining = [
+                info
+                for info in self.registry.get_all_plugins()
+                if info.metadata.id != plugin.plugin_id
+                and isinstance(info.instance, HostedPlugin)
+                and info.instance.host is host
+            ]
+            if not remaining:
+                host.stop()
+                self.hosts.pop(host.group, None)
+
     def _load_plugin_module(self, plugin_info: PluginInfo):
         """Load plugin Python module."""
         plugin_id = plugin_info.metadata.id
@@ -286,10 +568,7 @@ class PluginLoader:
                 # For viloedit package: viloedit.plugin
                 package_src = plugin_path.parent  # This should be the src directory
                 if package_src.exists() and package_src.name == "src":
-                    # Add src directory to path if not already there
-                    if str(package_src) not in sys.path:
-                        sys.path.insert(0, str(package_src))
-
+                    # The src directory was added to sys.path by _prepare_plugin_import
                     # Import the actual package module
                     try:
                         # Get package name from the actual directory name (not plugin_id)
@@ -298,7 +577,8 @@ class PluginLoader:
                             f"Attempting to import {package_name}.plugin from path {package_src}"
                         )
                         module = importlib.import_module(f"{package_name}.plugin")
-                        self.loaded_modules[plugin_id] = f"{package_name}.plugin"
+                        with self._modules_lock:
+                            self.loaded_modules[plugin_id] = f"{package_name}.plugin"
                         logger.info(f"Successfully imported {package_name}.plugin")
                         return module
                     except ImportError as e:
@@ -311,9 +591,11 @@ class PluginLoader:
 
                 if spec and spec.loader:
                     module = importlib.util.module_from_spec(spec)
-                    sys.modules[module_name] = module
+                    with self._modules_lock:
+                        sys.modules[module_name] = module
                     spec.loader.exec_module(module)
-                    self.loaded_modules[plugin_id] = module_name
+                    with self._modules_lock:
+                        self.loaded_modules[plugin_id] = module_name
                     return module
 
         return None
@@ -4,9 +4,12 @@ import logging
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from viloapp_sdk import EventBus, IPlugin
+from viloapp_sdk import EventBus, IPlugin, LifecycleState
+from viloapp_sdk.utils.decorators import ActivationEventType
 
 from .dependency_resolver import DependencyResolver
+from .discovery_cache import DiscoveryCache
+from .lazy_widget import LazyWidgetFactory
 from .plugin_discovery import PluginDiscovery
 from .plugin_loader import PluginLoader
 from .plugin_registry import PluginRegistry
@@ -18,7 +21,20 @@ logger = logging.getLogger(__name__)
 class PluginManager:
     """Central manager for all plugin operations."""
 
-    def __init__(self, event_bus: EventBus, services: Dict[str, Any]):
+    def __init__(
+        self,
+        event_bus: EventBus,
+        services: Dict[str, Any],
+        discovery_cache: Optional[DiscoveryCache] = None,
+    ):
+        """
+        Initialize the plugin manager.
+
+        Args:
+            event_bus: Event bus shared with plugins
+            services: Application services by name
+            discovery_cache: Cache for discovery results, defaults to the user cache dir
+        """
         self.event_bus = event_bus
         self.services = services
 
@@ -27,11 +43,20 @@ class PluginManager:
 
         # Initialize components
         self.registry = PluginRegistry()
-        self.discovery = PluginDiscovery(self.registry)
+        self.discovery = PluginDiscovery(self.registry, discovery_cache or DiscoveryCache())
         # Pass adapted services to loader
         self.loader = PluginLoader(self.registry, event_bus, self.service_adapters)
         self.resolver = DependencyResolver(self.registry)
 
+        # Activation event -> plugin IDs, in dependency order
+        self._activation_index: Dict[str, List[str]] = {}
+        self._unmet_dependencies: Dict[str, List[str]] = {}
+        # Command ID -> placeholder command registered from a manifest
+        self._command_stubs: Dict[str, Any] = {}
+        # Plugin ID -> placeholder widget factories registered from a manifest
+        self._lazy_widgets: Dict[str, List[LazyWidgetFactory]] = {}
+        self._widget_bridge = None
+
         self._initialized = False
 
     def initialize(self) -> bool:
@@ -54,20 +79,24 @@ class PluginManager:
 
             # Resolve dependencies
             load_order, unmet_deps = self.resolver.resolve_dependencies()
+            self._unmet_dependencies = unmet_deps
 
             # Log dependency issues
             if unmet_deps:
                 for plugin_id, deps in unmet_deps.items():
                     logger.warning(f"Plugin {plugin_id} has unmet dependencies: {deps}")
 
-            # Load and activate plugins in order
+            # Index activation events and register contributed commands.
+            # Plugin code is only imported when one of its events fires.
             for plugin_id in load_order:
                 if plugin_id not in unmet_deps:
-                    if self.load_plugin(plugin_id):
-                        # Auto-activate plugins with activation events
-                        plugin_info = self.registry.get_plugin(plugin_id)
-                        if plugin_info and self._should_auto_activate(plugin_info):
-                            self.activate_plugin(plugin_id)
+                    plugin_info = self.registry.get_plugin(plugin_id)
+                    if plugin_info:
+                        self._index_activation_events(plugin_info)
+                        self._register_command_stubs(plugin_info)
+
+            # Activate plugins that asked to start eagerly
+            self.fire_activation_event(ActivationEventType.ON_STARTUP.value)
 
             self._initialized = True
             logger.info("Plugin system initialized")
@@ -261,19 +290,255 @@ class PluginManager:
             return self.unload_plugin(plugin_id)
         return False
 
-    def _should_auto_activate(self, plugin_info) -> bool:
-        """Check if plugin should be auto-activated."""
-        activation_events = plugin_info.metadata.activation_events
+    def set_process_group(self, plugin_id: str, group: Optional[str]) -> None:
+        """
+        Run a plugin in a plugin host process instead of the app process.
 
-        # Check for startup activation
-        if "onStartup" in activation_events:
-            return True
+        Args:
+            plugin_id: Plugin identifier
+            group: Plugin host to run it in, or None to run it in process
+        """
+        self.loader.set_process_group(plugin_id, group)
+
+    def get_plugin_process_id(self, plugin_id: str) -> Optional[int]:
+        """Get the process ID of a plugin running out of process."""
+        return self.loader.get_process_id(plugin_id)
+
+    def shutdown(self) -> None:
+        """Deactivate all plugins and stop plugin host processes."""
+        for plugin_info in self.registry.get_plugins_by_state(LifecycleState.ACTIVATED):
+            self.loader.deactivate_plugin(plugin_info.metadata.id)
+        self.loader.shutdown_hosts()
+
+    def fire_activation_event(self, event: str) -> List[str]:
+        """
+        Activate all plugins waiting for an activation event.
+
+        Args:
+            event: Activation event, e.g. "onCommand:terminal.new" or "onStartupFinished"
+
+        Returns:
+            List of plugin IDs activated by this event
+        """
+        pending = []
+        for plugin_id in self._activation_index.get(event, []):
+            plugin_info = self.registry.get_plugin(plugin_id)
+            if plugin_info and plugin_info.state != LifecycleState.ACTIVATED:
+                pending.append(plugin_id)
+
+        # Import all plugins of this event concurrently, then activate them
+        # one by one in dependency order on this thread
+        self._preload_plugins(pending)
+
+        activated = []
+        for plugin_id in pending:
+            logger.info(f"Activating plugin {plugin_id} on {event}")
+            if self.ensure_activated(plugin_id):
+                activated.append(plugin_id)
+
+        return activated
+
+    def ensure_activated(self, plugin_id: str) -> bool:
+        """
+        Load and activate a plugin and its dependencies if not already active.
+
+        Args:
+            plugin_id: Plugin identifier
+
+        Returns:
+            True if the plugin is activated
+        """
+        return self._ensure_activated(plugin_id, set())
+
+    def register_widgets(self, widget_bridge) -> None:
+        """
+        Register plugin widgets with the UI.
+
+        Activated plugins register their real widget factory; the rest get
+        placeholders built from their manifest that activate the plugin when
+        a widget is first created.
+
+        Args:
+            widget_bridge: PluginWidgetBridge to register widgets with
+        """
+        self._widget_bridge = widget_bridge
 
-        # Check for '*' (always activate)
-        if "*" in activation_events:
+        for plugin_info in self.registry.get_all_plugins():
+            plugin_id = plugin_info.metadata.id
+            if plugin_id in self._unmet_dependencies:
+                continue
+
+            if plugin_info.state == LifecycleState.ACTIVATED:
+                self._register_activated_widget(plugin_id)
+                continue
+
+            for contribution in plugin_info.metadata.contributes.get("widgets", []):
+                if not contribution.get("id"):
+                    continue
+                lazy_widget = LazyWidgetFactory(
+                    plugin_id,
+                    contribution,
+                    lambda pid=plugin_id, wid=contribution["id"]: self._resolve_widget(pid, wid),
+                )
+                self._lazy_widgets.setdefault(plugin_id, []).append(lazy_widget)
+                widget_bridge.register_plugin_widget(lazy_widget, plugin_id)
+
+    def get_load_timings(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get per-plugin load timings.
+
+        Returns:
+            Dictionary of plugin ID to {"import_ms", "init_ms"}
+        """
+        return self.loader.get_load_timings()
+
+    def _preload_plugins(self, plugin_ids: List[str]) -> None:
+        """Load plugins and their plugin dependencies concurrently."""
+        to_load = []
+        stack = list(plugin_ids)
+        while stack:
+            plugin_id = stack.pop()
+            plugin_info = self.registry.get_plugin(plugin_id)
+            if (
+                plugin_id in to_load
+                or plugin_id in self._unmet_dependencies
+                or not plugin_info
+                or plugin_info.state not in (LifecycleState.DISCOVERED, LifecycleState.UNLOADED)
+            ):
+                continue
+            to_load.append(plugin_id)
+            stack.extend(self.resolver.get_dependency_map([plugin_id])[plugin_id])
+
+        # A single plugin is loaded directly during activation
+        if len(to_load) > 1:
+            self.loader.load_plugins(to_load, self.resolver.get_dependency_map(to_load))
+
+    def _ensure_activated(self, plugin_id: str, visiting: set) -> bool:
+        """Activate a plugin after its plugin dependencies."""
+        plugin_info = self.registry.get_plugin(plugin_id)
+        if not plugin_info:
+            return False
+
+        if plugin_info.state == LifecycleState.ACTIVATED:
             return True
 
-        return False
+        if plugin_id in self._unmet_dependencies:
+            logger.warning(f"Not activating {plugin_id}: unmet dependencies")
+            return False
+
+        if plugin_id in visiting:
+            logger.error(f"Circular dependency while activating {plugin_id}")
+            return False
+        visiting.add(plugin_id)
+
+        for dependency in sorted(self.resolver.get_dependency_map([plugin_id])[plugin_id]):
+            if not self._ensure_activated(dependency, visiting):
+                logger.error(f"Cannot activate {plugin_id}: dependency {dependency} failed")
+                return False
+
+        # The plugin registers the real commands during activation
+        self._remove_command_stubs(plugin_id)
+
+        if plugin_info.state in (LifecycleState.DISCOVERED, LifecycleState.UNLOADED):
+            if not self.load_plugin(plugin_id):
+                return False
+
+        if not self.activate_plugin(plugin_id):
+            return False
+
+        if plugin_id not in self._lazy_widgets:
+            self._register_activated_widget(plugin_id)
+        return True
+
+    def _index_activation_events(self, plugin_info) -> None:
+        """Add a plugin's activation events to the index."""
+        plugin_id = plugin_info.metadata.id
+        for event in plugin_info.metadata.activation_events:
+            # '*' means always activate, i.e. on startup
+            if event == "*":
+                event = ActivationEventType.ON_STARTUP.value
+            plugin_ids = self._activation_index.setdefault(event, [])
+            if plugin_id not in plugin_ids:
+                plugin_ids.append(plugin_id)
+
+    def _register_command_stubs(self, plugin_info) -> None:
+        """Register placeholders for commands contributed by an inactive plugin."""
+        from viloapp.core.commands.base import FunctionCommand
+        from viloapp.core.commands.registry import command_registry
+
+        plugin_id = plugin_info.metadata.id
+        for contribution in plugin_info.metadata.contributes.get("commands", []):
+            command_id = contribution.get("id")
+            if not command_id or command_registry.get_command(command_id):
+                continue
+
+            stub = FunctionCommand(
+                id=command_id,
+                title=contribution.get("title", command_id),
+                category=contribution.get("category", "Plugin"),
+                handler=self._make_command_stub_handler(plugin_id, command_id),
+                description=contribution.get("description"),
+                icon=contribution.get("icon"),
+            )
+            command_registry.register(stub)
+            self._command_stubs[command_id] = stub
+
+    def _make_command_stub_handler(self, plugin_id: str, command_id: str):
+        """Create a handler that activates the plugin and runs the real command."""
+        from viloapp.core.commands.base import CommandResult, CommandStatus
+        from viloapp.core.commands.registry import command_registry
+
+        def handler(context):
+            self.fire_activation_event(f"{ActivationEventType.ON_COMMAND.value}:{command_id}")
+            if not self.ensure_activated(plugin_id):
+                return CommandResult(
+                    status=CommandStatus.FAILURE,
+                    message=f"Plugin {plugin_id} could not be activated",
+                )
+
+            command = command_registry.get_command(command_id)
+            if command is None or command is self._command_stubs.get(command_id):
+                return CommandResult(
+                    status=CommandStatus.FAILURE,
+                    message=f"Plugin {plugin_id} did not register command {command_id}",
+                )
+
+            # Run the real command directly; the executor is still busy with the stub
+            return command.execute(context)
+
+        return handler
+
+    def _remove_command_stubs(self, plugin_id: str) -> None:
+        """Unregister the placeholder commands of a plugin."""
+        from viloapp.core.commands.registry import command_registry
+
+        plugin_info = self.registry.get_plugin(plugin_id)
+        if not plugin_info:
+            return
+
+        for contribution in plugin_info.metadata.contributes.get("commands", []):
+            command_id = contribution.get("id")
+            stub = self._command_stubs.pop(command_id, None)
+            if stub is not None and command_registry.get_command(command_id) is stub:
+                command_registry.unregister(command_id)
+
+    def _resolve_widget(self, plugin_id: str, widget_id: str) -> Optional[Any]:
+        """Activate the plugin behind a placeholder widget and return its factory."""
+        self.fire_activation_event(f"{ActivationEventType.ON_WIDGET.value}:{widget_id}")
+        if not self.ensure_activated(plugin_id):
+            return None
+
+        plugin = self.get_plugin(plugin_id)
+        return getattr(plugin, "widget_factory", None)
+
+    def _register_activated_widget(self, plugin_id: str) -> None:
+        """Register the widget factory of an activated plugin with the UI."""
+        if not self._widget_bridge:
+            return
+
+        plugin = self.get_plugin(plugin_id)
+        if plugin and hasattr(plugin, "widget_factory"):
+            self._widget_bridge.register_plugin_widget(plugin.widget_factory, plugin_id)
 
     def save_state(self, path: Optional[Path] = None) -> bool:
         """
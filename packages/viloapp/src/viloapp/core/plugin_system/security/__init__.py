@@ -3,6 +3,7 @@
 from .permissions import Permission, PermissionCategory, PermissionManager, PermissionScope
 from .resources import ResourceLimiter, ResourceMonitor, ResourceType, ResourceViolation
 from .sandbox import PluginSandbox, RestartPolicy
+from .telemetry import OperationStats, PluginTelemetry
 
 __all__ = [
     "Permission",
@@ -15,4 +16,6 @@ __all__ = [
     "ResourceViolation",
     "PluginSandbox",
     "RestartPolicy",
+    "PluginTelemetry",
+    "OperationStats",
 ]
@@ -1,9 +1,13 @@
 """Permission system for plugin security."""
 
 import fnmatch
+import os
+import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 
 class PermissionCategory(Enum):
@@ -71,14 +75,91 @@ class Permission:
         return False
 
 
+# Marks the trie node where a directory prefix ends
+_PREFIX_END = None
+
+
+class PermissionMatcher:
+    """
+    Matches resources against all resources of a permission category and scope.
+
+    Gives the same answers as calling Permission.matches_resource for each
+    permission, in one pass: exact resources are looked up in a set,
+    filesystem directory prefixes are walked in a trie of path components
+    and glob patterns are compiled into a single regex.
+    """
+
+    def __init__(self, category: PermissionCategory, resources: Iterable[str]):
+        """
+        Compile a matcher.
+
+        Args:
+            category: Category of the permissions
+            resources: Resources of the permissions
+        """
+        self._exact: Set[str] = set()
+        self._prefixes: Dict[Optional[str], Any] = {}
+        patterns = []
+
+        for resource in resources:
+            self._exact.add(resource)
+            if any(char in resource for char in "*?["):
+                patterns.append(fnmatch.translate(os.path.normcase(resource)))
+            if category == PermissionCategory.FILESYSTEM:
+                # Files within a directory, also for "directory/*"
+                self._add_prefix(resource)
+                if resource.endswith("/*"):
+                    self._add_prefix(resource[:-2])
+
+        self._pattern = re.compile("|".join(patterns)) if patterns else None
+
+    def matches(self, resource_path: str) -> bool:
+        """Check if any of the permissions matches a resource path."""
+        if resource_path in self._exact:
+            return True
+        if self._prefixes and self._matches_prefix(resource_path):
+            return True
+        return bool(self._pattern and self._pattern.match(os.path.normcase(resource_path)))
+
+    def _add_prefix(self, directory: str) -> None:
+        node = self._prefixes
+        for part in directory.split("/"):
+            node = node.setdefault(part, {})
+        node[_PREFIX_END] = True
+
+    def _matches_prefix(self, resource_path: str) -> bool:
+        """Check if resource_path starts with one of the directories and a "/"."""
+        node = self._prefixes
+        parts = resource_path.split("/")
+        last = len(parts) - 1
+        for index, part in enumerate(parts):
+            node = node.get(part)
+            if node is None:
+                return False
+            if _PREFIX_END in node and index < last:
+                return True
+        return False
+
+
 class PermissionManager:
     """Manages permissions for plugins."""
 
+    # Number of can_access() decisions remembered
+    DECISION_CACHE_SIZE = 4096
+
     def __init__(self):
         """Initialize permission manager."""
         self._plugin_permissions: Dict[str, Set[Permission]] = {}
         self._default_permissions: Dict[str, List[Permission]] = self._initialize_defaults()
 
+        # Compiled per (plugin, category, scope) and decisions per resource,
+        # both dropped when the plugin's permissions change
+        self._matchers: Dict[Tuple[str, PermissionCategory, PermissionScope], PermissionMatcher] = (
+            {}
+        )
+        self._decisions: OrderedDict[tuple, bool] = OrderedDict()
+        self._cache_lock = threading.Lock()
+
     def _initialize_defaults(self) -> Dict[str, List[Permission]]:
         """Initialize default permission sets for different plugin types."""
         return {
@@ -97,6 +178,7 @@ class PermissionManager:
     def set_plugin_permissions(self, plugin_id: str, permissions: List[Permission]) -> None:
         """Set permissions for a plugin."""
         self._plugin_permissions[plugin_id] = set(permissions)
+        self._permissions_changed(plugin_id)
 
     def get_plugin_permissions(self, plugin_id: str) -> List[Permission]:
         """Get all permissions for a plugin."""
@@ -108,11 +190,13 @@ class PermissionManager:
         if plugin_id not in self._plugin_permissions:
             self._plugin_permissions[plugin_id] = set()
         self._plugin_permissions[plugin_id].add(permission)
+        self._permissions_changed(plugin_id)
 
     def revoke_permission(self, plugin_id: str, permission: Permission) -> None:
         """Revoke a specific permission from a plugin."""
         if plugin_id in self._plugin_permissions:
             self._plugin_permissions[plugin_id].discard(permission)
+            self._permissions_changed(plugin_id)
 
     def has_permission(self, plugin_id: str, permission: Permission) -> bool:
         """Check if a plugin has a specific permission."""
@@ -134,17 +218,42 @@ class PermissionManager:
         Returns:
             True if plugin has permission to access resource
         """
-        plugin_permissions = self._plugin_permissions.get(plugin_id, set())
-
-        for permission in plugin_permissions:
-            if (
-                permission.category == category
-                and permission.scope == scope
-                and permission.matches_resource(resource)
-            ):
-                return True
-
-        return False
+        key = (plugin_id, category, scope, resource)
+        with self._cache_lock:
+            decision = self._decisions.get(key)
+            if decision is not None:
+                self._decisions.move_to_end(key)
+                return decision
+
+            matcher_key = (plugin_id, category, scope)
+            matcher = self._matchers.get(matcher_key)
+            if matcher is None:
+                matcher = self._matchers[matcher_key] = PermissionMatcher(
+                    category,
+                    (
+                        permission.resource
+                        for permission in self._plugin_permissions.get(plugin_id, ())
+                        if permission.category == category and permission.scope == scope
+                    ),
+                )
+
+            decision = matcher.matches(resource)
+            self._decisions[key] = decision
+            if len(self._decisions) > self.DECISION_CACHE_SIZE:
+                self._decisions.popitem(last=False)
+            return decision
+
+    def _permissions_changed(self, plugin_id: Optional[str] = None) -> None:
+        """Drop compiled matchers and decisions after a change of permissions."""
+        with self._cache_lock:
+            if plugin_id is None:
+                self._matchers.clear()
+                self._decisions.clear()
+                return
+            for key in [key for key in self._matchers if key[0] == plugin_id]:
+                del self._matchers[key]
+            for key in [key for key in self._decisions if key[0] == plugin_id]:
+                del self._decisions[key]
 
     def get_default_permissions(self, plugin_type: str) -> List[Permission]:
         """Get default permissions for a plugin type."""
@@ -219,6 +328,7 @@ class PermissionManager:
             config: Configuration dictionary
         """
         self._plugin_permissions.clear()
+        self._permissions_changed()
 
         for plugin_id, perm_list in config.items():
             permissions = []
@@ -1,12 +1,15 @@
 """Resource monitoring and limiting for plugin security."""
 
 import logging
+import os
 import threading
 import time
+from array import array
 from collections import deque
+from contextlib import nullcontext
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 try:
     import psutil
@@ -44,6 +47,304 @@ class ResourceViolation:
         )
 
 
+# Column of each resource type in samples and usage histories
+_COLUMNS = {resource_type: column for column, resource_type in enumerate(ResourceType)}
+
+
+def _read_usage(process: Optional[Any]) -> List[float]:
+    """
+    Read all resource usage of a process in one psutil snapshot, by column.
+
+    Raises:
+        psutil.NoSuchProcess: If the process no longer exists
+    """
+    usage = [0.0] * len(_COLUMNS)
+    if process is None:
+        return usage
+
+    with process.oneshot():
+        try:
+            # Resident Set Size in bytes and CPU percentage since the last read
+            usage[_COLUMNS[ResourceType.MEMORY]] = float(process.memory_info().rss)
+            usage[_COLUMNS[ResourceType.CPU]] = float(process.cpu_percent())
+        except psutil.NoSuchProcess:
+            raise
+        except Exception as e:
+            logger.warning(f"Error getting memory and CPU usage: {e}")
+
+        try:
+            # Disk I/O bytes read + written
+            io_counters = process.io_counters()
+            usage[_COLUMNS[ResourceType.DISK]] = float(
+                io_counters.read_bytes + io_counters.write_bytes
+            )
+        except psutil.NoSuchProcess:
+            raise
+        except Exception as e:
+            logger.debug(f"Error getting disk usage: {e}")
+
+    # psutil doesn't provide per-process network stats, NETWORK stays 0
+    return usage
+
+
+class UsageHistory:
+    """
+    Fixed-size history of resource usage samples.
+
+    Samples are stored in preallocated array columns used as a ring
+    buffer, one for the timestamps and one per resource type. Running sums
+    and sliding maxima are updated as samples are added and evicted, so
+    the average and peak over the whole history cost O(1); windowed
+    queries only visit the samples in the window.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Initialize the history.
+
+        Args:
+            capacity: Maximum number of samples kept
+        """
+        self.capacity = max(1, capacity)
+        self._timestamps = array("d", bytes(8 * self.capacity))
+        self._columns = [array("d", bytes(8 * self.capacity)) for _ in _COLUMNS]
+        self._start = 0
+        self._count = 0
+        self._added = 0
+        self._sums = [0.0] * len(_COLUMNS)
+        # Per column: (sample number, value) pairs with decreasing values
+        self._maxima = [deque() for _ in _COLUMNS]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, timestamp: float, usage: Dict[ResourceType, float]) -> None:
+        """Add a sample of some resource types; the others are recorded as 0."""
+        values = [0.0] * len(_COLUMNS)
+        for resource_type, value in usage.items():
+            values[_COLUMNS[resource_type]] = value
+        self.append_values(timestamp, values)
+
+    def append_values(self, timestamp: float, values: Sequence[float]) -> None:
+        """Add a sample with a value per column, evicting the oldest when full."""
+        capacity = self.capacity
+        columns = self._columns
+        sums = self._sums
+        if self._count == capacity:
+            oldest = self._start
+            for column, values_column in enumerate(columns):
+                sums[column] -= values_column[oldest]
+            self._start = (oldest + 1) % capacity
+            self._count -= 1
+            if self._start == 0:
+                # Once per lap, drop the rounding error of the running sums
+                for column, values_column in enumerate(columns):
+                    sums[column] = sum(values_column[i] for i in self._indices(0))
+
+        index = (self._start + self._count) % capacity
+        number = self._added
+        self._added += 1
+        self._count += 1
+        oldest_kept = number - self._count + 1
+
+        self._timestamps[index] = timestamp
+        for column, value in enumerate(values):
+            columns[column][index] = value
+            sums[column] += value
+
+            maxima = self._maxima[column]
+            while maxima and maxima[-1][1] <= value:
+                maxima.pop()
+            maxima.append((number, value))
+            if maxima[0][0] < oldest_kept:
+                maxima.popleft()
+
+    def latest(self, resource_type: ResourceType) -> Optional[float]:
+        """Get the newest sample of a resource type, if any."""
+        if not self._count:
+            return None
+        index = (self._start + self._count - 1) % self.capacity
+        return self._columns[_COLUMNS[resource_type]][index]
+
+    def average(self, resource_type: ResourceType, since: Optional[float] = None) -> float:
+        """Get the average of the samples taken at or after since."""
+        if since is None:
+            return self._sums[_COLUMNS[resource_type]] / self._count if self._count else 0.0
+        values = self._window(resource_type, since)
+        return sum(values) / len(values) if values else 0.0
+
+    def peak(self, resource_type: ResourceType, since: Optional[float] = None) -> float:
+        """Get the maximum of the samples taken at or after since."""
+        if since is None:
+            maxima = self._maxima[_COLUMNS[resource_type]]
+            return maxima[0][1] if maxima else 0.0
+        return max(self._window(resource_type, since), default=0.0)
+
+    def entries(self, resource_type: ResourceType) -> List[Dict[str, Any]]:
+        """Get the samples of a resource type, oldest first."""
+        values_column = self._columns[_COLUMNS[resource_type]]
+        return [
+            {"timestamp": self._timestamps[index], "usage": values_column[index]}
+            for index in self._indices(0)
+        ]
+
+    def _indices(self, first: int):
+        """Physical indices of the samples from the first-oldest on."""
+        return ((self._start + i) % self.capacity for i in range(first, self._count))
+
+    def _window(self, resource_type: ResourceType, since: float) -> List[float]:
+        # Samples are in time order; find the first one in the window
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._timestamps[(self._start + middle) % self.capacity] < since:
+                low = middle + 1
+            else:
+                high = middle
+        values_column = self._columns[_COLUMNS[resource_type]]
+        return [values_column[index] for index in self._indices(low)]
+
+
+class ResourceSampler:
+    """
+    Samples the resource usage of all monitored plugins from one thread.
+
+    Each monitor is sampled at its own collection interval. Monitors due at
+    the same tick that watch the same process share one psutil oneshot()
+    read, so in-process plugins cost a single read per tick however many
+    are monitored. Monitors of a process that exited are dropped, and the
+    thread exits when the last monitor is removed.
+    """
+
+    _instance: Optional["ResourceSampler"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        # Monitor -> monotonic time it is next due
+        self._monitors: Dict[ResourceMonitor, float] = {}
+        # Process ID -> shared psutil process, whose cpu_percent() is relative
+        # to its previous call
+        self._processes: Dict[int, Any] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def get_instance(cls) -> "ResourceSampler":
+        """Get the sampler shared by all monitors."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def get_process(self, process_id: Optional[int] = None) -> Optional[Any]:
+        """
+        Get the shared psutil process for a process ID.
+
+        Args:
+            process_id: Process to get, None for the app process
+
+        Returns:
+            psutil process, or None if psutil is not available
+        """
+        if not psutil:
+            return None
+        process_id = process_id or os.getpid()
+        with self._condition:
+            process = self._processes.get(process_id)
+            if process is None:
+                process = self._processes[process_id] = psutil.Process(process_id)
+            return process
+
+    def add(self, monitor: "ResourceMonitor") -> None:
+        """Start sampling a monitor, first at the next tick."""
+        with self._condition:
+            self._monitors[monitor] = time.monotonic()
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, daemon=True, name="ResourceSampler"
+                )
+                self._thread.start()
+            self._condition.notify()
+
+    def remove(self, monitor: "ResourceMonitor") -> None:
+        """Stop sampling a monitor."""
+        with self._condition:
+            self._monitors.pop(monitor, None)
+            self._condition.notify()
+
+    def is_sampling(self, monitor: "ResourceMonitor") -> bool:
+        """Check if a monitor is being sampled."""
+        return monitor in self._monitors
+
+    def _run(self) -> None:
+        with self._condition:
+            while self._monitors:
+                now = time.monotonic()
+                due = [monitor for monitor, due_at in self._monitors.items() if due_at <= now]
+                if due:
+                    violations = self._sample(due)
+                    for monitor in due:
+                        if monitor in self._monitors:
+                            self._monitors[monitor] = now + monitor.collection_interval
+                    if violations:
+                        # Callbacks may stop monitors or block, so run them unlocked
+                        self._condition.release()
+                        try:
+                            self._report(violations)
+                        finally:
+                            self._condition.acquire()
+                    continue
+                self._condition.wait(min(self._monitors.values()) - now)
+            self._thread = None
+
+    def _sample(
+        self, monitors: List["ResourceMonitor"]
+    ) -> List[Tuple["ResourceLimiter", ResourceViolation]]:
+        """
+        Read the usage of each process once and record it for its monitors.
+
+        Returns:
+            Limit violations found in the samples, with the limiter to report them to
+        """
+        timestamp = time.time()
+        violations = []
+        by_process: Dict[int, List[ResourceMonitor]] = {}
+        for monitor in monitors:
+            by_process.setdefault(id(monitor._process), []).append(monitor)
+
+        for group in by_process.values():
+            process = group[0]._process
+            try:
+                usage = _read_usage(process)
+            except psutil.NoSuchProcess:
+                # The process exited; a new one may reuse its ID
+                logger.info(f"Process {process.pid} exited, stopping its resource monitoring")
+                self._processes.pop(process.pid, None)
+                for monitor in group:
+                    self._monitors.pop(monitor, None)
+                continue
+            except Exception as e:
+                logger.warning(f"Error sampling process for {group[0].plugin_id}: {e}")
+                usage = [0.0] * len(_COLUMNS)
+            for monitor in group:
+                try:
+                    violation = monitor._record(timestamp, usage)
+                except Exception as e:
+                    logger.error(f"Error in monitoring loop for {monitor.plugin_id}: {e}")
+                    continue
+                if violation:
+                    violations.append((monitor.resource_limiter, violation))
+        return violations
+
+    def _report(self, violations: List[Tuple["ResourceLimiter", ResourceViolation]]) -> None:
+        """Report violations to their limiters."""
+        for limiter, violation in violations:
+            try:
+                limiter.report_violation(violation)
+            except Exception as e:
+                logger.error(f"Error reporting violation for {violation.plugin_id}: {e}")
+
+
 class ResourceMonitor:
     """Monitors resource usage for a plugin."""
 
@@ -53,6 +354,7 @@ class ResourceMonitor:
         collection_interval: float = 1.0,
         history_size: int = 100,
         resource_limiter: Optional["ResourceLimiter"] = None,
+        process_id: Optional[int] = None,
     ):
         """
         Initialize resource monitor.
@@ -62,20 +364,19 @@ class ResourceMonitor:
             collection_interval: How often to collect data (seconds)
             history_size: Maximum number of historical data points
             resource_limiter: Optional resource limiter
+            process_id: Plugin host process the plugin runs in, None if in process
         """
         self.plugin_id = plugin_id
+        self.process_id = process_id
         self.collection_interval = collection_interval
         self.history_size = history_size
         self.resource_limiter = resource_limiter
 
-        self._monitoring = False
-        self._monitor_thread: Optional[threading.Thread] = None
+        self._sampler = ResourceSampler.get_instance()
         self._lock = threading.Lock()
 
         # Resource usage history
-        self._usage_history: Dict[ResourceType, deque] = {
-            resource_type: deque(maxlen=history_size) for resource_type in ResourceType
-        }
+        self._history = UsageHistory(history_size)
 
         # Try to find the plugin process
         self._process = self._find_plugin_process()
@@ -87,80 +388,45 @@ class ResourceMonitor:
             return None
 
         try:
-            # For now, use current process as a fallback
-            # In a real implementation, this would find the actual plugin process
-            return psutil.Process()
+            # In-process plugins can only be measured together with the app
+            return self._sampler.get_process(self.process_id)
         except Exception as e:
             logger.warning(f"Could not find process for plugin {self.plugin_id}: {e}")
             return None
 
     def start_monitoring(self) -> None:
         """Start resource monitoring."""
-        with self._lock:
-            if self._monitoring:
-                return
-
-            self._monitoring = True
-            self._monitor_thread = threading.Thread(
-                target=self._monitor_loop, daemon=True, name=f"ResourceMonitor-{self.plugin_id}"
-            )
-            self._monitor_thread.start()
-
+        if self.is_monitoring():
+            return
+        self._sampler.add(self)
         logger.info(f"Started resource monitoring for plugin {self.plugin_id}")
 
     def stop_monitoring(self) -> None:
         """Stop resource monitoring."""
-        with self._lock:
-            if not self._monitoring:
-                return
-
-            self._monitoring = False
-
-        # Wait for monitor thread to finish
-        if self._monitor_thread:
-            self._monitor_thread.join(timeout=5.0)
-            if self._monitor_thread.is_alive():
-                logger.warning(f"Monitor thread for {self.plugin_id} did not stop cleanly")
-
+        if not self.is_monitoring():
+            return
+        self._sampler.remove(self)
         logger.info(f"Stopped resource monitoring for plugin {self.plugin_id}")
 
     def is_monitoring(self) -> bool:
         """Check if monitoring is active."""
-        return self._monitoring
-
-    def _monitor_loop(self) -> None:
-        """Main monitoring loop."""
-        while self._monitoring:
-            try:
-                self._collect_resource_data()
-
-                # Check limits if limiter is configured
-                if self.resource_limiter:
-                    violation = self.resource_limiter.check_limits()
-                    if violation and hasattr(self.resource_limiter, "violation_callback"):
-                        if self.resource_limiter.violation_callback:
-                            self.resource_limiter.violation_callback(violation)
-
-            except Exception as e:
-                logger.error(f"Error in monitoring loop for {self.plugin_id}: {e}")
-
-            # Sleep for collection interval
-            time.sleep(self.collection_interval)
+        return self._sampler.is_sampling(self)
 
-    def _collect_resource_data(self) -> None:
-        """Collect current resource usage data."""
-        timestamp = time.time()
-
-        for resource_type in ResourceType:
-            try:
-                usage = self._get_resource_usage_internal(resource_type)
-                entry = {"timestamp": timestamp, "usage": usage}
+    def _record(self, timestamp: float, usage: Sequence[float]) -> Optional[ResourceViolation]:
+        """
+        Store a sample taken by the sampler and check it against the limits.
 
-                with self._lock:
-                    self._usage_history[resource_type].append(entry)
+        Returns:
+            Limit violation in the sample, left for the sampler to report
+        """
+        with self._lock:
+            self._history.append_values(timestamp, usage)
 
-            except Exception as e:
-                logger.error(f"Error collecting {resource_type.value} usage: {e}")
+        if not self.resource_limiter:
+            return None
+        return self.resource_limiter.check_usage(
+            {resource_type: usage[column] for resource_type, column in _COLUMNS.items()}
+        )
 
     def _get_resource_usage_internal(self, resource_type: ResourceType) -> float:
         """Get current resource usage for a specific type."""
@@ -168,43 +434,28 @@ class ResourceMonitor:
             return 0.0
 
         try:
-            if resource_type == ResourceType.MEMORY:
-                # Memory usage in bytes
-                memory_info = self._process.memory_info()
-                return float(memory_info.rss)  # Resident Set Size
-
-            elif resource_type == ResourceType.CPU:
-                # CPU usage as percentage
-                cpu_percent = self._process.cpu_percent()
-                return float(cpu_percent)
-
-            elif resource_type == ResourceType.DISK:
-                # Disk I/O bytes read + written
-                io_counters = self._process.io_counters()
-                return float(io_counters.read_bytes + io_counters.write_bytes)
-
-            elif resource_type == ResourceType.NETWORK:
-                # Network I/O bytes sent + received
-                # Note: psutil doesn't provide per-process network stats easily
-                # This is a simplified implementation
-                return 0.0
-
+            return _read_usage(self._process)[_COLUMNS[resource_type]]
         except Exception as e:
             logger.warning(f"Error getting {resource_type.value} usage: {e}")
             return 0.0
 
-        return 0.0
-
     def get_resource_usage(self, resource_type: ResourceType) -> float:
         """
         Get current resource usage for a specific type.
 
+        While monitoring this is the latest sample rather than a new read.
+
         Args:
             resource_type: Type of resource to query
 
         Returns:
             Current usage value
         """
+        if self.is_monitoring():
+            with self._lock:
+                latest = self._history.latest(resource_type)
+            if latest is not None:
+                return latest
         try:
             return self._get_resource_usage_internal(resource_type)
         except Exception:
@@ -221,7 +472,7 @@ class ResourceMonitor:
             List of usage entries with timestamp and usage
         """
         with self._lock:
-            return list(self._usage_history[resource_type])
+            return self._history.entries(resource_type)
 
     def get_average_usage(
         self, resource_type: ResourceType, window_seconds: Optional[float] = None
@@ -236,20 +487,9 @@ class ResourceMonitor:
         Returns:
             Average usage value
         """
-        history = self.get_usage_history(resource_type)
-        if not history:
-            return 0.0
-
-        # Filter by time window if specified
-        if window_seconds:
-            cutoff_time = time.time() - window_seconds
-            history = [entry for entry in history if entry["timestamp"] >= cutoff_time]
-
-        if not history:
-            return 0.0
-
-        total_usage = sum(entry["usage"] for entry in history)
-        return total_usage / len(history)
+        since = time.time() - window_seconds if window_seconds else None
+        with self._lock:
+            return self._history.average(resource_type, since)
 
     def get_peak_usage(
         self, resource_type: ResourceType, window_seconds: Optional[float] = None
@@ -264,19 +504,9 @@ class ResourceMonitor:
         Returns:
             Peak usage value
         """
-        history = self.get_usage_history(resource_type)
-        if not history:
-            return 0.0
-
-        # Filter by time window if specified
-        if window_seconds:
-            cutoff_time = time.time() - window_seconds
-            history = [entry for entry in history if entry["timestamp"] >= cutoff_time]
-
-        if not history:
-            return 0.0
-
-        return max(entry["usage"] for entry in history)
+        since = time.time() - window_seconds if window_seconds else None
+        with self._lock:
+            return self._history.peak(resource_type, since)
 
 
 class ResourceLimiter:
@@ -287,6 +517,7 @@ class ResourceLimiter:
         plugin_id: str,
         limits: Dict[ResourceType, float],
         violation_callback: Optional[Callable[[ResourceViolation], None]] = None,
+        process_id: Optional[int] = None,
     ):
         """
         Initialize resource limiter.
@@ -295,8 +526,10 @@ class ResourceLimiter:
             plugin_id: Plugin identifier
             limits: Resource limits by type
             violation_callback: Callback for limit violations
+            process_id: Plugin host process the plugin runs in, None if in process
         """
         self.plugin_id = plugin_id
+        self.process_id = process_id
         self._limits = limits.copy()
         self.violation_callback = violation_callback
         self._lock = threading.Lock()
@@ -310,8 +543,8 @@ class ResourceLimiter:
             return None
 
         try:
-            # For now, use current process as a fallback
-            return psutil.Process()
+            # In-process plugins can only be measured together with the app
+            return psutil.Process(self.process_id)
         except Exception:
             return None
 
@@ -364,28 +597,53 @@ class ResourceLimiter:
             ResourceViolation if any limit is exceeded, None otherwise
         """
         with self._lock:
-            for resource_type, limit in self._limits.items():
-                current_usage = self._get_current_usage(resource_type)
+            resource_types = list(self._limits)
+
+        # Read all limited resources from one psutil snapshot
+        snapshot = self._process.oneshot() if self._process else nullcontext()
+        with snapshot:
+            usage = {
+                resource_type: self._get_current_usage(resource_type)
+                for resource_type in resource_types
+            }
+
+        violation = self.check_usage(usage)
+        if violation:
+            self.report_violation(violation)
+        return violation
+
+    def check_usage(self, usage: Dict[ResourceType, float]) -> Optional[ResourceViolation]:
+        """
+        Check already measured usage against the limits.
+
+        Unlike check_limits() this neither reads the process nor reports the
+        violation.
+
+        Args:
+            usage: Usage by resource type
 
+        Returns:
+            ResourceViolation for the first exceeded limit, None otherwise
+        """
+        with self._lock:
+            for resource_type, limit in self._limits.items():
+                current_usage = usage.get(resource_type, 0.0)
                 if current_usage > limit:
-                    violation = ResourceViolation(
+                    return ResourceViolation(
                         plugin_id=self.plugin_id,
                         resource_type=resource_type,
                         current_usage=current_usage,
                         limit=limit,
                         timestamp=time.time(),
                     )
-
-                    logger.warning(str(violation))
-
-                    # Call violation callback if configured
-                    if self.violation_callback:
-                        self.violation_callback(violation)
-
-                    return violation
-
         return None
 
+    def report_violation(self, violation: ResourceViolation) -> None:
+        """Log a violation and pass it to the violation callback, if configured."""
+        logger.warning(str(violation))
+        if self.violation_callback:
+            self.violation_callback(violation)
+
     def check_resource_limit(self, resource_type: ResourceType) -> Optional[ResourceViolation]:
         """
         Check if a specific resource limit is violated.
@@ -2,11 +2,11 @@
 
 import logging
 import os
-import threading
 import time
-from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from .telemetry import PluginTelemetry
 
 logger = logging.getLogger(__name__)
 
@@ -19,17 +19,6 @@ class RestartPolicy(Enum):
     ALWAYS = "always"
 
 
-@dataclass
-class OperationRecord:
-    """Record of a plugin operation for telemetry."""
-
-    timestamp: float
-    operation_type: str
-    target: str
-    success: bool = True
-    details: Dict[str, Any] = field(default_factory=dict)
-
-
 class PluginSandbox:
     """Provides sandboxing and isolation for plugins."""
 
@@ -66,6 +55,10 @@ class PluginSandbox:
         # Isolation settings
         self._allowed_paths: List[str] = []
         self._allowed_hosts: List[str] = []
+        # Lookup forms of the allowed paths and hosts, rebuilt when they change
+        self._path_prefixes: Tuple[str, ...] = ()
+        self._exact_hosts: FrozenSet[str] = frozenset()
+        self._host_suffixes: Tuple[str, ...] = ()
         self._environment_vars: Dict[str, str] = {}
 
         # Restart tracking
@@ -74,8 +67,7 @@ class PluginSandbox:
 
         # Telemetry
         self._telemetry_enabled = False
-        self._operations: List[OperationRecord] = []
-        self._lock = threading.Lock()
+        self._telemetry = PluginTelemetry()
 
         # Default allowed paths for plugins
         self._setup_default_allowed_paths()
@@ -94,15 +86,18 @@ class PluginSandbox:
         )
 
         self._allowed_paths = [plugin_temp, config_dir, data_dir]
+        self._path_prefixes = tuple(self._allowed_paths)
 
     def set_allowed_paths(self, paths: List[str]) -> None:
         """Set allowed file system paths for the plugin."""
         self._allowed_paths = paths.copy()
+        self._path_prefixes = tuple(self._allowed_paths)
 
     def add_allowed_path(self, path: str) -> None:
         """Add an allowed file system path."""
         if path not in self._allowed_paths:
             self._allowed_paths.append(path)
+            self._path_prefixes = tuple(self._allowed_paths)
 
     def is_path_allowed(self, path: str) -> bool:
         """
@@ -114,27 +109,26 @@ class PluginSandbox:
         Returns:
             True if path is allowed
         """
-        path = os.path.abspath(path)
-
-        for allowed_path in self._allowed_paths:
-            # Handle wildcards and directory matching
-            if path.startswith(allowed_path):
-                return True
-
-            # Handle parent directory access
-            if path == allowed_path:
-                return True
-
-        return False
+        # The path itself or anything below it, checked in one call
+        return os.path.abspath(path).startswith(self._path_prefixes)
 
     def set_allowed_hosts(self, hosts: List[str]) -> None:
         """Set allowed network hosts for the plugin."""
         self._allowed_hosts = hosts.copy()
+        self._compile_hosts()
 
     def add_allowed_host(self, host: str) -> None:
         """Add an allowed network host."""
         if host not in self._allowed_hosts:
             self._allowed_hosts.append(host)
+            self._compile_hosts()
+
+    def _compile_hosts(self) -> None:
+        """Split the allowed hosts into exact names and "*." domain suffixes."""
+        self._exact_hosts = frozenset(self._allowed_hosts)
+        self._host_suffixes = tuple(
+            host[2:] for host in self._allowed_hosts if host.startswith("*.")
+        )
 
     def is_host_allowed(self, host: str) -> bool:
         """
@@ -146,18 +140,8 @@ class PluginSandbox:
         Returns:
             True if host is allowed
         """
-        # Exact match
-        if host in self._allowed_hosts:
-            return True
-
-        # Check for wildcard matches
-        for allowed_host in self._allowed_hosts:
-            if allowed_host.startswith("*."):
-                domain = allowed_host[2:]
-                if host.endswith(domain):
-                    return True
-
-        return False
+        # Exact match, or a wildcard match of the domain
+        return host in self._exact_hosts or host.endswith(self._host_suffixes)
 
     def get_isolated_environment(
         self, additional_vars: Optional[Dict[str, str]] = None
@@ -294,7 +278,12 @@ class PluginSandbox:
         self._telemetry_enabled = False
 
     def record_operation(
-        self, operation_type: str, target: str, success: bool = True, **details
+        self,
+        operation_type: str,
+        target: str,
+        success: bool = True,
+        duration: Optional[float] = None,
+        **details,
     ) -> None:
         """
         Record a plugin operation for telemetry.
@@ -303,50 +292,32 @@ class PluginSandbox:
             operation_type: Type of operation
             target: Target of operation
             success: Whether operation was successful
+            duration: How long the operation took in seconds
             **details: Additional operation details
         """
         if not self._telemetry_enabled:
             return
 
-        operation = OperationRecord(
-            timestamp=time.time(),
-            operation_type=operation_type,
-            target=target,
-            success=success,
-            details=details,
-        )
-
-        with self._lock:
-            self._operations.append(operation)
-
-            # Limit telemetry history size
-            if len(self._operations) > 1000:
-                self._operations = self._operations[-500:]  # Keep last 500
+        self._telemetry.record(operation_type, target, success, duration, details or None)
 
-    def get_telemetry(self) -> Dict[str, Any]:
+    def get_telemetry(self, limit: Optional[int] = None) -> Dict[str, Any]:
         """
         Get telemetry data for the plugin.
 
+        Args:
+            limit: Maximum number of recent operations to include
+
         Returns:
             Telemetry data dictionary
         """
-        with self._lock:
-            return {
-                "plugin_id": self.plugin_id,
-                "timestamp": time.time(),
-                "operations": [
-                    {
-                        "timestamp": op.timestamp,
-                        "type": op.operation_type,
-                        "target": op.target,
-                        "success": op.success,
-                        "details": op.details,
-                    }
-                    for op in self._operations
-                ],
-                "restart_attempts": self._restart_attempts,
-                "last_restart_time": self._last_restart_time,
-            }
+        return {
+            "plugin_id": self.plugin_id,
+            "timestamp": time.time(),
+            "operations": self._telemetry.recent(limit),
+            "summary": self._telemetry.summary(),
+            "restart_attempts": self._restart_attempts,
+            "last_restart_time": self._last_restart_time,
+        }
 
     def get_security_summary(self) -> Dict[str, Any]:
         """
@@ -369,7 +340,7 @@ class PluginSandbox:
             },
             "telemetry": {
                 "enabled": self._telemetry_enabled,
-                "operation_count": len(self._operations),
+                "operation_count": self._telemetry.operation_count,
             },
             "managers": {
                 "has_permission_manager": self.permission_manager is not None,
@@ -379,8 +350,7 @@ class PluginSandbox:
 
     def cleanup(self) -> None:
         """Clean up sandbox resources."""
-        with self._lock:
-            self._operations.clear()
+        self._telemetry.clear()
 
         logger.info(f"Cleaned up sandbox for plugin {self.plugin_id}")
 
@@ -0,0 +1,272 @@
+"""Low-overhead telemetry for plugin operations."""
+
+import itertools
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+# Duration histogram buckets: bucket i counts durations below 2**i microseconds,
+# the last bucket takes everything slower.
+HISTOGRAM_BUCKETS = 24
+
+# Record layout inside the ring buffers
+_SEQ, _TIMESTAMP, _TYPE, _TARGET, _SUCCESS, _DURATION, _DETAILS = range(7)
+
+
+class OperationStats:
+    """Aggregated counters for one operation type and target."""
+
+    __slots__ = ("count", "failures", "histogram", "last_seen", "max_duration", "total_duration")
+
+    def __init__(self):
+        self.count = 0
+        self.failures = 0
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+        self.last_seen = 0.0
+
+    def merge(self, other: "OperationStats") -> None:
+        """Add the counters of another stats object to this one."""
+        self.count += other.count
+        self.failures += other.failures
+        self.total_duration += other.total_duration
+        self.max_duration = max(self.max_duration, other.max_duration)
+        self.last_seen = max(self.last_seen, other.last_seen)
+        for i, value in enumerate(other.histogram):
+            self.histogram[i] += value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dictionary."""
+        timed = sum(self.histogram)
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "total_duration": self.total_duration,
+            "average_duration": self.total_duration / timed if timed else 0.0,
+            "max_duration": self.max_duration,
+            "histogram": list(self.histogram),
+            "last_seen": self.last_seen,
+        }
+
+
+class _ThreadBuffer:
+    """Ring buffer and counters written by a single thread."""
+
+    __slots__ = ("index", "records", "stats")
+
+    def __init__(self, capacity: int):
+        self.records: List[Optional[tuple]] = [None] * capacity
+        self.index = 0
+        self.stats: Dict[Tuple[str, str], OperationStats] = {}
+
+
+class _ThreadExit:
+    """Thread-local marker whose release signals that its thread exited."""
+
+    __slots__ = ("__weakref__",)
+
+
+def _retire_buffer(telemetry_ref: "weakref.ref[PluginTelemetry]", buffer: _ThreadBuffer) -> None:
+    """Retire a thread's buffer if its telemetry still exists."""
+    telemetry = telemetry_ref()
+    if telemetry is not None:
+        telemetry._retire(buffer)
+
+
+class PluginTelemetry:
+    """
+    Collects plugin operations with fixed memory and O(1) summaries.
+
+    Each recording thread writes into its own ring buffer and counters, so
+    recording never takes a lock; readers merge the per-thread state. Only the
+    most recent operations of each thread are kept, while the counters cover
+    everything recorded since the last clear. When a thread exits its
+    counters are folded into retired totals and its recent operations into a
+    single retired ring, so memory is bounded by the number of live threads.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Initialize telemetry.
+
+        Args:
+            capacity: Number of recent operations kept per recording thread
+        """
+        self.capacity = capacity
+        self._buffers: List[_ThreadBuffer] = []
+        self._retired = _ThreadBuffer(0)
+        self._local = threading.local()
+        self._register_lock = threading.Lock()
+        self._sequence = itertools.count()
+
+    def _buffer(self) -> _ThreadBuffer:
+        """Get the calling thread's buffer, registering it on first use."""
+        buffer = _ThreadBuffer(self.capacity)
+        with self._register_lock:
+            self._buffers.append(buffer)
+            buffers = self._buffers
+        self._local.buffer = buffer
+        self._local.buffers = buffers
+
+        # Thread-local values are released when their thread exits
+        marker = _ThreadExit()
+        weakref.finalize(marker, _retire_buffer, weakref.ref(self), buffer)
+        self._local.exit_marker = marker
+        return buffer
+
+    def _retire(self, buffer: _ThreadBuffer) -> None:
+        """Fold the buffer of an exited thread into the retired totals."""
+        with self._register_lock:
+            if buffer not in self._buffers:
+                # Already dropped by clear()
+                return
+
+            retired = _ThreadBuffer(0)
+            for source in (self._retired, buffer):
+                for key, stats in source.stats.items():
+                    retired.stats.setdefault(key, OperationStats()).merge(stats)
+            records = [
+                record
+                for source in (self._retired, buffer)
+                for record in source.records
+                if record is not None
+            ]
+            records.sort(key=lambda record: record[_SEQ])
+            retired.records = records[-self.capacity :]
+            retired.index = self._retired.index + buffer.index
+
+            self._retired = retired
+            self._buffers.remove(buffer)
+
+    def _snapshot(self) -> List[_ThreadBuffer]:
+        """Get the retired totals and the buffers of live threads."""
+        with self._register_lock:
+            return [self._retired, *self._buffers]
+
+    def record(
+        self,
+        operation_type: str,
+        target: str,
+        success: bool = True,
+        duration: Optional[float] = None,
+        details: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Record an operation.
+
+        Args:
+            operation_type: Type of operation
+            target: Target of operation
+            success: Whether operation was successful
+            duration: How long the operation took in seconds
+            details: Additional operation details
+        """
+        local = self._local
+        # A clear() swaps the buffer list, which retires every thread's buffer
+        if getattr(local, "buffers", None) is self._buffers:
+            buffer = local.buffer
+        else:
+            buffer = self._buffer()
+
+        now = time.time()
+        index = buffer.index
+        buffer.records[index % self.capacity] = (
+            next(self._sequence),
+            now,
+            operation_type,
+            target,
+            success,
+            duration,
+            details,
+        )
+        buffer.index = index + 1
+
+        key = (operation_type, target)
+        stats = buffer.stats.get(key)
+        if stats is None:
+            stats = buffer.stats[key] = OperationStats()
+        stats.count += 1
+        stats.last_seen = now
+        if not success:
+            stats.failures += 1
+        if duration is not None:
+            stats.total_duration += duration
+            if duration > stats.max_duration:
+                stats.max_duration = duration
+            bucket = min(int(duration * 1_000_000).bit_length(), HISTOGRAM_BUCKETS - 1)
+            stats.histogram[bucket] += 1
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the most recent operations, oldest first.
+
+        Args:
+            limit: Maximum number of operations to return
+
+        Returns:
+            List of operation dictionaries
+        """
+        records = []
+        for buffer in self._snapshot():
+            records.extend(record for record in list(buffer.records) if record is not None)
+        records.sort(key=lambda record: record[_SEQ])
+        if limit is not None:
+            records = records[-limit:] if limit > 0 else []
+
+        return [
+            {
+                "timestamp": record[_TIMESTAMP],
+                "type": record[_TYPE],
+                "target": record[_TARGET],
+                "success": record[_SUCCESS],
+                "duration": record[_DURATION],
+                "details": record[_DETAILS] or {},
+            }
+            for record in records
+        ]
+
+    def stats(self) -> Dict[Tuple[str, str], OperationStats]:
+        """
+        Get counters merged across threads.
+
+        Returns:
+            Stats keyed by (operation type, target)
+        """
+        merged: Dict[Tuple[str, str], OperationStats] = {}
+        for buffer in self._snapshot():
+            for key, stats in buffer.stats.copy().items():
+                total = merged.get(key)
+                if total is None:
+                    total = merged[key] = OperationStats()
+                total.merge(stats)
+        return merged
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get counters per operation type, with a breakdown per target.
+
+        Returns:
+            Summary dictionary keyed by operation type
+        """
+        summary: Dict[str, Dict[str, Any]] = {}
+        totals: Dict[str, OperationStats] = {}
+        for (operation_type, target), stats in self.stats().items():
+            entry = summary.setdefault(operation_type, {"targets": {}})
+            entry["targets"][target] = stats.to_dict()
+            totals.setdefault(operation_type, OperationStats()).merge(stats)
+        for operation_type, stats in totals.items():
+            summary[operation_type].update(stats.to_dict())
+        return summary
+
+    @property
+    def operation_count(self) -> int:
+        """Total number of operations recorded since the last clear."""
+        return sum(buffer.index for buffer in self._snapshot())
+
+    def clear(self) -> None:
+        """Drop all recorded operations and counters."""
+        with self._register_lock:
+            self._buffers = []
+            self._retired = _ThreadBuffer(0)
@@ -73,18 +73,18 @@ class ConfigurationServiceAdapter(IService):
         return "1.0.0"
 
     def get(self, key: str, default: Any = None) -> Any:
-        return self.settings_service.get(key, default)
+        """Get configuration value by key path (e.g. "terminal.font_size")."""
+        return self.settings_service.get_path(key, default)
 
     def set(self, key: str, value: Any) -> None:
-        self.settings_service.set(key, value)
+        """Set configuration value by key path."""
+        self.settings_service.set_path(key, value)
 
     def on_change(self, key: str, callback: callable) -> None:
         """Subscribe to configuration changes."""
-        if hasattr(self.settings_service, "setting_changed"):
-            # Connect to settings service signal
-            self.settings_service.setting_changed.connect(
-                lambda k, v: callback(v) if k == key else None
-            )
+        if hasattr(self.settings_service, "subscribe"):
+            # Only listeners of this key path are called on change
+            self.settings_service.subscribe(key, callback)
         else:
             # Settings service doesn't support change notifications
             pass
@@ -200,6 +200,9 @@ class ThemeServiceAdapter(IService):
     def on_theme_changed(self, callback: callable) -> None:
         self.theme_service.theme_changed.connect(callback)
 
+    def on_colors_changed(self, callback: callable) -> None:
+        self.theme_service.colors_changed.connect(callback)
+
 
 class NotificationServiceAdapter(IService):
     """Adapter for notification service."""
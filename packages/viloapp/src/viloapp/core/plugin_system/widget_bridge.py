@@ -158,6 +158,9 @@ class PluginWidgetBridge:
                 show_in_palette=True,  # Show in command palette
                 can_split=True,
                 singleton=False,
+                # Terminals keep their process running; plugins pause their display instead
+                can_suspend=category != WidgetCategory.TERMINAL,
+                can_suspend_rendering=True,
                 source="plugin",  # Mark as plugin-provided
                 provides_capabilities=provides_capabilities,  # Capabilities list
                 can_be_default=True,  # Can be used as default widget
@@ -212,6 +215,22 @@ class PluginAppWidgetAdapter(AppWidget):
             logger.error(f"Failed to create PluginAppWidgetAdapter: {e}")
             raise
 
+    def on_suspend_rendering(self) -> None:
+        """Let the plugin stop rendering the hidden instance."""
+        try:
+            if hasattr(self.plugin_widget, "suspend_instance"):
+                self.plugin_widget.suspend_instance(self.instance_id)
+        except Exception as e:
+            logger.error(f"Failed to suspend plugin widget rendering: {e}")
+
+    def on_resume_rendering(self) -> None:
+        """Let the plugin resume rendering the instance."""
+        try:
+            if hasattr(self.plugin_widget, "resume_instance"):
+                self.plugin_widget.resume_instance(self.instance_id)
+        except Exception as e:
+            logger.error(f"Failed to resume plugin widget rendering: {e}")
+
     def get_state(self) -> Dict[str, Any]:
         """Get widget state."""
         try:
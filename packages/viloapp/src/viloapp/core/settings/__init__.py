@@ -6,6 +6,7 @@ This package provides a type-safe, schema-validated settings system built on top
 of QSettings with integration to the existing StateService.
 """
 
+from .accessors import SettingAccessor
 from .defaults import DEFAULT_SETTINGS, get_default_keyboard_shortcuts
 from .schema import SettingsSchema, validate_settings
 from .service import SettingsService
@@ -16,4 +17,5 @@ __all__ = [
     "SettingsSchema",
     "validate_settings",
     "SettingsService",
+    "SettingAccessor",
 ]
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Typed, cached accessors for individual settings.
+
+An accessor reads a setting once, coerces it to the requested type and then
+keeps the cached value current through a key-path subscription, so hot code
+can read settings without repeated dict lookups or type conversion.
+"""
+
+import logging
+from typing import TYPE_CHECKING, Any, Callable, Generic, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from .service import SettingsService
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_TRUE_STRINGS = ("true", "1", "yes", "on")
+_FALSE_STRINGS = ("false", "0", "no", "off")
+
+
+def split_key_path(path: str) -> tuple[str, str]:
+    """
+    Split a key path into category and key.
+
+    The first segment is the category, the rest is the key within it,
+    e.g. "terminal.font_size" -> ("terminal", "font_size") and
+    "terminal.shell.linux" -> ("terminal", "shell.linux").
+
+    Args:
+        path: Dotted key path
+
+    Returns:
+        Tuple of (category, key)
+
+    Raises:
+        ValueError: If the path has no key segment
+    """
+    category, sep, key = path.partition(".")
+    if not sep or not category or not key:
+        raise ValueError(f"Invalid settings key path: {path!r}")
+    return category, key
+
+
+def coerce_setting(value: Any, value_type: type, default: Any) -> Any:
+    """
+    Coerce a raw setting value to the requested type.
+
+    Args:
+        value: Raw value (may come from QSettings as a string)
+        value_type: Target type
+        default: Value to use if coercion fails
+
+    Returns:
+        Coerced value or default
+    """
+    if value is None:
+        return default
+
+    if value_type is bool:
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str):
+            lowered = value.lower()
+            if lowered in _TRUE_STRINGS:
+                return True
+            if lowered in _FALSE_STRINGS:
+                return False
+            return default
+        if isinstance(value, int):
+            return bool(value)
+        return default
+
+    if isinstance(value, value_type) and not (
+        isinstance(value, bool) and value_type in (int, float)
+    ):
+        return value
+
+    try:
+        return value_type(value)
+    except (TypeError, ValueError):
+        logger.warning(f"Cannot convert setting value {value!r} to {value_type.__name__}")
+        return default
+
+
+class SettingAccessor(Generic[T]):
+    """
+    Cached, typed view of a single setting.
+
+    Example:
+        font_size = settings_service.accessor("terminal.font_size", int, 14)
+        ...
+        painter.setFont(QFont(family, font_size.value))
+    """
+
+    def __init__(self, service: "SettingsService", path: str, value_type: type[T], default: T):
+        """
+        Create an accessor and subscribe it to changes of its key path.
+
+        Args:
+            service: Settings service to read from
+            path: Key path, e.g. "terminal.font_size"
+            value_type: Type values are coerced to
+            default: Value used when the setting is missing or invalid
+        """
+        self.path = path
+        self.value_type = value_type
+        self.default = default
+        self._value: T = coerce_setting(service.get_path(path), value_type, default)
+        self._unsubscribe: Optional[Callable[[], None]] = service.subscribe(path, self._on_changed)
+
+    @property
+    def value(self) -> T:
+        """Get the cached setting value."""
+        return self._value
+
+    def __call__(self) -> T:
+        """Get the cached setting value."""
+        return self._value
+
+    def close(self) -> None:
+        """Stop tracking changes to the setting."""
+        if self._unsubscribe:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    def _on_changed(self, value: Any) -> None:
+        """Refresh the cache when the setting changes."""
+        self._value = coerce_setting(value, self.value_type, self.default)
@@ -292,6 +292,68 @@ def get_settings(organization: str = "ViloxTerm", application: str = "ViloxTerm"
     return config.create_settings(organization, application)
 
 
+# In-memory cache of individual values for hot read paths, keyed by
+# (organization, application, key)
+_value_cache: dict[tuple[str, str, str], Any] = {}
+
+
+def get_cached_value(
+    key: str,
+    default: Any = None,
+    value_type: Optional[type] = None,
+    organization: str = "ViloxTerm",
+    application: str = "ViloxTerm",
+) -> Any:
+    """
+    Get a settings value, reading QSettings only on first access.
+
+    Values written through set_cached_value() keep the cache current; code
+    that writes the same key directly must call clear_cached_values().
+
+    Args:
+        key: Settings key
+        default: Default value if not set
+        value_type: Optional type the value is coerced to
+        organization: Organization name
+        application: Application name
+
+    Returns:
+        Cached setting value
+    """
+    cache_key = (organization, application, key)
+    if cache_key not in _value_cache:
+        value = get_settings(organization, application).value(key, None)
+        if value_type is not None:
+            from .accessors import coerce_setting
+
+            value = coerce_setting(value, value_type, default)
+        _value_cache[cache_key] = default if value is None else value
+    return _value_cache[cache_key]
+
+
+def set_cached_value(
+    key: str, value: Any, organization: str = "ViloxTerm", application: str = "ViloxTerm"
+) -> None:
+    """
+    Write a settings value and update the cache.
+
+    Args:
+        key: Settings key
+        value: New value
+        organization: Organization name
+        application: Application name
+    """
+    settings = get_settings(organization, application)
+    settings.setValue(key, value)
+    settings.sync()
+    _value_cache[(organization, application, key)] = value
+
+
+def clear_cached_values() -> None:
+    """Drop all cached values so they are re-read on next access."""
+    _value_cache.clear()
+
+
 def initialize_settings_from_cli() -> SettingsConfig:
     """
     Initialize settings configuration from command line arguments.
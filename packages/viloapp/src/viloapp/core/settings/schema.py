@@ -8,8 +8,9 @@ validation functions to ensure settings conform to expected structure and types.
 
 import json
 import logging
+import re
 from pathlib import Path
-from typing import Any, Optional, Union
+from typing import Any, Callable, Optional, Union
 
 logger = logging.getLogger(__name__)
 
@@ -33,12 +34,22 @@ COMMAND_PALETTE_SCHEMA = {
     "additionalProperties": False,
 }
 
+# A shortcut is one or more space-separated chords (e.g. "ctrl+k s"), each being
+# optional modifiers followed by a single character or a named key.
+_SHORTCUT_KEY = (
+    r"(?:f(?:[1-9]|1[0-9]|2[0-4])|tab|enter|return|escape|esc|space|backspace|delete|del"
+    r"|insert|ins|home|end|pageup|pagedown|up|down|left|right"
+    r"|[a-zA-Z0-9\+\-\\\[\]\/;'`~,\.<>\?:\"{}|!@#$%^&*()_=])"
+)
+_SHORTCUT_CHORD = r"(?:ctrl\+|alt\+|shift\+|meta\+)*" + _SHORTCUT_KEY
+SHORTCUT_PATTERN = rf"^{_SHORTCUT_CHORD}(?: {_SHORTCUT_CHORD})*$|^$"
+
 KEYBOARD_SHORTCUTS_SCHEMA = {
     "type": "object",
     "patternProperties": {
         r"^[a-zA-Z][a-zA-Z0-9._]*$": {  # command_id pattern
             "type": "string",
-            "pattern": r"^(ctrl\+|alt\+|shift\+|meta\+)*[a-zA-Z0-9\+\-\\\[\]\/;'`~,\.<>\?:\"{}|!@#$%^&*()_=]$|^$",
+            "pattern": SHORTCUT_PATTERN,
         }
     },
     "additionalProperties": False,
@@ -66,6 +77,7 @@ UI_SCHEMA = {
         "show_sidebar": {"type": "boolean"},
         "show_status_bar": {"type": "boolean"},
         "show_menu_bar": {"type": "boolean"},
+        "frameless_mode": {"type": "boolean"},
         "sidebar_width": {"type": "integer", "minimum": 100, "maximum": 1000},
         "activity_bar_width": {"type": "integer", "minimum": 30, "maximum": 100},
         "status_bar_height": {"type": "integer", "minimum": 16, "maximum": 50},
@@ -191,6 +203,163 @@ SETTINGS_SCHEMA = {
     "additionalProperties": False,
 }
 
+# ============= Compiled Per-Key Validators =============
+
+# A key validator returns None when the value is valid, or an error message.
+KeyValidator = Callable[[Any], Optional[str]]
+
+_JSON_TYPE_CHECKS: dict[str, Callable[[Any], bool]] = {
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "array": lambda v: isinstance(v, (list, tuple)),
+    "object": lambda v: isinstance(v, dict),
+    "null": lambda v: v is None,
+}
+
+
+def compile_property_validator(schema: dict[str, Any]) -> KeyValidator:
+    """
+    Compile a property schema into a standalone validator function.
+
+    Supports the subset of JSON Schema used by the settings schemas
+    (type, enum, minimum, maximum, minLength, pattern, items, maxItems),
+    so a single value can be checked without validating its whole category.
+
+    Args:
+        schema: JSON schema for a single property
+
+    Returns:
+        Validator returning None if valid, otherwise an error message
+    """
+    checks: list[KeyValidator] = []
+
+    if "type" in schema:
+        types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        type_checks = [_JSON_TYPE_CHECKS[t] for t in types if t in _JSON_TYPE_CHECKS]
+        type_names = " or ".join(types)
+        checks.append(
+            lambda v: None if any(check(v) for check in type_checks) else f"must be {type_names}"
+        )
+
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+        checks.append(lambda v: None if v in allowed else f"must be one of {allowed}")
+
+    if "minimum" in schema:
+        minimum = schema["minimum"]
+        checks.append(
+            lambda v: (
+                f"must be >= {minimum}" if isinstance(v, (int, float)) and v < minimum else None
+            )
+        )
+
+    if "maximum" in schema:
+        maximum = schema["maximum"]
+        checks.append(
+            lambda v: (
+                f"must be <= {maximum}" if isinstance(v, (int, float)) and v > maximum else None
+            )
+        )
+
+    if "minLength" in schema:
+        min_length = schema["minLength"]
+        checks.append(
+            lambda v: (
+                f"must have length >= {min_length}"
+                if isinstance(v, str) and len(v) < min_length
+                else None
+            )
+        )
+
+    if "pattern" in schema:
+        regex = re.compile(schema["pattern"])
+        checks.append(
+            lambda v: (
+                f"does not match {regex.pattern!r}"
+                if isinstance(v, str) and not regex.search(v)
+                else None
+            )
+        )
+
+    if "maxItems" in schema:
+        max_items = schema["maxItems"]
+        checks.append(
+            lambda v: (
+                f"must have at most {max_items} items"
+                if isinstance(v, (list, tuple)) and len(v) > max_items
+                else None
+            )
+        )
+
+    if "items" in schema:
+        item_validator = compile_property_validator(schema["items"])
+
+        def check_items(value: Any) -> Optional[str]:
+            if not isinstance(value, (list, tuple)):
+                return None
+            for index, item in enumerate(value):
+                error = item_validator(item)
+                if error:
+                    return f"item {index} {error}"
+            return None
+
+        checks.append(check_items)
+
+    def validate(value: Any) -> Optional[str]:
+        for check in checks:
+            error = check(value)
+            if error:
+                return error
+        return None
+
+    return validate
+
+
+class CompiledCategorySchema:
+    """Category schema compiled into per-key validators."""
+
+    def __init__(self, schema: dict[str, Any]):
+        """
+        Compile a category schema.
+
+        Args:
+            schema: JSON schema of an object-typed settings category
+        """
+        self.property_validators: dict[str, KeyValidator] = {
+            key: compile_property_validator(prop)
+            for key, prop in schema.get("properties", {}).items()
+        }
+        self.pattern_validators: list[tuple[re.Pattern, KeyValidator]] = [
+            (re.compile(pattern), compile_property_validator(prop))
+            for pattern, prop in schema.get("patternProperties", {}).items()
+        ]
+        self.additional_properties = schema.get("additionalProperties", True) is not False
+
+    def validate_key(self, key: str, value: Any) -> Optional[str]:
+        """
+        Validate a single key in isolation.
+
+        Args:
+            key: Setting key within the category
+            value: Value to validate
+
+        Returns:
+            None if valid, otherwise an error message
+        """
+        validator = self.property_validators.get(key)
+        if validator is not None:
+            return validator(value)
+
+        for regex, pattern_validator in self.pattern_validators:
+            if regex.search(key):
+                return pattern_validator(value)
+
+        if not self.additional_properties:
+            return "unknown setting"
+        return None
+
 
 class SettingsSchema:
     """Settings schema validator with detailed error reporting."""
@@ -221,6 +390,9 @@ class SettingsSchema:
             self.validator = None
             self._jsonschema_available = False
 
+        # Per-key validators, compiled lazily per category
+        self._compiled: dict[str, CompiledCategorySchema] = {}
+
     def validate_settings(self, settings: dict[str, Any]) -> tuple[bool, list[str]]:
         """
         Validate complete settings dictionary.
@@ -257,6 +429,43 @@ class SettingsSchema:
         else:
             return self._validate_category_basic(category, data)
 
+    def get_compiled(self, category: str) -> Optional[CompiledCategorySchema]:
+        """
+        Get the compiled per-key validators for a category.
+
+        Args:
+            category: Category name
+
+        Returns:
+            Compiled category schema or None if the category is unknown
+        """
+        compiled = self._compiled.get(category)
+        if compiled is None and category in self.schemas and category != "root":
+            compiled = CompiledCategorySchema(self.schemas[category])
+            self._compiled[category] = compiled
+        return compiled
+
+    def validate_key(self, category: str, key: str, value: Any) -> tuple[bool, list[str]]:
+        """
+        Validate a single setting without touching the rest of its category.
+
+        Args:
+            category: Category name
+            key: Setting key within category
+            value: Value to validate
+
+        Returns:
+            Tuple of (is_valid, error_messages)
+        """
+        compiled = self.get_compiled(category)
+        if compiled is None:
+            return False, [f"Unknown settings category: {category}"]
+
+        error = compiled.validate_key(key, value)
+        if error:
+            return False, [f"{key}: {error}"]
+        return True, []
+
     def _validate_with_jsonschema(
         self, data: dict[str, Any], schema: dict[str, Any]
     ) -> tuple[bool, list[str]]:
@@ -367,12 +576,7 @@ def validate_keyboard_shortcut(shortcut: str) -> bool:
         return True  # Empty shortcuts are valid (disabled)
 
     # Basic validation - should contain only valid key combinations
-    import re
-
-    pattern = (
-        r"^(ctrl\+|alt\+|shift\+|meta\+)*[a-zA-Z0-9\+\-\\\[\]\/;'`~,\.<>\?:\"{}|!@#$%^&*()_=]$"
-    )
-    return re.match(pattern, shortcut.lower()) is not None
+    return re.match(SHORTCUT_PATTERN, shortcut.lower()) is not None
 
 
 def get_schema_for_category(category: str) -> Optional[dict[str, Any]]:
@@ -8,17 +8,26 @@ with type safety, validation, and integration with the existing StateService.
 
 import copy
 import logging
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from types import MappingProxyType
 from typing import Any, Callable, Optional
 
-from PySide6.QtCore import Signal
+from PySide6.QtCore import QTimer, Signal
 
 from viloapp.services.base import Service
 
+from .accessors import SettingAccessor, T, split_key_path
 from .defaults import DEFAULT_SETTINGS, get_default_keyboard_shortcuts
 from .schema import SettingsSchema, validate_keyboard_shortcut, validate_settings
 
 logger = logging.getLogger(__name__)
 
+# Delay before pending changes are written to storage; rapid changes are coalesced
+AUTO_SAVE_DELAY_MS = 500
+
+_MISSING = object()
+
 
 class SettingsService(Service):
     """
@@ -26,6 +35,11 @@ class SettingsService(Service):
 
     Provides a high-level interface for managing application settings
     with type safety, validation, and change notifications.
+
+    Settings are stored copy-on-write: snapshots handed to readers are never
+    mutated, and a category is only copied the first time it is written after
+    a snapshot was taken. Single keys are validated in isolation and changes
+    are persisted in debounced batches of dirty categories.
     """
 
     # Signals for settings changes
@@ -42,8 +56,22 @@ class SettingsService(Service):
         self._schema_validator = SettingsSchema()
         self._change_listeners: dict[str, list[Callable]] = {}
 
+        # Copy-on-write bookkeeping: whether the top-level dict and which
+        # category dicts are private to the service (not shared with a snapshot)
+        self._owns_root = True
+        self._owned_categories: set[str] = set()
+
+        # Debounced persistence
+        self._dirty_categories: set[str] = set()
+        self._batch_depth = 0
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(AUTO_SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self._flush_pending_save)
+
         # Load default settings
         self._settings = copy.deepcopy(DEFAULT_SETTINGS)
+        self._owned_categories = set(self._settings)
 
     def initialize(self, context: dict[str, Any]) -> None:
         """Initialize the service with application context."""
@@ -67,9 +95,12 @@ class SettingsService(Service):
     def cleanup(self) -> None:
         """Cleanup service resources."""
         # Save current settings
+        self._save_timer.stop()
         self._save_settings()
+        self._dirty_categories.clear()
 
-        self._settings.clear()
+        self._settings = {}
+        self._owned_categories.clear()
         self._change_listeners.clear()
         self._state_service = None
 
@@ -111,51 +142,122 @@ class SettingsService(Service):
         Returns:
             True if setting was updated successfully
         """
-        try:
-            # Ensure category exists
-            if category not in self._settings:
-                self._settings[category] = {}
+        return self.update(category, {key: value}, validate=validate)
 
-            # Validate if requested
-            if validate:
-                # Create temporary settings for validation
-                temp_settings = copy.deepcopy(self._settings)
-                temp_settings[category][key] = value
+    def update(self, category: str, values: Mapping[str, Any], validate: bool = True) -> bool:
+        """
+        Set several keys of a category at once.
 
-                is_valid, errors = self._schema_validator.validate_category(
-                    category, temp_settings[category]
-                )
-                if not is_valid:
-                    logger.warning(f"Invalid setting {category}.{key}: {errors}")
-                    return False
+        Only the given keys are validated, and the update is applied only if
+        all of them are valid. Cost is proportional to the number of keys.
 
-            # Special validation for keyboard shortcuts
-            if category == "keyboard_shortcuts" and not validate_keyboard_shortcut(value):
-                logger.warning(f"Invalid keyboard shortcut: {value}")
-                return False
+        Args:
+            category: Settings category
+            values: Mapping of key -> new value
+            validate: Whether to validate the settings
 
-            # Store old value for comparison
-            old_value = self._settings[category].get(key)
+        Returns:
+            True if all settings were updated successfully
+        """
+        try:
+            for key, value in values.items():
+                if validate:
+                    is_valid, errors = self._schema_validator.validate_key(category, key, value)
+                    if not is_valid:
+                        logger.warning(f"Invalid setting {category}.{key}: {errors}")
+                        return False
+
+                # Special validation for keyboard shortcuts
+                if category == "keyboard_shortcuts" and not validate_keyboard_shortcut(value):
+                    logger.warning(f"Invalid keyboard shortcut: {value}")
+                    return False
 
-            # Update setting
-            self._settings[category][key] = value
+            current = self._settings.get(category)
+            if not isinstance(current, dict):
+                current = {}
+            changed = {
+                key: value for key, value in values.items() if current.get(key, _MISSING) != value
+            }
+            if not changed and category in self._settings:
+                return True
 
-            # Notify if changed
-            if old_value != value:
+            category_settings = self._writable_category(category)
+            category_settings.update(changed)
+
+            # Notify changes
+            for key, value in changed.items():
                 self.setting_changed.emit(category, key, value)
                 self._notify_listeners(category, key, value)
+                logger.debug(f"Setting updated: {category}.{key} = {value}")
 
+            if changed:
                 # Auto-save if available
-                self._auto_save()
-
-                logger.debug(f"Setting updated: {category}.{key} = {value}")
+                self._auto_save([category])
 
             return True
 
         except Exception as e:
-            logger.error(f"Failed to set {category}.{key}: {e}")
+            logger.error(f"Failed to update {category}: {e}")
             return False
 
+    @contextmanager
+    def batch(self) -> Iterator["SettingsService"]:
+        """
+        Group several changes so they are persisted together.
+
+        Changes made inside the block are applied and notified immediately,
+        but nothing is written to storage until the outermost block exits.
+
+        Example:
+            with settings_service.batch():
+                settings_service.set("theme", "font_size", 14)
+                settings_service.set("terminal", "font_size", 14)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._dirty_categories:
+                self._save_timer.start()
+
+    def snapshot(self) -> Mapping[str, Any]:
+        """
+        Get a read-only snapshot of all settings without copying.
+
+        The snapshot and the category dicts it contains are never modified
+        by the service afterwards; later writes copy the affected category.
+        Callers must not mutate the returned data.
+
+        Returns:
+            Read-only mapping of category -> settings
+        """
+        self._owns_root = False
+        self._owned_categories.clear()
+        return MappingProxyType(self._settings)
+
+    def _writable_category(self, category: str) -> dict[str, Any]:
+        """Get a category dict that may be mutated, copying it if it is shared."""
+        if not self._owns_root:
+            self._settings = dict(self._settings)
+            self._owns_root = True
+
+        if category not in self._owned_categories:
+            current = self._settings.get(category)
+            self._settings[category] = dict(current) if isinstance(current, dict) else {}
+            self._owned_categories.add(category)
+
+        return self._settings[category]
+
+    def _replace_category(self, category: str, settings: Any) -> None:
+        """Replace a whole category with a private copy of the given settings."""
+        if not self._owns_root:
+            self._settings = dict(self._settings)
+            self._owns_root = True
+
+        self._settings[category] = dict(settings) if isinstance(settings, dict) else settings
+        self._owned_categories.add(category)
+
     def get_category(self, category: str) -> dict[str, Any]:
         """
         Get all settings for a category.
@@ -181,28 +283,44 @@ class SettingsService(Service):
             True if category was updated successfully
         """
         try:
-            # Validate if requested
+            old_settings = self._settings.get(category)
+            if not isinstance(old_settings, dict):
+                old_settings = {}
+            changed = {
+                key: value
+                for key, value in settings.items()
+                if old_settings.get(key, _MISSING) != value
+            }
+
+            # Validate if requested - unchanged keys were validated when they were set
             if validate:
-                is_valid, errors = self._schema_validator.validate_category(category, settings)
-                if not is_valid:
+                if category not in self._schema_validator.schemas:
+                    logger.warning(f"Invalid settings for {category}: unknown category")
+                    return False
+                errors = []
+                for key, value in changed.items():
+                    is_valid, key_errors = self._schema_validator.validate_key(category, key, value)
+                    if not is_valid:
+                        errors.extend(key_errors)
+                if errors:
                     logger.warning(f"Invalid settings for {category}: {errors}")
                     return False
 
             # Update category
-            old_settings = self._settings.get(category, {})
-            self._settings[category] = settings.copy()
+            self._replace_category(category, settings)
 
             # Notify if changed
-            if old_settings != settings:
+            if changed or len(old_settings) != len(settings):
                 self.category_changed.emit(category, settings)
 
                 # Notify individual setting changes
-                for key, value in settings.items():
-                    if old_settings.get(key) != value:
-                        self._notify_listeners(category, key, value)
+                for key, value in changed.items():
+                    self._notify_listeners(category, key, value)
+                for key in old_settings.keys() - settings.keys():
+                    self._notify_listeners(category, key, None)
 
                 # Auto-save if available
-                self._auto_save()
+                self._auto_save([category])
 
                 logger.debug(f"Category updated: {category}")
 
@@ -217,9 +335,13 @@ class SettingsService(Service):
         Get all application settings.
 
         Returns:
-            Complete settings dictionary
+            Complete settings dictionary with each category copied; use
+            snapshot() for read-only access without copying
         """
-        return copy.deepcopy(self._settings)
+        return {
+            category: dict(values) if isinstance(values, dict) else values
+            for category, values in self._settings.items()
+        }
 
     def set_all(self, settings: dict[str, Any], validate: bool = True) -> bool:
         """
@@ -240,22 +362,30 @@ class SettingsService(Service):
                     logger.warning(f"Invalid settings: {errors}")
                     return False
 
-            # Update all settings
-            old_settings = copy.deepcopy(self._settings)
+            # Update all settings - the old dicts are never mutated, so they
+            # can be compared against without copying
+            old_settings = self._settings
             self._settings = copy.deepcopy(settings)
+            self._owns_root = True
+            self._owned_categories = set(self._settings)
 
             # Notify of changes
+            changed_categories = []
             for category, category_settings in settings.items():
-                if old_settings.get(category) != category_settings:
+                old_category = old_settings.get(category)
+                if old_category != category_settings:
+                    changed_categories.append(category)
                     self.category_changed.emit(category, category_settings)
 
                     if isinstance(category_settings, dict):
+                        if not isinstance(old_category, dict):
+                            old_category = {}
                         for key, value in category_settings.items():
-                            if old_settings.get(category, {}).get(key) != value:
+                            if old_category.get(key) != value:
                                 self._notify_listeners(category, key, value)
 
             # Auto-save if available
-            self._auto_save()
+            self._auto_save(changed_categories)
 
             logger.info("All settings updated")
             return True
@@ -342,8 +472,79 @@ class SettingsService(Service):
         """Get font size."""
         return self.get("theme", "font_size", 12)
 
+    # ============= Key Paths =============
+
+    def get_path(self, path: str, default: Any = None) -> Any:
+        """
+        Get a setting by key path.
+
+        Args:
+            path: Key path, e.g. "terminal.font_size"
+            default: Default value if not found
+
+        Returns:
+            Setting value or default
+        """
+        try:
+            category, key = split_key_path(path)
+        except ValueError:
+            return default
+        return self.get(category, key, default)
+
+    def set_path(self, path: str, value: Any, validate: bool = True) -> bool:
+        """
+        Set a setting by key path.
+
+        Args:
+            path: Key path, e.g. "terminal.font_size"
+            value: New value
+            validate: Whether to validate the setting
+
+        Returns:
+            True if setting was updated successfully
+        """
+        try:
+            category, key = split_key_path(path)
+        except ValueError as e:
+            logger.warning(str(e))
+            return False
+        return self.set(category, key, value, validate=validate)
+
+    def accessor(self, path: str, value_type: type[T], default: T) -> SettingAccessor[T]:
+        """
+        Create a typed accessor that caches a setting and tracks its changes.
+
+        Args:
+            path: Key path, e.g. "terminal.font_size"
+            value_type: Type values are coerced to
+            default: Value used when the setting is missing or invalid
+
+        Returns:
+            Accessor whose value is refreshed only when this setting changes
+        """
+        return SettingAccessor(self, path, value_type, default)
+
     # ============= Change Listeners =============
 
+    def subscribe(self, path: str, callback: Callable[[Any], None]) -> Callable[[], None]:
+        """
+        Subscribe to changes of a single key path.
+
+        Listeners are kept in a dispatch table keyed by path, so a change only
+        reaches the listeners of that path and of its category wildcard.
+
+        Args:
+            path: Key path ("terminal.font_size"), or "terminal.*" for any key
+                in the category
+            callback: Function called with the new value
+
+        Returns:
+            Function that removes the subscription
+        """
+        category, key = split_key_path(path)
+        self.add_change_listener(category, key, callback)
+        return lambda: self.remove_change_listener(category, key, callback)
+
     def add_change_listener(self, category: str, key: str, callback: Callable[[Any], None]) -> None:
         """
         Add a listener for setting changes.
@@ -381,10 +582,10 @@ class SettingsService(Service):
 
     def _notify_listeners(self, category: str, key: str, value: Any) -> None:
         """Notify change listeners."""
-        # Specific key listeners
+        # Specific key listeners (iterate a copy so listeners may unsubscribe)
         listener_key = f"{category}.{key}"
         if listener_key in self._change_listeners:
-            for callback in self._change_listeners[listener_key]:
+            for callback in tuple(self._change_listeners[listener_key]):
                 try:
                     callback(value)
                 except Exception as e:
@@ -393,7 +594,7 @@ class SettingsService(Service):
         # Wildcard listeners for category
         wildcard_key = f"{category}.*"
         if wildcard_key in self._change_listeners:
-            for callback in self._change_listeners[wildcard_key]:
+            for callback in tuple(self._change_listeners[wildcard_key]):
                 try:
                     callback(value)
                 except Exception as e:
@@ -408,6 +609,8 @@ class SettingsService(Service):
         Returns:
             True if save was successful
         """
+        self._save_timer.stop()
+        self._dirty_categories.clear()
         return self._save_settings()
 
     def load(self) -> bool:
@@ -430,19 +633,35 @@ class SettingsService(Service):
             True if reset was successful
         """
         try:
+            # Category dicts are replaced, never mutated, so keeping references is enough
+            old_settings = dict(self._settings)
+
             if categories:
                 # Reset specific categories
-                for category in categories:
-                    if category in DEFAULT_SETTINGS:
-                        self._settings[category] = copy.deepcopy(DEFAULT_SETTINGS[category])
-                        self.category_changed.emit(category, self._settings[category])
+                reset_categories = [c for c in categories if c in DEFAULT_SETTINGS]
+                for category in reset_categories:
+                    self._replace_category(category, copy.deepcopy(DEFAULT_SETTINGS[category]))
+                    self.category_changed.emit(category, self._settings[category])
             else:
                 # Reset all settings
+                reset_categories = list(DEFAULT_SETTINGS)
                 self._settings = copy.deepcopy(DEFAULT_SETTINGS)
+                self._owns_root = True
+                self._owned_categories = set(self._settings)
                 self.settings_reset.emit()
 
+            # Notify key listeners of values that actually changed
+            for category in reset_categories:
+                old_category = old_settings.get(category)
+                new_category = self._settings[category]
+                if not isinstance(old_category, dict) or not isinstance(new_category, dict):
+                    continue
+                for key, value in new_category.items():
+                    if old_category.get(key, _MISSING) != value:
+                        self._notify_listeners(category, key, value)
+
             # Auto-save
-            self._auto_save()
+            self._auto_save(reset_categories)
 
             logger.info(f"Settings reset: {categories or 'all'}")
             return True
@@ -451,15 +670,26 @@ class SettingsService(Service):
             logger.error(f"Failed to reset settings: {e}")
             return False
 
-    def _save_settings(self) -> bool:
-        """Save settings using StateService."""
+    def _save_settings(self, categories: Optional[Iterable[str]] = None) -> bool:
+        """
+        Save settings using StateService.
+
+        Args:
+            categories: Categories to save, or None for all
+        """
         if not self._state_service:
             return False
 
         try:
+            if categories is None:
+                categories = list(self._settings)
+
             # Save each category as a preference
-            for category, settings in self._settings.items():
-                self._state_service.save_preference(f"settings.{category}", settings)
+            for category in categories:
+                if category in self._settings:
+                    self._state_service.save_preference(
+                        f"settings.{category}", self._settings[category]
+                    )
 
             logger.debug("Settings saved")
             return True
@@ -487,7 +717,7 @@ class SettingsService(Service):
                     )
 
                     if is_valid:
-                        self._settings[category] = saved_settings
+                        self._replace_category(category, saved_settings)
                         loaded_any = True
                     else:
                         logger.warning(
@@ -505,11 +735,22 @@ class SettingsService(Service):
             logger.error(f"Failed to load settings: {e}")
             return False
 
-    def _auto_save(self) -> None:
-        """Auto-save settings if enabled."""
+    def _auto_save(self, categories: Iterable[str]) -> None:
+        """Schedule a debounced save of the given categories."""
         # For now, always auto-save
         # In the future, this could be controlled by a setting
-        self._save_settings()
+        self._dirty_categories.update(categories)
+        if self._dirty_categories and self._batch_depth == 0:
+            self._save_timer.start()
+
+    def _flush_pending_save(self) -> None:
+        """Write all categories changed since the last save."""
+        if not self._dirty_categories:
+            return
+
+        categories = list(self._dirty_categories)
+        self._dirty_categories.clear()
+        self._save_settings(categories)
 
     # ============= Service Info =============
 
@@ -521,6 +762,7 @@ class SettingsService(Service):
                 len(s) if isinstance(s, dict) else 1 for s in self._settings.values()
             ),
             "change_listeners": len(self._change_listeners),
+            "pending_save_categories": sorted(self._dirty_categories),
             "has_state_service": self._state_service is not None,
             "validation_available": self._schema_validator._jsonschema_available,
         }
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Compiled theme bundle cache.
+
+Parsing, validating and resolving theme files, and rendering component
+stylesheets, happen once and the results are kept in a single bundle file.
+Later launches read that file instead, and only fall back to the theme
+files when they or the application version change.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from .theme import Theme
+
+logger = logging.getLogger(__name__)
+
+# Bump when the bundle format or the way themes are compiled changes
+BUNDLE_VERSION = 1
+
+
+def source_fingerprints(paths: Iterable[Path]) -> list[list[Any]]:
+    """
+    Get cheap fingerprints of theme source files.
+
+    Args:
+        paths: Theme files
+
+    Returns:
+        Sorted [path, mtime_ns, size] entries, with None for missing files
+    """
+    fingerprints = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            fingerprints.append([str(path), stat.st_mtime_ns, stat.st_size])
+        except OSError:
+            fingerprints.append([str(path), None, None])
+    return sorted(fingerprints)
+
+
+def _app_version() -> str:
+    """Get the application version the bundle is compiled for."""
+    from viloapp import __version__
+
+    return __version__
+
+
+class ThemeBundleCache:
+    """
+    Theme bundle persisted between runs.
+
+    Holds the compiled themes together with the fingerprints of the sources
+    they were compiled from, and the rendered component stylesheets of each
+    theme keyed by the theme state they were rendered for.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Bundle file, defaults to theme_bundle.json in the user cache dir
+        """
+        if path is None:
+            import platformdirs
+
+            path = Path(platformdirs.user_cache_dir("ViloxTerm")) / "theme_bundle.json"
+
+        self.path = path
+        self._sources: Optional[list] = None
+        self._themes: dict[str, dict] = {}
+        self._stylesheets: dict[str, dict] = {}
+        self._dirty = False
+        self._loaded = False
+
+    def load_themes(self, sources: list) -> Optional[dict[str, Theme]]:
+        """
+        Get the compiled themes if they were compiled from the given sources.
+
+        Args:
+            sources: Fingerprints of the theme sources
+
+        Returns:
+            Themes by ID, or None if the bundle is missing or stale
+        """
+        self._ensure_loaded()
+        if self._sources != sources:
+            return None
+
+        try:
+            return {theme_id: Theme.from_dict(data) for theme_id, data in self._themes.items()}
+        except Exception as e:
+            logger.debug(f"Discarding unreadable theme bundle: {e}")
+            return None
+
+    def store_themes(self, sources: list, themes: dict[str, Theme]) -> None:
+        """
+        Store compiled themes, replacing everything compiled from other sources.
+
+        Args:
+            sources: Fingerprints of the theme sources
+            themes: Themes by ID
+        """
+        self._ensure_loaded()
+        self._sources = sources
+        self._themes = {theme_id: theme.to_dict() for theme_id, theme in themes.items()}
+        self._stylesheets = {}
+        self._dirty = True
+
+    def get_stylesheets(self, theme_id: str, state_key: str) -> Optional[dict]:
+        """
+        Get the rendered stylesheets of a theme.
+
+        Args:
+            theme_id: Theme identifier
+            state_key: Key of the colors and typography they were rendered for
+
+        Returns:
+            Dictionary with "stylesheets", "sections" and "dependencies" by
+            component, or None if not rendered for this state
+        """
+        self._ensure_loaded()
+        entry = self._stylesheets.get(theme_id)
+        if entry is None or entry.get("key") != state_key:
+            return None
+        return entry
+
+    def put_stylesheets(
+        self,
+        theme_id: str,
+        state_key: str,
+        stylesheets: dict[str, str],
+        sections: dict[str, str],
+        dependencies: dict[str, list[str]],
+    ) -> None:
+        """
+        Store the rendered stylesheets of a theme.
+
+        Args:
+            theme_id: Theme identifier
+            state_key: Key of the colors and typography they were rendered for
+            stylesheets: Component stylesheets
+            sections: Component sections of the application stylesheet
+            dependencies: Theme keys each component depends on
+        """
+        self._ensure_loaded()
+        self._stylesheets[theme_id] = {
+            "key": state_key,
+            "stylesheets": stylesheets,
+            "sections": sections,
+            "dependencies": dependencies,
+        }
+        self._dirty = True
+
+    def save(self) -> bool:
+        """
+        Persist the bundle.
+
+        Returns:
+            True if saved successfully or nothing changed
+        """
+        if not self._dirty:
+            return True
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "version": BUNDLE_VERSION,
+                        "app_version": _app_version(),
+                        "sources": self._sources,
+                        "themes": self._themes,
+                        "stylesheets": self._stylesheets,
+                    },
+                    f,
+                )
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to save theme bundle: {e}")
+            return False
+
+    def clear(self) -> None:
+        """Drop the compiled themes and stylesheets."""
+        self._sources = None
+        self._themes = {}
+        self._stylesheets = {}
+        self._loaded = True
+        self._dirty = True
+
+    def _ensure_loaded(self) -> None:
+        """Read the bundle file on first use."""
+        if self._loaded:
+            return
+        self._loaded = True
+
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable theme bundle: {e}")
+            return
+
+        if data.get("version") != BUNDLE_VERSION or data.get("app_version") != _app_version():
+            logger.debug("Theme bundle is from another version, recompiling")
+            return
+
+        self._sources = data.get("sources")
+        self._themes = data.get("themes", {})
+        self._stylesheets = data.get("stylesheets", {})
@@ -67,6 +67,29 @@ except ImportError as e:
     logger.warning(f"Could not register widgets with AppWidgetManager: {e}")
 
 
+def configure_web_engine():
+    """Apply the terminal renderer process settings before Qt WebEngine starts."""
+    from PySide6.QtCore import QSettings
+
+    from viloapp.core.environment_detector import apply_renderer_settings
+    from viloapp.core.settings.accessors import coerce_setting
+
+    try:
+        # Settings are saved per category by the StateService; the settings
+        # service itself only exists once the application is running
+        terminal = QSettings("ViloxTerm", "State").value("preferences/settings.terminal")
+        if not isinstance(terminal, dict):
+            terminal = {}
+
+        flags = apply_renderer_settings(
+            process_per_site=coerce_setting(terminal.get("share_renderer_process"), bool, True),
+            renderer_process_limit=coerce_setting(terminal.get("renderer_process_limit"), int, 0),
+        )
+        logger.info(f"Chromium flags: {flags}")
+    except Exception as e:
+        logger.error(f"Failed to configure web engine: {e}")
+
+
 def initialize_plugins(window):
     """Initialize plugin system after main window is ready."""
     import logging
@@ -89,8 +112,6 @@ def initialize_plugins(window):
             return
 
         # Create widget bridge
-        from viloapp_sdk import LifecycleState
-
         from viloapp.core.plugin_system.widget_bridge import PluginWidgetBridge
         from viloapp.services.workspace_service import WorkspaceService
 
@@ -99,73 +120,27 @@ def initialize_plugins(window):
             widget_bridge = PluginWidgetBridge(workspace_service)
             plugin_service._widget_bridge = widget_bridge
 
-            # Get all discovered plugins from registry
-            registry = plugin_manager.registry
-            all_plugins = {}
-            for plugin_info in registry.get_all_plugins():
-                all_plugins[plugin_info.metadata.id] = plugin_info
-                logger.debug(
-                    f"Plugin in registry: {plugin_info.metadata.id} (path: {plugin_info.path})"
-                )
-
-            logger.info(f"Found {len(all_plugins)} plugins to process")
-
-            # Load and activate each plugin
-            for plugin_id, plugin_info in all_plugins.items():
-                logger.info(f"Processing plugin: {plugin_id}")
-
-                # Skip built-in plugins (they're handled differently)
-                if plugin_id in ["core-commands", "core-themes"]:
-                    logger.info(f"Skipping built-in plugin: {plugin_id}")
-                    continue
-
-                # Check if plugin is already loaded or activated
-                if plugin_info.state in [LifecycleState.ACTIVATED, LifecycleState.LOADED]:
-                    logger.info(
-                        f"Plugin already loaded/activated: {plugin_id} (state: {plugin_info.state})"
-                    )
-                    # Just register widget if available
-                    plugin = plugin_manager.get_plugin(plugin_id)
-                    if plugin and hasattr(plugin, "widget_factory"):
-                        widget_bridge.register_plugin_widget(plugin.widget_factory, plugin_id)
-                        logger.info(
-                            f"Registered widget factory for already loaded plugin: {plugin_id}"
-                        )
-                    continue
-
-                # Load the plugin
-                if plugin_manager.load_plugin(plugin_id):
-                    logger.info(f"Loaded plugin: {plugin_id}")
-
-                    # Activate the plugin
-                    if plugin_manager.activate_plugin(plugin_id):
-                        logger.info(f"Activated plugin: {plugin_id}")
-
-                        # Get the plugin instance
-                        plugin = plugin_manager.get_plugin(plugin_id)
-                        if plugin:
-                            # Register widget factory if available
-                            if hasattr(plugin, "widget_factory"):
-                                widget_bridge.register_plugin_widget(
-                                    plugin.widget_factory, plugin_id
-                                )
-                                logger.info(f"Registered widget factory for: {plugin_id}")
-                    else:
-                        logger.error(f"Failed to activate plugin: {plugin_id}")
-                else:
-                    logger.error(f"Failed to load plugin: {plugin_id}")
+            # Register plugin widgets. Plugins that are not active yet get
+            # placeholders from their manifest and are imported and activated
+            # the first time one of their widgets is opened.
+            plugin_manager.register_widgets(widget_bridge)
 
             logger.info("Plugin system initialization complete")
 
-            # Now that plugins are loaded, restore all state (window geometry + workspace)
+            # Now that plugin widgets are registered, restore all state (window geometry + workspace)
             if hasattr(window, "restore_state"):
                 window.restore_state()
                 logger.info("Restored window and workspace state after plugin initialization")
 
-            # Refresh Apps menu now that plugins are loaded
+            # Refresh Apps menu now that plugin widgets are registered
             if hasattr(window, "action_manager") and window.action_manager:
                 window.action_manager.refresh_apps_menu()
                 logger.info("Refreshed Apps menu with plugin widgets")
+
+            # Activate deferred plugins once the event loop is running
+            from PySide6.QtCore import QTimer
+
+            QTimer.singleShot(0, lambda: plugin_manager.fire_activation_event("onStartupFinished"))
     except Exception as e:
         logger.error(f"Failed to initialize plugins: {e}", exc_info=True)
 
@@ -204,6 +179,9 @@ def main():
             Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
         )
 
+        # Chromium reads its flags when Qt WebEngine starts with the application
+        configure_web_engine()
+
         # Create application
         app = QApplication(sys.argv)
 
@@ -7,14 +7,28 @@ import logging
 from pathlib import Path
 from typing import Optional
 
-from PySide6.QtCore import QFile, QTextStream, Signal
+from PySide6.QtCore import QFile, QTextStream, QTimer, Signal
 
 from viloapp.core.themes.theme import Theme, ThemeInfo
+from viloapp.core.themes.theme_bundle import ThemeBundleCache, source_fingerprints
 from viloapp.core.themes.typography import TYPOGRAPHY_PRESETS, ThemeTypography
 from viloapp.services.base import Service
 
 logger = logging.getLogger(__name__)
 
+# Built-in themes compiled into the Qt resources
+BUILTIN_THEME_RESOURCES = [
+    ":/themes/builtin/vscode-dark.json",
+    ":/themes/builtin/vscode-light.json",
+    ":/themes/builtin/monokai.json",
+    ":/themes/builtin/solarized-dark.json",
+]
+
+DEFAULT_THEME_ID = "vscode-dark"
+
+# Preview tweaks are applied at most once per frame while a color is dragged
+PREVIEW_INTERVAL_MS = 16
+
 
 class ThemeService(Service):
     """
@@ -27,20 +41,32 @@ class ThemeService(Service):
     theme_changed = Signal(dict)
     # Signal emitted when typography changes
     typography_changed = Signal(object)
+    # Signal emitted with only the colors that changed (removed keys map to None)
+    colors_changed = Signal(dict)
+
+    def __init__(self, bundle_cache: Optional[ThemeBundleCache] = None):
+        """
+        Initialize theme service.
 
-    def __init__(self):
-        """Initialize theme service."""
+        Args:
+            bundle_cache: Compiled theme bundle, defaults to the one in the user cache dir
+        """
         super().__init__("ThemeService")
 
         self._themes: dict[str, Theme] = {}
         self._current_theme: Optional[Theme] = None
         self._user_themes_path = Path.home() / ".config/ViloxTerm/themes"
         self._theme_provider = None  # Will be set after initialization
+        self._bundle_cache = bundle_cache or ThemeBundleCache()
 
         # Preview mode state
         self._preview_mode = False
         self._preview_backup: Optional[Theme] = None
         self._preview_colors: dict[str, str] = {}
+        # Preview changes waiting for the next frame
+        self._pending_preview_colors: dict[str, str] = {}
+        self._pending_preview_typography: Optional[ThemeTypography] = None
+        self._preview_timer: Optional[QTimer] = None
 
         # Ensure user themes directory exists
         self._user_themes_path.mkdir(parents=True, exist_ok=True)
@@ -55,20 +81,63 @@ class ThemeService(Service):
         super().initialize(context)
 
         # Load all themes
-        self._load_builtin_themes()
-        self._load_user_themes()
+        self._load_themes()
 
         # Check if theme reset was requested via command line
         from viloapp.core.app_config import app_config
 
         if app_config.reset_theme:
             self.reset_to_default_theme()
-        # Apply default theme
+        # Apply saved theme, falling back to the default theme
         elif not self._current_theme:
-            self.apply_theme("vscode-dark")
+            theme_id = self._load_theme_preference()
+            if not theme_id or theme_id not in self._themes:
+                theme_id = DEFAULT_THEME_ID
+            self.apply_theme(theme_id)
 
         logger.info(f"ThemeService initialized with {len(self._themes)} themes")
 
+    def _load_themes(self) -> None:
+        """Load all themes, from the compiled theme bundle when it is current."""
+        sources = self._theme_sources()
+        themes = self._bundle_cache.load_themes(sources)
+        if themes is not None:
+            self._themes.update(themes)
+            logger.debug(f"Loaded {len(themes)} themes from theme bundle")
+            return
+
+        self._load_builtin_themes()
+        self._load_user_themes()
+
+        # Resolve inheritance once so the bundle holds complete themes
+        for theme in self._themes.values():
+            if theme.extends and theme.extends in self._themes:
+                theme.merge_with_parent(self._themes[theme.extends])
+
+        self._bundle_cache.store_themes(sources, self._themes)
+        self._bundle_cache.save()
+
+    def _theme_sources(self) -> list:
+        """
+        Get fingerprints of every source themes are loaded from.
+
+        Returns:
+            Fingerprints identifying the current theme files
+        """
+        from viloapp.core.app_config import app_config
+
+        if app_config.production_mode:
+            # Resource themes only change with the application version
+            sources = [[path] for path in BUILTIN_THEME_RESOURCES]
+        else:
+            themes_dir = Path(__file__).parent.parent / "resources/themes/builtin"
+            sources = source_fingerprints(themes_dir.glob("*.json"))
+        return sources + source_fingerprints(self._user_themes_path.glob("*.json"))
+
+    def get_bundle_cache(self) -> ThemeBundleCache:
+        """Get the compiled theme bundle cache."""
+        return self._bundle_cache
+
     def _load_builtin_themes(self) -> None:
         """Load built-in themes from resources or filesystem."""
         from viloapp.core.app_config import app_config
@@ -86,14 +155,7 @@ class ThemeService(Service):
 
     def _load_themes_from_resources(self) -> None:
         """Load themes from Qt resources."""
-        theme_files = [
-            ":/themes/builtin/vscode-dark.json",
-            ":/themes/builtin/vscode-light.json",
-            ":/themes/builtin/monokai.json",
-            ":/themes/builtin/solarized-dark.json",
-        ]
-
-        for resource_path in theme_files:
+        for resource_path in BUILTIN_THEME_RESOURCES:
             try:
                 file = QFile(resource_path)
                 if file.open(QFile.ReadOnly):
@@ -342,6 +404,10 @@ class ThemeService(Service):
         """
         Apply temporary theme for preview without saving.
 
+        The first change is applied right away; changes arriving faster than
+        once per frame, such as while a color slider is dragged, are merged
+        and applied together at the end of the frame.
+
         Args:
             colors: Dictionary of color key-value pairs to preview
             typography: Optional typography configuration to preview
@@ -351,6 +417,40 @@ class ThemeService(Service):
             self._preview_backup = self._current_theme
             self._preview_mode = True
 
+        self._pending_preview_colors.update(colors)
+        if typography is not None:
+            self._pending_preview_typography = typography
+
+        if self._preview_timer is None:
+            self._preview_timer = QTimer(self)
+            self._preview_timer.setSingleShot(True)
+            self._preview_timer.setInterval(PREVIEW_INTERVAL_MS)
+            self._preview_timer.timeout.connect(self._on_preview_timer)
+
+        if not self._preview_timer.isActive():
+            self._flush_preview()
+            self._preview_timer.start()
+
+    def _on_preview_timer(self) -> None:
+        """Apply preview changes collected during the last frame."""
+        if self._pending_preview_colors or self._pending_preview_typography:
+            self._flush_preview()
+            # Keep throttling while changes keep coming
+            self._preview_timer.start()
+
+    def _flush_preview(self) -> None:
+        """Apply pending preview changes that differ from the previewed theme."""
+        colors = self._pending_preview_colors
+        typography = self._pending_preview_typography
+        self._pending_preview_colors = {}
+        self._pending_preview_typography = None
+
+        current = self._current_theme
+        current_colors = current.colors if current else {}
+        changed = {key: value for key, value in colors.items() if current_colors.get(key) != value}
+        if not changed and typography is None:
+            return
+
         # Merge preview colors with current theme
         preview_theme = Theme(
             id="__preview__",
@@ -358,21 +458,25 @@ class ThemeService(Service):
             description="Temporary preview theme",
             version="1.0.0",
             author="Theme Editor",
-            colors=({**self._current_theme.colors, **colors} if self._current_theme else colors),
-            typography=typography
-            or (self._current_theme.typography if self._current_theme else None),
+            colors={**current_colors, **changed},
+            typography=typography or (current.typography if current else None),
         )
 
         # Store preview colors for reference
-        self._preview_colors = colors
+        self._preview_colors.update(colors)
 
         # Apply without saving to settings
-        self._apply_theme_internal(preview_theme, save=False)
+        self._apply_theme_internal(preview_theme, save=False, preview=True)
 
     def end_preview(self) -> None:
         """End preview and restore previous theme."""
+        if self._preview_timer is not None:
+            self._preview_timer.stop()
+        self._pending_preview_colors = {}
+        self._pending_preview_typography = None
+
         if self._preview_mode and self._preview_backup:
-            self._apply_theme_internal(self._preview_backup, save=False)
+            self._apply_theme_internal(self._preview_backup, save=False, preview=True)
             self._preview_mode = False
             self._preview_backup = None
             self._preview_colors = {}
@@ -385,19 +489,36 @@ class ThemeService(Service):
         """Get colors being previewed."""
         return self._preview_colors.copy()
 
-    def _apply_theme_internal(self, theme: Theme, save: bool = True) -> None:
+    def _apply_theme_internal(self, theme: Theme, save: bool = True, preview: bool = False) -> None:
         """
         Internal method to apply theme.
 
         Args:
             theme: Theme to apply
             save: Whether to save to settings
+            preview: Only signal the colors and typography that changed
         """
+        previous = self._current_theme
+        previous_colors = previous.colors if previous else {}
         self._current_theme = theme
         if save and not self._preview_mode and theme.id != "__preview__":
             self._save_theme_preference(theme.id)
 
+        changed = {
+            key: theme.colors.get(key)
+            for key in previous_colors.keys() | theme.colors.keys()
+            if previous_colors.get(key) != theme.colors.get(key)
+        }
+
         # Emit signals for UI updates
+        if changed:
+            self.colors_changed.emit(changed)
+        if preview:
+            # Listeners of the whole theme are not restyled for every preview frame
+            typography = theme.get_typography()
+            if previous is None or previous.get_typography().to_dict() != typography.to_dict():
+                self.typography_changed.emit(typography)
+            return
         self.theme_changed.emit(theme.colors)
         self.typography_changed.emit(theme.get_typography())
 
@@ -595,8 +716,6 @@ class ThemeService(Service):
         Returns:
             True if reset was successful
         """
-        DEFAULT_THEME_ID = "vscode-dark"
-
         try:
             # Clear theme preference from settings
             from viloapp.core.settings.config import get_settings
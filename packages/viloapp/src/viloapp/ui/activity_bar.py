@@ -235,7 +235,7 @@ class ActivityBar(QToolBar):
         # Get theme provider from parent window
         main_window = self.window()
         if hasattr(main_window, "theme_provider"):
-            self.setStyleSheet(main_window.theme_provider.get_stylesheet("activity_bar"))
+            main_window.theme_provider.apply_theme_to_widget(self, "activity_bar")
 
     def update_icons(self):
         """Update icons when theme changes."""
@@ -154,16 +154,10 @@ class MainWindowLayoutManager:
             return
 
         try:
-            # Apply main window theme
-            self.main_window.setStyleSheet(
-                self.main_window.theme_provider.get_stylesheet("main_window")
-                + self.main_window.theme_provider.get_stylesheet("menu")
-            )
-
-            # Apply splitter theme
-            self.main_splitter.setStyleSheet(
-                self.main_window.theme_provider.get_stylesheet("splitter")
-            )
+            # Main window, menu and splitter styles are part of the
+            # application stylesheet, which the provider keeps up to date
+            self.main_window.theme_provider.apply_theme_to_widget(self.main_window, "main_window")
+            self.main_window.theme_provider.apply_theme_to_widget(self.main_splitter, "splitter")
 
             # Let each component apply its own theme
             if self.activity_bar:
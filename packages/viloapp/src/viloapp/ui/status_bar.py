@@ -48,4 +48,4 @@ class AppStatusBar(QStatusBar):
         # Get theme provider from parent window
         main_window = self.window()
         if hasattr(main_window, "theme_provider") and main_window.theme_provider:
-            self.setStyleSheet(main_window.theme_provider.get_stylesheet("status_bar"))
+            main_window.theme_provider.apply_theme_to_widget(self, "status_bar")
@@ -6,17 +6,36 @@ This module generates Qt stylesheets dynamically based on the current theme.
 """
 
 import logging
-from typing import Callable
+import re
+from typing import Callable, Optional
 
 logger = logging.getLogger(__name__)
 
+# Dependency key recorded for anything read from the theme typography
+TYPOGRAPHY = "@typography"
+
+# Dynamic property that tags a widget with the component it is styled as
+SCOPE_PROPERTY = "themeComponent"
+
+# Components whose rules target top-level or uniquely named widgets, so they
+# go into the application stylesheet without a component scope
+GLOBAL_COMPONENTS = frozenset(
+    {"main_window", "menu", "splitter", "activity_bar", "status_bar", "pane_header"}
+)
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_RULE = re.compile(r"([^{}]+)\{([^{}]*)\}")
+_COMBINATOR = re.compile(r"\s|>")
+
 
 class StylesheetGenerator:
     """
     Generates Qt stylesheets from theme colors.
 
     Each component has its own generator method that creates
-    appropriate stylesheets using the current theme colors.
+    appropriate stylesheets using the current theme colors. The color
+    and typography keys read while generating a component are recorded
+    so callers can tell which components a theme change affects.
     """
 
     def __init__(self, theme_service):
@@ -27,6 +46,8 @@ class StylesheetGenerator:
             theme_service: ThemeService instance
         """
         self._theme_service = theme_service
+        self._dependencies: dict[str, frozenset[str]] = {}
+        self._recording: Optional[set[str]] = None
 
         # Map component names to generator methods
         self._generators: dict[str, Callable] = {
@@ -41,6 +62,7 @@ class StylesheetGenerator:
             "splitter": self._splitter_style,
             "settings_widget": self._settings_widget_style,
             "pane_header": self._pane_header_style,
+            "split_pane": self._split_pane_style,
             "command_palette": self._command_palette_style,
         }
 
@@ -55,26 +77,66 @@ class StylesheetGenerator:
             Stylesheet string
         """
         generator = self._generators.get(component, self._default_style)
+        self._recording = set()
         try:
-            return generator()
-        except Exception as e:
-            logger.error(f"Failed to generate stylesheet for {component}: {e}")
-            return self._default_style()
+            try:
+                return generator()
+            except Exception as e:
+                logger.error(f"Failed to generate stylesheet for {component}: {e}")
+                return self._default_style()
+        finally:
+            self._dependencies[component] = frozenset(self._recording)
+            self._recording = None
+
+    def get_components(self) -> list[str]:
+        """Get the names of all components with a generator."""
+        return list(self._generators)
+
+    def get_dependencies(self, component: str) -> frozenset[str]:
+        """
+        Get the theme keys read when the component was last generated.
+
+        Args:
+            component: Component name
+
+        Returns:
+            Color keys, plus TYPOGRAPHY if any typography setting was read
+        """
+        return self._dependencies.get(component, frozenset())
+
+    def set_dependencies(self, component: str, dependencies) -> None:
+        """
+        Set the theme keys of a component rendered elsewhere.
+
+        Args:
+            component: Component name
+            dependencies: Theme keys the component depends on
+        """
+        self._dependencies[component] = frozenset(dependencies)
+
+    def _record(self, key: str) -> None:
+        """Record a theme key read by the component being generated."""
+        if self._recording is not None:
+            self._recording.add(key)
 
     def _get_color(self, key: str, fallback: str = "#000000") -> str:
         """Helper to get color from theme service."""
+        self._record(key)
         return self._theme_service.get_color(key, fallback)
 
     def _get_font_size(self, scale: str = "base") -> int:
         """Helper to get font size from theme service."""
+        self._record(TYPOGRAPHY)
         return self._theme_service.get_font_size(scale)
 
     def _get_font_family(self) -> str:
         """Helper to get font family from theme service."""
+        self._record(TYPOGRAPHY)
         return self._theme_service.get_font_family()
 
     def _get_component_typography(self, component: str) -> dict:
         """Helper to get component-specific typography."""
+        self._record(TYPOGRAPHY)
         return self._theme_service.get_component_typography(component)
 
     def _main_window_style(self) -> str:
@@ -694,6 +756,16 @@ class StylesheetGenerator:
                 color: {self._get_color("paneHeader.activeForeground")};
                 font-weight: bold;
             }}
+            PaneHeaderBar QLabel#paneNumber {{
+                background-color: {self._get_color("paneHeader.buttonHoverBackground")};
+                border-radius: 2px;
+                min-width: 12px;
+                max-width: 12px;
+                font-weight: bold;
+            }}
+            PaneHeaderBar[active="true"] QLabel#paneNumber {{
+                background-color: {self._get_color("focusBorder")};
+            }}
             PaneHeaderBar QToolButton {{
                 background-color: transparent;
                 color: {self._get_color("paneHeader.foreground")};
@@ -711,6 +783,67 @@ class StylesheetGenerator:
             }}
         """
 
+    def _split_pane_style(self) -> str:
+        """Generate split pane stylesheet for the panes and splitters of a workspace."""
+        font_size = self._get_font_size("sm")
+
+        return f"""
+            PaneView, PaneContainer {{
+                background-color: {self._get_color("editor.background")};
+                border: none;
+            }}
+            PaneView[focused="true"] {{
+                border: 1px solid {self._get_color("focusBorder")};
+            }}
+            PaneView[focused="false"] {{
+                border: 1px solid {self._get_color("paneHeader.border")};
+            }}
+            QWidget#paneViewHeader {{
+                background-color: {self._get_color("paneHeader.background")};
+                border-bottom: 1px solid {self._get_color("paneHeader.border")};
+            }}
+            QWidget#paneViewHeader QLabel {{
+                color: {self._get_color("paneHeader.foreground")};
+                font-weight: bold;
+                font-size: {font_size}px;
+            }}
+            QWidget#paneViewHeader QPushButton {{
+                background-color: transparent;
+                color: {self._get_color("paneHeader.foreground")};
+                border: none;
+            }}
+            QWidget#paneViewHeader QPushButton:hover {{
+                background-color: {self._get_color("paneHeader.buttonHoverBackground")};
+            }}
+            QLabel#panePlaceholder {{
+                background-color: {self._get_color("paneHeader.background")};
+                color: {self._get_color("paneHeader.foreground")};
+                padding: 20px;
+                border: 1px dashed {self._get_color("paneHeader.border")};
+            }}
+            QSplitter {{
+                background-color: {self._get_color("editor.background")};
+            }}
+            QSplitter::handle {{
+                background-color: {self._get_color("splitter.background")};
+                border: none;
+                margin: 0px;
+            }}
+            QSplitter::handle:horizontal {{
+                width: 3px;
+                min-width: 3px;
+                max-width: 3px;
+            }}
+            QSplitter::handle:vertical {{
+                height: 3px;
+                min-height: 3px;
+                max-height: 3px;
+            }}
+            QSplitter::handle:hover {{
+                background-color: {self._get_color("splitter.hoverBackground")};
+            }}
+        """
+
     def _command_palette_style(self) -> str:
         """Generate command palette stylesheet."""
         # Use base font size for command palette
@@ -755,3 +888,40 @@ class StylesheetGenerator:
                 color: {self._get_color("editor.foreground")};
             }}
         """
+
+
+def _scope_selector(selector: str, scope: str) -> list[str]:
+    """Scope one selector to a tagged widget and its descendants."""
+    scoped = [f"*{scope} {selector}"]
+    if not _COMBINATOR.search(selector):
+        # A single compound selector may also match the tagged widget itself;
+        # the property test goes before any pseudo-state or sub-control
+        colon = selector.find(":")
+        if colon == -1:
+            scoped.append(f"{selector}{scope}")
+        else:
+            scoped.append(f"{selector[:colon]}{scope}{selector[colon:]}")
+    return scoped
+
+
+def scope_stylesheet(stylesheet: str, component: str) -> str:
+    """
+    Restrict a stylesheet to widgets tagged with a component.
+
+    Args:
+        stylesheet: Stylesheet written for a single widget
+        component: Component the widget is tagged with
+
+    Returns:
+        Stylesheet whose selectors only match the tagged widget and its descendants
+    """
+    scope = f'[{SCOPE_PROPERTY}="{component}"]'
+    rules = []
+    for selectors, body in _RULE.findall(_COMMENT.sub("", stylesheet)):
+        scoped = []
+        for selector in selectors.split(","):
+            selector = selector.strip()
+            if selector:
+                scoped.extend(_scope_selector(selector, scope))
+        rules.append(f"{', '.join(scoped)} {{{body}}}")
+    return "\n".join(rules)
@@ -4,15 +4,39 @@ Theme provider for UI components.
 
 This module provides the bridge between the ThemeService and UI components,
 managing stylesheet generation and caching.
+
+Component stylesheets are composed into a single application stylesheet.
+Widgets opt in by being tagged with their component, so a theme change
+re-applies one stylesheet instead of one per widget, and only components
+that read a changed color or typography setting are regenerated.
 """
 
+import hashlib
+import json
 import logging
+from pathlib import Path
 from typing import Optional
 
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import QCoreApplication, QObject, Qt, QTimer, Signal
+from PySide6.QtWidgets import QApplication
+
+from viloapp.core.themes.theme_bundle import source_fingerprints
+from viloapp.ui.themes import stylesheet_generator
+from viloapp.ui.themes.stylesheet_generator import (
+    GLOBAL_COMPONENTS,
+    SCOPE_PROPERTY,
+    TYPOGRAPHY,
+    scope_stylesheet,
+)
 
 logger = logging.getLogger(__name__)
 
+# Bundled stylesheets are re-rendered when the generator itself changes
+_GENERATOR_FINGERPRINT = source_fingerprints([Path(stylesheet_generator.__file__)])
+
+# Rendered stylesheets are written to the bundle once theme switching settles
+BUNDLE_SAVE_DELAY_MS = 2000
+
 
 class ThemeProvider(QObject):
     """
@@ -36,9 +60,25 @@ class ThemeProvider(QObject):
         self._theme_service = theme_service
         self._stylesheet_cache: dict[str, str] = {}
         self._stylesheet_generator = None
-
-        # Connect to theme changes
-        theme_service.theme_changed.connect(self._on_theme_changed)
+        # Scoped component sections of the application stylesheet
+        self._application_sections: dict[str, str] = {}
+        # Stylesheet installed on the application, None until installed
+        self._application_stylesheet: Optional[str] = None
+        # Theme state the cached stylesheets were generated from
+        self._colors = theme_service.get_colors()
+        self._typography = theme_service.get_typography().to_dict()
+        # Stylesheets rendered in earlier runs
+        self._bundle_cache = theme_service.get_bundle_cache()
+        self._bundle_save_timer = QTimer(self)
+        self._bundle_save_timer.setSingleShot(True)
+        self._bundle_save_timer.setInterval(BUNDLE_SAVE_DELAY_MS)
+        self._bundle_save_timer.timeout.connect(self.save_bundle)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.save_bundle)
+
+        # Connect to color changes, which previews send without a theme change
+        theme_service.colors_changed.connect(self._on_colors_changed)
         # Connect to typography changes
         theme_service.typography_changed.connect(self._on_typography_changed)
 
@@ -47,20 +87,28 @@ class ThemeProvider(QObject):
 
         self._stylesheet_generator = StylesheetGenerator(theme_service)
 
-    def _on_theme_changed(self, colors: dict[str, str]) -> None:
+    def _on_colors_changed(self, colors: dict[str, Optional[str]]) -> None:
         """
-        Handle theme change from service.
+        Handle color changes from service.
 
         Args:
-            colors: New theme colors
+            colors: Changed colors, with None for removed keys
         """
-        # Clear stylesheet cache
-        self._stylesheet_cache.clear()
+        for key, value in colors.items():
+            if value is None:
+                self._colors.pop(key, None)
+            else:
+                self._colors[key] = value
+        changed = set(colors)
 
-        # Notify all widgets to update
-        self.style_changed.emit()
+        # A theme switch also emits typography_changed right after; picking the
+        # new typography up here keeps the switch to a single regeneration
+        typography = self._theme_service.get_typography().to_dict()
+        if typography != self._typography:
+            self._typography = typography
+            changed.add(TYPOGRAPHY)
 
-        logger.debug("Theme changed, cache cleared and widgets notified")
+        self._invalidate(changed)
 
     def _on_typography_changed(self, typography) -> None:
         """
@@ -69,13 +117,40 @@ class ThemeProvider(QObject):
         Args:
             typography: New typography configuration
         """
-        # Clear stylesheet cache (fonts affect all stylesheets)
-        self._stylesheet_cache.clear()
+        typography = typography.to_dict()
+        if typography == self._typography:
+            return
+        self._typography = typography
+        self._invalidate({TYPOGRAPHY})
 
-        # Notify all widgets to update
-        self.style_changed.emit()
+    def _invalidate(self, keys: set[str]) -> None:
+        """
+        Regenerate the components that depend on changed theme keys.
 
-        logger.debug("Typography changed, cache cleared and widgets notified")
+        Args:
+            keys: Changed color keys, plus TYPOGRAPHY for typography changes
+        """
+        if not keys:
+            return
+
+        stale = [
+            component
+            for component in self._stylesheet_cache
+            if not keys.isdisjoint(self._stylesheet_generator.get_dependencies(component))
+        ]
+        for component in stale:
+            del self._stylesheet_cache[component]
+            self._application_sections.pop(component, None)
+
+        logger.debug(f"Theme keys changed ({len(keys)}), regenerated: {stale}")
+        if not stale:
+            return
+
+        self._load_bundled_stylesheets()
+        self._update_application_stylesheet()
+
+        # Notify widgets that still style themselves
+        self.style_changed.emit()
 
     def get_color(self, key: str, fallback: str = "#000000") -> str:
         """
@@ -173,26 +248,140 @@ class ThemeProvider(QObject):
         theme = self._theme_service.get_current_theme()
         return theme.name if theme else "Unknown"
 
+    def _state_key(self) -> str:
+        """Get a key identifying the theme state stylesheets are rendered from."""
+        from viloapp.core.app_config import app_config
+
+        state = {
+            "colors": self._colors,
+            "typography": self._typography,
+            "dev_mode": app_config.dev_mode,
+            "generator": _GENERATOR_FINGERPRINT,
+        }
+        return hashlib.sha1(json.dumps(state, sort_keys=True).encode()).hexdigest()
+
+    def _load_bundled_stylesheets(self) -> None:
+        """Fill the caches with stylesheets rendered for the current theme in an earlier run."""
+        theme_id = self.get_theme_id()
+        if not theme_id:
+            return
+
+        entry = self._bundle_cache.get_stylesheets(theme_id, self._state_key())
+        if entry is None:
+            return
+
+        for component, stylesheet in entry["stylesheets"].items():
+            if component not in self._stylesheet_cache:
+                self._stylesheet_cache[component] = stylesheet
+                self._stylesheet_generator.set_dependencies(
+                    component, entry["dependencies"].get(component, ())
+                )
+        for component, section in entry["sections"].items():
+            self._application_sections.setdefault(component, section)
+
+    def _store_bundled_stylesheets(self) -> None:
+        """Keep the rendered stylesheets of the current theme for later runs."""
+        theme_id = self.get_theme_id()
+        if not theme_id or theme_id == "__preview__":
+            return
+
+        components = self._stylesheet_generator.get_components()
+        self._bundle_cache.put_stylesheets(
+            theme_id,
+            self._state_key(),
+            {component: self._stylesheet_cache[component] for component in components},
+            {component: self._application_sections[component] for component in components},
+            {
+                component: sorted(self._stylesheet_generator.get_dependencies(component))
+                for component in components
+            },
+        )
+        # Several switches in a row, e.g. stepping through themes, are saved once
+        self._bundle_save_timer.start()
+
+    def save_bundle(self) -> None:
+        """Write stylesheets rendered since the last save to the theme bundle."""
+        self._bundle_save_timer.stop()
+        self._bundle_cache.save()
+
+    def get_application_stylesheet(self) -> str:
+        """
+        Get the stylesheet composed from all component stylesheets.
+
+        Returns:
+            Application stylesheet string
+        """
+        if not self._application_sections:
+            self._load_bundled_stylesheets()
+
+        sections = []
+        rendered = False
+        for component in self._stylesheet_generator.get_components():
+            section = self._application_sections.get(component)
+            if section is None:
+                section = self.get_stylesheet(component)
+                if component not in GLOBAL_COMPONENTS:
+                    # Only style widgets tagged with the component
+                    section = scope_stylesheet(section, component)
+                self._application_sections[component] = section
+                rendered = True
+            sections.append(section)
+
+        if rendered:
+            self._store_bundled_stylesheets()
+        return "\n".join(sections)
+
+    def install_application_stylesheet(self) -> None:
+        """Install the composed stylesheet on the application and keep it updated."""
+        if self._application_stylesheet is None:
+            self._application_stylesheet = ""
+        self._update_application_stylesheet()
+
+    def _update_application_stylesheet(self) -> None:
+        """Re-apply the application stylesheet if it is installed and changed."""
+        if self._application_stylesheet is None:
+            return
+
+        app = QApplication.instance()
+        if not isinstance(app, QApplication):
+            return
+
+        stylesheet = self.get_application_stylesheet()
+        if stylesheet != self._application_stylesheet:
+            self._application_stylesheet = stylesheet
+            # One polish pass for every widget in the application
+            app.setStyleSheet(stylesheet)
+
     def apply_theme_to_widget(self, widget, component: str) -> None:
         """
         Apply theme to a specific widget.
 
+        Tags the widget with the component so the application stylesheet
+        styles it; the widget needs no stylesheet of its own and is restyled
+        with the application on theme changes.
+
         Args:
             widget: QWidget to apply theme to
             component: Component name for stylesheet
         """
         try:
-            stylesheet = self.get_stylesheet(component)
-            if stylesheet:
-                widget.setStyleSheet(stylesheet)
-            else:
-                logger.warning(f"No stylesheet available for component: {component}")
+            self.install_application_stylesheet()
+            if widget.property(SCOPE_PROPERTY) == component:
+                return
+            widget.setProperty(SCOPE_PROPERTY, component)
+            if widget.testAttribute(Qt.WidgetAttribute.WA_WState_Polished):
+                # Property selectors are only evaluated when polishing
+                style = widget.style()
+                style.unpolish(widget)
+                style.polish(widget)
         except Exception as e:
             logger.error(f"Failed to apply theme to widget {component}: {e}")
 
     def clear_cache(self) -> None:
         """Clear the stylesheet cache."""
         self._stylesheet_cache.clear()
+        self._application_sections.clear()
+        self._update_application_stylesheet()
         logger.debug("Stylesheet cache cleared")
 
     def invalidate_component(self, component: str) -> None:
@@ -204,4 +393,6 @@ class ThemeProvider(QObject):
         """
         if component in self._stylesheet_cache:
             del self._stylesheet_cache[component]
+            self._application_sections.pop(component, None)
+            self._update_application_stylesheet()
             logger.debug(f"Invalidated cache for component: {component}")
@@ -83,6 +83,7 @@ class AppWidget(QWidget, ICapabilityProvider):
         # Lifecycle state management
         self.widget_state = WidgetState.CREATED
         self._pending_focus = False
+        self._rendering_suspended = False
         self._has_focus = False  # Explicit focus tracking
         self._initialization_time = None
         self._error_count = 0
@@ -182,6 +183,29 @@ class AppWidget(QWidget, ICapabilityProvider):
             self._set_state(WidgetState.READY)
             self.on_resume()
 
+    def suspend_rendering(self):
+        """
+        Stop rendering while hidden, for widgets that cannot be suspended.
+
+        Unlike suspend(), the widget stays READY and its background work
+        (e.g. a terminal's shell) keeps running; only its display pauses.
+        """
+        if self._rendering_suspended or not self.can_suspend_rendering:
+            return
+        if self.widget_state in (WidgetState.DESTROYING, WidgetState.DESTROYED):
+            return
+
+        self._rendering_suspended = True
+        self.on_suspend_rendering()
+
+    def resume_rendering(self):
+        """Resume rendering when shown again."""
+        if not self._rendering_suspended:
+            return
+
+        self._rendering_suspended = False
+        self.on_resume_rendering()
+
     def cleanup(self):
         """
         Clean up resources when widget is being destroyed.
@@ -401,6 +425,23 @@ class AppWidget(QWidget, ICapabilityProvider):
         # Default to allowing suspension if no metadata
         return True
 
+    @property
+    def can_suspend_rendering(self) -> bool:
+        """
+        Check if widget can stop rendering when hidden.
+
+        Returns:
+            True if rendering can be suspended, False otherwise
+        """
+        if self._metadata:
+            return self._metadata.can_suspend_rendering
+        return False
+
+    @property
+    def rendering_suspended(self) -> bool:
+        """Check if rendering is currently suspended."""
+        return self._rendering_suspended
+
     def set_metadata(self, metadata):
         """
         Set the widget's metadata.
@@ -493,6 +534,7 @@ class AppWidget(QWidget, ICapabilityProvider):
     def showEvent(self, event):
         """Handle widget becoming visible."""
         super().showEvent(event)
+        self.resume_rendering()
         if self.widget_state == WidgetState.SUSPENDED:
             self.resume()
         # Process pending focus if widget is now ready and visible
@@ -504,6 +546,7 @@ class AppWidget(QWidget, ICapabilityProvider):
         super().hideEvent(event)
         if self.widget_state == WidgetState.READY:
             self.suspend()
+        self.suspend_rendering()
 
     def focusInEvent(self, event):
         """Handle widget gaining focus."""
@@ -600,6 +643,22 @@ class AppWidget(QWidget, ICapabilityProvider):
         """
         pass
 
+    def on_suspend_rendering(self):
+        """
+        Called when rendering is suspended while hidden.
+
+        Override in subclasses to pause display updates.
+        """
+        pass
+
+    def on_resume_rendering(self):
+        """
+        Called when rendering resumes after being suspended.
+
+        Override in subclasses to bring the display up to date.
+        """
+        pass
+
     def on_cleanup(self):
         """
         Called during widget cleanup.
@@ -7,7 +7,7 @@ Provides a minimal, unobtrusive header with split/close controls.
 import logging
 
 from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QAction, QBrush, QColor, QPainter
+from PySide6.QtGui import QAction
 from PySide6.QtWidgets import (
     QHBoxLayout,
     QLabel,
@@ -26,6 +26,10 @@ class PaneHeaderBar(QWidget):
     """
     Minimal header bar for pane operations.
     Appears at the top of each pane with split/close controls.
+
+    Headers are styled by the pane_header rules of the application
+    stylesheet, so they carry no stylesheet of their own and follow theme
+    changes without being restyled one pane at a time.
     """
 
     # Signals
@@ -39,9 +43,7 @@ class PaneHeaderBar(QWidget):
         self.pane_id = pane_id
         self.show_type_menu = show_type_menu
         self.is_active = False
-        self.background_color = QColor("#252526")  # Default dark background
         self.setup_ui()
-        self.apply_theme()
 
     def setup_ui(self):
         """Initialize the header UI."""
@@ -49,8 +51,9 @@ class PaneHeaderBar(QWidget):
         self.setFixedHeight(18)  # Ultra-minimal height to save screen space
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
 
-        # Don't use palette or stylesheet for background - we'll paint it ourselves
-        self.setAttribute(Qt.WA_StyledBackground, False)
+        # Background and active state come from the application stylesheet
+        self.setAttribute(Qt.WA_StyledBackground, True)
+        self.setProperty("active", False)
 
         # Create layout
         layout = QHBoxLayout(self)
@@ -59,35 +62,14 @@ class PaneHeaderBar(QWidget):
 
         # Pane number label (shows 1-9 when enabled)
         self.number_label = QLabel()
-        self.number_label.setStyleSheet(
-            """
-            QLabel {
-                background-color: #007ACC;
-                color: white;
-                border-radius: 2px;
-                padding: 0px 4px;
-                font-weight: bold;
-                font-size: 10px;
-                min-width: 12px;
-                max-width: 12px;
-            }
-        """
-        )
+        self.number_label.setObjectName("paneNumber")
         self.number_label.setAlignment(Qt.AlignCenter)
         self.number_label.hide()  # Hidden by default
         layout.addWidget(self.number_label)
 
         # Pane ID label (optional, for debugging)
         self.id_label = QLabel(self.pane_id)
-        self.id_label.setStyleSheet(
-            """
-            QLabel {
-                color: #969696;
-                font-size: 10px;
-                padding: 0 2px;
-            }
-        """
-        )
+        self.id_label.setObjectName("paneId")
         layout.addWidget(self.id_label)
 
         # Stretch to push buttons to the right
@@ -115,10 +97,10 @@ class PaneHeaderBar(QWidget):
 
         # Close button
         self.close_button = self.create_tool_button("×", "Close this pane")
+        self.close_button.setObjectName("closeButton")
         self.close_button.clicked.connect(
             lambda: execute_command("workbench.action.closePane", pane=self.parent())
         )
-        # Style will be applied by theme
         layout.addWidget(self.close_button)
 
     def create_tool_button(self, text: str, tooltip: str) -> QToolButton:
@@ -128,43 +110,13 @@ class PaneHeaderBar(QWidget):
         button.setToolTip(tooltip)
         button.setFixedSize(16, 16)  # Smaller buttons
 
-        # Style will be applied by theme
-
         return button
 
     def show_widget_type_menu(self):
         """Show menu with available widget types dynamically from AppWidgetManager."""
+        # Styled by the menu rules of the application stylesheet
         menu = QMenu(self)
 
-        # Apply theme to menu using commands
-        theme_result = execute_command("theme.getCurrentColors")
-        colors = theme_result.value if theme_result and theme_result.success else {}
-
-        if colors:
-            menu.setStyleSheet(
-                f"""
-                QMenu {{
-                    background-color: {colors.get("menu.background", "#252526")};
-                    color: {colors.get("menu.foreground", "#cccccc")};
-                    border: 1px solid {colors.get("menu.border", "#454545")};
-                    padding: 4px;
-                }}
-                QMenu::item {{
-                    padding: 4px 20px;
-                    border-radius: 2px;
-                }}
-                QMenu::item:selected {{
-                    background-color: {colors.get("menu.selectionBackground", "#094771")};
-                    color: {colors.get("menu.selectionForeground", "#ffffff")};
-                }}
-                QMenu::separator {{
-                    height: 1px;
-                    background-color: {colors.get("menu.separatorBackground", "#454545")};
-                    margin: 4px 10px;
-                }}
-            """
-            )
-
         # Try to use AppWidgetManager for dynamic menu generation
         try:
             from viloapp.core.app_widget_manager import AppWidgetManager
@@ -383,137 +335,26 @@ class PaneHeaderBar(QWidget):
             self.number_label.setText(str(number))
         self.number_label.setVisible(visible and number is not None)
 
-    def paintEvent(self, event):  # noqa: N802
-        """Custom paint event to draw the background."""
-        painter = QPainter(self)
-        painter.fillRect(self.rect(), QBrush(self.background_color))
-        super().paintEvent(event)
-
     def set_active(self, active: bool):
         """Update visual state for active pane."""
         self.is_active = active
-
-        if active:
-            # Set active background color
-            self.background_color = QColor("#2d2d30")  # Default active background
-            self.update()  # Force repaint
-
-            self.id_label.setStyleSheet(
-                """
-                QLabel {
-                    color: #ffffff;
-                    font-size: 10px;
-                    padding: 0 2px;
-                    font-weight: bold;
-                }
-            """
-            )
-            # Highlight number label for active pane
-            if self.number_label.isVisible():
-                self.number_label.setStyleSheet(
-                    """
-                    QLabel {
-                        background-color: #007ACC;
-                        color: white;
-                        border-radius: 2px;
-                        padding: 0px 4px;
-                        font-weight: bold;
-                        font-size: 10px;
-                        min-width: 12px;
-                        max-width: 12px;
-                        border: 1px solid white;
-                    }
-                """
-                )
-        else:
-            # Set inactive background color
-            self.background_color = QColor("#252526")  # Default inactive background
-            self.update()  # Force repaint
-
-            self.id_label.setStyleSheet(
-                """
-                QLabel {
-                    color: #969696;
-                    font-size: 10px;
-                    padding: 0 2px;
-                }
-            """
-            )
-            # Normal number label for inactive pane
-            if self.number_label.isVisible():
-                self.number_label.setStyleSheet(
-                    """
-                    QLabel {
-                        background-color: #505050;
-                        color: #969696;
-                        border-radius: 2px;
-                        padding: 0px 4px;
-                        font-weight: bold;
-                        font-size: 10px;
-                        min-width: 12px;
-                        max-width: 12px;
-                    }
-                """
-                )
+        if self.property("active") != active:
+            self.setProperty("active", active)
+            self.apply_theme()
 
     def apply_theme(self):
-        """Apply current theme to pane header."""
-        # Get theme colors using command instead of ServiceLocator
-        theme_result = execute_command("theme.getCurrentColors")
-        colors = theme_result.value if theme_result and theme_result.success else {}
-
-        if colors:
-            # Update background color
-            self.background_color = QColor(colors.get("editor.background", "#252526"))
-
-            # Update button styles
-            button_style = f"""
-                QToolButton {{
-                    background-color: transparent;
-                    color: {colors.get("titleBar.activeForeground", "#cccccc")};
-                    border: none;
-                    padding: 0px;
-                    font-size: 12px;
-                    font-weight: bold;
-                }}
-                QToolButton:hover {{
-                    background-color: {colors.get("toolbar.hoverBackground", "#505050")};
-                    border: 1px solid {colors.get("focusBorder", "#007ACC")};
-                    border-radius: 2px;
-                }}
-                QToolButton:pressed {{
-                    background-color: {colors.get("focusBorder", "#007ACC")};
-                }}
-            """
-
-            if hasattr(self, "split_h_button"):
-                self.split_h_button.setStyleSheet(button_style)
-            if hasattr(self, "split_v_button"):
-                self.split_v_button.setStyleSheet(button_style)
-
-            # Close button special style
-            if hasattr(self, "close_button"):
-                self.close_button.setStyleSheet(
-                    f"""
-                    QToolButton {{
-                        background-color: transparent;
-                        color: {colors.get("titleBar.activeForeground", "#cccccc")};
-                        border: none;
-                        padding: 0px 2px;
-                        font-size: 12px;
-                        font-weight: bold;
-                    }}
-                    QToolButton:hover {{
-                        background-color: {colors.get("editorGroupHeader.tabsBackground", "#252526")};
-                        color: white;
-                        border-radius: 2px;
-                    }}
-                """
-                )
-
-            # Update label styles based on active state
-            self.set_active(self.is_active)
-            self.update()  # Force repaint
+        """Re-evaluate the application stylesheet rules for the header state."""
+        if not self.testAttribute(Qt.WA_WState_Polished):
+            # Rules are evaluated when the header is first shown
+            return
+
+        # Property selectors are only evaluated when polishing, and the label
+        # and button rules depend on the header's active property
+        for widget in (self, *self.findChildren(QWidget)):
+            style = widget.style()
+            style.unpolish(widget)
+            style.polish(widget)
+        self.update()
 
 
 class CompactPaneHeader(QWidget):
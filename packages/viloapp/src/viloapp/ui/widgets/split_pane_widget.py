@@ -18,6 +18,7 @@ from PySide6.QtWidgets import (
 )
 
 from viloapp.models.workspace_model import Orientation, PaneNode, WorkspaceModel
+from viloapp.ui.themes.stylesheet_generator import SCOPE_PROPERTY
 
 logger = logging.getLogger(__name__)
 
@@ -50,15 +51,6 @@ class PaneContainer(QWidget):
         self.setAttribute(Qt.WA_StaticContents, True)  # Content doesn't change often
         self.setAttribute(Qt.WA_DontCreateNativeAncestors, True)  # Avoid native windows
 
-        # Styling without border to prevent overlapping
-        self.setStyleSheet(
-            """
-            PaneContainer {
-                background-color: #252526;
-            }
-        """
-        )
-
     def set_widget(self, widget: QWidget):
         """Set the widget to display in this pane.
 
@@ -123,6 +115,10 @@ class SplitPaneWidget(QWidget):
         self.main_layout.setContentsMargins(0, 0, 0, 0)
         self.main_layout.setSpacing(0)
 
+        # Panes and splitters are styled by the split_pane rules of the
+        # application stylesheet instead of a stylesheet each
+        self.setProperty(SCOPE_PROPERTY, "split_pane")
+
         # Subscribe to model changes
         self._connect_model_observers()
 
@@ -277,30 +273,6 @@ class SplitPaneWidget(QWidget):
             splitter.setAttribute(Qt.WA_NoSystemBackground, True)
             splitter.setAttribute(Qt.WA_StaticContents, True)  # Hint that content is static
 
-            # 5. Complete styling with explicit dimensions
-            splitter.setStyleSheet(
-                """
-                QSplitter {
-                    background-color: #252526;
-                }
-                QSplitter::handle {
-                    background-color: #3c3c3c;
-                    border: none;
-                    margin: 0px;
-                }
-                QSplitter::handle:horizontal {
-                    width: 3px;
-                    min-width: 3px;
-                    max-width: 3px;
-                }
-                QSplitter::handle:vertical {
-                    height: 3px;
-                    min-height: 3px;
-                    max-height: 3px;
-                }
-            """
-            )
-
             # Build child widgets
             first_widget = self._build_tree_widget(node.first)
             second_widget = self._build_tree_widget(node.second)
@@ -354,16 +326,7 @@ class SplitPaneWidget(QWidget):
             from PySide6.QtWidgets import QLabel
 
             placeholder = QLabel("Widget unavailable")
-            placeholder.setStyleSheet(
-                """
-                QLabel {
-                    background-color: #252526;
-                    color: #999999;
-                    text-align: center;
-                    padding: 20px;
-                }
-            """
-            )
+            placeholder.setObjectName("panePlaceholder")
             placeholder.setAlignment(Qt.AlignCenter)
             container.set_widget(placeholder)
             logger.warning(f"Failed to create widget {widget_id} for pane {pane_id}")
@@ -52,7 +52,6 @@ class Workspace(QWidget):
 
         self.setup_ui()
         # Don't create default tab here - wait for restore_state or explicit call
-        self._setup_theme_observer()
 
     def setup_ui(self):
         """Initialize the workspace UI."""
@@ -377,35 +376,18 @@ class Workspace(QWidget):
                 self.command_registry.execute("tab.close", context, tab_id=tab_id)
                 break
 
-    def _setup_theme_observer(self):
-        """Setup theme observer for dynamic theme updates."""
-        try:
-            from viloapp.services import service_locator
-            from viloapp.services.theme_service import ThemeProvider
-
-            theme_service = service_locator.get(ThemeProvider)
-            if theme_service:
-                theme_service.theme_changed.connect(self.apply_theme)
-                # Apply initial theme
-                self.apply_theme()
-        except ImportError:
-            logger.warning("Theme service not available")
-        except Exception as e:
-            logger.error(f"Failed to setup theme observer: {e}")
-
     def apply_theme(self):
-        """Apply the current theme to the workspace."""
-        try:
-            from viloapp.services import service_locator
-            from viloapp.services.theme_service import ThemeProvider
-
-            theme_service = service_locator.get(ThemeProvider)
-            if theme_service:
-                stylesheet = theme_service.get_component_style("workspace")
-                if stylesheet:
-                    self.setStyleSheet(stylesheet)
-        except Exception as e:
-            logger.error(f"Failed to apply theme: {e}")
+        """
+        Apply the current theme to the workspace.
+
+        Panes, their headers and splitters are styled by the split_pane rules
+        of the application stylesheet. Tagging the workspace once covers every
+        pane it creates, and the theme provider re-applies the stylesheet on
+        theme changes.
+        """
+        main_window = self.window()
+        if getattr(main_window, "theme_provider", None):
+            main_window.theme_provider.apply_theme_to_widget(self, "split_pane")
 
     # Compatibility methods for existing code
     def create_new_tab(self, name: str = "New Tab", widget_type: str = "terminal"):
@@ -67,16 +67,7 @@ class WidgetFactory:
         layout = QVBoxLayout(widget)
         label = QLabel(f"{widget_id.split('.')[-1].upper()}\n(Plugin not available)")
         label.setAlignment(Qt.AlignCenter)
-        label.setStyleSheet(
-            """
-            QLabel {
-                background-color: #2d2d30;
-                color: #cccccc;
-                padding: 20px;
-                border: 1px dashed #555;
-            }
-            """
-        )
+        label.setObjectName("panePlaceholder")
         layout.addWidget(label)
         widget.setObjectName(f"placeholder_{pane_id[:8]}")
         return widget
@@ -112,15 +103,7 @@ class PaneView(QWidget):
         self.setAttribute(Qt.WA_NoSystemBackground, True)
         self.setAttribute(Qt.WA_StaticContents, True)
         self.setAttribute(Qt.WA_DontCreateNativeAncestors, True)
-        # No borders for clean appearance
-        self.setStyleSheet(
-            """
-            PaneView {
-                background-color: #252526;
-                border: none;
-            }
-        """
-        )
+        # Styled by the split_pane rules of the application stylesheet
 
         self.setup_ui()
 
@@ -156,7 +139,7 @@ class PaneView(QWidget):
 
             self.content_widget = QLabel("Widget unavailable")
             self.content_widget.setAlignment(Qt.AlignCenter)
-            self.content_widget.setStyleSheet("color: #999; background: #2d2d30;")
+            self.content_widget.setObjectName("panePlaceholder")
 
         # Install event filter on content widget to catch its focus events
         # This ensures we track focus even when child widgets receive it
@@ -164,11 +147,12 @@ class PaneView(QWidget):
 
         layout.addWidget(self.content_widget)
 
-        # Don't call update_style() here - style already set in __init__
+        # Don't call update_style() here - unfocused panes have no border
 
     def create_header(self) -> QWidget:
         """Create pane header with controls."""
         header = QWidget()
+        header.setObjectName("paneViewHeader")
         header.setFixedHeight(22)
         layout = QHBoxLayout(header)
         layout.setContentsMargins(5, 1, 5, 1)
@@ -177,7 +161,6 @@ class PaneView(QWidget):
         # Widget type label
         display_name = widget_metadata_registry.get_display_name(self.pane.widget_id)
         type_label = QLabel(display_name)
-        type_label.setStyleSheet("color: #cccccc; font-weight: bold; font-size: 12px;")
         layout.addWidget(type_label)
 
         layout.addStretch()
@@ -204,46 +187,17 @@ class PaneView(QWidget):
         close_btn.clicked.connect(lambda: self.request_close())
         layout.addWidget(close_btn)
 
-        header.setStyleSheet(
-            """
-            QWidget {
-                background-color: #2d2d30;
-                border-bottom: 1px solid #3c3c3c;
-            }
-            QPushButton {
-                background-color: transparent;
-                color: #cccccc;
-                border: none;
-            }
-            QPushButton:hover {
-                background-color: #3c3c3c;
-            }
-            """
-        )
-
         return header
 
     def update_style(self):
         """Update style based on focus state."""
-        if self.pane.focused:
-            self.setStyleSheet(
-                """
-                PaneView {
-                    background-color: #252526;
-                    border: 1px solid #007ACC;
-                    outline: 1px solid #007ACC;
-                }
-                """
-            )
-        else:
-            self.setStyleSheet(
-                """
-                PaneView {
-                    background-color: #252526;
-                    border: 1px solid #3c3c3c;
-                }
-                """
-            )
+        if self.property("focused") == self.pane.focused:
+            return
+        self.setProperty("focused", self.pane.focused)
+        # Property selectors are only evaluated when polishing
+        style = self.style()
+        style.unpolish(self)
+        style.polish(self)
 
     def request_split(self, orientation: str):
         """Request pane split through command."""
@@ -538,30 +492,8 @@ class TreeView(QWidget):
             splitter.setAttribute(Qt.WA_StaticContents, True)  # Hint that content is static
             splitter.setAttribute(Qt.WA_DontCreateNativeAncestors, True)  # Avoid native windows
 
-            # 5. Complete styling with explicit dimensions to prevent ambiguity
+            # 5. Fill the background; colors come from the split_pane theme rules
             splitter.setAutoFillBackground(True)
-            splitter.setStyleSheet(
-                """
-                QSplitter {
-                    background-color: #252526;
-                }
-                QSplitter::handle {
-                    background-color: #3c3c3c;
-                    border: none;
-                    margin: 0px;
-                }
-                QSplitter::handle:horizontal {
-                    width: 3px;
-                    min-width: 3px;
-                    max-width: 3px;
-                }
-                QSplitter::handle:vertical {
-                    height: 3px;
-                    min-height: 3px;
-                    max-height: 3px;
-                }
-                """
-            )
 
             # Recursively render children
             logger.debug("render_node: rendering first child")
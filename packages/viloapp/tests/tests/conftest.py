@@ -1,6 +1,7 @@
 """Pytest configuration and fixtures."""
 
 import os
+import tempfile
 import warnings
 
 import pytest
@@ -8,6 +9,8 @@ import pytest
 # Set test mode environment variable BEFORE importing any app modules
 os.environ["VILOAPP_TEST_MODE"] = "1"
 os.environ["VILOAPP_SHOW_CONFIRMATIONS"] = "0"
+# Keep caches created with default paths out of the user's cache dir
+os.environ["XDG_CACHE_HOME"] = tempfile.mkdtemp(prefix="viloapp-test-cache-")
 
 from PySide6.QtWidgets import QApplication
 
@@ -212,6 +212,44 @@ class TestPluginInfrastructure:
         factories = workspace_service.get_widget_factories()
         assert "test.widget" in factories
 
+    def test_hidden_plugin_terminal_suspends_rendering(self, qtbot):
+        """Test that hidden plugin terminals stop rendering but are not suspended."""
+        from PySide6.QtWidgets import QWidget
+
+        from viloapp.core.plugin_system.widget_bridge import PluginWidgetBridge
+        from viloapp.services.workspace_service import WorkspaceService
+        from viloapp.ui.widgets.widget_state import WidgetState
+
+        bridge = PluginWidgetBridge(WorkspaceService())
+        mock_plugin_widget = Mock()
+        mock_plugin_widget.get_widget_id.return_value = "terminal"
+        mock_plugin_widget.get_title.return_value = "Terminal"
+        mock_plugin_widget.get_icon.return_value = "terminal"
+        mock_plugin_widget.get_capabilities.return_value = []
+        mock_plugin_widget.create_instance.return_value = QWidget()
+
+        metadata = bridge._create_app_widget_metadata(mock_plugin_widget, "plugin.test.terminal")
+        assert not metadata.can_suspend
+        assert metadata.can_suspend_rendering
+
+        bridge._plugin_widgets["plugin.test.terminal"] = mock_plugin_widget
+        widget = bridge._create_widget_adapter("plugin.test.terminal", "instance-1")
+        widget.set_metadata(metadata)
+        qtbot.addWidget(widget)
+        widget.initialize()
+        widget.set_ready()
+
+        widget.show()
+        qtbot.waitExposed(widget)
+        widget.hide()
+        assert widget.widget_state == WidgetState.READY
+        assert widget.rendering_suspended
+        mock_plugin_widget.suspend_instance.assert_called_once_with("instance-1")
+
+        widget.show()
+        assert not widget.rendering_suspended
+        mock_plugin_widget.resume_instance.assert_called_once_with("instance-1")
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
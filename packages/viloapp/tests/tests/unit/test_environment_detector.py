@@ -0,0 +1,28 @@
+"""Tests for environment configuration."""
+
+from viloapp.core.environment_detector import apply_renderer_settings, merge_chromium_flags
+
+
+def test_merge_chromium_flags():
+    """Test that renderer flags are added without overriding the user's."""
+    assert merge_chromium_flags("") == "--process-per-site"
+    assert (
+        merge_chromium_flags("--disable-gpu", renderer_process_limit=2)
+        == "--disable-gpu --process-per-site --renderer-process-limit=2"
+    )
+    assert (
+        merge_chromium_flags(
+            "--renderer-process-limit=4", process_per_site=False, renderer_process_limit=2
+        )
+        == "--renderer-process-limit=4"
+    )
+
+
+def test_apply_renderer_settings(monkeypatch):
+    """Test that renderer flags are added to the Chromium flags in the environment."""
+    monkeypatch.setenv("QTWEBENGINE_CHROMIUM_FLAGS", "--disable-gpu")
+
+    flags = apply_renderer_settings(renderer_process_limit=3)
+
+    assert flags == "--disable-gpu --process-per-site --renderer-process-limit=3"
+    assert apply_renderer_settings(renderer_process_limit=3) == flags
@@ -0,0 +1,113 @@
+"""Tests for the persistent plugin discovery cache."""
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from viloapp.core.plugin_system import PluginRegistry
+from viloapp.core.plugin_system.discovery_cache import MISS, DiscoveryCache
+from viloapp.core.plugin_system.plugin_discovery import PluginDiscovery
+
+
+def _write_manifest(plugin_dir, version="1.0.0", activation_events=None):
+    """Write a plugin.json manifest."""
+    plugin_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {
+        "id": plugin_dir.name,
+        "name": plugin_dir.name.title(),
+        "version": version,
+        "description": "Cached plugin",
+        "author": "Test",
+        "activationEvents": activation_events or ["onCommand:cached.run"],
+        "contributes": {"commands": [{"id": "cached.run", "title": "Run"}]},
+    }
+    manifest_path = plugin_dir / "plugin.json"
+    manifest_path.write_text(json.dumps(manifest))
+    return manifest_path
+
+
+@pytest.fixture
+def plugins_dir(tmp_path):
+    """Directory with a single manifest plugin."""
+    directory = tmp_path / "plugins"
+    _write_manifest(directory / "cached")
+    return directory
+
+
+def _discovery(tmp_path):
+    """Create discovery backed by a cache file in tmp_path."""
+    return PluginDiscovery(PluginRegistry(), DiscoveryCache(tmp_path / "cache.json"))
+
+
+def test_warm_discovery_does_not_parse_manifests(tmp_path, plugins_dir):
+    """Test that unchanged manifests are served from the persisted cache."""
+    discovery = _discovery(tmp_path)
+    discovery.discover_from_directory(plugins_dir)
+    discovery.cache.save()
+
+    warm = _discovery(tmp_path)
+    with patch.object(warm, "_load_plugin_manifest") as load_manifest:
+        plugins = warm.discover_from_directory(plugins_dir)
+
+    load_manifest.assert_not_called()
+    assert [p.metadata.id for p in plugins] == ["cached"]
+    assert plugins[0].metadata.activation_events == ["onCommand:cached.run"]
+    assert plugins[0].metadata.contributes["commands"][0]["id"] == "cached.run"
+
+
+def test_cached_results_are_independent(tmp_path, plugins_dir):
+    """Test that each lookup returns a fresh PluginInfo."""
+    discovery = _discovery(tmp_path)
+    first = discovery.discover_from_directory(plugins_dir)[0]
+    first.metadata.activation_events.append("*")
+
+    second = discovery.discover_from_directory(plugins_dir)[0]
+
+    assert second is not first
+    assert second.metadata.activation_events == ["onCommand:cached.run"]
+
+
+def test_changed_manifest_is_reparsed(tmp_path, plugins_dir):
+    """Test that only the changed manifest is parsed again."""
+    _write_manifest(plugins_dir / "other")
+    discovery = _discovery(tmp_path)
+    discovery.discover_from_directory(plugins_dir)
+
+    manifest_path = _write_manifest(plugins_dir / "cached", version="2.0.10")
+    stat = manifest_path.stat()
+    os.utime(manifest_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    original_load = discovery._load_plugin_manifest
+    with patch.object(discovery, "_load_plugin_manifest", side_effect=original_load) as load:
+        plugins = discovery.discover_from_directory(plugins_dir)
+
+    assert [call.args[0] for call in load.call_args_list] == [manifest_path]
+    versions = {p.metadata.id: p.metadata.version for p in plugins}
+    assert versions == {"cached": "2.0.10", "other": "1.0.0"}
+
+
+def test_removed_plugins_are_pruned(tmp_path, plugins_dir):
+    """Test that entries not seen by the last scan are dropped on save."""
+    cache = DiscoveryCache(tmp_path / "cache.json")
+    discovery = PluginDiscovery(PluginRegistry(), cache)
+    discovery.discover_from_directory(plugins_dir)
+    cache.save()
+
+    (plugins_dir / "cached" / "plugin.json").unlink()
+    discovery.discover_from_directory(plugins_dir)
+    cache.save()
+
+    reloaded = DiscoveryCache(tmp_path / "cache.json")
+    key = f"manifest:{plugins_dir / 'cached' / 'plugin.json'}"
+    assert reloaded.get(key) is MISS
+
+
+def test_unreadable_cache_is_ignored(tmp_path, plugins_dir):
+    """Test that a corrupt cache file falls back to a full scan."""
+    (tmp_path / "cache.json").write_text("{not json")
+
+    plugins = _discovery(tmp_path).discover_from_directory(plugins_dir)
+
+    assert [p.metadata.id for p in plugins] == ["cached"]
@@ -0,0 +1,231 @@
+"""Tests for running plugins in a plugin host process."""
+
+import gc
+import multiprocessing
+import os
+import textwrap
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from viloapp_sdk import EventBus, EventType, IService, LifecycleState, PluginEvent, PluginMetadata
+
+from viloapp.core.plugin_system import PluginLoader, PluginRegistry
+from viloapp.core.plugin_system.plugin_host import Channel, HostedPlugin, PluginHostError
+from viloapp.core.plugin_system.plugin_registry import PluginInfo
+from viloapp.core.plugin_system.security import ResourceMonitor
+
+PLUGIN_SOURCE = """
+import os
+
+from viloapp_sdk import EventType, IPlugin, PluginMetadata
+
+
+class HostedTestPlugin(IPlugin):
+    def get_metadata(self):
+        return PluginMetadata(
+            id="hosted-test",
+            name="Hosted Test",
+            version="1.2.3",
+            description="Runs in a plugin host",
+            author="Test",
+        )
+
+    def activate(self, context):
+        self.context = context
+        self.commands = context.get_service("command")
+        self.commands.register_command("hosted.pid", lambda: os.getpid())
+        context.subscribe_event(EventType.CUSTOM, self.on_event)
+        context.emit_event(EventType.CUSTOM, {"ready": True})
+
+    def on_event(self, event):
+        if "value" in event.data:
+            self.commands.execute_command("echo", value=event.data["value"] * 2)
+
+    def deactivate(self):
+        self.commands.unregister_command("hosted.pid")
+"""
+
+
+class RecordingCommandService(IService):
+    """Command service that records what the plugin does."""
+
+    def __init__(self):
+        self.handlers = {}
+        self.executed = []
+
+    def get_service_id(self):
+        return "command"
+
+    def get_service_version(self):
+        return "1.0.0"
+
+    def register_command(self, command_id, handler):
+        self.handlers[command_id] = handler
+
+    def unregister_command(self, command_id):
+        del self.handlers[command_id]
+
+    def execute_command(self, command_id, **kwargs):
+        self.executed.append((command_id, kwargs))
+
+
+def _pump(host, predicate, timeout=10.0):
+    """Serve the host's messages until predicate is true."""
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        host.process_messages(timeout=0.1)
+    assert predicate()
+
+
+@pytest.fixture
+def hosted(tmp_path):
+    """Loader with a plugin that runs in a plugin host."""
+    plugin_dir = tmp_path / "hosted_test"
+    plugin_dir.mkdir()
+    (plugin_dir / "plugin.py").write_text(textwrap.dedent(PLUGIN_SOURCE))
+
+    registry = PluginRegistry()
+    metadata = PluginMetadata(
+        id="hosted-test", name="Hosted Test", version="0.0.0", description="", author=""
+    )
+    registry.register(PluginInfo(metadata=metadata, path=Path(plugin_dir)))
+
+    event_bus = EventBus()
+    commands = RecordingCommandService()
+    loader = PluginLoader(registry, event_bus, {"command": commands})
+    loader.set_process_group("hosted-test", "test-group")
+    yield loader, event_bus, commands
+    loader.shutdown_hosts()
+
+
+def test_plugin_runs_in_host_process(hosted):
+    """Test that a hosted plugin uses host services and events across processes."""
+    loader, event_bus, commands = hosted
+    received = []
+    event_bus.subscribe(EventType.CUSTOM, received.append)
+
+    assert loader.load_plugin("hosted-test")
+    plugin_info = loader.registry.get_plugin("hosted-test")
+    assert isinstance(plugin_info.instance, HostedPlugin)
+    assert plugin_info.metadata.version == "1.2.3"
+
+    pid = loader.get_process_id("hosted-test")
+    assert pid and pid != os.getpid()
+    assert ResourceMonitor("hosted-test", process_id=pid)._process.pid == pid
+
+    # Activation returns at once and completes from the host's messages
+    assert loader.activate_plugin("hosted-test")
+    host = loader.hosts["test-group"]
+    _pump(host, lambda: received)
+    # The handler registered by the plugin runs in the host
+    assert commands.handlers["hosted.pid"]() == pid
+    assert received[0].source == "hosted-test" and received[0].data == {"ready": True}
+
+    # Events the plugin subscribed to reach it, and it calls back
+    event_bus.emit(PluginEvent(type=EventType.CUSTOM, source="test", data={"value": 21}))
+    _pump(host, lambda: commands.executed)
+    assert commands.executed == [("echo", {"value": 42})]
+
+    assert loader.deactivate_plugin("hosted-test")
+    assert "hosted.pid" not in commands.handlers
+    assert loader.unload_plugin("hosted-test")
+    assert plugin_info.state == LifecycleState.UNLOADED
+    assert "test-group" not in loader.hosts
+    assert not host.is_running()
+
+
+def test_host_errors_reach_caller(hosted):
+    """Test that failures inside and of the host are reported to the app."""
+    loader, _, commands = hosted
+    assert loader.load_plugin("hosted-test")
+    assert loader.activate_plugin("hosted-test")
+    host = loader.hosts["test-group"]
+    _pump(host, lambda: "hosted.pid" in commands.handlers)
+
+    with pytest.raises(PluginHostError):
+        host.call_plugin("missing-plugin", "deactivate")
+
+    host.process.kill()
+    host.process.join()
+    with pytest.raises(PluginHostError):
+        commands.handlers["hosted.pid"]()
+    assert not host.is_running()
+
+
+def test_failed_activation_marks_plugin_failed(hosted):
+    """Test that an activation failing in the host is recorded once it replies."""
+    loader, _, commands = hosted
+    commands.register_command = None
+    assert loader.load_plugin("hosted-test")
+
+    assert loader.activate_plugin("hosted-test")
+    plugin_info = loader.registry.get_plugin("hosted-test")
+    _pump(loader.hosts["test-group"], lambda: plugin_info.state == LifecycleState.FAILED)
+    assert plugin_info.error
+
+
+@pytest.fixture
+def channels():
+    """Two ends of a channel, the second served by a thread."""
+    left_end, right_end = multiprocessing.Pipe()
+    stored = []
+
+    def handle(target, method, args, kwargs):
+        if method == "store":
+            stored.append(args[0])
+        elif method == "drop":
+            stored.clear()
+            gc.collect()
+        elif method == "echo":
+            return args[0]
+        return None
+
+    left = Channel(left_end, lambda *args: None)
+    right = Channel(right_end, handle)
+    stop = threading.Event()
+
+    def serve():
+        while not stop.is_set():
+            right.process_pending(0.01)
+
+    server = threading.Thread(target=serve)
+    server.start()
+    yield left, right
+    stop.set()
+    server.join()
+
+
+def test_channel_encodes_callables_in_containers(channels):
+    """Test that callables nested in lists and dicts cross both ways."""
+    left, _ = channels
+
+    result = left.call(("test",), "echo", {"items": [lambda: "called"]})
+
+    assert result["items"][0]() == "called"
+
+
+def test_channel_releases_dropped_callbacks(channels):
+    """Test that callables the other side no longer holds are released."""
+    left, _ = channels
+
+    left.call(("test",), "store", lambda: None)
+    assert len(left._callbacks) == 1
+    # Released ahead of the reply
+    left.call(("test",), "drop")
+
+    assert left._callbacks == {}
+
+
+def test_channel_async_call_times_out():
+    """Test that an asynchronous call without a reply fails after its timeout."""
+    left_end, _right_end = multiprocessing.Pipe()
+    channel = Channel(left_end, lambda *args: None)
+
+    future = channel.call_async(("plugin", "slow"), "activate", (), timeout=0.01)
+    time.sleep(0.02)
+    channel.process_pending()
+
+    with pytest.raises(PluginHostError):
+        future.result(0)
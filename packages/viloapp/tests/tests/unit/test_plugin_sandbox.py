@@ -2,6 +2,8 @@
 
 from unittest.mock import Mock, patch
 
+import pytest
+
 
 def test_plugin_sandbox_creation():
     """Test PluginSandbox creation."""
@@ -302,3 +304,60 @@ def test_plugin_sandbox_context_manager():
 
     # Cleanup should be called automatically
     assert cleanup_called
+
+
+def test_plugin_telemetry_ring_and_counters():
+    """Test that telemetry keeps recent operations bounded and counts everything."""
+    import threading
+
+    from viloapp.core.plugin_system.security import PluginTelemetry
+
+    telemetry = PluginTelemetry(capacity=8)
+
+    def record(thread_index):
+        for i in range(100):
+            telemetry.record("call", f"service-{thread_index}", success=i % 10 != 0, duration=0.001)
+
+    threads = [threading.Thread(target=record, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Finished threads leave their most recent operations in one shared ring
+    assert len(telemetry.recent()) == 8
+    assert len(telemetry._buffers) == 0
+    assert len(telemetry.recent(limit=5)) == 5
+    assert telemetry.operation_count == 400
+
+    summary = telemetry.summary()["call"]
+    assert summary["count"] == 400
+    assert summary["failures"] == 40
+    assert summary["average_duration"] == pytest.approx(0.001)
+    assert sum(summary["histogram"]) == 400
+    assert summary["targets"]["service-2"]["count"] == 100
+
+    telemetry.clear()
+    assert telemetry.recent() == []
+    assert telemetry.summary() == {}
+    telemetry.record("call", "service-0")
+    assert telemetry.operation_count == 1
+
+
+def test_plugin_telemetry_bounded_after_threads_exit():
+    """Test that buffers of finished recording threads are released."""
+    import threading
+
+    from viloapp.core.plugin_system.security import PluginTelemetry
+
+    telemetry = PluginTelemetry(capacity=16)
+
+    for _ in range(200):
+        thread = threading.Thread(target=telemetry.record, args=("call", "service"))
+        thread.start()
+        thread.join()
+
+    assert len(telemetry._buffers) == 0
+    assert len(telemetry.recent()) == 16
+    assert telemetry.operation_count == 200
+    assert telemetry.summary()["call"]["count"] == 200
@@ -207,6 +207,70 @@ def test_permission_manager_wildcard_resources():
     )
 
 
+def test_permission_matcher_agrees_with_permissions():
+    """Test that compiled matchers give the same answers as each permission."""
+    from viloapp.core.plugin_system.security import (
+        Permission,
+        PermissionCategory,
+        PermissionManager,
+        PermissionScope,
+    )
+
+    resources = ["/tmp/*", "/home/user/project", "*.log", "/data/[ab]?", "/srv/", "config"]
+    paths = [
+        "/tmp",
+        "/tmp/",
+        "/tmp/a/b.txt",
+        "/home/user/project",
+        "/home/user/project/src/x.py",
+        "/home/user/projects",
+        "/var/log/app.log",
+        "/data/a1",
+        "/data/c1",
+        "/srv/x",
+        "/srv//x",
+        "config",
+        "configs",
+        "",
+    ]
+
+    for category in (PermissionCategory.FILESYSTEM, PermissionCategory.SYSTEM):
+        manager = PermissionManager()
+        permissions = [Permission(category, PermissionScope.READ, r) for r in resources]
+        manager.set_plugin_permissions("test-plugin", permissions)
+        for path in paths:
+            expected = any(permission.matches_resource(path) for permission in permissions)
+            assert manager.can_access("test-plugin", category, PermissionScope.READ, path) == (
+                expected
+            ), (category, path)
+
+
+def test_permission_decisions_follow_grant_and_revoke():
+    """Test that cached decisions are dropped when permissions change."""
+    from viloapp.core.plugin_system.security import (
+        Permission,
+        PermissionCategory,
+        PermissionManager,
+        PermissionScope,
+    )
+
+    manager = PermissionManager()
+    permission = Permission(PermissionCategory.FILESYSTEM, PermissionScope.WRITE, "/work")
+    args = ("test-plugin", PermissionCategory.FILESYSTEM, PermissionScope.WRITE, "/work/a.txt")
+
+    assert not manager.can_access(*args)
+    manager.grant_permission("test-plugin", permission)
+    assert manager.can_access(*args)
+    assert manager.can_access(*args)
+    manager.revoke_permission("test-plugin", permission)
+    assert not manager.can_access(*args)
+
+    manager.load_configuration(
+        {"test-plugin": [{"category": "filesystem", "scope": "write", "resource": "/work"}]}
+    )
+    assert manager.can_access(*args)
+
+
 def test_permission_categories():
     """Test all permission categories are available."""
     from viloapp.core.plugin_system.security import PermissionCategory
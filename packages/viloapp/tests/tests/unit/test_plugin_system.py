@@ -4,9 +4,10 @@ from pathlib import Path
 from unittest.mock import Mock
 
 import pytest
-from viloapp_sdk import EventBus, IPlugin, PluginMetadata
+from viloapp_sdk import EventBus, IPlugin, LifecycleState, PluginMetadata
 
 from viloapp.core.plugin_system import PluginManager, PluginRegistry
+from viloapp.core.plugin_system.discovery_cache import DiscoveryCache
 
 
 class TestPlugin(IPlugin):
@@ -33,11 +34,11 @@ class TestPlugin(IPlugin):
 
 
 @pytest.fixture
-def plugin_manager():
+def plugin_manager(tmp_path):
     """Create plugin manager for testing."""
     event_bus = EventBus()
     services = {"command": Mock(), "configuration": Mock(), "workspace": Mock()}
-    return PluginManager(event_bus, services)
+    return PluginManager(event_bus, services, DiscoveryCache(tmp_path / "plugin_discovery.json"))
 
 
 def test_plugin_discovery(plugin_manager):
@@ -134,3 +135,243 @@ def test_dependency_resolution():
     # Check load order (A should come before B)
     assert load_order.index("plugin-a") < load_order.index("plugin-b")
     assert len(unmet) == 0
+
+
+def _lazy_plugin_info(plugin_id, activation_events, contributes=None, dependencies=None):
+    """Create discovered plugin info as read from a manifest."""
+    from viloapp.core.plugin_system.plugin_registry import PluginInfo
+
+    return PluginInfo(
+        metadata=PluginMetadata(
+            id=plugin_id,
+            name=plugin_id,
+            version="1.0.0",
+            description="Lazy",
+            author="Test",
+            dependencies=dependencies or [],
+            activation_events=activation_events,
+            contributes=contributes or {},
+        ),
+        path=Path(plugin_id),
+        state=LifecycleState.DISCOVERED,
+    )
+
+
+@pytest.fixture
+def lazy_manager(plugin_manager):
+    """Plugin manager whose loader only records state transitions."""
+    from viloapp.core.commands.registry import command_registry
+
+    activated = []
+
+    def load(plugin_id):
+        plugin_manager.registry.set_instance(plugin_id, Mock())
+        plugin_manager.registry.update_state(plugin_id, LifecycleState.LOADED)
+        return True
+
+    def activate(plugin_id):
+        plugin_manager.registry.update_state(plugin_id, LifecycleState.ACTIVATED)
+        activated.append(plugin_id)
+        return True
+
+    def load_all(plugin_ids, dependencies=None):
+        return {plugin_id: load(plugin_id) for plugin_id in plugin_ids}
+
+    plugin_manager.loader.load_plugin = Mock(side_effect=load)
+    plugin_manager.loader.load_plugins = Mock(side_effect=load_all)
+    plugin_manager.loader.activate_plugin = Mock(side_effect=activate)
+    plugin_manager.activated = activated
+    yield plugin_manager
+
+    for command_id in list(plugin_manager._command_stubs):
+        command_registry.unregister(command_id)
+
+
+def test_plugins_not_loaded_until_activation_event(lazy_manager):
+    """Test that only startup plugins are loaded during initialization."""
+    lazy_manager.discovery.discover_all = Mock(
+        return_value=[
+            _lazy_plugin_info("eager", ["*"]),
+            _lazy_plugin_info("lazy", ["onCommand:lazy.run"]),
+        ]
+    )
+
+    assert lazy_manager.initialize()
+    assert lazy_manager.activated == ["eager"]
+
+    assert lazy_manager.fire_activation_event("onCommand:lazy.run") == ["lazy"]
+    assert lazy_manager.fire_activation_event("onCommand:lazy.run") == []
+
+
+def test_activation_loads_dependencies_first(lazy_manager):
+    """Test that plugin dependencies are activated before the plugin."""
+    lazy_manager.discovery.discover_all = Mock(
+        return_value=[
+            _lazy_plugin_info("child", ["onStartupFinished"], dependencies=["base@>=1.0.0"]),
+            _lazy_plugin_info("base", []),
+        ]
+    )
+    lazy_manager.initialize()
+
+    lazy_manager.fire_activation_event("onStartupFinished")
+
+    assert lazy_manager.activated == ["base", "child"]
+
+
+def test_contributed_command_activates_plugin(lazy_manager):
+    """Test that a manifest command stub activates its plugin and runs the real command."""
+    from viloapp.core.commands.base import CommandContext, CommandStatus, FunctionCommand
+    from viloapp.core.commands.registry import command_registry
+
+    lazy_manager.discovery.discover_all = Mock(
+        return_value=[
+            _lazy_plugin_info(
+                "lazy",
+                ["onCommand:lazy.run"],
+                contributes={"commands": [{"id": "lazy.run", "title": "Run", "category": "Lazy"}]},
+            )
+        ]
+    )
+    lazy_manager.initialize()
+
+    stub = command_registry.get_command("lazy.run")
+    assert stub is not None
+    assert lazy_manager.activated == []
+
+    real_command = FunctionCommand(
+        id="lazy.run", title="Run", category="Lazy", handler=lambda context: "ran"
+    )
+
+    def activate(plugin_id):
+        command_registry.register(real_command)
+        lazy_manager.registry.update_state(plugin_id, LifecycleState.ACTIVATED)
+        return True
+
+    lazy_manager.loader.activate_plugin.side_effect = activate
+
+    try:
+        result = stub.execute(CommandContext())
+        assert result.status == CommandStatus.SUCCESS
+        assert result.data == {"value": "ran"}
+    finally:
+        command_registry.unregister("lazy.run")
+
+
+def test_lazy_widget_activates_plugin_on_create(lazy_manager, qapp):
+    """Test that placeholder widgets activate the plugin on first use."""
+    lazy_manager.discovery.discover_all = Mock(
+        return_value=[
+            _lazy_plugin_info(
+                "lazy",
+                ["onWidget:lazy-view"],
+                contributes={"widgets": [{"id": "lazy-view", "title": "Lazy View"}]},
+            )
+        ]
+    )
+    lazy_manager.initialize()
+
+    bridge = Mock()
+    lazy_manager.register_widgets(bridge)
+    lazy_widget, plugin_id = bridge.register_plugin_widget.call_args.args
+
+    assert plugin_id == "lazy"
+    assert lazy_widget.get_widget_id() == "lazy-view"
+    assert lazy_widget.get_title() == "Lazy View"
+    assert lazy_manager.activated == []
+
+    lazy_widget.create_instance("instance-1")
+
+    assert lazy_manager.activated == ["lazy"]
+    widget_factory = lazy_manager.get_plugin("lazy").widget_factory
+    widget_factory.create_instance.assert_called_once_with("instance-1")
+
+
+class _ThreadRecordingPlugin(TestPlugin):
+    """Plugin that records the thread it was created on."""
+
+    def __init__(self):
+        super().__init__()
+        import threading
+
+        self.thread = threading.current_thread()
+
+
+def test_load_plugins_imports_concurrently_in_dependency_order(plugin_manager):
+    """Test that independent imports overlap and dependents wait for their dependencies."""
+    import threading
+    import time
+
+    for plugin_id in ("base", "left", "right"):
+        plugin_manager.registry.register(_lazy_plugin_info(plugin_id, []))
+
+    events = []
+    lock = threading.Lock()
+
+    def import_plugin_class(plugin_info):
+        plugin_id = plugin_info.metadata.id
+        with lock:
+            events.append(("start", plugin_id))
+        time.sleep(0.05)
+        with lock:
+            events.append(("end", plugin_id))
+        return _ThreadRecordingPlugin, 50.0
+
+    plugin_manager.loader._import_plugin_class = import_plugin_class
+
+    results = plugin_manager.loader.load_plugins(
+        ["left", "right", "base"], {"left": {"base"}, "right": {"base"}, "base": set()}
+    )
+
+    assert results == {"base": True, "left": True, "right": True}
+    assert events.index(("end", "base")) < events.index(("start", "left"))
+    assert events.index(("end", "base")) < events.index(("start", "right"))
+    # left and right are imported at the same time
+    assert events.index(("start", "right")) < events.index(("end", "left"))
+    assert events.index(("start", "left")) < events.index(("end", "right"))
+
+    for plugin_id in results:
+        instance = plugin_manager.get_plugin(plugin_id)
+        assert instance.thread is threading.main_thread()
+        assert plugin_manager.get_load_timings()[plugin_id]["import_ms"] == 50.0
+
+
+def test_load_plugins_fails_dependents_of_failed_plugin(plugin_manager):
+    """Test that a failed import fails the plugins depending on it."""
+    for plugin_id in ("base", "child", "other"):
+        plugin_manager.registry.register(_lazy_plugin_info(plugin_id, []))
+
+    def import_plugin_class(plugin_info):
+        if plugin_info.metadata.id == "base":
+            raise ImportError("broken")
+        return TestPlugin, 1.0
+
+    plugin_manager.loader._import_plugin_class = import_plugin_class
+
+    results = plugin_manager.loader.load_plugins(["base", "child", "other"], {"child": {"base"}})
+
+    assert results == {"base": False, "child": False, "other": True}
+    assert plugin_manager.registry.get_plugin("child").state == LifecycleState.FAILED
+
+
+def test_load_plugins_imports_widget_plugins_on_calling_thread(plugin_manager):
+    """Test that plugins contributing widgets are not imported on the import threads."""
+    import threading
+
+    plugin_manager.registry.register(
+        _lazy_plugin_info("view", [], contributes={"widgets": [{"id": "view"}]})
+    )
+    plugin_manager.registry.register(_lazy_plugin_info("plain", []))
+
+    import_threads = {}
+
+    def import_plugin_class(plugin_info):
+        import_threads[plugin_info.metadata.id] = threading.current_thread()
+        return TestPlugin, 1.0
+
+    plugin_manager.loader._import_plugin_class = import_plugin_class
+
+    results = plugin_manager.loader.load_plugins(["view", "plain"])
+
+    assert results == {"view": True, "plain": True}
+    assert import_threads["view"] is threading.main_thread()
+    assert import_threads["plain"] is not threading.main_thread()
@@ -4,6 +4,8 @@ import threading
 import time
 from unittest.mock import Mock, patch
 
+import pytest
+
 
 def test_resource_type_enum():
     """Test ResourceType enumeration."""
@@ -308,16 +310,12 @@ def test_resource_average_calculation():
 
     monitor = ResourceMonitor(plugin_id="test-plugin")
 
-    # Mock some usage history
-    mock_history = [
-        {"timestamp": time.time(), "usage": 100},
-        {"timestamp": time.time(), "usage": 200},
-        {"timestamp": time.time(), "usage": 300},
-    ]
+    # Record some usage history
+    for usage in (100, 200, 300):
+        monitor._history.append(time.time(), {ResourceType.MEMORY: usage})
 
-    with patch.object(monitor, "get_usage_history", return_value=mock_history):
-        average = monitor.get_average_usage(ResourceType.MEMORY)
-        assert average == 200  # (100 + 200 + 300) / 3
+    average = monitor.get_average_usage(ResourceType.MEMORY)
+    assert average == 200  # (100 + 200 + 300) / 3
 
 
 def test_resource_peak_usage():
@@ -326,16 +324,63 @@ def test_resource_peak_usage():
 
     monitor = ResourceMonitor(plugin_id="test-plugin")
 
-    # Mock some usage history
-    mock_history = [
-        {"timestamp": time.time(), "usage": 100},
-        {"timestamp": time.time(), "usage": 300},
-        {"timestamp": time.time(), "usage": 200},
+    # Record some usage history
+    for usage in (100, 300, 200):
+        monitor._history.append(time.time(), {ResourceType.MEMORY: usage})
+
+    peak = monitor.get_peak_usage(ResourceType.MEMORY)
+    assert peak == 300  # Maximum usage
+
+
+def test_usage_history_aggregates_follow_eviction():
+    """Test that running averages and peaks forget evicted samples."""
+    from viloapp.core.plugin_system.security import ResourceType
+    from viloapp.core.plugin_system.security.resources import UsageHistory
+
+    history = UsageHistory(capacity=3)
+    for timestamp, usage in enumerate([500, 100, 200, 300, 50]):
+        history.append(float(timestamp), {ResourceType.CPU: usage})
+
+    assert len(history) == 3
+    assert [entry["usage"] for entry in history.entries(ResourceType.CPU)] == [200, 300, 50]
+    assert history.average(ResourceType.CPU) == pytest.approx((200 + 300 + 50) / 3)
+    assert history.peak(ResourceType.CPU) == 300
+    assert history.latest(ResourceType.CPU) == 50
+
+    # Windows start at the first sample taken at or after the cutoff
+    assert history.average(ResourceType.CPU, since=3.0) == pytest.approx(175)
+    assert history.peak(ResourceType.CPU, since=4.0) == 50
+    assert history.peak(ResourceType.CPU, since=5.0) == 0.0
+
+
+def test_monitors_share_one_sampler_thread():
+    """Test that many monitors are sampled by a single thread."""
+    from viloapp.core.plugin_system.security import ResourceMonitor, ResourceType
+
+    monitors = [
+        ResourceMonitor(plugin_id=f"plugin-{i}", collection_interval=0.05) for i in range(30)
     ]
+    for monitor in monitors:
+        monitor.start_monitoring()
+
+    try:
+        samplers = [t for t in threading.enumerate() if t.name == "ResourceSampler"]
+        assert len(samplers) == 1
+        assert not [t for t in threading.enumerate() if t.name.startswith("ResourceMonitor")]
 
-    with patch.object(monitor, "get_usage_history", return_value=mock_history):
-        peak = monitor.get_peak_usage(ResourceType.MEMORY)
-        assert peak == 300  # Maximum usage
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if all(len(m.get_usage_history(ResourceType.MEMORY)) >= 2 for m in monitors):
+                break
+            time.sleep(0.05)
+        # In-process plugins share the app process and one read per tick
+        assert all(m.get_resource_usage(ResourceType.MEMORY) > 0 for m in monitors)
+        assert len({m._process for m in monitors}) == 1
+    finally:
+        for monitor in monitors:
+            monitor.stop_monitoring()
+
+    assert not any(monitor.is_monitoring() for monitor in monitors)
 
 
 def test_resource_limiter_dynamic_limits():
@@ -383,3 +428,63 @@ def test_resource_monitor_thread_safety():
         assert result >= 0
 
     monitor.stop_monitoring()
+
+
+def test_sampler_reports_violation_once_without_lock():
+    """Test that a violation in a sample is reported once, outside the sampler lock."""
+    from viloapp.core.plugin_system.security import ResourceLimiter, ResourceMonitor, ResourceType
+
+    stopped = threading.Event()
+
+    def stop_monitoring(violation):
+        # Stopping from another thread needs the sampler lock
+        thread = threading.Thread(target=monitor.stop_monitoring)
+        thread.start()
+        thread.join(timeout=2)
+        if not thread.is_alive():
+            stopped.set()
+
+    violation_callback = Mock(side_effect=stop_monitoring)
+    limiter = ResourceLimiter(
+        plugin_id="test-plugin",
+        limits={ResourceType.MEMORY: 1024},
+        violation_callback=violation_callback,
+    )
+    monitor = ResourceMonitor(plugin_id="test-plugin", resource_limiter=limiter)
+
+    with patch.object(limiter, "_get_current_usage") as get_current_usage:
+        monitor.start_monitoring()
+        assert stopped.wait(timeout=5)
+
+    violation_callback.assert_called_once()
+    # The sampled usage is checked rather than a new read
+    get_current_usage.assert_not_called()
+    assert violation_callback.call_args.args[0].current_usage == monitor.get_resource_usage(
+        ResourceType.MEMORY
+    )
+
+
+def test_sampler_drops_monitors_of_exited_process():
+    """Test that monitors of a process that exited stop being sampled."""
+    import subprocess
+    import sys
+
+    from viloapp.core.plugin_system.security import ResourceMonitor
+
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        monitor = ResourceMonitor(
+            plugin_id="hosted-plugin", collection_interval=0.05, process_id=process.pid
+        )
+        monitor.start_monitoring()
+        assert monitor.is_monitoring()
+    finally:
+        process.kill()
+        process.wait()
+
+    deadline = time.monotonic() + 5
+    while monitor.is_monitoring() and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert not monitor.is_monitoring()
+    assert process.pid not in monitor._sampler._processes
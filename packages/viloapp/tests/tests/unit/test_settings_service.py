@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the SettingsService store.
+
+Tests per-key validation, copy-on-write snapshots, debounced persistence,
+key-path subscriptions and typed accessors.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from viloapp.core.settings.accessors import coerce_setting, split_key_path
+from viloapp.core.settings.schema import SettingsSchema
+from viloapp.core.settings.service import SettingsService
+
+
+@pytest.fixture
+def service(qapp):
+    """Create a settings service with a mocked StateService."""
+    settings_service = SettingsService()
+    settings_service._state_service = MagicMock()
+    yield settings_service
+    settings_service._save_timer.stop()
+
+
+class TestPerKeyValidation:
+    """Test compiled per-key schema validators."""
+
+    def test_valid_key(self):
+        """Test that a valid value passes."""
+        schema = SettingsSchema()
+        assert schema.validate_key("theme", "font_size", 14) == (True, [])
+
+    def test_out_of_range_value(self):
+        """Test that range constraints are enforced."""
+        is_valid, errors = SettingsSchema().validate_key("theme", "font_size", 4)
+        assert is_valid is False
+        assert "font_size" in errors[0]
+
+    def test_bool_is_not_integer(self):
+        """Test that booleans are rejected for integer settings."""
+        is_valid, _ = SettingsSchema().validate_key("terminal", "font_size", True)
+        assert is_valid is False
+
+    def test_unknown_key_rejected(self):
+        """Test that additionalProperties=False rejects unknown keys."""
+        is_valid, _ = SettingsSchema().validate_key("ui", "not_a_setting", 1)
+        assert is_valid is False
+
+    def test_array_items_validated(self):
+        """Test that array items are validated."""
+        schema = SettingsSchema()
+        assert schema.validate_key("editor", "rulers", [80, 120])[0] is True
+        assert schema.validate_key("editor", "rulers", [80, 0])[0] is False
+
+    def test_keyboard_chords_accepted(self):
+        """Test that chord and named-key shortcuts match the schema."""
+        schema = SettingsSchema()
+        assert schema.validate_key("keyboard_shortcuts", "file.saveAll", "ctrl+k s")[0]
+        assert schema.validate_key("keyboard_shortcuts", "view.fullScreen", "f11")[0]
+
+    def test_unknown_category(self):
+        """Test that unknown categories are rejected."""
+        assert SettingsSchema().validate_key("nope", "key", 1)[0] is False
+
+
+class TestCopyOnWrite:
+    """Test snapshot isolation."""
+
+    def test_snapshot_not_affected_by_later_writes(self, service):
+        """Test that a snapshot keeps the values it was taken with."""
+        snapshot = service.snapshot()
+        old_font_size = snapshot["theme"]["font_size"]
+
+        assert service.set("theme", "font_size", 20)
+
+        assert snapshot["theme"]["font_size"] == old_font_size
+        assert service.get("theme", "font_size") == 20
+
+    def test_write_copies_only_touched_category(self, service):
+        """Test that untouched categories are shared with the snapshot."""
+        snapshot = service.snapshot()
+        service.set("theme", "font_size", 20)
+        after = service.snapshot()
+
+        assert after["theme"] is not snapshot["theme"]
+        assert after["terminal"] is snapshot["terminal"]
+
+    def test_snapshot_is_read_only(self, service):
+        """Test that the snapshot cannot be modified."""
+        with pytest.raises(TypeError):
+            service.snapshot()["theme"] = {}
+
+    def test_get_all_returns_independent_copy(self, service):
+        """Test that mutating get_all output does not affect the store."""
+        all_settings = service.get_all()
+        all_settings["theme"]["font_size"] = 30
+        assert service.get("theme", "font_size") != 30
+
+
+class TestUpdates:
+    """Test set/update semantics and notifications."""
+
+    def test_invalid_set_rejected(self, service):
+        """Test that invalid values are not stored."""
+        old_value = service.get("theme", "font_size")
+        assert service.set("theme", "font_size", 1000) is False
+        assert service.get("theme", "font_size") == old_value
+
+    def test_update_is_all_or_nothing(self, service):
+        """Test that one invalid key rejects the whole update."""
+        old_value = service.get("terminal", "font_size")
+        assert service.update("terminal", {"font_size": 16, "shell": "nope"}) is False
+        assert service.get("terminal", "font_size") == old_value
+
+    def test_update_notifies_only_changed_keys(self, service):
+        """Test that unchanged keys do not emit change signals."""
+        changes = []
+        service.setting_changed.connect(lambda c, k, v: changes.append((c, k, v)))
+
+        current_shell = service.get("terminal", "shell")
+        service.update("terminal", {"shell": current_shell, "font_size": 17})
+
+        assert changes == [("terminal", "font_size", 17)]
+
+    def test_set_category_validates_changed_keys(self, service):
+        """Test that set_category rejects invalid changed keys."""
+        category = service.get_category("theme")
+        category["font_size"] = 3
+        assert service.set_category("theme", category) is False
+
+
+class TestDebouncedPersistence:
+    """Test that saving is debounced and batched."""
+
+    def test_set_does_not_save_immediately(self, service):
+        """Test that changes are persisted later, not synchronously."""
+        service.set("theme", "font_size", 15)
+        service._state_service.save_preference.assert_not_called()
+        assert service._save_timer.isActive()
+
+    def test_flush_saves_only_dirty_categories(self, service):
+        """Test that only changed categories are written."""
+        service.set("theme", "font_size", 15)
+        service.set("terminal", "font_size", 15)
+        service.set("theme", "font_size", 16)
+
+        service._flush_pending_save()
+
+        saved_keys = {
+            call.args[0] for call in service._state_service.save_preference.call_args_list
+        }
+        assert saved_keys == {"settings.theme", "settings.terminal"}
+
+    def test_batch_defers_save_until_exit(self, service):
+        """Test that the save timer only starts after the batch completes."""
+        with service.batch():
+            service.set("theme", "font_size", 15)
+            assert not service._save_timer.isActive()
+        assert service._save_timer.isActive()
+
+    def test_cleanup_flushes_pending_changes(self, service):
+        """Test that pending changes are written on cleanup."""
+        state_service = service._state_service
+        service.set("theme", "font_size", 15)
+        service.cleanup()
+        state_service.save_preference.assert_called()
+
+
+class TestKeyPathSubscriptions:
+    """Test key-path based change dispatch."""
+
+    def test_split_key_path(self):
+        """Test splitting paths into category and key."""
+        assert split_key_path("terminal.font_size") == ("terminal", "font_size")
+        assert split_key_path("terminal.shell.linux") == ("terminal", "shell.linux")
+        with pytest.raises(ValueError):
+            split_key_path("terminal")
+
+    def test_get_and_set_path(self, service):
+        """Test reading and writing by key path."""
+        assert service.set_path("terminal.font_size", 18)
+        assert service.get_path("terminal.font_size") == 18
+        assert service.get_path("invalid", "fallback") == "fallback"
+
+    def test_only_matching_path_notified(self, service):
+        """Test that listeners of other paths are not called."""
+        font_calls, theme_calls = [], []
+        service.subscribe("terminal.font_size", font_calls.append)
+        service.subscribe("theme.theme", theme_calls.append)
+
+        service.set("terminal", "font_size", 19)
+
+        assert font_calls == [19]
+        assert theme_calls == []
+
+    def test_category_wildcard(self, service):
+        """Test that category wildcards receive all keys of the category."""
+        calls = []
+        service.subscribe("terminal.*", calls.append)
+
+        service.update("terminal", {"font_size": 19, "cursor_blink": False})
+
+        assert sorted(calls, key=str) == sorted([19, False], key=str)
+
+    def test_unsubscribe(self, service):
+        """Test that the returned function removes the subscription."""
+        calls = []
+        unsubscribe = service.subscribe("terminal.font_size", calls.append)
+        unsubscribe()
+
+        service.set("terminal", "font_size", 19)
+
+        assert calls == []
+
+    def test_reset_notifies_changed_keys(self, service):
+        """Test that reset notifies listeners of keys it changed."""
+        calls = []
+        service.set("terminal", "font_size", 19)
+        service.subscribe("terminal.font_size", calls.append)
+
+        service.reset(["terminal"])
+
+        assert calls == [service.get("terminal", "font_size")]
+
+
+class TestSettingAccessor:
+    """Test typed cached accessors."""
+
+    def test_accessor_tracks_changes(self, service):
+        """Test that the cached value follows the setting."""
+        font_size = service.accessor("terminal.font_size", int, 14)
+        service.set("terminal", "font_size", 21)
+        assert font_size.value == 21
+        assert font_size() == 21
+
+    def test_accessor_default_for_missing(self, service):
+        """Test that missing settings use the default."""
+        accessor = service.accessor("terminal.missing_key", str, "fallback")
+        assert accessor.value == "fallback"
+
+    def test_closed_accessor_stops_tracking(self, service):
+        """Test that close() unsubscribes the accessor."""
+        font_size = service.accessor("terminal.font_size", int, 14)
+        old_value = font_size.value
+        font_size.close()
+
+        service.set("terminal", "font_size", old_value + 1)
+
+        assert font_size.value == old_value
+
+    def test_coerce_setting(self):
+        """Test coercion of raw QSettings values."""
+        assert coerce_setting("true", bool, False) is True
+        assert coerce_setting("off", bool, True) is False
+        assert coerce_setting("12", int, 0) == 12
+        assert coerce_setting("abc", int, 7) == 7
+        assert coerce_setting(None, str, "x") == "x"
+        assert coerce_setting(True, int, 3) == 1
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Unit tests for ThemeProvider.
+
+Tests the application stylesheet and incremental regeneration on theme changes.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from PySide6.QtWidgets import QLineEdit, QWidget
+
+from viloapp.core.themes.theme_bundle import ThemeBundleCache
+from viloapp.services.theme_service import ThemeService
+from viloapp.ui.themes.stylesheet_generator import SCOPE_PROPERTY, TYPOGRAPHY, scope_stylesheet
+from viloapp.ui.themes.theme_provider import ThemeProvider
+
+
+class TestThemeProvider:
+    """Unit tests for ThemeProvider stylesheet handling."""
+
+    @pytest.fixture
+    def theme_service(self, tmp_path):
+        """Create an initialized ThemeService with its own theme bundle."""
+        service = ThemeService(ThemeBundleCache(tmp_path / "theme_bundle.json"))
+        service.initialize({"main_window": None})
+        return service
+
+    @pytest.fixture
+    def provider(self, qapp, theme_service):
+        """Create a ThemeProvider and restore the application stylesheet afterwards."""
+        provider = ThemeProvider(theme_service)
+        yield provider
+        qapp.setStyleSheet("")
+
+    def test_dependencies_are_recorded(self, provider):
+        """Test that the generator records the theme keys a component reads."""
+        provider.get_stylesheet("status_bar")
+        dependencies = provider._stylesheet_generator.get_dependencies("status_bar")
+
+        assert {"statusBar.background", "statusBar.foreground", TYPOGRAPHY} <= dependencies
+        assert "menu.background" not in dependencies
+
+    def test_only_affected_components_regenerate(self, provider, theme_service):
+        """Test that a color change only regenerates components using that color."""
+        menu = provider.get_stylesheet("menu")
+        status_bar = provider.get_stylesheet("status_bar")
+
+        colors = theme_service.get_colors()
+        colors["statusBar.background"] = "#123456"
+        theme_service.apply_theme_preview(colors)
+
+        assert provider.get_stylesheet("menu") is menu
+        assert provider.get_stylesheet("status_bar") != status_bar
+        assert "#123456" in provider.get_stylesheet("status_bar")
+
+        # Unchanged typography does not invalidate anything
+        provider._on_typography_changed(theme_service.get_typography())
+        assert provider.get_stylesheet("menu") is menu
+
+    def test_style_changed_only_when_regenerated(self, qtbot, provider, theme_service):
+        """Test that widgets are only notified when a stylesheet was regenerated."""
+        provider.get_stylesheet("status_bar")
+        colors = theme_service.get_colors()
+
+        colors["terminal.ansiRed"] = "#123456"
+        with qtbot.assertNotEmitted(provider.style_changed):
+            theme_service.apply_theme_preview(colors)
+
+        theme_service.end_preview()
+        colors["statusBar.background"] = "#123456"
+        with qtbot.waitSignal(provider.style_changed, timeout=1000):
+            theme_service.apply_theme_preview(colors)
+
+    def test_scope_stylesheet(self):
+        """Test that scoped rules match the tagged widget and its descendants."""
+        scoped = scope_stylesheet("/* input */ QLineEdit:focus { color: red; }", "palette")
+
+        assert '*[themeComponent="palette"] QLineEdit:focus' in scoped
+        assert 'QLineEdit[themeComponent="palette"]:focus' in scoped
+        assert "input" not in scoped
+
+    def test_application_stylesheet_follows_theme(
+        self, qapp, qtbot, monkeypatch, provider, theme_service
+    ):
+        """Test that tagged widgets are styled by one application stylesheet."""
+        widget = QLineEdit()
+        qtbot.addWidget(widget)
+        provider.apply_theme_to_widget(widget, "command_palette")
+
+        assert widget.property(SCOPE_PROPERTY) == "command_palette"
+        assert widget.styleSheet() == ""
+        assert qapp.styleSheet() == provider.get_application_stylesheet()
+        assert '[themeComponent="command_palette"]' in qapp.styleSheet()
+
+        theme_ids = [theme.id for theme in theme_service.get_available_themes()]
+        other = next(
+            theme_id for theme_id in theme_ids if theme_id != theme_service.get_current_theme_id()
+        )
+        stylesheets = []
+        set_style_sheet = qapp.setStyleSheet
+        monkeypatch.setattr(
+            qapp, "setStyleSheet", lambda sheet: (stylesheets.append(sheet), set_style_sheet(sheet))
+        )
+        theme_service.apply_theme(other)
+        monkeypatch.undo()
+
+        # The theme and typography change are applied in one pass
+        assert len(stylesheets) == 1
+        assert qapp.styleSheet() == provider.get_application_stylesheet()
+        assert theme_service.get_color("input.background") in qapp.styleSheet()
+
+    def test_stylesheets_load_from_bundle(self, qapp, provider, theme_service, tmp_path):
+        """Test that stylesheets rendered in an earlier run are reused."""
+        bundle_path = tmp_path / "theme_bundle.json"
+        saved = bundle_path.stat().st_mtime_ns
+        stylesheet = provider.get_application_stylesheet()
+
+        # Rendering does not write the bundle right away
+        assert bundle_path.stat().st_mtime_ns == saved
+        provider.save_bundle()
+
+        service = ThemeService(ThemeBundleCache(bundle_path))
+        warm = ThemeProvider(service)
+        service.initialize({"main_window": None})
+
+        with patch.object(
+            warm._stylesheet_generator, "generate", side_effect=AssertionError("rendered")
+        ):
+            assert warm.get_application_stylesheet() == stylesheet
+
+        # Dependencies come with the bundle, so later changes stay incremental
+        assert "statusBar.background" in warm._stylesheet_generator.get_dependencies("status_bar")
+
+    def test_pane_header_follows_application_stylesheet(self, qtbot, provider, theme_service):
+        """Test that pane headers are styled without a stylesheet of their own."""
+        from PySide6.QtGui import QPalette
+
+        from viloapp.ui.widgets.pane_header import PaneHeaderBar
+
+        provider.install_application_stylesheet()
+        header = PaneHeaderBar("pane-1")
+        qtbot.addWidget(header)
+        header.show()
+
+        def label_color():
+            return header.id_label.palette().color(QPalette.ColorRole.WindowText).name().lower()
+
+        assert label_color() == theme_service.get_color("paneHeader.foreground").lower()
+        header.set_active(True)
+        assert label_color() == theme_service.get_color("paneHeader.activeForeground").lower()
+
+        widgets = [header, *header.findChildren(QWidget)]
+        assert all(widget.styleSheet() == "" for widget in widgets)
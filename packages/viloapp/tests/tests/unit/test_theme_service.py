@@ -316,6 +316,68 @@ class TestThemeService:
         colors = initialized_theme_service.get_colors()
         assert len(colors) > 0
 
+    def test_themes_load_from_bundle(self, tmp_path):
+        """Test that a compiled theme bundle replaces parsing the theme files."""
+        from viloapp.core.themes.theme import Theme
+        from viloapp.core.themes.theme_bundle import ThemeBundleCache
+
+        def create_service():
+            service = ThemeService(ThemeBundleCache(tmp_path / "theme_bundle.json"))
+            service._user_themes_path = tmp_path / "themes"
+            service._user_themes_path.mkdir(exist_ok=True)
+            return service
+
+        cold = create_service()
+        cold.initialize({"main_window": None})
+        assert (tmp_path / "theme_bundle.json").exists()
+
+        warm = create_service()
+        with patch.object(Theme, "from_json_file", side_effect=AssertionError("parsed")):
+            warm.initialize({"main_window": None})
+        assert sorted(warm._themes) == sorted(cold._themes)
+        assert warm.get_theme("monokai").colors == cold.get_theme("monokai").colors
+
+        # A new theme file makes the bundle stale
+        custom = cold.get_theme("monokai").to_dict()
+        custom["id"] = "custom-monokai"
+        (tmp_path / "themes" / "custom-monokai.json").write_text(json.dumps(custom))
+        changed = create_service()
+        changed.initialize({"main_window": None})
+        assert changed.get_theme("custom-monokai") is not None
+
+    def test_preview_applies_diffs_once_per_frame(self, qtbot, initialized_theme_service):
+        """Test that rapid preview changes are merged and only changed colors are sent."""
+        service = initialized_theme_service
+        service.apply_theme("vscode-dark")
+        changes = []
+        service.colors_changed.connect(changes.append)
+        themes = []
+        service.theme_changed.connect(themes.append)
+        service.typography_changed.connect(themes.append)
+
+        # The first change applies at once, later ones wait for the frame to end
+        service.apply_theme_preview({"terminal.ansiRed": "#ff0000"})
+        service.apply_theme_preview({"terminal.ansiRed": "#ee0000"})
+        service.apply_theme_preview(
+            {"terminal.ansiRed": "#dd0000", "statusBar.background": "#000001"}
+        )
+        assert changes == [{"terminal.ansiRed": "#ff0000"}]
+
+        qtbot.waitUntil(lambda: len(changes) == 2, timeout=1000)
+        assert changes[1] == {"terminal.ansiRed": "#dd0000", "statusBar.background": "#000001"}
+        assert service.get_color("terminal.ansiRed") == "#dd0000"
+
+        # Reapplying the same colors changes nothing
+        qtbot.wait(50)
+        service.apply_theme_preview({"terminal.ansiRed": "#dd0000"})
+        assert len(changes) == 2
+
+        service.end_preview()
+        assert changes[-1]["terminal.ansiRed"] == service.get_color("terminal.ansiRed")
+        assert not service.is_preview_mode()
+        # Only the changed colors are signalled while previewing
+        assert themes == []
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,580 @@
+"""Background syntax highlighting for large documents."""
+
+import logging
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional, Set, Tuple
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtGui import QTextLayout
+
+from .syntax import ROOT_STATE, LineLexer, SyntaxHighlighter
+
+logger = logging.getLogger(__name__)
+
+# Documents larger than this (in characters) are highlighted in the background
+BACKGROUND_THRESHOLD = 1024 * 1024
+
+# Documents larger than this only have their visible lines highlighted
+VIEWPORT_ONLY_THRESHOLD = 32 * 1024 * 1024
+
+# Lines longer than this (minified code, data dumps) are left unhighlighted
+MAX_LINE_LENGTH = 5000
+
+# Errors Pygments lexers raise on input they cannot handle
+LEXER_ERRORS = (IndexError, KeyError, RecursionError, TypeError, ValueError)
+
+
+class _SparseLines(dict):
+    """Per-line data kept only for lines that have been visible."""
+
+    def __missing__(self, line):
+        return None
+
+
+class _TokenizeJob:
+    """Tokenization state shared between the UI thread and the worker."""
+
+    def __init__(self, lines: Optional[List[str]], lexer, line_count: int):
+        """
+        Initialize the job.
+
+        Args:
+            lines: Snapshot of the document lines, or None to only tokenize
+                visible lines, which the UI thread copies in as they are shown
+            lexer: Pygments lexer
+            line_count: Number of lines in the document
+        """
+        self.line_lexer = LineLexer(lexer)
+        self.line_count = line_count
+        self.full_pass = lines is not None
+        # Line the sequential pass starts at, and the line it has lexed up to;
+        # lexer states before that line are final
+        self.resume_line = 0
+        self.lexed_to = 0
+        # Set when the lines after the resume line were all lexed by an
+        # earlier job, so the pass can stop once the states agree again
+        # anywhere from converge_from on, past the edited lines
+        self.stop_on_converge = False
+        self.converge_from = 0
+        # Lines lexed ahead by priority passes, which say nothing about convergence
+        self.priority_lines: Set[int] = set()
+        self.thread: Optional[threading.Thread] = None
+
+        # Per line: text, format runs, lexer state at the start and at the end.
+        # Runs are flat (start, length, token id) arrays, which the garbage
+        # collector does not track, so millions of tokens add no GC pauses.
+        if self.full_pass:
+            self.lines = lines
+            self.runs: List[Optional[array]] = [None] * line_count
+            self.start_states: List[Optional[Tuple[str, ...]]] = [None] * line_count
+            self.end_states: List[Optional[Tuple[str, ...]]] = [None] * line_count
+        else:
+            self.lines = _SparseLines()
+            self.runs = _SparseLines()
+            self.start_states = _SparseLines()
+            self.end_states = _SparseLines()
+
+        # Lines with results not yet applied to the document, in arrival order
+        self.dirty: Dict[int, None] = {}
+        self.priority: Optional[Tuple[int, int]] = None
+
+        # Token types interned to the ids stored in runs
+        self.token_types: List = []
+        self._token_ids: Dict = {}
+
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        # Cleared while the UI thread applies results, pausing the worker
+        self.ui_idle = threading.Event()
+        self.ui_idle.set()
+        # Set while a wake-up of the UI thread is pending
+        self.notified = False
+        self.cancelled = False
+        self.finished = False
+
+    @property
+    def complete(self) -> bool:
+        """Whether every line after the resume line has been lexed."""
+        return self.lexed_to >= self.line_count or self.stop_on_converge
+
+    def inherit(self, previous: "_TokenizeJob", first: int, removed: int, texts: List[str]):
+        """
+        Take over the results of a job across an edit that added or removed lines.
+
+        Results after the edited lines move with their lines, so the new
+        job only has to lex from the edit until the lexer states agree
+        with the ones computed before.
+
+        Args:
+            previous: Job tokenizing the document before the edit
+            first: First edited line
+            removed: Number of lines the edit replaced
+            texts: Text of the lines that replaced them
+        """
+        added = len(texts)
+        delta = added - removed
+        with previous.lock:
+            self.token_types = list(previous.token_types)
+            self._token_ids = dict(previous._token_ids)
+            self.resume_line = min(first, previous.lexed_to)
+            self.lexed_to = self.resume_line
+            self.stop_on_converge = previous.complete
+            # Edits the previous job had not re-lexed yet must be passed too
+            converge_from = previous.converge_from
+            if converge_from >= first + removed:
+                converge_from += delta
+            self.converge_from = max(first + added, converge_from)
+            self.dirty = {
+                line if line < first else line + delta: None
+                for line in previous.dirty
+                if not first <= line < first + removed
+            }
+            self.priority_lines = {
+                line if line < first else line + delta
+                for line in previous.priority_lines
+                if not first <= line < first + removed
+            }
+
+            for name in ("lines", "runs", "start_states", "end_states"):
+                old = getattr(previous, name)
+                new = texts if name == "lines" else [None] * added
+                if self.full_pass:
+                    values = old[:first] + new + old[first + removed :]
+                else:
+                    values = _SparseLines(
+                        (line if line < first else line + delta, value)
+                        for line, value in old.items()
+                        if not first <= line < first + removed
+                    )
+                    values.update(zip(range(first, first + added), new))
+                setattr(self, name, values)
+
+    def lex_line(self, text: str, stack: Tuple[str, ...]) -> Tuple[array, Tuple[str, ...]]:
+        """Lex a line into encoded runs."""
+        if len(text) > MAX_LINE_LENGTH:
+            return array("i"), ROOT_STATE
+
+        try:
+            tokens, end_stack = self.line_lexer.lex_line(text, stack)
+        except LEXER_ERRORS as e:
+            # Left unhighlighted, like overlong lines
+            logger.debug(f"Syntax highlighting error: {e}")
+            return array("i"), ROOT_STATE
+
+        runs = array("i")
+        for start, length, token_type in tokens:
+            token_id = self._token_ids.get(token_type)
+            if token_id is None:
+                with self.lock:
+                    token_id = self._token_ids.setdefault(token_type, len(self.token_types))
+                    if token_id == len(self.token_types):
+                        self.token_types.append(token_type)
+            runs.extend((start, length, token_id))
+        return runs, end_stack
+
+
+class BackgroundHighlighter(QObject):
+    """
+    Highlights large documents without blocking the UI thread.
+
+    A worker thread lexes the document snapshot line by line, carrying the
+    lexer state like SyntaxHighlighter does, and publishes format runs per
+    line. The UI thread applies them to the block layouts in short time
+    slices, visible lines first. The visible range is also lexed ahead of
+    the sequential pass so the viewport is colored right away; those
+    results are corrected if the sequential pass reaches them with a
+    different lexer state.
+    """
+
+    # Milliseconds of UI time spent applying formats per time slice
+    APPLY_BUDGET_MS = 8
+
+    # Delay before re-lexing the lines after an edit that changes the lexer
+    # state they start in, so typing a quote does not re-lex on every key
+    RESTART_DELAY_MS = 300
+
+    # Longest the worker lexes before checking for priority requests and
+    # pausing, so the UI thread gets the GIL back without waiting out the
+    # interpreter's switch interval on every Qt call
+    WORKER_SLICE_MS = 10
+    WORKER_PAUSE_MS = 4
+
+    # Lines applied between time budget checks
+    APPLY_BATCH_SIZE = 20
+
+    _results_ready = Signal()
+
+    def __init__(self, editor, highlighter: SyntaxHighlighter):
+        """
+        Initialize the background highlighter.
+
+        Args:
+            editor: CodeEditor whose document is highlighted
+            highlighter: Highlighter providing the token formats
+        """
+        super().__init__(editor)
+        self.editor = editor
+        self.highlighter = highlighter
+        self.lexer = None
+        self._job: Optional[_TokenizeJob] = None
+        self._block_count = 0
+        self._applying = False
+
+        self._apply_timer = QTimer(self)
+        self._apply_timer.setSingleShot(True)
+        self._apply_timer.setInterval(0)
+        self._apply_timer.timeout.connect(self._apply_ready)
+
+        self._restart_timer = QTimer(self)
+        self._restart_timer.setSingleShot(True)
+        self._restart_timer.setInterval(self.RESTART_DELAY_MS)
+        self._restart_timer.timeout.connect(self._resume)
+
+        self._results_ready.connect(self._apply_timer.start)
+
+    @property
+    def active(self) -> bool:
+        """Whether the document is being highlighted in the background."""
+        return self._job is not None
+
+    @property
+    def busy(self) -> bool:
+        """Whether tokenization or applying results is still in progress."""
+        job = self._job
+        if job is None:
+            return False
+        with job.lock:
+            return bool(job.dirty) or (job.full_pass and not job.finished)
+
+    def start(self, lexer, text: Optional[str] = None):
+        """
+        Start highlighting the editor's document in the background.
+
+        Args:
+            lexer: Pygments lexer
+            text: Document text, if already at hand
+        """
+        self.stop()
+        self.lexer = lexer
+
+        document = self.editor.document()
+        self._block_count = document.blockCount()
+        document.contentsChange.connect(self._on_contents_change)
+        self.editor.verticalScrollBar().valueChanged.connect(self._update_priority)
+
+        if document.characterCount() <= VIEWPORT_ONLY_THRESHOLD:
+            if text is None:
+                text = document.toPlainText()
+            self._start_job(text.split("\n"))
+        else:
+            logger.info("Document too large for full highlighting, highlighting visible lines only")
+            self._start_job(None)
+
+    def stop(self):
+        """Stop background highlighting."""
+        self._restart_timer.stop()
+        self._apply_timer.stop()
+        self._cancel_job()
+
+        if self.lexer is not None:
+            try:
+                self.editor.document().contentsChange.disconnect(self._on_contents_change)
+                self.editor.verticalScrollBar().valueChanged.disconnect(self._update_priority)
+            except (RuntimeError, TypeError):
+                pass
+        self.lexer = None
+
+    def _start_job(self, lines: Optional[List[str]]):
+        """Start tokenizing a snapshot of the document lines."""
+        self._job = _TokenizeJob(lines, self.lexer, self.editor.document().blockCount())
+        self._start_worker()
+
+    def _start_worker(self):
+        """Start the worker thread of the current job."""
+        job = self._job
+        self._update_priority()
+        job.thread = threading.Thread(
+            target=self._run, args=(job,), name="viloedit-tokenizer", daemon=True
+        )
+        job.thread.start()
+
+    def _cancel_job(self):
+        """Stop the running job; its worker exits at the next line."""
+        if self._job is not None:
+            self._job.cancelled = True
+            self._job.wake.set()
+            self._job = None
+
+    def _shift_job(self, first: int, removed: int, texts: List[str]):
+        """
+        Replace the job with one that continues from an edit.
+
+        The new job's worker starts after RESTART_DELAY_MS, so a burst of
+        edits only re-lexes once.
+
+        Args:
+            first: First edited line
+            removed: Number of lines the edit replaced
+            texts: Text of the lines that replaced them
+        """
+        previous = self._job
+        job = _TokenizeJob(
+            [] if previous.full_pass else None,
+            self.lexer,
+            self.editor.document().blockCount(),
+        )
+        job.inherit(previous, first, removed, texts)
+        self._cancel_job()
+        self._job = job
+        self._restart_timer.start()
+
+    def _resume(self):
+        """Start lexing from the edited lines."""
+        if self._job is not None and self._job.thread is None:
+            self._start_worker()
+
+    def _visible_range(self) -> Tuple[int, int]:
+        """Get the first and last visible line."""
+        first = self.editor.firstVisibleBlock().blockNumber()
+        line_height = max(1, self.editor.fontMetrics().height())
+        visible_lines = self.editor.viewport().height() // line_height + 1
+        return max(0, first), first + visible_lines
+
+    def _update_priority(self, *args):
+        """Ask the worker to lex the visible lines next."""
+        job = self._job
+        if job is None:
+            return
+        first, last = self._visible_range()
+        with job.lock:
+            if not job.full_pass:
+                # Copy in the visible lines, the only ones this job reads
+                block = self.editor.document().findBlockByNumber(first)
+                line = first
+                while block.isValid() and line <= last:
+                    job.lines[line] = block.text()
+                    block = block.next()
+                    line += 1
+            job.priority = (first, last)
+        job.wake.set()
+
+    # Worker thread
+
+    def _run(self, job: _TokenizeJob):
+        """Tokenize the job's lines; runs on the worker thread."""
+        with job.lock:
+            next_line = job.resume_line
+            stack = job.end_states[next_line - 1] if next_line > 0 else ROOT_STATE
+        while not job.cancelled:
+            with job.lock:
+                priority, job.priority = job.priority, None
+
+            if priority:
+                self._lex_priority(job, *priority)
+            elif job.full_pass and next_line < job.line_count:
+                next_line, stack = self._lex_sequential(job, next_line, stack)
+                time.sleep(self.WORKER_PAUSE_MS / 1000)
+            else:
+                with job.lock:
+                    job.finished = True
+                self._notify(job)
+                job.wake.wait()
+                job.wake.clear()
+
+    def _lex_priority(self, job: _TokenizeJob, first: int, last: int):
+        """Lex the visible lines ahead of the sequential pass."""
+        last = min(last, job.line_count - 1)
+        if first > last:
+            return
+
+        with job.lock:
+            stack = job.end_states[first - 1] if first > 0 else ROOT_STATE
+        # Best guess when the lines above have not been lexed yet
+        stack = stack or ROOT_STATE
+
+        for line in range(first, last + 1):
+            if job.cancelled:
+                return
+            with job.lock:
+                already_lexed = job.start_states[line] == stack and job.runs[line] is not None
+                if already_lexed:
+                    stack = job.end_states[line]
+                    continue
+                job.priority_lines.add(line)
+            stack = self._lex_line(job, line, stack)
+        self._notify(job)
+
+    def _lex_sequential(self, job: _TokenizeJob, line: int, stack: Tuple[str, ...]):
+        """Lex the next slice of lines of the full pass."""
+        deadline = time.perf_counter() + self.WORKER_SLICE_MS / 1000
+        end = job.line_count
+        while line < end and not job.cancelled and time.perf_counter() < deadline:
+            with job.lock:
+                # Lexed from the same state already, by a priority pass or by
+                # the job this one took over from
+                if job.start_states[line] == stack and job.runs[line] is not None:
+                    if (
+                        job.stop_on_converge
+                        and line >= job.converge_from
+                        and line not in job.priority_lines
+                    ):
+                        # The states agree again, the rest is unchanged
+                        line = end
+                        stack = job.end_states[end - 1]
+                        break
+                    stack = job.end_states[line]
+                    line += 1
+                    continue
+            stack = self._lex_line(job, line, stack)
+            line += 1
+        with job.lock:
+            job.lexed_to = line
+        self._notify(job)
+        return line, stack
+
+    def _lex_line(self, job: _TokenizeJob, line: int, stack: Tuple[str, ...]):
+        """Lex one line and publish its runs; returns the end state."""
+        job.ui_idle.wait()
+        text = job.lines[line]
+        if text is None:
+            return ROOT_STATE
+        runs, end_stack = job.lex_line(text, stack)
+
+        with job.lock:
+            job.runs[line] = runs
+            job.start_states[line] = stack
+            job.end_states[line] = end_stack
+            job.dirty[line] = None
+        return end_stack
+
+    def _notify(self, job: _TokenizeJob):
+        """Wake the UI thread to apply new results, unless it is already due to."""
+        if job.notified:
+            return
+        job.notified = True
+        try:
+            self._results_ready.emit()
+        except RuntimeError:
+            # Editor was destroyed while tokenizing
+            pass
+
+    # UI thread
+
+    def _apply_ready(self):
+        """Apply published results for one time slice."""
+        job = self._job
+        if job is None:
+            return
+
+        deadline = time.perf_counter() + self.APPLY_BUDGET_MS / 1000
+        first, last = self._visible_range()
+
+        # Results published from here on need a new notification
+        job.notified = False
+        job.ui_idle.clear()
+        try:
+            self._apply_batches(job, first, last, deadline)
+        finally:
+            job.ui_idle.set()
+
+    def _apply_batches(self, job: _TokenizeJob, first: int, last: int, deadline: float):
+        """Apply batches of results until the time budget is used up."""
+        while time.perf_counter() < deadline:
+            with job.lock:
+                if not job.dirty:
+                    return
+                batch = {line: None for line in range(first, last + 1) if line in job.dirty}
+                for line in job.dirty:
+                    if len(batch) >= self.APPLY_BATCH_SIZE:
+                        break
+                    batch[line] = None
+                items = [(line, job.lines[line], job.runs[line]) for line in batch]
+                for line in batch:
+                    del job.dirty[line]
+
+            for line, text, runs in items:
+                self._apply_runs(job, line, text, runs)
+
+        self._apply_timer.start()
+
+    def _apply_runs(self, job: _TokenizeJob, line: int, text: str, runs: array):
+        """Set the formats of one block."""
+        block = self.editor.document().findBlockByNumber(line)
+        # Skip lines edited since the snapshot was taken
+        if not block.isValid() or block.text() != text:
+            return
+
+        token_types = job.token_types
+        ranges = []
+        for i in range(0, len(runs), 3):
+            char_format = self.highlighter.get_format_for_token(token_types[runs[i + 2]])
+            if char_format is None:
+                continue
+            format_range = QTextLayout.FormatRange()
+            format_range.start = runs[i]
+            format_range.length = runs[i + 1]
+            format_range.format = char_format
+            ranges.append(format_range)
+
+        # Re-layout reports a contents change, which is not an edit
+        self._applying = True
+        try:
+            block.layout().setFormats(ranges)
+            self.editor.document().markContentsDirty(block.position(), block.length())
+        finally:
+            self._applying = False
+
+    def _on_contents_change(self, position: int, removed: int, added: int):
+        """Re-highlight edited lines."""
+        job = self._job
+        if job is None or self._applying:
+            return
+
+        document = self.editor.document()
+        block = document.findBlock(position)
+        end_block = document.findBlock(position + added)
+
+        block_count = document.blockCount()
+        if block_count != self._block_count:
+            # Line numbers shifted; move the results with their lines and
+            # re-lex from the edit. Formats stay attached to their blocks.
+            first = block.blockNumber()
+            texts = []
+            while block.isValid():
+                texts.append(block.text())
+                if block == end_block:
+                    break
+                block = block.next()
+            removed = len(texts) - (block_count - self._block_count)
+            self._block_count = block_count
+            self._shift_job(first, removed, texts)
+            return
+
+        while block.isValid():
+            line = block.blockNumber()
+            text = block.text()
+            with job.lock:
+                stack = job.end_states[line - 1] if line > 0 else ROOT_STATE
+                old_end = job.end_states[line]
+                job.lines[line] = text
+            if stack is None and not job.full_pass:
+                stack = ROOT_STATE
+            if stack is None:
+                # Lexed later from the new text
+                with job.lock:
+                    job.runs[line] = None
+            else:
+                runs, end_stack = job.lex_line(text, stack)
+                with job.lock:
+                    job.runs[line] = runs
+                    job.start_states[line] = stack
+                    job.end_states[line] = end_stack
+                self._apply_runs(job, line, text, runs)
+                if end_stack != old_end and block == end_block:
+                    # Following lines continue from a different state
+                    self._shift_job(line + 1, 0, [])
+            if block == end_block:
+                break
+            block = block.next()
@@ -0,0 +1,254 @@
+"""Named decoration sets composited into an editor's extra selections."""
+
+import bisect
+import logging
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from PySide6.QtCore import QEvent, QObject, Qt, QTimer
+from PySide6.QtGui import QTextCharFormat, QTextCursor
+from PySide6.QtWidgets import QPlainTextEdit, QTextEdit
+
+logger = logging.getLogger(__name__)
+
+# Document positions (start, end) of a decorated range
+Range = Tuple[int, int]
+
+# Called with the first and last visible block numbers, yields the ranges in them
+RangeProvider = Callable[[int, int], Iterable[Range]]
+
+# Viewport as (first block, last block, start position, end position)
+Viewport = Tuple[int, int, int, int]
+
+
+class _DecorationSet:
+    """Ranges sharing one format, and their selections for the last viewport."""
+
+    __slots__ = (
+        "ends",
+        "format",
+        "limit",
+        "priority",
+        "provider",
+        "selections",
+        "span",
+        "starts",
+        "viewport",
+    )
+
+    def __init__(self, fmt: QTextCharFormat, priority: int, limit: int):
+        self.format = fmt
+        self.priority = priority
+        self.limit = limit
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        # Longest range, bounds how far before the viewport a range can start
+        self.span = 0
+        self.provider: Optional[RangeProvider] = None
+        self.viewport: Optional[Viewport] = None
+        self.selections: Optional[list] = None
+
+    def set_ranges(self, ranges: Iterable[Range]):
+        ordered = sorted((min(start, end), max(start, end)) for start, end in ranges)
+        self.starts = [start for start, _ in ordered]
+        self.ends = [end for _, end in ordered]
+        self.span = max((end - start for start, end in ordered), default=0)
+
+    def visible(self, viewport: Viewport) -> Iterator[Range]:
+        """Get the ranges of the set intersecting a viewport."""
+        first, last, start, end = viewport
+        if self.provider is not None:
+            yield from self.provider(first, last)
+            return
+
+        starts, ends = self.starts, self.ends
+        begin = bisect.bisect_left(starts, start - self.span)
+        stop = bisect.bisect_right(starts, end)
+        for i in range(begin, stop):
+            if ends[i] >= start:
+                yield starts[i], ends[i]
+
+
+class DecorationCompositor(QObject):
+    """
+    Merges named decoration sets into a single list of extra selections.
+
+    QPlainTextEdit has one list of extra selections, so features that each
+    set it replace one another's highlights. Features register a named set
+    instead, either as fixed ranges or as a provider asked for the ranges
+    in the visible blocks, and the compositor combines the sets in priority
+    order. Only ranges intersecting the viewport become selections; they
+    are rebuilt when the editor scrolls, is resized or edited, and a set's
+    selections are kept until it or the viewport changes, so moving the
+    cursor only rebuilds the current line highlight.
+    """
+
+    # Most selections one set contributes to the viewport
+    MAX_PER_SET = 2000
+
+    def __init__(self, editor: QPlainTextEdit):
+        """
+        Initialize the compositor.
+
+        Args:
+            editor: Editor to decorate; the compositor is owned by it
+        """
+        super().__init__(editor)
+        self.editor = editor
+        self._sets: Dict[str, _DecorationSet] = {}
+        self._order: List[_DecorationSet] = []
+
+        # Coalesce changes into one update per event loop pass
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.refresh)
+
+        editor.verticalScrollBar().valueChanged.connect(self._schedule)
+        editor.textChanged.connect(self._on_text_changed)
+        editor.viewport().installEventFilter(self)
+
+    @classmethod
+    def for_editor(cls, editor: QPlainTextEdit) -> "DecorationCompositor":
+        """Get the compositor of an editor, creating it on first use."""
+        compositor = editor.findChild(cls, "", Qt.FindDirectChildrenOnly)
+        if compositor is None:
+            compositor = cls(editor)
+        return compositor
+
+    def set_ranges(
+        self,
+        name: str,
+        ranges: Iterable[Range],
+        fmt: QTextCharFormat,
+        priority: int = 0,
+        limit: Optional[int] = None,
+    ):
+        """
+        Decorate fixed ranges, replacing the set's previous ranges.
+
+        Ranges are document positions when set, so the owner sets them
+        again after edits that move them.
+
+        Args:
+            name: Name of the decoration set
+            ranges: (start, end) document positions, in any order
+            fmt: Format applied to every range
+            priority: Sets with a higher priority are drawn on top
+            limit: Most ranges shown at once, MAX_PER_SET by default
+        """
+        decoration = self._set(name, fmt, priority, limit)
+        decoration.provider = None
+        decoration.set_ranges(ranges)
+
+    def set_provider(
+        self,
+        name: str,
+        provider: RangeProvider,
+        fmt: QTextCharFormat,
+        priority: int = 0,
+        limit: Optional[int] = None,
+    ):
+        """
+        Decorate the ranges a provider yields for the visible blocks.
+
+        The provider is called with the first and last visible block numbers
+        whenever the viewport or document changes, so ranges outside the
+        viewport are never computed.
+
+        Args:
+            name: Name of the decoration set
+            provider: Yields (start, end) positions of ranges in the blocks
+            fmt: Format applied to every range
+            priority: Sets with a higher priority are drawn on top
+            limit: Most ranges shown at once, MAX_PER_SET by default
+        """
+        decoration = self._set(name, fmt, priority, limit)
+        decoration.set_ranges(())
+        decoration.provider = provider
+
+    def clear(self, name: str):
+        """Remove a decoration set."""
+        decoration = self._sets.pop(name, None)
+        if decoration is not None:
+            self._order.remove(decoration)
+            self._schedule()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._sets
+
+    def refresh(self):
+        """Update the editor's extra selections now."""
+        self._timer.stop()
+        viewport = self.viewport()
+        selections = []
+        for decoration in self._order:
+            if decoration.selections is None or decoration.viewport != viewport:
+                decoration.selections = self._materialize(decoration, viewport)
+                decoration.viewport = viewport
+            selections.extend(decoration.selections)
+        self.editor.setExtraSelections(selections)
+
+    def viewport(self) -> Viewport:
+        """Get the visible blocks and the document positions they span."""
+        editor = self.editor
+        first = editor.firstVisibleBlock()
+        last = editor.cursorForPosition(editor.viewport().rect().bottomRight()).block()
+        return (
+            first.blockNumber(),
+            last.blockNumber(),
+            first.position(),
+            last.position() + last.length(),
+        )
+
+    def eventFilter(self, watched, event) -> bool:
+        if event.type() == QEvent.Resize:
+            self._schedule()
+        return False
+
+    def _set(
+        self, name: str, fmt: QTextCharFormat, priority: int, limit: Optional[int]
+    ) -> _DecorationSet:
+        """Get a set ready to take new ranges, creating it if needed."""
+        limit = self.MAX_PER_SET if limit is None else limit
+        decoration = self._sets.get(name)
+        if decoration is None or decoration.priority != priority:
+            if decoration is not None:
+                self._order.remove(decoration)
+            decoration = _DecorationSet(fmt, priority, limit)
+            self._sets[name] = decoration
+            # Stable, so sets of equal priority keep the order they were added in
+            self._order.append(decoration)
+            self._order.sort(key=lambda d: d.priority)
+        else:
+            decoration.format = fmt
+            decoration.limit = limit
+            decoration.selections = None
+        self._schedule()
+        return decoration
+
+    def _materialize(self, decoration: _DecorationSet, viewport: Viewport) -> list:
+        """Create the selections of a set's ranges in the viewport."""
+        document = self.editor.document()
+        last_position = document.characterCount() - 1
+        selections = []
+        for start, end in islice(decoration.visible(viewport), decoration.limit):
+            selection = QTextEdit.ExtraSelection()
+            selection.format = decoration.format
+            cursor = QTextCursor(document)
+            # Ranges set before an edit may point past the end
+            cursor.setPosition(min(start, last_position))
+            cursor.setPosition(min(end, last_position), QTextCursor.KeepAnchor)
+            selection.cursor = cursor
+            selections.append(selection)
+        return selections
+
+    def _on_text_changed(self):
+        for decoration in self._order:
+            if decoration.provider is not None:
+                decoration.selections = None
+        self._schedule()
+
+    def _schedule(self, *args):
+        """Update the selections once the current event has been handled."""
+        self._timer.start()
@@ -1,12 +1,21 @@
 """Code editor widget implementation."""
 
 import logging
+import os
 from typing import Optional, Dict, Any
 from pathlib import Path
 
 from PySide6.QtWidgets import QPlainTextEdit, QWidget
-from PySide6.QtCore import Signal, Qt, QRect, QSize
-from PySide6.QtGui import QTextOption, QPainter, QColor, QTextFormat, QFont, QKeySequence, QShortcut
+from PySide6.QtCore import Signal, QRect, QSize
+from PySide6.QtGui import (
+    QTextOption,
+    QColor,
+    QTextFormat,
+    QTextCharFormat,
+    QFont,
+    QKeySequence,
+    QShortcut,
+)
 
 try:
     from pygments import highlight
@@ -17,6 +26,19 @@ try:
 except ImportError:
     PYGMENTS_AVAILABLE = False
 
+from .background_highlighter import BACKGROUND_THRESHOLD, BackgroundHighlighter
+from .decorations import DecorationCompositor
+from .file_io import (
+    LARGE_FILE_THRESHOLD,
+    ChunkedFileLoader,
+    apply_text_diff,
+    detect_newline,
+    save_document,
+)
+from .file_watcher import FileWatcher, Signature, file_signature
+from .gutter import GutterRenderer
+from .syntax import SyntaxHighlighter
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,14 +66,31 @@ class CodeEditor(QPlainTextEdit):
     cursor_position_changed = Signal(int, int)  # line, column
     find_requested = Signal()  # find dialog requested
     replace_requested = Signal()  # replace dialog requested
+    file_changed_on_disk = Signal(str)  # file_path, changed over unsaved edits or removed
+
+    # Qt repaints the cursor with a few pixels on either side
+    CURSOR_UPDATE_MARGIN = 5
 
     def __init__(self, parent=None):
         super().__init__(parent)
 
         self.file_path: Optional[Path] = None
+        # Line ending of the file, kept when saving
+        self.newline = "\n"
         self.lexer = None
+        self.highlighter = SyntaxHighlighter(self.document())
+        self.background_highlighter = BackgroundHighlighter(self, self.highlighter)
+        self._loader: Optional[ChunkedFileLoader] = None
+        self._read_only_before_load = False
         self.line_number_area = LineNumberArea(self)
+        self.gutter = GutterRenderer(self)
+        self._gutter_width = -1
         self.find_replace_widget = None
+        self.decorations = DecorationCompositor.for_editor(self)
+        self.file_watcher = FileWatcher.get_instance()
+        # What the file looked like when it was last loaded or saved
+        self._disk_signature: Signature = None
+        self.file_watcher.file_changed.connect(self._on_file_changed_on_disk)
 
         self.setup_editor()
         self.setup_shortcuts()
@@ -105,29 +144,43 @@ class CodeEditor(QPlainTextEdit):
 
     def line_number_area_width(self):
         """Calculate line number area width."""
-        digits = 1
-        max_num = max(1, self.blockCount())
-        while max_num >= 10:
-            max_num /= 10
-            digits += 1
-
-        space = 3 + self.fontMetrics().horizontalAdvance("9") * digits
-        return space
+        return self.gutter.width(self.blockCount())
 
     def update_line_number_area_width(self, _):
         """Update line number area width."""
-        self.setViewportMargins(self.line_number_area_width(), 0, 0, 0)
+        width = self.line_number_area_width()
+        if width != self._gutter_width:
+            self._gutter_width = width
+            self.setViewportMargins(width, 0, 0, 0)
 
     def update_line_number_area(self, rect, dy):
         """Update line number area on scroll."""
         if dy:
             self.line_number_area.scroll(0, dy)
-        else:
+        elif rect.width() > self.cursorWidth() + 2 * self.CURSOR_UPDATE_MARGIN:
+            # Requests as narrow as the cursor are its blinking, which
+            # cannot change any line number
             self.line_number_area.update(0, rect.y(), self.line_number_area.width(), rect.height())
 
         if rect.contains(self.viewport().rect()):
             self.update_line_number_area_width(0)
 
+    def define_gutter_marker(self, kind: str, color: str, priority: int = 0):
+        """Define a kind of gutter marker, such as a fold or diagnostic marker."""
+        self.gutter.define_marker(kind, color, priority)
+        self.update_line_number_area_width(0)
+        self.line_number_area.update()
+
+    def set_gutter_markers(self, kind: str, lines):
+        """Mark lines (block numbers) in the gutter, replacing the kind's previous lines."""
+        self.gutter.set_markers(kind, lines)
+        self.line_number_area.update()
+
+    def clear_gutter_markers(self, kind: str):
+        """Remove the gutter markers of a kind."""
+        self.gutter.clear_markers(kind)
+        self.line_number_area.update()
+
     def resizeEvent(self, event):
         """Handle resize event."""
         super().resizeEvent(event)
@@ -139,50 +192,18 @@ class CodeEditor(QPlainTextEdit):
 
     def line_number_area_paint_event(self, event):
         """Paint line numbers."""
-        painter = QPainter(self.line_number_area)
-        painter.fillRect(event.rect(), QColor("#2d2d30"))
-
-        block = self.firstVisibleBlock()
-        block_number = block.blockNumber()
-        top = self.blockBoundingGeometry(block).translated(self.contentOffset()).top()
-        bottom = top + self.blockBoundingRect(block).height()
-
-        while block.isValid() and top <= event.rect().bottom():
-            if block.isVisible() and bottom >= event.rect().top():
-                number = str(block_number + 1)
-                painter.setPen(QColor("#858585"))
-                painter.drawText(
-                    0,
-                    int(top),
-                    self.line_number_area.width(),
-                    self.fontMetrics().height(),
-                    Qt.AlignRight,
-                    number,
-                )
-
-            block = block.next()
-            top = bottom
-            bottom = top + self.blockBoundingRect(block).height()
-            block_number += 1
+        self.gutter.paint(self.line_number_area, event.rect())
 
     def highlight_current_line(self):
         """Highlight the current line."""
-        from PySide6.QtWidgets import QTextEdit
-
-        extra_selections = []
-
-        if not self.isReadOnly():
-            selection = QTextEdit.ExtraSelection()
-
-            line_color = QColor("#2f2f30")
-            selection.format.setBackground(line_color)
-            selection.format.setProperty(QTextFormat.FullWidthSelection, True)
-            selection.cursor = self.textCursor()
-            selection.cursor.clearSelection()
-
-            extra_selections.append(selection)
-
-        self.setExtraSelections(extra_selections)
+        if self.isReadOnly():
+            self.decorations.clear("current_line")
+        else:
+            line_format = QTextCharFormat()
+            line_format.setBackground(QColor("#2f2f30"))
+            line_format.setProperty(QTextFormat.FullWidthSelection, True)
+            position = self.textCursor().position()
+            self.decorations.set_ranges("current_line", [(position, position)], line_format)
 
         # Emit cursor position
         cursor = self.textCursor()
@@ -191,15 +212,22 @@ class CodeEditor(QPlainTextEdit):
         self.cursor_position_changed.emit(line, column)
 
     def load_file(self, file_path: str):
-        """Load a file into the editor."""
-        try:
-            self.file_path = Path(file_path)
+        """
+        Load a file into the editor.
 
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+        Files larger than LARGE_FILE_THRESHOLD are loaded in chunks while the
+        event loop keeps running; file_loaded is emitted once loading is done.
+        """
+        try:
+            large_file = os.path.getsize(file_path) > LARGE_FILE_THRESHOLD
+            content = None
+            if not large_file:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    content = f.read()
+                    self.newline = detect_newline(f.newlines)
 
-            self.setPlainText(content)
-            self.document().setModified(False)
+            self._set_file_path(Path(file_path))
+            self._cancel_loading()
 
             # Set lexer based on file extension
             if PYGMENTS_AVAILABLE:
@@ -208,22 +236,104 @@ class CodeEditor(QPlainTextEdit):
                 except:
                     self.lexer = TextLexer()
 
+            # Detach the highlighter while replacing the text so the new
+            # content is highlighted once, after the file is shown
+            self.background_highlighter.stop()
+            self.highlighter.setDocument(None)
+            self.highlighter.set_lexer(self.lexer, rehighlight=False)
+
+            if large_file:
+                self._start_chunked_load(file_path)
+                return
+
+            self.setPlainText(content)
+            self.document().setModified(False)
+            self._start_highlighting(content)
+
             self.file_loaded.emit(file_path)
 
         except Exception as e:
             logger.error(f"Failed to load file {file_path}: {e}")
 
-    def save_file(self, file_path: str = None):
-        """Save the editor content to file."""
+    def is_loading(self) -> bool:
+        """Whether a large file is still being loaded."""
+        return self._loader is not None
+
+    def _start_chunked_load(self, file_path: str):
+        """Load a large file incrementally."""
+        self._read_only_before_load = self.isReadOnly()
+        self.setReadOnly(True)
+
+        self._loader = ChunkedFileLoader(self.document(), file_path, self)
+        self._loader.finished.connect(self._on_chunked_load_finished)
+        self._loader.failed.connect(self._on_chunked_load_failed)
+        self._loader.start()
+
+    def _on_chunked_load_finished(self, file_path: str):
+        """Handle the end of an incremental load."""
+        self.newline = self._loader.newline
+        self._end_loading()
+        self._start_highlighting()
+        self.file_loaded.emit(file_path)
+
+    def _on_chunked_load_failed(self, file_path: str, error: str):
+        """Handle a failed incremental load."""
+        self._end_loading()
+
+    def _cancel_loading(self):
+        """Stop an incremental load in progress."""
+        if self._loader is not None:
+            self._loader.cancel()
+            self._end_loading()
+
+    def _end_loading(self):
+        """Restore the editor after an incremental load."""
+        if self._loader is not None:
+            self._loader.deleteLater()
+            self._loader = None
+            self.setReadOnly(self._read_only_before_load)
+
+    def _start_highlighting(self, content: Optional[str] = None):
+        """Highlight the loaded document, in the background if it is large."""
+        if self.lexer is not None and self.document().characterCount() > BACKGROUND_THRESHOLD:
+            # Large files are tokenized off the UI thread
+            self.background_highlighter.start(self.lexer, content)
+        else:
+            self.highlighter.setDocument(self.document())
+
+    def save_file(self, file_path: str = None, overwrite: bool = False):
+        """
+        Save the editor content to file.
+
+        Saving over a file that changed on disk, or was deleted, since it was
+        loaded or last saved is refused unless overwrite is set. Instead
+        file_changed_on_disk is emitted, so a connected prompt can overwrite
+        the file or reload it.
+
+        Returns:
+            True if the file on disk now matches the editor content
+        """
         if file_path:
-            self.file_path = Path(file_path)
+            self._set_file_path(Path(file_path))
 
         if not self.file_path:
             return False
 
+        if self.is_loading():
+            logger.warning(f"Cannot save {self.file_path} while it is still loading")
+            return False
+
+        if not overwrite and self._disk_signature != file_signature(str(self.file_path)):
+            logger.warning(f"Not saving {self.file_path}: it changed on disk")
+            self.file_changed_on_disk.emit(str(self.file_path))
+            # A connected prompt may have saved or reloaded the file
+            return not self.document().isModified() and self._disk_signature == file_signature(
+                str(self.file_path)
+            )
+
         try:
-            with open(self.file_path, "w", encoding="utf-8") as f:
-                f.write(self.toPlainText())
+            save_document(self.document(), self.file_path, self.newline)
+            self._record_disk_signature()
 
             self.document().setModified(False)
             self.file_saved.emit(str(self.file_path))
@@ -233,6 +343,59 @@ class CodeEditor(QPlainTextEdit):
             logger.error(f"Failed to save file {self.file_path}: {e}")
             return False
 
+    def reload_file(self) -> bool:
+        """
+        Reload the file from disk, keeping the cursor, scroll position and undo history.
+
+        Only the lines that changed are replaced, as one undoable edit.
+        """
+        if not self.file_path or self.is_loading():
+            return False
+
+        # Recorded first, so a write while reading is reloaded again
+        self._record_disk_signature()
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                content = f.read()
+                newline = detect_newline(f.newlines)
+        except (OSError, UnicodeDecodeError) as e:
+            logger.error(f"Failed to reload file {self.file_path}: {e}")
+            return False
+
+        apply_text_diff(self.document(), content)
+        self.newline = newline
+        self.document().setModified(False)
+        self.file_loaded.emit(str(self.file_path))
+        return True
+
+    def _set_file_path(self, file_path: Path):
+        """Set the file shown, watching it for external changes."""
+        if self.file_path is not None and file_path != self.file_path:
+            self.file_watcher.unwatch(str(self.file_path), self)
+        self.file_path = file_path
+        self._record_disk_signature()
+
+    def _record_disk_signature(self):
+        """Remember the file as it is on disk now, so the change is not reloaded."""
+        self.file_watcher.watch(str(self.file_path), self)
+        self._disk_signature = file_signature(str(self.file_path))
+
+    def _on_file_changed_on_disk(self, file_path: str):
+        """Reload the file when it changed on disk, or report unsaved edits and removal."""
+        if self.file_path is None or os.path.abspath(self.file_path) != file_path:
+            return
+        signature = file_signature(file_path)
+        if signature == self._disk_signature:
+            # Our own save, or a change already reloaded
+            return
+        if signature is None:
+            logger.info(f"File was removed from disk: {file_path}")
+            self.file_changed_on_disk.emit(file_path)
+        elif self.document().isModified() or self.is_loading():
+            self.file_changed_on_disk.emit(file_path)
+        else:
+            self.reload_file()
+
     def _on_text_changed(self):
         """Handle text change."""
         is_modified = self.document().isModified()
@@ -244,8 +407,7 @@ class CodeEditor(QPlainTextEdit):
         fg_color = theme_data.get("editor.foreground", "#d4d4d4")
         selection_bg = theme_data.get("editor.selectionBackground", "#264f78")
 
-        self.setStyleSheet(
-            f"""
+        self.setStyleSheet(f"""
             QPlainTextEdit {{
                 background-color: {bg_color};
                 color: {fg_color};
@@ -253,10 +415,13 @@ class CodeEditor(QPlainTextEdit):
                 selection-background-color: {selection_bg};
                 selection-color: #ffffff;
             }}
-        """
-        )
+        """)
 
         # Update line number area
+        self.gutter.set_colors(
+            theme_data.get("editorGutter.background", "#2d2d30"),
+            theme_data.get("editorLineNumber.foreground", "#858585"),
+        )
         self.line_number_area.update()
 
     def show_find_dialog(self):
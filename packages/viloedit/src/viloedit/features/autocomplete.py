@@ -1,7 +1,7 @@
 """Autocomplete functionality for the code editor."""
 
 import logging
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Optional, Set
 from abc import ABC, abstractmethod
 import re
 
@@ -9,11 +9,24 @@ from PySide6.QtWidgets import QListWidget, QListWidgetItem, QFrame, QVBoxLayout
 from PySide6.QtCore import Qt, Signal, QTimer
 from PySide6.QtGui import QTextCursor, QKeySequence, QShortcut, QFont
 
+from .completion_pipeline import CompletionPipeline, current_word, rank_completions
+from .symbol_index import DocumentSymbolIndex, SymbolTrie, compile_patterns, extract_symbols
+
 logger = logging.getLogger(__name__)
 
 
 class CompletionProvider(ABC):
-    """Abstract base class for completion providers."""
+    """
+    Abstract base class for completion providers.
+
+    Providers are called on a worker thread by the completion pipeline.
+    Providers that read editor or document state must set
+    runs_on_ui_thread, and long-running providers should return early once
+    the "cancelled" event in the context is set.
+    """
+
+    # Whether the provider must be called on the UI thread
+    runs_on_ui_thread = False
 
     @abstractmethod
     def get_completions(
@@ -238,65 +251,39 @@ class SnippetCompletionProvider(CompletionProvider):
 
 
 class VariableCompletionProvider(CompletionProvider):
-    """Provides completion for variables found in the current document."""
+    """
+    Provides completion for variables found in the current document.
+
+    When the context carries the editor's QTextDocument, names come from a
+    DocumentSymbolIndex that is updated incrementally as the document is
+    edited, so completion cost does not grow with the size of the file.
+    Otherwise the given text is scanned whenever it changes.
+    """
+
+    # Maximum number of names returned per request
+    MAX_COMPLETIONS = 200
+
+    # The symbol index is updated from document signals on the UI thread
+    runs_on_ui_thread = True
 
     def __init__(self):
-        self.variable_cache = {}
+        self.variable_cache = SymbolTrie()
         self.last_text = ""
+        self.symbol_index: Optional[DocumentSymbolIndex] = None
 
     def _extract_variables(self, text: str, language: str = "python") -> Set[str]:
         """Extract variable names from the text."""
-        variables = set()
-
-        if language == "python":
-            # Match Python variable assignments and function definitions
-            patterns = [
-                r"\b([a-zA-Z_]\w*)\s*=",  # Variable assignments
-                r"def\s+([a-zA-Z_]\w*)",  # Function definitions
-                r"class\s+([a-zA-Z_]\w*)",  # Class definitions
-                r"for\s+([a-zA-Z_]\w*)\s+in",  # For loop variables
-                r"import\s+([a-zA-Z_]\w*)",  # Import statements
-                r"from\s+\w+\s+import\s+([a-zA-Z_]\w*)",  # From import statements
-            ]
-        elif language == "javascript":
-            patterns = [
-                r"\b(?:var|let|const)\s+([a-zA-Z_$]\w*)",  # Variable declarations
-                r"function\s+([a-zA-Z_$]\w*)",  # Function declarations
-                r"class\s+([a-zA-Z_$]\w*)",  # Class declarations
-                r"([a-zA-Z_$]\w*)\s*=",  # Assignments
-            ]
-        else:
-            # Generic patterns
-            patterns = [
-                r"\b([a-zA-Z_]\w*)\s*=",  # Variable assignments
-                r"function\s+([a-zA-Z_]\w*)",  # Function definitions
-                r"def\s+([a-zA-Z_]\w*)",  # Function definitions
-            ]
-
-        for pattern in patterns:
-            matches = re.finditer(pattern, text, re.MULTILINE)
-            for match in matches:
-                variables.add(match.group(1))
-
-        # Filter out common keywords and very short names
-        filtered = {
-            var
-            for var in variables
-            if len(var) > 2 and var not in {"def", "class", "for", "if", "else", "try", "except"}
-        }
+        return set(extract_symbols(text, compile_patterns(language)))
 
-        return filtered
+    def _index_for(self, document, language: str) -> DocumentSymbolIndex:
+        """Get the symbol index of a document, creating it on first use."""
+        self.symbol_index = DocumentSymbolIndex.for_document(document, language)
+        return self.symbol_index
 
     def get_completions(
         self, text: str, cursor_position: int, context: Dict[str, Any]
     ) -> List[str]:
         """Get variable completions."""
-        # Update cache if text has changed significantly
-        if self.last_text != text:
-            language = context.get("language", "python")
-            self.variable_cache = self._extract_variables(text, language)
-            self.last_text = text
-
         # Extract the current word being typed
         lines = text[:cursor_position].split("\n")
         current_line = lines[-1] if lines else ""
@@ -310,14 +297,24 @@ class VariableCompletionProvider(CompletionProvider):
         if len(current_word) < 2:  # Only suggest after 2 characters
             return []
 
-        # Filter variables that start with the current word
-        completions = [
+        language = context.get("language", "python")
+        document = context.get("document")
+        if document is not None:
+            symbols = self._index_for(document, language).trie
+        else:
+            # Update cache if text has changed
+            if self.last_text != text:
+                self.variable_cache = SymbolTrie()
+                for name in extract_symbols(text, compile_patterns(language)):
+                    self.variable_cache.add(name)
+                self.last_text = text
+            symbols = self.variable_cache
+
+        return [
             var
-            for var in self.variable_cache
-            if var.startswith(current_word) and var != current_word
-        ]
-
-        return sorted(completions)
+            for var in symbols.complete(current_word, self.MAX_COMPLETIONS + 1)
+            if var != current_word
+        ][: self.MAX_COMPLETIONS]
 
     def get_provider_name(self) -> str:
         return "Variables"
@@ -343,6 +340,12 @@ class AutoComplete:
         self.completion_timer.setSingleShot(True)
         self.completion_timer.timeout.connect(self._trigger_completion)
 
+        # Providers run concurrently and results stream into the popup
+        self.pipeline = CompletionPipeline()
+        self.pipeline.results_ready.connect(self._on_results_ready)
+        self.pipeline.finished.connect(self._on_completion_finished)
+        self._has_results = False
+
     def setup_default_providers(self):
         """Setup default completion providers."""
         self.add_provider(KeywordCompletionProvider("python"))
@@ -384,9 +387,10 @@ class AutoComplete:
         if not self.enabled or not self.editor:
             return
 
-        cursor = self.editor.textCursor()
-        text = self.editor.toPlainText()
-        cursor_position = cursor.position()
+        text, cursor_position = self._current_line()
+
+        # Results for the previous word are stale
+        self.pipeline.cancel()
 
         # Check if we should trigger completion
         if self.should_trigger_completion(text, cursor_position):
@@ -395,6 +399,16 @@ class AutoComplete:
         else:
             self.hide_popup()
 
+    def _current_line(self):
+        """
+        Get the text of the cursor's line and the cursor column.
+
+        Providers only look at the text before the cursor on its line, so
+        the whole document is never copied out of the editor.
+        """
+        cursor = self.editor.textCursor()
+        return cursor.block().text(), cursor.positionInBlock()
+
     def should_trigger_completion(self, text: str, cursor_position: int) -> bool:
         """Check if completion should be triggered."""
         if cursor_position < self.min_chars:
@@ -418,36 +432,58 @@ class AutoComplete:
         if not self.editor:
             return
 
-        cursor = self.editor.textCursor()
-        text = self.editor.toPlainText()
-        cursor_position = cursor.position()
+        text, cursor_position = self._current_line()
+        context = self._build_context(cursor_position, self.editor.document())
+        context["locality"] = DocumentSymbolIndex.for_document(
+            self.editor.document(), context["language"]
+        ).nearby(self.editor.textCursor().blockNumber(), self.pipeline.LOCALITY_RADIUS)
 
-        completions = self.get_completions(text, cursor_position)
-        if completions:
-            self.show_completion_popup(completions)
-        else:
-            self.hide_popup()
+        self._has_results = False
+        self.pipeline.request(self.providers, text, cursor_position, context)
 
-    def get_completions(self, text: str, cursor_position: int) -> List[str]:
-        """Get all completions from providers."""
-        all_completions = []
-        context = {
+    def _build_context(self, cursor_position: int, document=None) -> Dict[str, Any]:
+        """Build the context passed to providers."""
+        return {
             "language": "python",  # Could be detected from file extension
             "cursor_position": cursor_position,
+            "document": document,
         }
 
+    def _on_results_ready(self, generation: int, completions: List[str]):
+        """Show the completions received so far."""
+        if completions:
+            # Later batches of the same request keep the selection
+            self.show_completion_popup(completions, keep_selection=self._has_results)
+            self._has_results = True
+
+    def _on_completion_finished(self, generation: int):
+        """Hide the popup if no provider had anything to offer."""
+        if not self._has_results:
+            self.hide_popup()
+
+    def get_completions(self, text: str, cursor_position: int, document=None) -> List[str]:
+        """
+        Get all completions from providers, synchronously.
+
+        Args:
+            text: Text up to and around the cursor
+            cursor_position: Cursor position within text
+            document: Editor document, passed to providers that index it
+
+        Returns:
+            Completions ranked the same way as the asynchronous pipeline
+        """
+        context = self._build_context(cursor_position, document)
+        batches = []
         for provider in self.providers:
             try:
-                completions = provider.get_completions(text, cursor_position, context)
-                all_completions.extend(completions)
+                batches.append(provider.get_completions(text, cursor_position, context))
             except Exception as e:
                 logger.warning(f"Provider {provider.get_provider_name()} failed: {e}")
 
-        # Remove duplicates and sort
-        unique_completions = list(set(all_completions))
-        return sorted(unique_completions)
+        return rank_completions(current_word(text, cursor_position), batches)
 
-    def show_completion_popup(self, completions: List[str]):
+    def show_completion_popup(self, completions: List[str], keep_selection: bool = False):
         """Show the completion popup."""
         if not self.editor or not completions:
             return
@@ -456,11 +492,12 @@ class AutoComplete:
             self.completion_popup = CompletionPopup(self.editor)
             self.completion_popup.completion_selected.connect(self.insert_completion)
 
-        self.completion_popup.set_completions(completions)
+        self.completion_popup.set_completions(completions, keep_selection)
         self.completion_popup.show_at_cursor()
 
     def hide_popup(self):
         """Hide the completion popup."""
+        self.pipeline.cancel()
         if self.completion_popup:
             self.completion_popup.hide()
 
@@ -480,13 +517,10 @@ class AutoComplete:
             return
 
         cursor = self.editor.textCursor()
-        text = self.editor.toPlainText()
         cursor_position = cursor.position()
 
         # Find the word to replace
-        text_before = text[:cursor_position]
-        lines = text_before.split("\n")
-        current_line = lines[-1] if lines else ""
+        current_line = cursor.block().text()[: cursor.positionInBlock()]
 
         word_match = re.search(r"\b\w*$", current_line)
         if word_match:
@@ -538,8 +572,7 @@ class CompletionPopup(QFrame):
         self.list_widget.itemClicked.connect(self.on_item_clicked)
         self.list_widget.itemActivated.connect(self.on_item_activated)
 
-        self.setStyleSheet(
-            """
+        self.setStyleSheet("""
             CompletionPopup {
                 background-color: #2d2d30;
                 border: 1px solid #3e3e42;
@@ -558,18 +591,28 @@ class CompletionPopup(QFrame):
             QListWidget::item:hover {
                 background-color: #3e3e42;
             }
+        """)
+
+    def set_completions(self, completions: List[str], keep_selection: bool = False):
+        """
+        Set the completions to display.
+
+        Args:
+            completions: Completions, best first
+            keep_selection: Keep the selected completion if it is still
+                offered, for results that arrive in several batches
         """
-        )
+        current_item = self.list_widget.currentItem() if keep_selection else None
+        current = current_item.text() if current_item else None
 
-    def set_completions(self, completions: List[str]):
-        """Set the completions to display."""
         self.list_widget.clear()
         for completion in completions:
             item = QListWidgetItem(completion)
             self.list_widget.addItem(item)
 
         if completions:
-            self.list_widget.setCurrentRow(0)
+            row = completions.index(current) if current in completions else 0
+            self.list_widget.setCurrentRow(row)
 
     def show_at_cursor(self):
         """Show the popup at the cursor position."""
@@ -0,0 +1,93 @@
+"""Base class for per-block indexes of a text document."""
+
+import logging
+from typing import Any, List
+
+from PySide6.QtCore import QObject
+from PySide6.QtGui import QTextDocument
+
+logger = logging.getLogger(__name__)
+
+
+class BlockIndex(QObject):
+    """
+    Per-block data derived from a QTextDocument, kept up to date as it is edited.
+
+    Subclasses compute an entry from each block's text in _scan and undo its
+    contribution to any aggregate state in _discard. The index listens to
+    contentsChange, so an edit only rescans the blocks it touched instead of
+    the whole document. Entries are stored by block number, so they hold
+    positions relative to their block and stay valid when text before them
+    changes.
+    """
+
+    def __init__(self, document: QTextDocument):
+        """
+        Initialize the index.
+
+        Subclasses call rebuild() once their own state is set up.
+
+        Args:
+            document: Document to index; the index is owned by it
+        """
+        super().__init__(document)
+        self.document = document
+        self._blocks: List[Any] = []
+        document.contentsChange.connect(self._on_contents_change)
+
+    @classmethod
+    def for_document(cls, document: QTextDocument, *args):
+        """Get the index of a document, creating it on first use."""
+        index = document.findChild(cls)
+        if index is None:
+            index = cls(document, *args)
+        return index
+
+    def rebuild(self):
+        """Rescan the whole document."""
+        self._reset()
+        self._blocks = []
+        block = self.document.firstBlock()
+        while block.isValid():
+            self._blocks.append(self._scan(block.text()))
+            block = block.next()
+
+    def _reset(self):
+        """Clear aggregate state before a full rescan."""
+
+    def _scan(self, text: str) -> Any:
+        """Compute the entry of a block."""
+        raise NotImplementedError
+
+    def _discard(self, entry: Any):
+        """Remove the contribution of a block's entry before it is replaced."""
+
+    def _on_contents_change(self, position: int, removed: int, added: int):
+        """Rescan the blocks touched by an edit."""
+        document = self.document
+        # Blocks inserted (positive) or removed (negative) by the edit
+        delta = document.blockCount() - len(self._blocks)
+
+        end = min(position + added, document.characterCount() - 1)
+        first = document.findBlock(position).blockNumber()
+        last = document.findBlock(end).blockNumber()
+        old_last = last - delta
+        if first < 0 or old_last < first or old_last >= len(self._blocks):
+            # The change does not line up with what was indexed
+            logger.debug(f"{type(self).__name__} out of sync, rescanning document")
+            self.rebuild()
+            return
+
+        for entry in self._blocks[first : old_last + 1]:
+            self._discard(entry)
+
+        rescanned = []
+        block = document.findBlockByNumber(first)
+        for _ in range(last - first + 1):
+            rescanned.append(self._scan(block.text()))
+            block = block.next()
+        self._blocks[first : old_last + 1] = rescanned
+        self._changed(first, last)
+
+    def _changed(self, first: int, last: int):
+        """Called after blocks first to last were rescanned."""
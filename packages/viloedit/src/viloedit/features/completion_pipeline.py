@@ -0,0 +1,267 @@
+"""Asynchronous completion pipeline with ranked merging across providers."""
+
+import logging
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+logger = logging.getLogger(__name__)
+
+# Bonus for a candidate defined on the cursor's line, fading with distance
+LOCALITY_WEIGHT = 10.0
+
+_WORD_AT_END = re.compile(r"\b\w*$")
+
+# Failures of a single provider, which leave it out of the merged results
+# instead of stalling the request; anything else is a bug and propagates
+PROVIDER_ERRORS = (AttributeError, LookupError, OSError, RuntimeError, TypeError, ValueError)
+
+
+def current_word(text: str, cursor_position: int) -> str:
+    """Get the word ending at the cursor."""
+    line = text[:cursor_position].rsplit("\n", 1)[-1]
+    match = _WORD_AT_END.search(line)
+    return match.group() if match else ""
+
+
+def fuzzy_score(query: str, candidate: str) -> Optional[float]:
+    """
+    Score how well a candidate matches a query.
+
+    The query must be a case-insensitive subsequence of the candidate.
+    Prefix matches, consecutive characters and characters at word
+    boundaries score higher, and shorter candidates win ties.
+
+    Returns:
+        The score, or None if the candidate does not match
+    """
+    lowered = candidate.lower()
+    score = 0.0
+    position = 0
+    previous = -2
+    for char in query.lower():
+        index = lowered.find(char, position)
+        if index < 0:
+            return None
+        score += 1.0
+        if index == previous + 1:
+            score += 5.0
+        if (
+            index == 0
+            or not candidate[index - 1].isalnum()
+            or (candidate[index].isupper() and candidate[index - 1].islower())
+        ):
+            score += 3.0
+        # Penalize skipped characters
+        score -= 0.1 * (index - position)
+        previous = index
+        position = index + 1
+
+    if candidate.startswith(query):
+        score += 10.0
+    elif lowered.startswith(query.lower()):
+        score += 8.0
+    return score - 0.01 * len(candidate)
+
+
+def rank_completions(
+    query: str,
+    batches: Iterable[List[str]],
+    locality: Optional[Dict[str, int]] = None,
+    radius: int = 1,
+) -> List[str]:
+    """
+    Merge completions from several providers, best match first.
+
+    Args:
+        query: Word being completed
+        batches: Completions from each provider
+        locality: Distance in lines from the cursor to where a name is defined
+        radius: Largest distance in locality
+
+    Returns:
+        Unique completions ordered by fuzzy score plus locality bonus
+    """
+    locality = locality or {}
+    scored: Dict[str, float] = {}
+    for completions in batches:
+        for candidate in completions:
+            if candidate in scored:
+                continue
+            # Snippets are labelled "<trigger> (snippet)"
+            score = fuzzy_score(query, candidate.split(" ", 1)[0]) if query else 0.0
+            if score is None:
+                continue
+            distance = locality.get(candidate)
+            if distance is not None:
+                score += LOCALITY_WEIGHT * (1.0 - distance / (radius + 1))
+            scored[candidate] = score
+    return sorted(scored, key=lambda candidate: (-scored[candidate], candidate))
+
+
+class _Request:
+    """A completion request in flight."""
+
+    def __init__(self, generation: int, query: str, context: Dict[str, Any]):
+        self.generation = generation
+        self.query = query
+        self.context = context
+        self.cancelled = threading.Event()
+        self.futures: List[Future] = []
+        self.results: Dict[int, List[str]] = {}
+        self.pending = 0
+
+
+class CompletionPipeline(QObject):
+    """
+    Runs completion providers concurrently and streams ranked results.
+
+    Providers run on a thread pool, except those with runs_on_ui_thread set,
+    which read UI-owned state and are called directly. Each time a provider
+    finishes, the merged results so far are re-ranked and emitted. A new
+    request cancels the previous one: queued provider calls are dropped,
+    running ones see the cancelled event in their context, and their
+    results are ignored. Providers that miss the deadline are dropped.
+    """
+
+    # Milliseconds a request waits for slow providers
+    DEADLINE_MS = 1000
+
+    # Lines around the cursor whose definitions get a locality bonus
+    LOCALITY_RADIUS = 50
+
+    results_ready = Signal(int, list)  # generation, ranked completions
+    finished = Signal(int)  # generation
+
+    _provider_done = Signal(int, int, list)  # generation, provider index, completions
+
+    def __init__(self, max_workers: int = 4, parent=None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="completion"
+        )
+        self._request: Optional[_Request] = None
+        self._generation = 0
+
+        self._deadline_timer = QTimer(self)
+        self._deadline_timer.setSingleShot(True)
+        self._deadline_timer.timeout.connect(self._on_deadline)
+
+        # Emitted from worker threads, delivered on the UI thread
+        self._provider_done.connect(self._on_provider_done)
+
+    @property
+    def busy(self) -> bool:
+        """Whether a request is still waiting for providers."""
+        return self._request is not None
+
+    def request(
+        self, providers: List[Any], text: str, cursor_position: int, context: Dict[str, Any]
+    ) -> int:
+        """
+        Start a completion request, cancelling the previous one.
+
+        Args:
+            providers: Completion providers to query
+            text: Text up to and around the cursor
+            cursor_position: Cursor position within text
+            context: Context passed to providers, with the request's cancelled
+                event added; an optional "locality" mapping of name to
+                distance from the cursor line boosts nearby definitions
+
+        Returns:
+            Generation number identifying the request's results
+        """
+        self.cancel()
+        self._generation += 1
+        context = dict(context)
+        request = _Request(self._generation, current_word(text, cursor_position), context)
+        context["cancelled"] = request.cancelled
+        self._request = request
+
+        inline = []
+        for index, provider in enumerate(providers):
+            request.pending += 1
+            if getattr(provider, "runs_on_ui_thread", False):
+                inline.append((index, provider))
+            else:
+                request.futures.append(
+                    self._executor.submit(
+                        self._run_provider, request, index, provider, text, cursor_position
+                    )
+                )
+
+        for index, provider in inline:
+            completions = self._call_provider(provider, text, cursor_position, context)
+            self._on_provider_done(request.generation, index, completions)
+
+        if self._request is request:
+            self._deadline_timer.start(self.DEADLINE_MS)
+        return request.generation
+
+    def cancel(self):
+        """Cancel the request in flight, if any."""
+        request = self._request
+        if request is None:
+            return
+        self._request = None
+        self._deadline_timer.stop()
+        request.cancelled.set()
+        for future in request.futures:
+            future.cancel()
+
+    def shutdown(self):
+        """Cancel the request in flight and stop the worker threads."""
+        self.cancel()
+        self._executor.shutdown(wait=False)
+
+    def _run_provider(self, request: _Request, index: int, provider, text, cursor_position):
+        """Call a provider on a worker thread."""
+        if request.cancelled.is_set():
+            return
+        completions = self._call_provider(provider, text, cursor_position, request.context)
+        if not request.cancelled.is_set():
+            self._provider_done.emit(request.generation, index, completions)
+
+    @staticmethod
+    def _call_provider(provider, text: str, cursor_position: int, context) -> List[str]:
+        try:
+            return list(provider.get_completions(text, cursor_position, context))
+        except PROVIDER_ERRORS as e:
+            logger.warning(f"Provider {provider.get_provider_name()} failed: {e}")
+            return []
+
+    def _on_provider_done(self, generation: int, index: int, completions: List[str]):
+        """Merge a provider's results into the current request."""
+        request = self._request
+        if request is None or request.generation != generation:
+            return
+
+        request.results[index] = completions
+        request.pending -= 1
+        if completions or not request.pending:
+            ranked = rank_completions(
+                request.query,
+                (request.results[i] for i in sorted(request.results)),
+                request.context.get("locality"),
+                self.LOCALITY_RADIUS,
+            )
+            self.results_ready.emit(generation, ranked)
+        if not request.pending:
+            self._finish(request)
+
+    def _on_deadline(self):
+        """Give up on providers that have not answered in time."""
+        request = self._request
+        if request is not None:
+            logger.debug(f"{request.pending} completion provider(s) missed the deadline")
+            self.cancel()
+            self.finished.emit(request.generation)
+
+    def _finish(self, request: _Request):
+        self._request = None
+        self._deadline_timer.stop()
+        self.finished.emit(request.generation)
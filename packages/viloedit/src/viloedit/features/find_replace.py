@@ -2,7 +2,7 @@
 
 import re
 import logging
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 from enum import Enum
 
 from PySide6.QtWidgets import (
@@ -14,10 +14,20 @@ from PySide6.QtWidgets import (
     QCheckBox,
     QLabel,
     QComboBox,
-    QTextEdit,
+    QPlainTextEdit,
 )
-from PySide6.QtCore import Signal, QTimer, QRegularExpression
-from PySide6.QtGui import QTextCursor, QTextDocument, QKeySequence, QShortcut
+from PySide6.QtCore import Signal, QTimer
+from PySide6.QtGui import (
+    QColor,
+    QTextCharFormat,
+    QTextCursor,
+    QTextDocument,
+    QKeySequence,
+    QShortcut,
+)
+
+from ..decorations import DecorationCompositor
+from .search_index import DocumentSearchIndex, compile_search, replace_all
 
 logger = logging.getLogger(__name__)
 
@@ -59,12 +69,20 @@ class FindReplace(QWidget):
     replace_all_requested = Signal(str, str, dict)  # find_text, replace_text, options
     closed = Signal()
 
+    # Most matches highlighted at once; only the visible ones are highlighted
+    MAX_HIGHLIGHTS = 1000
+
+    # Decoration set of the match highlights, drawn over the current line
+    DECORATION = "search"
+    DECORATION_PRIORITY = 10
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.editor = None
         self.last_search_position = 0
         self.search_history = []
         self.replace_history = []
+        self._search_index: Optional[DocumentSearchIndex] = None
         self.setup_ui()
         self.setup_shortcuts()
 
@@ -216,8 +234,51 @@ class FindReplace(QWidget):
         text = self.find_input.currentText()
         if text and self.editor:
             self.add_to_history(text, self.search_history)
-            matches = self.find_all_matches(text)
-            logger.info(f"Found {len(matches)} matches for '{text}'")
+            index = self.update_search(text)
+            self.highlight_visible_matches()
+            count = index.count if index else 0
+            logger.info(f"Found {count} matches for '{text}'")
+
+    def update_search(self, text: str) -> Optional[DocumentSearchIndex]:
+        """
+        Search the editor's document for text with the current options.
+
+        The document is only rescanned when the search changes; the index
+        keeps itself up to date as the document is edited.
+
+        Returns:
+            The document's search index, or None if there is nothing to search
+        """
+        index = self._get_search_index()
+        if index is None:
+            return None
+
+        options = self.get_search_options()
+        try:
+            pattern = compile_search(
+                text, options["case_sensitive"], options["whole_word"], options["regex"]
+            )
+        except re.error as e:
+            logger.warning(f"Invalid search pattern '{text}': {e}")
+            pattern = None
+
+        index.set_pattern(pattern)
+        return index if pattern is not None else None
+
+    def _get_search_index(self) -> Optional[DocumentSearchIndex]:
+        """Get the search index of the editor's document."""
+        document = self.editor.document() if self.editor else None
+        if not isinstance(document, QTextDocument):
+            return None
+
+        self._search_index = DocumentSearchIndex.for_document(document)
+        return self._search_index
+
+    def _get_decorations(self) -> Optional[DecorationCompositor]:
+        """Get the decoration compositor of the editor."""
+        if not isinstance(self.editor, QPlainTextEdit):
+            return None
+        return DecorationCompositor.for_editor(self.editor)
 
     def find_text(
         self, text: str, direction: SearchDirection, from_current: bool = False
@@ -226,127 +287,86 @@ class FindReplace(QWidget):
         if not self.editor or not text:
             return FindReplaceResult()
 
+        index = self.update_search(text)
+        if index is None:
+            return FindReplaceResult()
+
         options = self.get_search_options()
         cursor = self.editor.textCursor()
+        backward = direction == SearchDirection.BACKWARD
 
-        # Set search flags
-        search_flags = QTextDocument.FindFlags()
-        if options["case_sensitive"]:
-            search_flags |= QTextDocument.FindCaseSensitively
-        if options["whole_word"]:
-            search_flags |= QTextDocument.FindWholeWords
-        if direction == SearchDirection.BACKWARD:
-            search_flags |= QTextDocument.FindBackward
-
-        # Prepare search pattern
-        if options["regex"]:
-            pattern = QRegularExpression(text)
-            if not options["case_sensitive"]:
-                pattern.setPatternOptions(QRegularExpression.CaseInsensitiveOption)
-        else:
-            pattern = text
-
-        # Perform search
-        if not from_current and direction == SearchDirection.FORWARD:
-            cursor.movePosition(QTextCursor.Start)
-        elif not from_current and direction == SearchDirection.BACKWARD:
-            cursor.movePosition(QTextCursor.End)
-
-        if options["regex"]:
-            found_cursor = self.editor.document().find(pattern, cursor, search_flags)
+        # Search on from the current match, or from its start when the
+        # search text changed so the match under the cursor is kept
+        if backward or from_current:
+            position = cursor.selectionStart()
         else:
-            found_cursor = self.editor.document().find(text, cursor, search_flags)
+            position = cursor.selectionEnd()
 
-        # Handle wrap around
-        if found_cursor.isNull() and options["wrap_around"]:
-            if direction == SearchDirection.FORWARD:
-                cursor.movePosition(QTextCursor.Start)
-            else:
-                cursor.movePosition(QTextCursor.End)
-
-            if options["regex"]:
-                found_cursor = self.editor.document().find(pattern, cursor, search_flags)
-            else:
-                found_cursor = self.editor.document().find(text, cursor, search_flags)
+        match = index.find(position, backward, options["wrap_around"])
+        self.highlight_visible_matches()
+        if match is None:
+            return FindReplaceResult(matches=index.count)
 
-        if not found_cursor.isNull():
-            self.editor.setTextCursor(found_cursor)
-            self.editor.ensureCursorVisible()
-            return FindReplaceResult(found=True, position=found_cursor.position())
-
-        return FindReplaceResult()
+        start, end = match
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.KeepAnchor)
+        self.editor.setTextCursor(cursor)
+        self.editor.ensureCursorVisible()
+        return FindReplaceResult(found=True, position=end, matches=index.count)
 
     def find_all_matches(self, text: str) -> List[Tuple[int, int]]:
         """Find all matches and return their positions."""
         if not self.editor or not text:
             return []
 
-        options = self.get_search_options()
-        matches = []
-
-        # Reset cursor to start
-        cursor = self.editor.textCursor()
-        cursor.movePosition(QTextCursor.Start)
-
-        # Set search flags
-        search_flags = QTextDocument.FindFlags()
-        if options["case_sensitive"]:
-            search_flags |= QTextDocument.FindCaseSensitively
-        if options["whole_word"]:
-            search_flags |= QTextDocument.FindWholeWords
-
-        # Prepare search pattern
-        if options["regex"]:
-            pattern = QRegularExpression(text)
-            if not options["case_sensitive"]:
-                pattern.setPatternOptions(QRegularExpression.CaseInsensitiveOption)
-        else:
-            pattern = text
-
-        # Find all matches
-        while True:
-            if options["regex"]:
-                found_cursor = self.editor.document().find(pattern, cursor, search_flags)
-            else:
-                found_cursor = self.editor.document().find(text, cursor, search_flags)
-
-            if found_cursor.isNull():
-                break
+        index = self.update_search(text)
+        if index is None:
+            return []
 
-            start = found_cursor.selectionStart()
-            end = found_cursor.selectionEnd()
-            matches.append((start, end))
+        self.highlight_visible_matches()
+        return list(index.matches())
 
-            # Move cursor past this match
-            cursor = found_cursor
-            cursor.clearSelection()
+    def highlight_visible_matches(self):
+        """
+        Highlight the matches of the current search.
 
-        # Highlight all matches (basic implementation)
-        if matches:
-            self.highlight_matches(matches)
+        The matches are read from the search index for the visible blocks
+        only, as the editor scrolls and is edited.
+        """
+        index = self._search_index
+        decorations = self._get_decorations()
+        if index is None or decorations is None:
+            return
 
-        return matches
+        decorations.set_provider(
+            self.DECORATION,
+            index.matches_in_blocks,
+            self._highlight_format(),
+            self.DECORATION_PRIORITY,
+            self.MAX_HIGHLIGHTS,
+        )
+        decorations.refresh()
 
     def highlight_matches(self, matches: List[Tuple[int, int]]):
         """Highlight all matches in the editor."""
-        if not self.editor:
+        decorations = self._get_decorations()
+        if decorations is None:
             return
 
-        # This is a basic implementation
-        # In a full implementation, you'd use QTextEdit.ExtraSelection
-        from PySide6.QtGui import QColor
-
-        extra_selections = []
-
-        for start, end in matches:
-            selection = QTextEdit.ExtraSelection()
-            selection.format.setBackground(QColor(255, 255, 0, 100))  # Yellow highlight
-            selection.cursor = self.editor.textCursor()
-            selection.cursor.setPosition(start)
-            selection.cursor.setPosition(end, QTextCursor.KeepAnchor)
-            extra_selections.append(selection)
-
-        self.editor.setExtraSelections(extra_selections)
+        decorations.set_ranges(
+            self.DECORATION,
+            matches,
+            self._highlight_format(),
+            self.DECORATION_PRIORITY,
+            self.MAX_HIGHLIGHTS,
+        )
+        decorations.refresh()
+
+    @staticmethod
+    def _highlight_format() -> QTextCharFormat:
+        highlight_format = QTextCharFormat()
+        highlight_format.setBackground(QColor(255, 255, 0, 100))  # Yellow highlight
+        return highlight_format
 
     def replace_current(self):
         """Replace current selection."""
@@ -379,22 +399,16 @@ class FindReplace(QWidget):
 
         self.add_to_history(replace_text, self.replace_history)
 
-        matches = self.find_all_matches(find_text)
-        if not matches:
+        index = self.update_search(find_text)
+        if index is None or not index.count:
             return
 
-        # Perform replacements from end to start to maintain positions
-        cursor = self.editor.textCursor()
-        cursor.beginEditBlock()
-
-        replaced_count = 0
-        for start, end in reversed(matches):
-            cursor.setPosition(start)
-            cursor.setPosition(end, QTextCursor.KeepAnchor)
-            cursor.insertText(replace_text)
-            replaced_count += 1
+        try:
+            replaced_count = replace_all(index, replace_text, self.get_search_options()["regex"])
+        except re.error as e:
+            logger.warning(f"Invalid replacement '{replace_text}': {e}")
+            return
 
-        cursor.endEditBlock()
         logger.info(f"Replaced {replaced_count} occurrences")
 
     def text_matches(self, text: str, pattern: str, options: Dict[str, Any]) -> bool:
@@ -437,9 +451,14 @@ class FindReplace(QWidget):
     def close_widget(self):
         """Close the find/replace widget."""
         self.hide()
+        if self._search_index is not None:
+            # Stop tracking matches while the widget is closed
+            self._search_index.set_pattern(None)
         if self.editor:
             # Clear highlights
-            self.editor.setExtraSelections([])
+            decorations = self._get_decorations()
+            if decorations is not None:
+                decorations.clear(self.DECORATION)
             # Return focus to editor
             self.editor.setFocus()
         self.closed.emit()
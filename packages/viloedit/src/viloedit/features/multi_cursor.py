@@ -1,12 +1,14 @@
 """Multi-cursor functionality for the code editor."""
 
 import logging
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from dataclasses import dataclass
 
-from PySide6.QtWidgets import QTextEdit
+from PySide6.QtWidgets import QPlainTextEdit
 from PySide6.QtCore import Qt, Signal, QObject
-from PySide6.QtGui import QTextCursor, QKeySequence, QShortcut, QTextFormat, QColor
+from PySide6.QtGui import QTextCursor, QKeySequence, QShortcut, QTextCharFormat, QColor
+
+from ..decorations import DecorationCompositor
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +53,11 @@ class MultiCursor(QObject):
     cursors_changed = Signal()
     selection_changed = Signal()
 
+    # Decoration sets of the extra cursors, drawn over search highlights
+    SELECTIONS_DECORATION = "multi_cursor.selections"
+    CARETS_DECORATION = "multi_cursor.carets"
+    DECORATION_PRIORITY = 20
+
     def __init__(self, editor=None):
         super().__init__()
         self.editor = editor
@@ -217,7 +224,7 @@ class MultiCursor(QObject):
                 break
 
             self.cursors.append(CursorInfo(found_cursor.position(), found_cursor.anchor()))
-            position = found_cursor.position() + len(selected_text)
+            position = found_cursor.selectionEnd()
 
         if self.cursors:
             self.update_visual_indicators()
@@ -261,72 +268,71 @@ class MultiCursor(QObject):
                 self.update_visual_indicators()
 
     def insert_text(self, text: str):
-        """Insert text at all cursor positions."""
+        """Insert text at all cursor positions, replacing their selections."""
         if not self.is_active() or not self.editor:
             return
 
-        document = self.editor.document()
-        cursor = QTextCursor(document)
-
-        # Sort cursors by position (descending) to maintain positions during insertion
-        sorted_cursors = sorted(self.cursors, key=lambda c: c.position, reverse=True)
-
-        cursor.beginEditBlock()
-        for cursor_info in sorted_cursors:
-            cursor.setPosition(cursor_info.position)
-            if cursor_info.has_selection:
-                cursor.setPosition(cursor_info.anchor, QTextCursor.KeepAnchor)
-            cursor.insertText(text)
-
-            # Update cursor positions after insertion
-            text_length = len(text)
-            for other_cursor in self.cursors:
-                if other_cursor.position > cursor_info.position:
-                    other_cursor.position += text_length
-                    other_cursor.anchor += text_length
-                elif other_cursor.position == cursor_info.position:
-                    other_cursor.position += text_length
-                    if not cursor_info.has_selection:
-                        other_cursor.anchor = other_cursor.position
-
-        cursor.endEditBlock()
-        self.update_visual_indicators()
+        self._replace_ranges([(c.selection_start, c.selection_end) for c in self.cursors], text)
 
     def delete_selected_text(self):
         """Delete selected text at all cursor positions."""
         if not self.is_active() or not self.editor:
             return
 
-        document = self.editor.document()
-        cursor = QTextCursor(document)
+        if not any(c.has_selection for c in self.cursors):
+            return
 
-        # Sort cursors by position (descending) to maintain positions during deletion
-        sorted_cursors = sorted(
-            [c for c in self.cursors if c.has_selection],
-            key=lambda c: c.selection_start,
-            reverse=True,
-        )
+        self._replace_ranges([(c.selection_start, c.selection_end) for c in self.cursors], "")
+
+    def _replace_ranges(self, ranges: List[Tuple[int, int]], text: str):
+        """
+        Replace a range per cursor with text, leaving a cursor after each.
+
+        The ranges are sorted once and applied front to back in a single
+        edit block, shifting each by the change in length of the ones
+        before it, so n cursors take O(n log n) rather than updating every
+        cursor after each edit. Overlapping ranges are merged first, and
+        cursors that end up at the same position become one.
+
+        Args:
+            ranges: (start, end) document positions, one per cursor
+            text: Replacement text
+        """
+        merged: List[List[int]] = []
+        for start, end in sorted(ranges):
+            if merged and (start < merged[-1][1] or (start, end) == tuple(merged[-1])):
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
 
-        if not sorted_cursors:
-            return
+        # Document positions count UTF-16 code units
+        length = len(text.encode("utf-16-le")) // 2
+        # Ranges are clamped to the document as it was before the edit
+        last_position = self.editor.document().characterCount() - 1
+        cursor = QTextCursor(self.editor.document())
+        cursors: List[CursorInfo] = []
+        shift = 0
 
+        self._updating = True
         cursor.beginEditBlock()
-        for cursor_info in sorted_cursors:
-            cursor.setPosition(cursor_info.selection_start)
-            cursor.setPosition(cursor_info.selection_end, QTextCursor.KeepAnchor)
-            cursor.removeSelectedText()
-
-            # Update cursor positions after deletion
-            deleted_length = cursor_info.selection_end - cursor_info.selection_start
-            for other_cursor in self.cursors:
-                if other_cursor.position > cursor_info.selection_end:
-                    other_cursor.position -= deleted_length
-                    other_cursor.anchor -= deleted_length
-                elif other_cursor.position > cursor_info.selection_start:
-                    other_cursor.position = cursor_info.selection_start
-                    other_cursor.anchor = cursor_info.selection_start
-
-        cursor.endEditBlock()
+        try:
+            for start, end in merged:
+                end = min(end, last_position)
+                start = min(start, end)
+                if start != end or text:
+                    cursor.setPosition(start + shift)
+                    cursor.setPosition(end + shift, QTextCursor.KeepAnchor)
+                    cursor.insertText(text)
+                position = start + shift + length
+                if not cursors or cursors[-1].position != position:
+                    cursors.append(CursorInfo(position))
+                shift += length - (end - start)
+        finally:
+            cursor.endEditBlock()
+            self._updating = False
+
+        self.cursors = cursors
+        self.primary_cursor_index = min(self.primary_cursor_index, len(cursors) - 1)
         self.update_visual_indicators()
 
     def update_visual_indicators(self):
@@ -335,36 +341,42 @@ class MultiCursor(QObject):
             self.clear_visual_indicators()
             return
 
-        try:
-            extra_selections = []
-
-            for i, cursor_info in enumerate(self.cursors):
-                selection = QTextEdit.ExtraSelection()
-
-                if cursor_info.has_selection:
-                    # Highlight selection
-                    selection.format.setBackground(QColor(100, 100, 255, 100))  # Light blue
-                    selection.cursor = self.editor.textCursor()
-                    selection.cursor.setPosition(cursor_info.anchor)
-                    selection.cursor.setPosition(cursor_info.position, QTextCursor.KeepAnchor)
-                else:
-                    # Show cursor position
-                    selection.format.setBackground(QColor(255, 255, 255, 200))  # White
-                    selection.format.setProperty(QTextFormat.FullWidthSelection, False)
-                    selection.cursor = self.editor.textCursor()
-                    selection.cursor.setPosition(cursor_info.position)
-
-                extra_selections.append(selection)
-
-            self.editor.setExtraSelections(extra_selections)
-        except Exception as e:
-            # Gracefully handle errors in test environment
-            logger.debug(f"Error updating visual indicators: {e}")
+        decorations = self._get_decorations()
+        if decorations is None:
+            return
+
+        selection_format = QTextCharFormat()
+        selection_format.setBackground(QColor(100, 100, 255, 100))  # Light blue
+        caret_format = QTextCharFormat()
+        caret_format.setBackground(QColor(255, 255, 255, 200))  # White
+
+        selections = []
+        carets = []
+        for cursor_info in self.cursors:
+            if cursor_info.has_selection:
+                selections.append((cursor_info.selection_start, cursor_info.selection_end))
+            else:
+                carets.append((cursor_info.position, cursor_info.position))
+
+        decorations.set_ranges(
+            self.SELECTIONS_DECORATION, selections, selection_format, self.DECORATION_PRIORITY
+        )
+        decorations.set_ranges(
+            self.CARETS_DECORATION, carets, caret_format, self.DECORATION_PRIORITY
+        )
 
     def clear_visual_indicators(self):
         """Clear visual indicators."""
-        if self.editor:
-            self.editor.setExtraSelections([])
+        decorations = self._get_decorations()
+        if decorations is not None:
+            decorations.clear(self.SELECTIONS_DECORATION)
+            decorations.clear(self.CARETS_DECORATION)
+
+    def _get_decorations(self) -> Optional[DecorationCompositor]:
+        """Get the decoration compositor of the editor."""
+        if not isinstance(self.editor, QPlainTextEdit):
+            return None
+        return DecorationCompositor.for_editor(self.editor)
 
     def handle_key_press(self, event) -> bool:
         """Handle key press events for multi-cursor mode."""
@@ -413,58 +425,15 @@ class MultiCursor(QObject):
         if not self.is_active() or not self.editor:
             return
 
-        document = self.editor.document()
-        cursor = QTextCursor(document)
-
-        # Sort cursors by position (descending)
-        sorted_cursors = sorted(self.cursors, key=lambda c: c.position, reverse=True)
-
-        cursor.beginEditBlock()
-        for cursor_info in sorted_cursors:
-            if cursor_info.position > 0:
-                cursor.setPosition(cursor_info.position - 1)
-                cursor.setPosition(cursor_info.position, QTextCursor.KeepAnchor)
-                cursor.removeSelectedText()
-
-                # Update cursor positions
-                for other_cursor in self.cursors:
-                    if other_cursor.position > cursor_info.position:
-                        other_cursor.position -= 1
-                        other_cursor.anchor -= 1
-                    elif other_cursor.position == cursor_info.position:
-                        other_cursor.position -= 1
-                        other_cursor.anchor = other_cursor.position
-
-        cursor.endEditBlock()
-        self.update_visual_indicators()
+        self._replace_ranges([(max(c.position - 1, 0), c.position) for c in self.cursors], "")
 
     def delete_after_cursors(self):
         """Delete one character after each cursor."""
         if not self.is_active() or not self.editor:
             return
 
-        document = self.editor.document()
-        cursor = QTextCursor(document)
-        text = document.toPlainText()
-
-        # Sort cursors by position (descending)
-        sorted_cursors = sorted(self.cursors, key=lambda c: c.position, reverse=True)
-
-        cursor.beginEditBlock()
-        for cursor_info in sorted_cursors:
-            if cursor_info.position < len(text):
-                cursor.setPosition(cursor_info.position)
-                cursor.setPosition(cursor_info.position + 1, QTextCursor.KeepAnchor)
-                cursor.removeSelectedText()
-
-                # Update cursor positions
-                for other_cursor in self.cursors:
-                    if other_cursor.position > cursor_info.position:
-                        other_cursor.position -= 1
-                        other_cursor.anchor -= 1
-
-        cursor.endEditBlock()
-        self.update_visual_indicators()
+        # _replace_ranges clamps ranges to the end of the document
+        self._replace_ranges([(c.position, c.position + 1) for c in self.cursors], "")
 
     def get_cursor_count(self) -> int:
         """Get the number of active cursors."""
@@ -0,0 +1,249 @@
+"""Whole-document search with an incrementally updated match index."""
+
+import bisect
+import logging
+import re
+from array import array
+from typing import Iterator, List, Optional, Tuple
+
+from PySide6.QtGui import QTextCursor, QTextDocument
+
+from .block_index import BlockIndex
+
+logger = logging.getLogger(__name__)
+
+_NO_MATCHES = array("i")
+
+_ASTRAL = re.compile("[\U00010000-\U0010ffff]")
+
+
+def compile_search(
+    text: str, case_sensitive: bool = False, whole_word: bool = False, regex: bool = False
+) -> re.Pattern:
+    """
+    Compile a search for the find/replace options.
+
+    Raises:
+        re.error: If regex is set and text is not a valid expression
+    """
+    pattern = text if regex else re.escape(text)
+    if whole_word:
+        pattern = rf"\b(?:{pattern})\b"
+    return re.compile(pattern, 0 if case_sensitive else re.IGNORECASE)
+
+
+class DocumentSearchIndex(BlockIndex):
+    """
+    All matches of a search in a QTextDocument, kept up to date as it is edited.
+
+    The document is scanned once when the search changes; after that only
+    the blocks touched by an edit are rescanned. Each block keeps its
+    matches as an array of (column, length) pairs, so positions stay valid
+    when text before the block changes, and the number of matches before
+    each block is kept lazily for locating the n-th match.
+    """
+
+    def __init__(self, document: QTextDocument):
+        """
+        Initialize an index with no search.
+
+        Args:
+            document: Document to search; the index is owned by it
+        """
+        super().__init__(document)
+        self.pattern: Optional[re.Pattern] = None
+        self.count = 0
+        # Matches before each block, rebuilt after edits when needed
+        self._offsets: Optional[List[int]] = None
+        self.rebuild()
+
+    def set_pattern(self, pattern: Optional[re.Pattern]):
+        """Search for a new pattern, or stop searching with None."""
+        if pattern != self.pattern:
+            self.pattern = pattern
+            self.rebuild()
+
+    def matches_in_blocks(self, first: int, last: int) -> Iterator[Tuple[int, int]]:
+        """Get the (start, end) positions of matches in blocks first to last."""
+        if not self.count:
+            return
+        first = max(first, 0)
+        last = min(last, len(self._blocks) - 1)
+        block = self.document.findBlockByNumber(first)
+        for number in range(first, last + 1):
+            runs = self._blocks[number]
+            if runs:
+                position = block.position()
+                for i in range(0, len(runs), 2):
+                    start = position + runs[i]
+                    yield start, start + runs[i + 1]
+            block = block.next()
+
+    def matches(self) -> Iterator[Tuple[int, int]]:
+        """Get the (start, end) positions of all matches in document order."""
+        return self.matches_in_blocks(0, len(self._blocks) - 1)
+
+    def find(
+        self, position: int, backward: bool = False, wrap: bool = True
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Find the match after (or before) a position.
+
+        A forward search finds the first match starting at or after
+        position, a backward search the last match ending at or before it.
+
+        Returns:
+            The (start, end) of the match, or None if there is none
+        """
+        if not self.count:
+            return None
+
+        block = self.document.findBlock(position)
+        match = self._find_from(block, position, backward)
+        if match is None and wrap:
+            edge = self.document.lastBlock() if backward else self.document.firstBlock()
+            match = self._find_from(
+                edge, edge.position() + (edge.length() if backward else 0), backward
+            )
+        return match
+
+    def match_number(self, position: int) -> int:
+        """Get the number of matches that start before a position."""
+        if not self.count:
+            return 0
+        offsets = self._match_offsets()
+        block = self.document.findBlock(position)
+        number = block.blockNumber()
+        runs = self._blocks[number]
+        column = position - block.position()
+        before = sum(1 for i in range(0, len(runs), 2) if runs[i] < column)
+        return offsets[number] + before
+
+    def _find_from(self, block, position: int, backward: bool) -> Optional[Tuple[int, int]]:
+        """Scan blocks from block for the nearest match in a direction."""
+        blocks = self._blocks
+        number = block.blockNumber()
+        column = position - block.position()
+        step = -1 if backward else 1
+        while 0 <= number < len(blocks):
+            runs = blocks[number]
+            if runs:
+                starts = runs[0::2]
+                if backward:
+                    # Last match ending at or before column
+                    for i in range(len(starts) - 1, -1, -1):
+                        if starts[i] + runs[2 * i + 1] <= column:
+                            return self._absolute(block, starts[i], runs[2 * i + 1])
+                else:
+                    i = bisect.bisect_left(starts, column)
+                    if i < len(starts):
+                        return self._absolute(block, starts[i], runs[2 * i + 1])
+            block = block.previous() if backward else block.next()
+            number += step
+            column = block.length() if backward else 0
+        return None
+
+    @staticmethod
+    def _absolute(block, column: int, length: int) -> Tuple[int, int]:
+        start = block.position() + column
+        return start, start + length
+
+    def _match_offsets(self) -> List[int]:
+        if self._offsets is None:
+            offsets = []
+            total = 0
+            for runs in self._blocks:
+                offsets.append(total)
+                total += len(runs) // 2
+            self._offsets = offsets
+        return self._offsets
+
+    def _reset(self):
+        self.count = 0
+        self._offsets = None
+
+    def _scan(self, text: str) -> array:
+        """Find the matches in a block."""
+        if self.pattern is None or not text:
+            return _NO_MATCHES
+        # Document positions count UTF-16 code units, so characters outside
+        # the BMP take two
+        astral = None if text.isascii() else [m.start() for m in _ASTRAL.finditer(text)]
+        runs = None
+        for match in self.pattern.finditer(text):
+            start, end = match.span()
+            if start == end:
+                # Empty matches cannot be highlighted or replaced sensibly
+                continue
+            if astral:
+                start += bisect.bisect_left(astral, start)
+                end += bisect.bisect_left(astral, end)
+            if runs is None:
+                runs = array("i")
+            runs.append(start)
+            runs.append(end - start)
+        if runs is None:
+            return _NO_MATCHES
+        self.count += len(runs) // 2
+        return runs
+
+    def _discard(self, runs: array):
+        self.count -= len(runs) // 2
+
+    def _changed(self, first: int, last: int):
+        self._offsets = None
+
+
+def replace_all(index: DocumentSearchIndex, replacement: str, regex: bool = False) -> int:
+    """
+    Replace every match of an index's search in a single edit.
+
+    The text from the first to the last block with a match is rebuilt with
+    the replacements and inserted at once, so the document changes (and
+    is rescanned) once and the whole replacement is one undo step.
+
+    Args:
+        index: Search index whose matches are replaced
+        replacement: Replacement text; with regex, group references such as
+            \\1 are expanded
+        regex: Whether the search is a regular expression
+
+    Returns:
+        Number of replacements made
+
+    Raises:
+        re.error: If replacement refers to a group the search does not have
+    """
+    count = index.count
+    if not count:
+        return 0
+
+    blocks = index._blocks
+    first = next(number for number, runs in enumerate(blocks) if runs)
+    last = next(number for number in range(len(blocks) - 1, -1, -1) if blocks[number])
+
+    pattern = index.pattern
+    document = index.document
+
+    def substitute(match: re.Match) -> str:
+        if match.start() == match.end():
+            # Empty matches are not indexed, leave them alone
+            return match.group()
+        return match.expand(replacement) if regex else replacement
+
+    lines = []
+    block = document.findBlockByNumber(first)
+    for number in range(first, last + 1):
+        text = block.text()
+        if blocks[number]:
+            text = pattern.sub(substitute, text)
+        lines.append(text)
+        block = block.next()
+
+    start_block = document.findBlockByNumber(first)
+    end_block = document.findBlockByNumber(last)
+    cursor = QTextCursor(document)
+    cursor.setPosition(start_block.position())
+    cursor.setPosition(end_block.position() + end_block.length() - 1, QTextCursor.KeepAnchor)
+    cursor.insertText("\n".join(lines))
+    return count
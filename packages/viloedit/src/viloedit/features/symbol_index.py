@@ -0,0 +1,246 @@
+"""Incremental symbol index for document-based completion."""
+
+import re
+from typing import Dict, Iterable, List, Optional
+
+from PySide6.QtGui import QTextDocument
+
+from .block_index import BlockIndex
+
+# Patterns whose first group is a symbol name, per language
+SYMBOL_PATTERNS = {
+    "python": [
+        r"\b([a-zA-Z_]\w*)\s*=",  # Variable assignments
+        r"def\s+([a-zA-Z_]\w*)",  # Function definitions
+        r"class\s+([a-zA-Z_]\w*)",  # Class definitions
+        r"for\s+([a-zA-Z_]\w*)\s+in",  # For loop variables
+        r"import\s+([a-zA-Z_]\w*)",  # Import statements
+        r"from\s+\w+\s+import\s+([a-zA-Z_]\w*)",  # From import statements
+    ],
+    "javascript": [
+        r"\b(?:var|let|const)\s+([a-zA-Z_$]\w*)",  # Variable declarations
+        r"function\s+([a-zA-Z_$]\w*)",  # Function declarations
+        r"class\s+([a-zA-Z_$]\w*)",  # Class declarations
+        r"([a-zA-Z_$]\w*)\s*=",  # Assignments
+    ],
+}
+
+# Patterns for languages without their own entry
+GENERIC_PATTERNS = [
+    r"\b([a-zA-Z_]\w*)\s*=",  # Variable assignments
+    r"function\s+([a-zA-Z_]\w*)",  # Function definitions
+    r"def\s+([a-zA-Z_]\w*)",  # Function definitions
+]
+
+# Names never offered as symbols
+IGNORED_SYMBOLS = {"def", "class", "for", "if", "else", "try", "except"}
+
+_compiled_patterns: Dict[str, List[re.Pattern]] = {}
+
+
+def compile_patterns(language: str) -> List[re.Pattern]:
+    """Get the compiled symbol patterns for a language."""
+    patterns = _compiled_patterns.get(language)
+    if patterns is None:
+        sources = SYMBOL_PATTERNS.get(language, GENERIC_PATTERNS)
+        patterns = [re.compile(source, re.MULTILINE) for source in sources]
+        _compiled_patterns[language] = patterns
+    return patterns
+
+
+def extract_symbols(text: str, patterns: Iterable[re.Pattern]) -> List[str]:
+    """
+    Extract symbol names from text.
+
+    Returns every occurrence, so a name defined twice on a line is
+    counted twice by the index.
+    """
+    symbols = []
+    for pattern in patterns:
+        for match in pattern.finditer(text):
+            name = match.group(1)
+            if len(name) > 2 and name not in IGNORED_SYMBOLS:
+                symbols.append(name)
+    return symbols
+
+
+class _TrieNode:
+    """Node of a SymbolTrie."""
+
+    __slots__ = ("children", "count", "total")
+
+    def __init__(self):
+        self.children: Dict[str, _TrieNode] = {}
+        self.count = 0  # occurrences of the word ending here
+        self.total = 0  # occurrences of words in this subtree
+
+
+class SymbolTrie:
+    """
+    Prefix trie of symbol names with reference counts.
+
+    Every name is counted once per occurrence, so removing the lines that
+    define a name only drops it once no other line defines it.
+    """
+
+    def __init__(self):
+        self._root = _TrieNode()
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Number of distinct names."""
+        return self._size
+
+    def __contains__(self, word: str) -> bool:
+        node = self._find(word)
+        return node is not None and node.count > 0
+
+    def add(self, word: str, count: int = 1):
+        """Add occurrences of a name."""
+        node = self._root
+        node.total += count
+        for char in word:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _TrieNode()
+            child.total += count
+            node = child
+        if node.count == 0:
+            self._size += 1
+        node.count += count
+
+    def remove(self, word: str, count: int = 1):
+        """Remove occurrences of a name, pruning nodes that become empty."""
+        path = [self._root]
+        for char in word:
+            node = path[-1].children.get(char)
+            if node is None:
+                return
+            path.append(node)
+        count = min(count, path[-1].count)
+        if not count:
+            return
+
+        path[-1].count -= count
+        if path[-1].count == 0:
+            self._size -= 1
+        for node in path:
+            node.total -= count
+        for i in range(len(word), 0, -1):
+            if path[i].total:
+                break
+            del path[i - 1].children[word[i - 1]]
+
+    def clear(self):
+        """Remove all names."""
+        self._root = _TrieNode()
+        self._size = 0
+
+    def count(self, word: str) -> int:
+        """Number of occurrences of a name."""
+        node = self._find(word)
+        return node.count if node is not None else 0
+
+    def complete(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Get the names starting with a prefix, in sorted order.
+
+        Only the subtree under the prefix is visited, and the walk stops
+        after limit names.
+        """
+        node = self._find(prefix)
+        if node is None:
+            return []
+
+        results = []
+        stack = [(prefix, node)]
+        while stack:
+            word, node = stack.pop()
+            if node.count:
+                results.append(word)
+                if limit is not None and len(results) >= limit:
+                    break
+            # Push in reverse so the smallest child is visited first
+            for char in sorted(node.children, reverse=True):
+                stack.append((word + char, node.children[char]))
+        return results
+
+    def _find(self, word: str) -> Optional[_TrieNode]:
+        node = self._root
+        for char in word:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+
+class DocumentSymbolIndex(BlockIndex):
+    """
+    Symbols defined in a QTextDocument, kept up to date as it is edited.
+
+    Each block's symbols are kept with the block, so an edit only rescans
+    the blocks it touched, and the names are counted in a SymbolTrie.
+    """
+
+    def __init__(self, document: QTextDocument, language: str = "python"):
+        """
+        Initialize the index and scan the document.
+
+        Args:
+            document: Document to index; the index is owned by it
+            language: Language whose symbol patterns are used
+        """
+        super().__init__(document)
+        self.language = language
+        self.trie = SymbolTrie()
+        self._patterns = compile_patterns(language)
+        self.rebuild()
+
+    @classmethod
+    def for_document(cls, document: QTextDocument, language: str = "python"):
+        """Get the index of a document, creating it on first use."""
+        index = super().for_document(document, language)
+        index.set_language(language)
+        return index
+
+    def set_language(self, language: str):
+        """Switch the symbol patterns, rescanning the document if they change."""
+        if language != self.language:
+            self.language = language
+            self._patterns = compile_patterns(language)
+            self.rebuild()
+
+    def complete(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Get the indexed symbols starting with a prefix, in sorted order."""
+        return self.trie.complete(prefix, limit)
+
+    def nearby(self, block_number: int, radius: int) -> Dict[str, int]:
+        """
+        Get the symbols defined within radius blocks of a block.
+
+        Returns:
+            Mapping of name to its distance in blocks from block_number
+        """
+        distances: Dict[str, int] = {}
+        first = max(0, block_number - radius)
+        last = min(len(self._blocks) - 1, block_number + radius)
+        for number in range(first, last + 1):
+            distance = abs(number - block_number)
+            for name in self._blocks[number]:
+                if distances.get(name, radius + 1) > distance:
+                    distances[name] = distance
+        return distances
+
+    def _reset(self):
+        self.trie.clear()
+
+    def _scan(self, text: str) -> List[str]:
+        """Extract the symbols of a block and add them to the trie."""
+        symbols = extract_symbols(text, self._patterns)
+        for name in symbols:
+            self.trie.add(name)
+        return symbols
+
+    def _discard(self, symbols: List[str]):
+        for name in symbols:
+            self.trie.remove(name)
@@ -0,0 +1,398 @@
+"""Incremental file loading, reloading and atomic saving for the editor."""
+
+import bisect
+import codecs
+import difflib
+import io
+import logging
+import mmap
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtGui import QTextCursor, QTextDocument
+
+logger = logging.getLogger(__name__)
+
+# Files larger than this (in bytes) are loaded in chunks
+LARGE_FILE_THRESHOLD = 16 * 1024 * 1024
+
+# Bytes read and appended to the document per chunk
+LOAD_CHUNK_SIZE = 256 * 1024
+
+# Characters written per chunk when saving
+SAVE_CHUNK_SIZE = 1024 * 1024
+
+# Changed regions without unique lines to align on are diffed line by line up
+# to this many lines, and replaced whole beyond it
+DIFF_LINE_LIMIT = 500
+
+
+def _read_umask() -> int:
+    """Get the process umask."""
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# Read once at import: reading it means setting it, which would briefly give
+# files created by other threads the wrong permissions
+_UMASK = _read_umask()
+
+
+def detect_newline(newlines) -> str:
+    """
+    Get the line ending to save a file with from the ones it was read with.
+
+    Args:
+        newlines: The newlines attribute of the file or decoder that read
+            it: None, a line ending, or a tuple of them for mixed endings
+
+    Returns:
+        "\\n", "\\r\\n" or "\\r"; mixed endings save as "\\r\\n" if the file
+        had any, since stray "\\n" lines in CRLF files are the common case
+    """
+    if not newlines:
+        return "\n"
+    if isinstance(newlines, str):
+        return newlines
+    return "\r\n" if "\r\n" in newlines else "\n"
+
+
+class ChunkedFileLoader(QObject):
+    """
+    Loads a file into a QTextDocument a chunk at a time.
+
+    The file is memory-mapped and decoded incrementally, and each chunk is
+    appended to the document from a zero-delay timer, so the event loop
+    keeps running while a large file loads and the file contents never
+    exist as a single Python string next to the document.
+    """
+
+    # Milliseconds of UI time spent appending per event loop iteration
+    TIME_BUDGET_MS = 16
+
+    progress = Signal(int, int)  # bytes_loaded, total_bytes
+    finished = Signal(str)  # file_path
+    failed = Signal(str, str)  # file_path, error
+
+    def __init__(self, document: QTextDocument, file_path: str, parent=None):
+        """
+        Initialize the loader.
+
+        Args:
+            document: Document to load into; it is cleared when loading starts
+            file_path: File to load
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self.document = document
+        self.file_path = file_path
+        self.offset = 0
+        self.size = 0
+
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder("utf-8")(), translate=True
+        )
+        self._cursor: Optional[QTextCursor] = None
+        self._undo_enabled = True
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._load_next)
+
+    @property
+    def loading(self) -> bool:
+        """Whether the load is still in progress."""
+        return self._file is not None
+
+    @property
+    def newline(self) -> str:
+        """Line ending of the file, as far as it has been read."""
+        return detect_newline(self._decoder.newlines)
+
+    def start(self):
+        """Start loading."""
+        try:
+            # Kept open across timer callbacks and closed in _close
+            self._file = open(self.file_path, "rb")  # noqa: SIM115
+            self.size = os.fstat(self._file.fileno()).st_size
+            if self.size:
+                try:
+                    self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                except (OSError, ValueError) as e:
+                    # Not mappable (special or network file), read it instead
+                    logger.debug(f"Cannot mmap {self.file_path}, reading instead: {e}")
+        except OSError as e:
+            self._finish(str(e))
+            return
+
+        # Loading is not an undoable edit
+        self._undo_enabled = self.document.isUndoRedoEnabled()
+        self.document.setUndoRedoEnabled(False)
+        self.document.clear()
+        self._cursor = QTextCursor(self.document)
+        self._timer.start()
+
+    def cancel(self):
+        """Stop loading, keeping what has been loaded so far."""
+        self._timer.stop()
+        self._close()
+
+    def _read_chunk(self) -> bytes:
+        """Read the next chunk of the file."""
+        if self._mmap is not None:
+            chunk = self._mmap[self.offset : self.offset + LOAD_CHUNK_SIZE]
+        else:
+            chunk = self._file.read(LOAD_CHUNK_SIZE)
+        self.offset += len(chunk)
+        return chunk
+
+    def _load_next(self):
+        """Append chunks until the time budget is used up."""
+        deadline = time.perf_counter() + self.TIME_BUDGET_MS / 1000
+        try:
+            while time.perf_counter() < deadline:
+                chunk = self._read_chunk()
+                final = not chunk or (self._mmap is not None and self.offset >= self.size)
+                text = self._decoder.decode(chunk, final=final)
+                if text:
+                    self._cursor.movePosition(QTextCursor.End)
+                    self._cursor.insertText(text)
+                if final:
+                    self._finish()
+                    return
+        except (OSError, UnicodeDecodeError) as e:
+            self._finish(str(e))
+            return
+
+        self.progress.emit(self.offset, self.size)
+        self._timer.start()
+
+    def _close(self):
+        """Release the file and restore the document."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._cursor is not None:
+            self._cursor = None
+            self.document.setUndoRedoEnabled(self._undo_enabled)
+
+    def _finish(self, error: Optional[str] = None):
+        """Complete the load and report the result."""
+        self._close()
+        if error:
+            logger.error(f"Failed to load file {self.file_path}: {error}")
+            self.failed.emit(self.file_path, error)
+        else:
+            self.document.setModified(False)
+            self.progress.emit(self.size, self.size)
+            self.finished.emit(self.file_path)
+
+
+def _lines(text: str) -> List[str]:
+    """Split text into lines that keep their newline, so they join back exactly."""
+    lines = text.split("\n")
+    return [line + "\n" for line in lines[:-1]] + [lines[-1]]
+
+
+def _unique_matches(
+    old: List[str], new: List[str], i1: int, i2: int, j1: int, j2: int
+) -> List[Tuple[int, int]]:
+    """
+    Pair up lines occurring once in each range, keeping the longest run in order.
+
+    This is the anchoring step of patience diff: the pairs are sorted by
+    their old line, and a longest increasing subsequence of their new lines
+    is found in O(n log n).
+    """
+    # Line -> [count in old, count in new, old index, new index]
+    counts: Dict[str, List[int]] = {}
+    for i in range(i1, i2):
+        entry = counts.setdefault(old[i], [0, 0, i, 0])
+        entry[0] += 1
+    for j in range(j1, j2):
+        entry = counts.get(new[j])
+        if entry is not None:
+            entry[1] += 1
+            entry[3] = j
+    pairs = sorted((i, j) for n_old, n_new, i, j in counts.values() if n_old == n_new == 1)
+
+    # Patience sorting: tails[k] is the smallest new index ending a run of k + 1
+    tails: List[int] = []
+    tail_pairs: List[Tuple[int, int]] = []
+    previous: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {}
+    for pair in pairs:
+        k = bisect.bisect_left(tails, pair[1])
+        previous[pair] = tail_pairs[k - 1] if k else None
+        if k == len(tails):
+            tails.append(pair[1])
+            tail_pairs.append(pair)
+        else:
+            tails[k] = pair[1]
+            tail_pairs[k] = pair
+
+    matches = []
+    pair = tail_pairs[-1] if tail_pairs else None
+    while pair is not None:
+        matches.append(pair)
+        pair = previous[pair]
+    matches.reverse()
+    return matches
+
+
+def diff_lines(old: List[str], new: List[str]) -> List[Tuple[int, int, int, int]]:
+    """
+    Find the ranges of lines that differ between two lists of lines.
+
+    Common leading and trailing lines are skipped, then the rest is aligned
+    on lines that occur once in each (patience diff) and the gaps between
+    them are compared the same way. Gaps without such lines are diffed with
+    difflib when small and replaced whole otherwise, so the cost stays close
+    to linear for large files with few changes.
+
+    Returns:
+        (i1, i2, j1, j2) ranges in order, where old[i1:i2] becomes new[j1:j2]
+    """
+    changes: List[Tuple[int, int, int, int]] = []
+    # Ranges still to compare, the next one last
+    pending = [(0, len(old), 0, len(new))]
+    while pending:
+        i1, i2, j1, j2 = pending.pop()
+        while i1 < i2 and j1 < j2 and old[i1] == new[j1]:
+            i1 += 1
+            j1 += 1
+        while i1 < i2 and j1 < j2 and old[i2 - 1] == new[j2 - 1]:
+            i2 -= 1
+            j2 -= 1
+        if i1 == i2 or j1 == j2:
+            if i1 != i2 or j1 != j2:
+                changes.append((i1, i2, j1, j2))
+            continue
+
+        matches = _unique_matches(old, new, i1, i2, j1, j2)
+        if matches:
+            gaps = []
+            for i, j in matches:
+                gaps.append((i1, i, j1, j))
+                i1, j1 = i + 1, j + 1
+            gaps.append((i1, i2, j1, j2))
+            pending.extend(reversed(gaps))
+        elif max(i2 - i1, j2 - j1) <= DIFF_LINE_LIMIT:
+            matcher = difflib.SequenceMatcher(None, old[i1:i2], new[j1:j2], autojunk=False)
+            changes.extend(
+                (a1 + i1, a2 + i1, b1 + j1, b2 + j1)
+                for tag, a1, a2, b1, b2 in matcher.get_opcodes()
+                if tag != "equal"
+            )
+        else:
+            changes.append((i1, i2, j1, j2))
+    return changes
+
+
+def apply_text_diff(document: QTextDocument, text: str) -> int:
+    """
+    Change a document's text to text by editing only the lines that differ.
+
+    The edits are found with diff_lines and applied from the end in a
+    single edit block, so their number and size follow the change rather
+    than the document. Cursors and the scroll position outside the changed
+    lines stay where they are, and the change is one undo step.
+
+    Args:
+        document: Document to change
+        text: New text, with "\\n" line endings
+
+    Returns:
+        Number of edits made
+    """
+    old = _lines(document.toPlainText())
+    new = _lines(text)
+    changes = diff_lines(old, new)
+    if not changes:
+        return 0
+
+    def offset(line: int) -> int:
+        if line < len(old):
+            return document.findBlockByNumber(line).position()
+        return document.characterCount() - 1
+
+    cursor = QTextCursor(document)
+    cursor.beginEditBlock()
+    # From the end, so the lines before each edit keep their positions
+    for i1, i2, j1, j2 in reversed(changes):
+        cursor.setPosition(offset(i1))
+        cursor.setPosition(offset(i2), QTextCursor.KeepAnchor)
+        cursor.insertText("".join(new[j1:j2]))
+    cursor.endEditBlock()
+    return len(changes)
+
+
+def save_document(document: QTextDocument, file_path: Path, newline: str = "\n") -> None:
+    """
+    Save a document atomically.
+
+    The text is streamed to a temporary file next to the target in chunks,
+    flushed to disk and then renamed over the target, so a failed save never
+    leaves a truncated file behind and no full copy of the text is made.
+    A symlinked target is resolved first, so the link keeps pointing to the
+    saved file.
+
+    Args:
+        document: Document to save
+        file_path: Target file
+        newline: Line ending to write
+
+    Raises:
+        OSError: If the file could not be written
+    """
+    file_path = Path(os.path.realpath(file_path))
+    fd, tmp_path = tempfile.mkstemp(
+        dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline=newline) as f:
+            cursor = QTextCursor(document)
+            end = document.characterCount() - 1
+            position = 0
+            while position < end:
+                # End chunks at block boundaries so they never split a
+                # surrogate pair; a block longer than a chunk is written whole
+                chunk_end = position + SAVE_CHUNK_SIZE
+                if chunk_end >= end:
+                    chunk_end = end
+                else:
+                    block = document.findBlock(chunk_end)
+                    chunk_end = block.position()
+                    if chunk_end <= position:
+                        chunk_end = min(block.position() + block.length(), end)
+                cursor.setPosition(position)
+                cursor.setPosition(chunk_end, QTextCursor.KeepAnchor)
+                # Block separators come back as U+2029
+                f.write(cursor.selectedText().replace("\u2029", "\n"))
+                position = chunk_end
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Keep the permissions of the file being replaced
+        try:
+            os.chmod(tmp_path, os.stat(file_path).st_mode & 0o7777)
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o666 & ~_UMASK)
+
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,156 @@
+"""Shared watcher for external changes to files open in editors."""
+
+import logging
+import os
+from functools import partial
+from typing import Dict, Optional, Set, Tuple
+
+from PySide6.QtCore import (
+    QCoreApplication,
+    QFileSystemWatcher,
+    QMetaObject,
+    QObject,
+    QTimer,
+    Signal,
+)
+
+logger = logging.getLogger(__name__)
+
+# What a file looked like on disk: (modification time in ns, size), None if missing
+Signature = Optional[Tuple[int, int]]
+
+
+def file_signature(file_path: str) -> Signature:
+    """Get the on-disk signature of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _disconnect(connections: Dict[Tuple[str, int], QMetaObject.Connection], *_):
+    """Disconnect a watcher from the owners it still tracks."""
+    for connection in connections.values():
+        QObject.disconnect(connection)
+    connections.clear()
+
+
+class FileWatcher(QObject):
+    """
+    Watches the files of all open editors with a single QFileSystemWatcher.
+
+    Editors register the files they show with watch(). Change notifications
+    are collected and handled together after DEBOUNCE_MS, so a tool writing
+    a file in several steps causes one notification per file, and a file is
+    only reported when its signature differs from the last one reported.
+    Every owner is told about every change, including saves by another
+    editor; an editor compares the signature with the one it last loaded or
+    saved to ignore its own writes. Files replaced by a rename, as atomic
+    saves do, drop out of QFileSystemWatcher and are added back.
+    """
+
+    # Milliseconds to wait for a burst of changes to a file to settle
+    DEBOUNCE_MS = 200
+
+    file_changed = Signal(str)  # file_path
+
+    _instance: Optional["FileWatcher"] = None
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        # Watched path -> ids of the editors watching it, and last signature
+        self._watchers: Dict[str, Set[int]] = {}
+        self._signatures: Dict[str, Signature] = {}
+        self._pending: Set[str] = set()
+        # (watched path, owner id) -> connection to the owner's destroyed signal
+        self._connections: Dict[Tuple[str, int], QMetaObject.Connection] = {}
+        # Owners can outlive the watcher at shutdown; they must not call back
+        # into it then. Not a method, which would not run during destruction.
+        self.destroyed.connect(partial(_disconnect, self._connections))
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.DEBOUNCE_MS)
+        self._timer.timeout.connect(self._check_pending)
+
+    @classmethod
+    def get_instance(cls) -> "FileWatcher":
+        """Get the watcher shared by all editors."""
+        if cls._instance is None:
+            # Owned by the application, so it lives as long as any editor can
+            cls._instance = cls(QCoreApplication.instance())
+        return cls._instance
+
+    def watch(self, file_path: str, owner: QObject):
+        """
+        Watch a file for an owner, usually an editor.
+
+        Watching a file again after writing it puts it back in the watcher
+        if the write replaced it. An owner that is destroyed stops watching.
+        """
+        file_path = os.path.abspath(file_path)
+        owners = self._watchers.setdefault(file_path, set())
+        if not owners:
+            # Only changes after this are reported
+            self._signatures[file_path] = file_signature(file_path)
+        key = id(owner)
+        if key not in owners:
+            owners.add(key)
+            self._connections[(file_path, key)] = owner.destroyed.connect(
+                partial(self._on_owner_destroyed, file_path, key)
+            )
+        self._add_path(file_path)
+
+    def unwatch(self, file_path: str, owner: QObject):
+        """Stop watching a file for an owner."""
+        self._forget(os.path.abspath(file_path), id(owner))
+
+    def is_watched(self, file_path: str) -> bool:
+        """Whether any owner watches a file."""
+        return bool(self._watchers.get(os.path.abspath(file_path)))
+
+    def _add_path(self, file_path: str):
+        if os.path.exists(file_path) and file_path not in self._watcher.files():
+            self._watcher.addPath(file_path)
+
+    def _on_owner_destroyed(self, file_path: str, key: int, *_):
+        self._connections.pop((file_path, key), None)
+        self._forget(file_path, key)
+
+    def _forget(self, file_path: str, key: int):
+        connection = self._connections.pop((file_path, key), None)
+        if connection is not None:
+            QObject.disconnect(connection)
+
+        owners = self._watchers.get(file_path)
+        if owners is None:
+            return
+        owners.discard(key)
+        if not owners:
+            del self._watchers[file_path]
+            self._signatures.pop(file_path, None)
+            self._pending.discard(file_path)
+            if file_path in self._watcher.files():
+                self._watcher.removePath(file_path)
+
+    def _on_file_changed(self, file_path: str):
+        """Collect a change notification until the burst settles."""
+        self._pending.add(file_path)
+        self._timer.start()
+
+    def _check_pending(self):
+        """Report the collected files whose signature changed."""
+        pending, self._pending = self._pending, set()
+        for file_path in sorted(pending):
+            if file_path not in self._watchers:
+                continue
+            self._add_path(file_path)
+            signature = file_signature(file_path)
+            if signature == self._signatures.get(file_path):
+                continue
+            self._signatures[file_path] = signature
+            logger.debug(f"File changed on disk: {file_path}")
+            self.file_changed.emit(file_path)
@@ -0,0 +1,178 @@
+"""Line number gutter rendering with cached line numbers and markers."""
+
+import logging
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from PySide6.QtCore import QPointF, QRect, QRectF, Qt
+from PySide6.QtGui import QColor, QFont, QPainter, QPen, QPixmap, QStaticText, QTextOption
+from PySide6.QtWidgets import QPlainTextEdit, QWidget
+
+logger = logging.getLogger(__name__)
+
+
+class GutterRenderer:
+    """
+    Paints the line number gutter of a QPlainTextEdit.
+
+    Line numbers are drawn from QStaticText objects cached per number, so
+    their glyphs are laid out once instead of on every paint, and the pen,
+    colors and font metrics are kept until the theme or font changes.
+    Markers such as folds or diagnostics are shown in a column left of the
+    numbers from a pixmap cached per marker kind. Only the blocks in the
+    area being repainted are visited.
+    """
+
+    # Space between the numbers and the text
+    PADDING = 3
+
+    # Line numbers kept laid out; scrolling a long file replaces the oldest
+    MAX_CACHED_NUMBERS = 4096
+
+    def __init__(self, editor: QPlainTextEdit):
+        """
+        Initialize the renderer.
+
+        Args:
+            editor: Editor whose blocks are numbered
+        """
+        self.editor = editor
+        self.background = QColor("#2d2d30")
+        self._pen = QPen(QColor("#858585"))
+        self._font: Optional[QFont] = None
+        self._digit_width = 0
+        self._line_height = 0
+        self._numbers: Dict[int, Tuple[QStaticText, float]] = {}
+
+        # Marker kind -> (color, priority) and the block numbers marked with it
+        self._marker_kinds: Dict[str, Tuple[QColor, int]] = {}
+        self._markers: Dict[str, Set[int]] = {}
+        self._marker_pixmaps: Dict[str, QPixmap] = {}
+
+    def set_colors(self, background: str, foreground: str):
+        """Set the gutter's background and line number colors."""
+        self.background = QColor(background)
+        self._pen = QPen(QColor(foreground))
+
+    def define_marker(self, kind: str, color: str, priority: int = 0):
+        """
+        Define a kind of marker.
+
+        Args:
+            kind: Name of the marker kind, e.g. "error" or "fold"
+            color: Color the marker is drawn in
+            priority: When a line has several markers the highest is shown
+        """
+        self._marker_kinds[kind] = (QColor(color), priority)
+        self._marker_pixmaps.pop(kind, None)
+
+    def set_markers(self, kind: str, lines: Iterable[int]):
+        """Mark lines (block numbers) with a kind of marker, replacing its previous lines."""
+        if kind not in self._marker_kinds:
+            raise ValueError(f"Unknown marker kind: {kind}")
+        self._markers[kind] = set(lines)
+
+    def clear_markers(self, kind: str):
+        """Remove all markers of a kind."""
+        self._markers.pop(kind, None)
+
+    def marker_at(self, line: int) -> Optional[str]:
+        """Get the kind of marker shown on a line, if any."""
+        shown = None
+        for kind, lines in self._markers.items():
+            if line in lines and (
+                shown is None or self._marker_kinds[kind][1] > self._marker_kinds[shown][1]
+            ):
+                shown = kind
+        return shown
+
+    def width(self, block_count: int) -> int:
+        """Get the gutter width needed for a number of blocks."""
+        self._update_font()
+        digits = len(str(max(1, block_count)))
+        return self.PADDING + self._digit_width * digits + self._marker_width()
+
+    def paint(self, area: QWidget, rect: QRect):
+        """Paint the part of the gutter in rect."""
+        self._update_font()
+        editor = self.editor
+        painter = QPainter(area)
+        painter.fillRect(rect, self.background)
+        painter.setPen(self._pen)
+        painter.setFont(self._font)
+
+        block = editor.firstVisibleBlock()
+        number = block.blockNumber()
+        top = editor.blockBoundingGeometry(block).translated(editor.contentOffset()).top()
+        # Without wrapping every visible block is one line high
+        uniform = (
+            editor.lineWrapMode() == QPlainTextEdit.NoWrap
+            or editor.wordWrapMode() == QTextOption.NoWrap
+        )
+        height = editor.blockBoundingRect(block).height()
+        right = area.width()
+        marker_width = self._marker_width()
+        bottom_edge = rect.bottom()
+        top_edge = rect.top()
+
+        while block.isValid() and top <= bottom_edge:
+            if block.isVisible():
+                if not uniform:
+                    height = editor.blockBoundingRect(block).height()
+                bottom = top + height
+                if bottom >= top_edge:
+                    text, text_width = self._number(number + 1)
+                    painter.drawStaticText(QPointF(right - text_width, top), text)
+                    if marker_width:
+                        kind = self.marker_at(number)
+                        if kind is not None:
+                            painter.drawPixmap(0, int(top), self._marker_pixmap(kind))
+                top = bottom
+            block = block.next()
+            number += 1
+
+        painter.end()
+
+    def _update_font(self):
+        """Drop cached layouts when the editor's font changed."""
+        font = self.editor.font()
+        if self._font is not None and font == self._font:
+            return
+        self._font = QFont(font)
+        metrics = self.editor.fontMetrics()
+        self._digit_width = metrics.horizontalAdvance("9")
+        self._line_height = metrics.height()
+        self._numbers.clear()
+        self._marker_pixmaps.clear()
+
+    def _number(self, number: int) -> Tuple[QStaticText, float]:
+        """Get the laid out text of a line number and its width."""
+        cached = self._numbers.get(number)
+        if cached is None:
+            if len(self._numbers) >= self.MAX_CACHED_NUMBERS:
+                # Dictionaries keep insertion order, drop the oldest
+                del self._numbers[next(iter(self._numbers))]
+            text = QStaticText(str(number))
+            text.setTextFormat(Qt.PlainText)
+            text.prepare(font=self._font)
+            cached = (text, text.size().width())
+            self._numbers[number] = cached
+        return cached
+
+    def _marker_width(self) -> int:
+        return self._line_height if self._marker_kinds else 0
+
+    def _marker_pixmap(self, kind: str) -> QPixmap:
+        pixmap = self._marker_pixmaps.get(kind)
+        if pixmap is None:
+            size = self._line_height
+            pixmap = QPixmap(size, size)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self._marker_kinds[kind][0])
+            margin = size / 4
+            painter.drawEllipse(QRectF(margin, margin, size - 2 * margin, size - 2 * margin))
+            painter.end()
+            self._marker_pixmaps[kind] = pixmap
+        return pixmap
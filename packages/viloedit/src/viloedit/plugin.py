@@ -39,6 +39,7 @@ class EditorPlugin(IPlugin):
             activation_events=[
                 "onCommand:editor.open",
                 "onCommand:editor.new",
+                "onWidget:editor",
                 "onLanguage:python",
                 "onLanguage:javascript",
                 "workspaceContains:**/*.py",
@@ -49,7 +50,14 @@ class EditorPlugin(IPlugin):
                 PluginCapability.LANGUAGES,
             ],
             contributes={
-                "widgets": [{"id": "editor", "factory": "viloedit.widget:EditorWidgetFactory"}],
+                "widgets": [
+                    {
+                        "id": "editor",
+                        "title": "Editor",
+                        "icon": "file-text",
+                        "factory": "viloedit.widget:EditorWidgetFactory",
+                    }
+                ],
                 "commands": [
                     {"id": "editor.open", "title": "Open File", "category": "Editor"},
                     {"id": "editor.save", "title": "Save File", "category": "Editor"},
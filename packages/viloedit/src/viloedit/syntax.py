@@ -1,13 +1,13 @@
 """Syntax highlighting for editor."""
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
 from PySide6.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QFont
 
 try:
-    from pygments import lex
-    from pygments.token import Token
+    from pygments.lexer import ExtendedRegexLexer, LexerContext, RegexLexer
+    from pygments.token import Error, Token, Whitespace, _TokenType
 
     PYGMENTS_AVAILABLE = True
 except ImportError:
@@ -15,13 +15,145 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Lexer state stack at the start of a document
+ROOT_STATE: Tuple[str, ...] = ("root",)
+
+
+class LineLexer:
+    """
+    Lexes a document one line at a time.
+
+    For Pygments regex lexers the lexer state stack at the end of a line is
+    returned so the next line can continue from it; this is what makes
+    multi-line strings and comments highlight correctly when lines are
+    lexed separately. Other lexers are lexed line by line without state.
+    """
+
+    def __init__(self, lexer):
+        self.lexer = lexer
+        self.stateful = PYGMENTS_AVAILABLE and isinstance(lexer, RegexLexer)
+
+    def lex_line(
+        self, text: str, stack: Tuple[str, ...] = ROOT_STATE
+    ) -> Tuple[List[Tuple[int, int, Any]], Tuple[str, ...]]:
+        """
+        Lex a single line.
+
+        Args:
+            text: Line text without the trailing newline
+            stack: Lexer state stack at the start of the line
+
+        Returns:
+            Tuple of ([(start, length, token_type)], stack at the end of the line)
+        """
+        # Lex with the newline so end-of-line rules (comments, line
+        # continuations, string states) behave as in a full-document lex
+        line = text + "\n"
+
+        if not self.stateful:
+            tokens = self.lexer.get_tokens_unprocessed(line)
+            end_stack = ROOT_STATE
+        elif isinstance(self.lexer, ExtendedRegexLexer):
+            context = LexerContext(line, 0, list(stack))
+            tokens = list(self.lexer.get_tokens_unprocessed(context=context))
+            end_stack = tuple(context.stack)
+        else:
+            tokens, end_stack = self._lex_regex(line, stack)
+
+        result = []
+        text_length = len(text)
+        for start, token_type, value in tokens:
+            if start >= text_length:
+                break
+            length = min(len(value), text_length - start)
+            if length > 0:
+                result.append((start, length, token_type))
+        return result, end_stack
+
+    def _lex_regex(self, text: str, stack: Tuple[str, ...]):
+        """
+        Lex with a RegexLexer and return the final state stack.
+
+        Mirrors RegexLexer.get_tokens_unprocessed, which does not expose the
+        state stack it ends in.
+        """
+        lexer = self.lexer
+        tokendefs = lexer._tokens
+        statestack = [state for state in stack if state in tokendefs] or list(ROOT_STATE)
+        statetokens = tokendefs[statestack[-1]]
+        tokens = []
+        pos = 0
+
+        while True:
+            for rexmatch, action, new_state in statetokens:
+                m = rexmatch(text, pos)
+                if not m:
+                    continue
+
+                if action is not None:
+                    if type(action) is _TokenType:
+                        tokens.append((pos, action, m.group()))
+                    else:
+                        tokens.extend(action(lexer, m))
+                pos = m.end()
+
+                if new_state is not None:
+                    if isinstance(new_state, tuple):
+                        for state in new_state:
+                            if state == "#pop":
+                                if len(statestack) > 1:
+                                    statestack.pop()
+                            elif state == "#push":
+                                statestack.append(statestack[-1])
+                            else:
+                                statestack.append(state)
+                    elif isinstance(new_state, int):
+                        # Pop, but keep at least one state on the stack
+                        if abs(new_state) >= len(statestack):
+                            del statestack[1:]
+                        else:
+                            del statestack[new_state:]
+                    elif new_state == "#push":
+                        statestack.append(statestack[-1])
+                    statetokens = tokendefs[statestack[-1]]
+                break
+            else:
+                # No rule matched
+                if pos >= len(text):
+                    break
+                if text[pos] == "\n":
+                    # At EOL, reset state to "root"
+                    statestack = list(ROOT_STATE)
+                    statetokens = tokendefs["root"]
+                    tokens.append((pos, Whitespace, "\n"))
+                else:
+                    tokens.append((pos, Error, text[pos]))
+                pos += 1
+
+        return tokens, tuple(statestack)
+
 
 class SyntaxHighlighter(QSyntaxHighlighter):
-    """Syntax highlighter using Pygments."""
+    """
+    Syntax highlighter using Pygments.
+
+    Each block stores the lexer state it ends in as its block state, so
+    QSyntaxHighlighter only re-highlights from an edited block until the
+    state of the following blocks stops changing.
+    """
 
     def __init__(self, document, lexer=None):
         super().__init__(document)
         self.lexer = lexer
+        self._line_lexer = LineLexer(lexer) if lexer and PYGMENTS_AVAILABLE else None
+
+        # Lexer state stacks interned to the ints stored as block states
+        self._states: List[Tuple[str, ...]] = [ROOT_STATE]
+        self._state_ids: Dict[Tuple[str, ...], int] = {ROOT_STATE: 0}
+
+        # Token type -> format (None when the token is not highlighted)
+        self._format_cache: Dict[Any, Optional[QTextCharFormat]] = {}
+
         self.setup_formats()
 
     def setup_formats(self):
@@ -65,49 +197,84 @@ class SyntaxHighlighter(QSyntaxHighlighter):
         variable_format.setForeground(QColor("#9cdcfe"))
         self.formats["variable"] = variable_format
 
+        self._format_cache.clear()
+
+        # Token type -> format name, checked from the most specific token type up
+        if PYGMENTS_AVAILABLE:
+            self._token_format_names = {
+                Token.Keyword: "keyword",
+                Token.String: "string",
+                Token.Comment: "comment",
+                Token.Name.Function: "function",
+                Token.Name.Class: "class",
+                Token.Name.Variable: "variable",
+                Token.Number: "number",
+            }
+
+    def set_lexer(self, lexer, rehighlight: bool = True):
+        """
+        Change the lexer.
+
+        Args:
+            lexer: Pygments lexer, or None to disable highlighting
+            rehighlight: Re-highlight the current document. Pass False when the
+                document text is about to be replaced anyway.
+        """
+        self.lexer = lexer
+        self._line_lexer = LineLexer(lexer) if lexer and PYGMENTS_AVAILABLE else None
+        self._states = [ROOT_STATE]
+        self._state_ids = {ROOT_STATE: 0}
+        if rehighlight:
+            self.rehighlight()
+
     def highlightBlock(self, text):
         """Highlight a block of text."""
-        if not self.lexer or not PYGMENTS_AVAILABLE:
+        if not self._line_lexer:
             return
 
-        try:
-            # Use Pygments to tokenize
-            tokens = list(lex(text, self.lexer))
-
-            index = 0
-            for token_type, token_text in tokens:
-                length = len(token_text)
+        previous_state = self.previousBlockState()
+        if 0 <= previous_state < len(self._states):
+            stack = self._states[previous_state]
+        else:
+            stack = ROOT_STATE
 
-                # Map token type to format
-                format = self.get_format_for_token(token_type)
-                if format:
-                    self.setFormat(index, length, format)
-
-                index += length
+        try:
+            tokens, end_stack = self._line_lexer.lex_line(text, stack)
         except Exception as e:
             logger.debug(f"Syntax highlighting error: {e}")
+            self.setCurrentBlockState(0)
+            return
+
+        for start, length, token_type in tokens:
+            char_format = self.get_format_for_token(token_type)
+            if char_format:
+                self.setFormat(start, length, char_format)
+
+        state_id = self._state_id(end_stack)
+        if state_id != self.currentBlockState():
+            self.setCurrentBlockState(state_id)
 
     def get_format_for_token(self, token_type):
         """Get format for a token type."""
         if not PYGMENTS_AVAILABLE:
             return None
 
-        if token_type in Token.Keyword:
-            return self.formats["keyword"]
-        elif token_type in Token.String:
-            return self.formats["string"]
-        elif token_type in Token.Comment:
-            return self.formats["comment"]
-        elif token_type in Token.Name.Function:
-            return self.formats["function"]
-        elif token_type in Token.Name.Class:
-            return self.formats["class"]
-        elif token_type in Token.Name.Variable:
-            return self.formats["variable"]
-        elif token_type in Token.Number:
-            return self.formats["number"]
-
-        return None
+        try:
+            return self._format_cache[token_type]
+        except KeyError:
+            pass
+
+        char_format = None
+        ttype = token_type
+        while ttype is not None:
+            name = self._token_format_names.get(ttype)
+            if name:
+                char_format = self.formats[name]
+                break
+            ttype = ttype.parent
+
+        self._format_cache[token_type] = char_format
+        return char_format
 
     def update_theme(self, theme_data: Dict[str, Any]):
         """Update highlighter colors based on theme."""
@@ -121,3 +288,12 @@ class SyntaxHighlighter(QSyntaxHighlighter):
 
         # Re-highlight document
         self.rehighlight()
+
+    def _state_id(self, stack: Tuple[str, ...]) -> int:
+        """Get the block state id for a lexer state stack."""
+        state_id = self._state_ids.get(stack)
+        if state_id is None:
+            state_id = len(self._states)
+            self._states.append(stack)
+            self._state_ids[stack] = state_id
+        return state_id
@@ -1,9 +1,12 @@
 """Editor widget factory."""
 
 import logging
+import os
+from functools import partial
+from pathlib import Path
 from typing import Optional, Dict, Any
 
-from PySide6.QtWidgets import QWidget
+from PySide6.QtWidgets import QMessageBox, QWidget
 from viloapp_sdk import IWidget
 
 from .editor import CodeEditor
@@ -32,9 +35,35 @@ class EditorWidgetFactory(IWidget):
     def create_instance(self, instance_id: str) -> QWidget:
         """Create widget instance with unique ID."""
         widget = CodeEditor()
+        widget.file_changed_on_disk.connect(partial(self._on_file_changed_on_disk, widget))
         self._instances[instance_id] = widget
         return widget
 
+    def _on_file_changed_on_disk(self, widget: CodeEditor, file_path: str) -> None:
+        """Ask whether to overwrite or reload a file that changed on disk."""
+        name = Path(file_path).name
+
+        if not os.path.exists(file_path):
+            reply = QMessageBox.question(
+                widget,
+                "File Removed",
+                f"{name} was removed from disk. Do you want to save it again?",
+                QMessageBox.Save | QMessageBox.Cancel,
+            )
+        else:
+            reply = QMessageBox.question(
+                widget,
+                "File Changed",
+                f"{name} changed on disk. Save to overwrite it with your changes, "
+                "or discard your changes and reload it?",
+                QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel,
+            )
+
+        if reply == QMessageBox.Save:
+            widget.save_file(overwrite=True)
+        elif reply == QMessageBox.Discard:
+            widget.reload_file()
+
     def destroy_instance(self, instance_id: str) -> None:
         """Destroy widget instance and clean up resources."""
         if instance_id in self._instances:
@@ -66,8 +95,7 @@ class EditorWidgetFactory(IWidget):
             if instance_id in self._instances:
                 widget = self._instances[instance_id]
                 if hasattr(widget, "save_file"):
-                    widget.save_file()
-                    return True
+                    return widget.save_file()
             return False
 
         elif command == "get_text":
@@ -4,8 +4,10 @@ import pytest
 from unittest.mock import Mock
 
 try:
-    from PySide6.QtWidgets import QApplication
+    from PySide6.QtWidgets import QApplication, QPlainTextEdit
     from PySide6.QtCore import Qt
+    from PySide6.QtGui import QTextCursor
+    from PySide6.QtTest import QSignalSpy
 
     QT_AVAILABLE = True
 except ImportError:
@@ -83,6 +85,23 @@ class TestAutoComplete:
         assert isinstance(completions, list)
         # Length could be 0 if no matching completions
 
+    def test_pipeline_shows_ranked_completions(self):
+        """Test that completions are requested from the editor's current line."""
+        editor = QPlainTextEdit("value_two = 2\nvalue_one = 1\nva")
+        editor.moveCursor(QTextCursor.End)
+        self.autocomplete.editor = editor
+
+        finished = QSignalSpy(self.autocomplete.pipeline.finished)
+
+        self.autocomplete._trigger_completion()
+        assert finished.wait(5000)
+
+        popup = self.autocomplete.completion_popup
+        items = [popup.list_widget.item(i).text() for i in range(popup.list_widget.count())]
+        # value_one is defined closer to the cursor
+        assert items == ["value_one", "value_two"]
+        editor.close()
+
 
 class TestKeywordCompletionProvider:
     """Test keyword completion provider."""
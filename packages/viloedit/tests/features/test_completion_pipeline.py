@@ -0,0 +1,156 @@
+"""Tests for the asynchronous completion pipeline."""
+
+import threading
+import time
+from concurrent.futures import wait
+
+import pytest
+
+try:
+    from PySide6.QtWidgets import QApplication
+
+    QT_AVAILABLE = True
+except ImportError:
+    QT_AVAILABLE = False
+
+from viloedit.features.autocomplete import CompletionProvider
+from viloedit.features.completion_pipeline import (
+    CompletionPipeline,
+    fuzzy_score,
+    rank_completions,
+)
+
+
+class StaticProvider(CompletionProvider):
+    """Provider returning fixed completions, optionally after a gate opens."""
+
+    def __init__(self, completions, gate=None):
+        self.completions = completions
+        self.gate = gate
+        self.calls = 0
+
+    def get_completions(self, text, cursor_position, context):
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(5)
+        return self.completions
+
+    def get_provider_name(self):
+        return "Static"
+
+
+class FailingProvider(StaticProvider):
+    """Provider whose lookups fail."""
+
+    def get_completions(self, text, cursor_position, context):
+        raise KeyError("missing")
+
+
+def _deliver(request, timeout=5.0):
+    """Wait for a request's provider calls and deliver their results."""
+    wait(request.futures, timeout)
+    QApplication.processEvents()
+
+
+class TestRanking:
+    """Test fuzzy scoring and merging."""
+
+    def test_fuzzy_score(self):
+        """Test that prefix and boundary matches beat scattered ones."""
+        assert fuzzy_score("gv", "other") is None
+        assert fuzzy_score("get", "get_value") > fuzzy_score("get", "target")
+        assert fuzzy_score("gv", "get_value") > fuzzy_score("gv", "gravy")
+
+    def test_rank_merges_and_uses_locality(self):
+        """Test that duplicates are merged and nearby names rank higher."""
+        batches = [["value_b", "value_a"], ["value_a", "def (snippet)"]]
+
+        assert rank_completions("val", batches) == ["value_a", "value_b"]
+        assert rank_completions("val", batches, {"value_b": 0}, radius=10) == [
+            "value_b",
+            "value_a",
+        ]
+        assert rank_completions("de", batches) == ["def (snippet)"]
+
+
+@pytest.mark.skipif(not QT_AVAILABLE, reason="Qt not available")
+class TestCompletionPipeline:
+    """Test concurrent provider execution."""
+
+    @classmethod
+    def setup_class(cls):
+        """Setup Qt application."""
+        if not QApplication.instance():
+            cls.app = QApplication([])
+
+    def setup_method(self):
+        """Setup a pipeline and record its output."""
+        self.pipeline = CompletionPipeline()
+        self.results = []
+        self.finished = []
+        self.pipeline.results_ready.connect(lambda g, c: self.results.append((g, c)))
+        self.pipeline.finished.connect(self.finished.append)
+
+    def teardown_method(self):
+        """Stop the worker threads."""
+        self.pipeline.shutdown()
+
+    def test_results_stream_in_ranked(self):
+        """Test that a slow provider does not hold back a fast one."""
+        gate = threading.Event()
+        fast = StaticProvider(["value_b"])
+        slow = StaticProvider(["value_a"], gate)
+
+        generation = self.pipeline.request([slow, fast], "val", 3, {})
+        request = self.pipeline._request
+        wait(request.futures[1:], 5)
+        QApplication.processEvents()
+        assert self.results == [(generation, ["value_b"])]
+
+        gate.set()
+        _deliver(request)
+        assert self.results[-1] == (generation, ["value_a", "value_b"])
+        assert self.finished == [generation]
+
+    def test_new_request_cancels_stale_one(self):
+        """Test that results of a superseded request are dropped."""
+        gate = threading.Event()
+        slow = StaticProvider(["value_a"], gate)
+
+        stale = self.pipeline.request([slow], "val", 3, {})
+        stale_request = self.pipeline._request
+        current = self.pipeline.request([StaticProvider(["value_b"])], "val", 3, {})
+        current_request = self.pipeline._request
+        gate.set()
+        _deliver(stale_request)
+        _deliver(current_request)
+
+        assert current != stale
+        assert [generation for generation, _ in self.results] == [current]
+        assert self.finished == [current]
+
+    def test_deadline(self, monkeypatch):
+        """Test that providers missing the deadline are dropped."""
+        monkeypatch.setattr(CompletionPipeline, "DEADLINE_MS", 10)
+        gate = threading.Event()
+
+        generation = self.pipeline.request([StaticProvider(["value_a"], gate)], "val", 3, {})
+        request = self.pipeline._request
+        time.sleep(0.05)
+        QApplication.processEvents()
+        gate.set()
+        _deliver(request)
+
+        assert self.finished == [generation]
+        assert not self.pipeline.busy
+        assert self.results == []
+
+    def test_failing_provider_is_skipped(self):
+        """Test that a provider error leaves the other results and finishes the request."""
+        generation = self.pipeline.request(
+            [FailingProvider([]), StaticProvider(["value_a"])], "val", 3, {}
+        )
+        _deliver(self.pipeline._request)
+
+        assert self.results[-1] == (generation, ["value_a"])
+        assert self.finished == [generation]
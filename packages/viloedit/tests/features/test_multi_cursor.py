@@ -4,7 +4,7 @@ import pytest
 from unittest.mock import Mock, patch
 
 try:
-    from PySide6.QtWidgets import QApplication
+    from PySide6.QtWidgets import QApplication, QPlainTextEdit
     from PySide6.QtCore import Qt
     from PySide6.QtGui import QTextCursor, QKeyEvent
 
@@ -267,6 +267,56 @@ class TestMultiCursor:
         assert result is False
 
 
+@pytest.mark.skipif(not QT_AVAILABLE, reason="Qt not available")
+class TestMultiCursorEdits:
+    """Test editing at many cursors in a real document."""
+
+    @classmethod
+    def setup_class(cls):
+        """Setup Qt application."""
+        if not QApplication.instance():
+            cls.app = QApplication([])
+
+    def setup_method(self):
+        """Setup an editor with a multi-cursor manager."""
+        self.editor = QPlainTextEdit("ab ab\nab")
+        self.multi_cursor = MultiCursor()
+        self.multi_cursor.editor = self.editor
+
+    def teardown_method(self):
+        """Cleanup test environment."""
+        self.editor.close()
+
+    def test_insert_replaces_selections_in_one_step(self):
+        """Test that typing replaces every selection as one undo step."""
+        self.multi_cursor.cursors = [CursorInfo(2, 0), CursorInfo(5, 3), CursorInfo(8, 6)]
+
+        self.multi_cursor.insert_text("xyz")
+
+        assert self.editor.toPlainText() == "xyz xyz\nxyz"
+        assert self.multi_cursor.get_cursor_positions() == [3, 7, 11]
+
+        self.editor.document().undo()
+        assert self.editor.toPlainText() == "ab ab\nab"
+
+    def test_overlapping_cursors_merge(self):
+        """Test that cursors meeting after an edit become one."""
+        self.multi_cursor.cursors = [CursorInfo(1), CursorInfo(2), CursorInfo(5)]
+
+        self.multi_cursor.delete_before_cursors()
+        assert self.editor.toPlainText() == " a\nab"
+        assert self.multi_cursor.get_cursor_positions() == [0, 2]
+
+        self.multi_cursor.cursors = [CursorInfo(2, 0), CursorInfo(3, 1), CursorInfo(4)]
+        self.multi_cursor.insert_text("-")
+        assert self.editor.toPlainText() == "-a-b"
+        assert self.multi_cursor.get_cursor_positions() == [1, 3]
+
+        self.multi_cursor.delete_after_cursors()
+        assert self.editor.toPlainText() == "--"
+        assert self.multi_cursor.get_cursor_positions() == [1, 2]
+
+
 @pytest.mark.skipif(QT_AVAILABLE, reason="Testing without Qt")
 class TestMultiCursorWithoutQt:
     """Test multi-cursor without Qt dependencies."""
@@ -0,0 +1,127 @@
+"""Tests for the document search index."""
+
+import pytest
+
+try:
+    from PySide6.QtGui import QTextCursor, QTextDocument
+    from PySide6.QtWidgets import QApplication, QPlainTextEdit
+
+    QT_AVAILABLE = True
+except ImportError:
+    QT_AVAILABLE = False
+
+from viloedit.features.find_replace import FindReplace, SearchDirection
+from viloedit.features.search_index import DocumentSearchIndex, compile_search, replace_all
+
+SOURCE = "foo = 1\nbar = foo\n🙂 foo Foo\n"
+
+
+@pytest.mark.skipif(not QT_AVAILABLE, reason="Qt not available")
+class TestDocumentSearchIndex:
+    """Test the match index."""
+
+    @classmethod
+    def setup_class(cls):
+        """Setup Qt application."""
+        if not QApplication.instance():
+            cls.app = QApplication([])
+
+    def setup_method(self):
+        """Setup a document searched for "foo"."""
+        self.document = QTextDocument(SOURCE)
+        self.document.documentLayout()
+        self.index = DocumentSearchIndex.for_document(self.document)
+        self.index.set_pattern(compile_search("foo", case_sensitive=True))
+
+    def _text(self, match):
+        cursor = QTextCursor(self.document)
+        cursor.setPosition(match[0])
+        cursor.setPosition(match[1], QTextCursor.KeepAnchor)
+        return cursor.selectedText()
+
+    def test_matches_in_document_positions(self):
+        """Test that matches use document positions, also after wide characters."""
+        matches = list(self.index.matches())
+
+        assert self.index.count == 3
+        assert [self._text(match) for match in matches] == ["foo"] * 3
+        assert matches[2][0] == SOURCE.index("🙂") + 3
+
+    def test_find_and_wrap(self):
+        """Test finding the next and previous match, wrapping around."""
+        first, second, third = self.index.matches()
+
+        assert self.index.find(1) == second
+        assert self.index.find(third[1]) == first
+        assert self.index.find(third[1], wrap=False) is None
+        assert self.index.find(second[0], backward=True) == first
+        assert self.index.find(0, backward=True) == third
+        assert self.index.match_number(third[0]) == 2
+
+    def test_edits_update_index(self):
+        """Test that edits rescan only the touched blocks."""
+        cursor = QTextCursor(self.document.findBlockByNumber(1))
+        cursor.insertText("foo foo\n")
+
+        assert self.index.count == 5
+        assert len(self.index._blocks) == self.document.blockCount()
+        assert [self._text(match) for match in self.index.matches()] == ["foo"] * 5
+
+    def test_replace_all_is_one_edit(self):
+        """Test that replace all is a single undoable edit."""
+        self.index.set_pattern(compile_search(r"(\w+) = (\w+)", regex=True))
+
+        assert replace_all(self.index, r"\2 = \1", regex=True) == 2
+        assert self.document.toPlainText() == "1 = foo\nfoo = bar\n🙂 foo Foo\n"
+        assert self.index.count == 2
+
+        self.document.undo()
+        assert self.document.toPlainText() == SOURCE
+
+
+@pytest.mark.skipif(not QT_AVAILABLE, reason="Qt not available")
+class TestFindReplaceSearch:
+    """Test FindReplace on a real editor."""
+
+    @classmethod
+    def setup_class(cls):
+        """Setup Qt application."""
+        if not QApplication.instance():
+            cls.app = QApplication([])
+
+    def setup_method(self):
+        """Setup an editor with many matches."""
+        self.editor = QPlainTextEdit("x = value\n" * 50)
+        self.editor.resize(300, 100)
+        self.find_replace = FindReplace()
+        self.find_replace.set_editor(self.editor)
+
+    def teardown_method(self):
+        """Cleanup test environment."""
+        self.find_replace.close()
+        self.editor.close()
+
+    def test_find_next_advances(self):
+        """Test that find next moves from match to match."""
+        first = self.find_replace.find_text("value", SearchDirection.FORWARD)
+        second = self.find_replace.find_text("value", SearchDirection.FORWARD)
+
+        assert first.found and first.matches == 50
+        assert second.position == first.position + len("x = value\n")
+
+    def test_highlights_limited_to_viewport(self):
+        """Test that only the visible matches are highlighted."""
+        self.find_replace.find_input.setCurrentText("value")
+        self.find_replace.find_all()
+
+        highlighted = len(self.editor.extraSelections())
+        assert 0 < highlighted < 50
+
+    def test_replace_all(self):
+        """Test replacing every match."""
+        self.find_replace.find_input.setCurrentText("value")
+        self.find_replace.replace_input.setCurrentText("other")
+
+        self.find_replace.replace_all()
+
+        assert self.editor.toPlainText() == "x = other\n" * 50
@@ -0,0 +1,99 @@
+"""Tests for the incremental symbol index."""
+
+import pytest
+
+try:
+    from PySide6.QtGui import QTextCursor, QTextDocument
+    from PySide6.QtWidgets import QApplication
+
+    QT_AVAILABLE = True
+except ImportError:
+    QT_AVAILABLE = False
+
+from viloedit.features.autocomplete import VariableCompletionProvider
+from viloedit.features.symbol_index import DocumentSymbolIndex, SymbolTrie
+
+SOURCE = "import os\nvalue = 1\ndef compute():\n    value_two = value\n"
+
+
+class TestSymbolTrie:
+    """Test the reference-counted prefix trie."""
+
+    def test_complete_sorted_with_limit(self):
+        """Test that completions are sorted and stop at the limit."""
+        trie = SymbolTrie()
+        for word in ["value_b", "value", "value_a", "other"]:
+            trie.add(word)
+
+        assert trie.complete("val") == ["value", "value_a", "value_b"]
+        assert trie.complete("val", limit=2) == ["value", "value_a"]
+        assert trie.complete("xyz") == []
+
+    def test_reference_counts(self):
+        """Test that a name stays until every occurrence is removed."""
+        trie = SymbolTrie()
+        trie.add("value")
+        trie.add("value")
+        trie.add("value_a")
+
+        trie.remove("value")
+        assert "value" in trie
+        trie.remove("value")
+        assert "value" not in trie
+        assert trie.complete("val") == ["value_a"]
+
+        trie.remove("value_a")
+        assert len(trie) == 0
+        assert not trie._root.children
+
+
+@pytest.mark.skipif(not QT_AVAILABLE, reason="Qt not available")
+class TestDocumentSymbolIndex:
+    """Test incremental indexing of a document."""
+
+    @classmethod
+    def setup_class(cls):
+        """Setup Qt application."""
+        if not QApplication.instance():
+            cls.app = QApplication([])
+
+    def setup_method(self):
+        """Setup an indexed document."""
+        self.document = QTextDocument(SOURCE)
+        self.document.documentLayout()
+        self.index = DocumentSymbolIndex(self.document)
+
+    def test_initial_scan(self):
+        """Test that the whole document is indexed up front."""
+        assert self.index.complete("val") == ["value", "value_two"]
+        assert self.index.complete("com") == ["compute"]
+        assert len(self.index._blocks) == self.document.blockCount()
+
+    def test_edits_rescan_touched_blocks(self, monkeypatch):
+        """Test that edits only rescan the blocks they touch."""
+        scanned = []
+        scan = self.index._scan
+        monkeypatch.setattr(self.index, "_scan", lambda text: scanned.append(text) or scan(text))
+
+        # Split a line in two
+        cursor = QTextCursor(self.document.findBlockByNumber(1))
+        cursor.insertText("total = 0\n")
+        assert scanned == ["total = 0", "value = 1"]
+        assert self.index.complete("tot") == ["total"]
+
+        # Remove the line defining value; value_two is still defined
+        cursor = QTextCursor(self.document.findBlockByNumber(2))
+        cursor.movePosition(QTextCursor.NextBlock, QTextCursor.KeepAnchor)
+        cursor.removeSelectedText()
+        assert self.index.complete("val") == ["value_two"]
+        assert len(self.index._blocks) == self.document.blockCount()
+
+    def test_provider_uses_document_index(self):
+        """Test that the provider completes from the index, not the text."""
+        provider = VariableCompletionProvider()
+
+        completions = provider.get_completions("va", 2, {"document": self.document})
+
+        assert completions == ["value", "value_two"]
+        assert provider.symbol_index.document is self.document
+        assert provider.last_text == ""
@@ -0,0 +1,138 @@
+"""Tests for background highlighting of large documents."""
+
+import time
+
+import pytest
+
+try:
+    from PySide6.QtGui import QTextCursor
+    from PySide6.QtWidgets import QApplication
+
+    QT_AVAILABLE = True
+except ImportError:
+    QT_AVAILABLE = False
+
+from viloedit import background_highlighter
+from viloedit.editor import CodeEditor
+from viloedit.syntax import ROOT_STATE
+
+SOURCE = '"""Module\ndocstring\n"""\n' + "".join(
+    f"def func_{i}():\n    return {i}\n" for i in range(8)
+)
+
+
+@pytest.mark.skipif(not QT_AVAILABLE, reason="Qt not available")
+class TestBackgroundHighlighter:
+    """Test background tokenization."""
+
+    @classmethod
+    def setup_class(cls):
+        """Setup Qt application."""
+        if not QApplication.instance():
+            cls.app = QApplication([])
+
+    def setup_method(self):
+        """Setup an editor and a source file."""
+        self.editor = CodeEditor()
+        self.editor.resize(400, 100)
+
+    def teardown_method(self):
+        """Cleanup test environment."""
+        self.editor.background_highlighter.stop()
+        self.editor.close()
+
+    def _load(self, tmp_path, monkeypatch, threshold=100):
+        monkeypatch.setattr("viloedit.editor.BACKGROUND_THRESHOLD", threshold)
+        file_path = tmp_path / "module.py"
+        file_path.write_text(SOURCE)
+        self.editor.load_file(str(file_path))
+        return self.editor.background_highlighter
+
+    def _wait(self, highlighter, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while highlighter.busy and time.monotonic() < deadline:
+            QApplication.processEvents()
+            time.sleep(0.005)
+        QApplication.processEvents()
+
+    def test_small_file_uses_inline_highlighter(self, tmp_path, monkeypatch):
+        """Test that files below the threshold are highlighted normally."""
+        highlighter = self._load(tmp_path, monkeypatch, threshold=len(SOURCE) + 1)
+
+        assert not highlighter.active
+        assert self.editor.highlighter.document() is self.editor.document()
+
+    def test_large_file_tokenized_in_background(self, tmp_path, monkeypatch):
+        """Test that every line is tokenized with lexer state carried over."""
+        highlighter = self._load(tmp_path, monkeypatch)
+
+        assert highlighter.active
+        assert self.editor.highlighter.document() is None
+
+        self._wait(highlighter)
+        job = highlighter._job
+        assert all(runs is not None for runs in job.runs)
+        # Inside the docstring
+        assert job.end_states[1] != ROOT_STATE
+        assert job.end_states[2] == ROOT_STATE
+        assert self.editor.document().findBlockByNumber(3).layout().formats()
+
+    def test_viewport_only_above_limit(self, tmp_path, monkeypatch):
+        """Test that huge documents only tokenize the visible lines."""
+        monkeypatch.setattr(background_highlighter, "VIEWPORT_ONLY_THRESHOLD", 100)
+        highlighter = self._load(tmp_path, monkeypatch)
+
+        self._wait(highlighter)
+        job = highlighter._job
+        _, last_visible = highlighter._visible_range()
+
+        assert not job.full_pass
+        assert job.runs[0] is not None
+        assert last_visible + 1 < job.line_count
+        assert all(job.runs[line] is None for line in range(last_visible + 1, job.line_count))
+
+    def test_edited_line_relexed(self, tmp_path, monkeypatch):
+        """Test that an edit within a line is highlighted immediately."""
+        highlighter = self._load(tmp_path, monkeypatch)
+        self._wait(highlighter)
+
+        cursor = QTextCursor(self.editor.document().findBlockByNumber(4))
+        cursor.insertText("x = 1; ")
+
+        job = highlighter._job
+        assert job.lines[4] == "x = 1; " + "    return 0"
+        # First run is the new "x" at column 0
+        assert list(job.runs[4][:2]) == [0, 1]
+
+    def test_line_insert_shifts_results(self, tmp_path, monkeypatch):
+        """Test that adding a line moves the results below it instead of re-lexing them."""
+        highlighter = self._load(tmp_path, monkeypatch)
+        self._wait(highlighter)
+        last_runs = highlighter._job.runs[-1]
+
+        cursor = QTextCursor(self.editor.document().findBlockByNumber(4))
+        cursor.insertText("x = 1\n")
+
+        job = highlighter._job
+        assert job.line_count == len(job.lines) == self.editor.document().blockCount()
+        assert job.lines[4:6] == ["x = 1", "    return 0"]
+        assert job.resume_line == 4
+        assert job.runs[-1] is last_runs
+
+        self._wait(highlighter)
+        assert job.runs[4] is not None
+        # Lexing stopped where the states agreed with the previous results
+        assert job.runs[-1] is last_runs
+
+    def test_state_change_relexes_following_lines(self, tmp_path, monkeypatch):
+        """Test that opening a string carries the new state past the inserted lines."""
+        highlighter = self._load(tmp_path, monkeypatch)
+        self._wait(highlighter)
+
+        cursor = QTextCursor(self.editor.document().findBlockByNumber(4))
+        cursor.insertText('"""\n')
+
+        self._wait(highlighter)
+        job = highlighter._job
+        assert job.lines[4] == '"""'
+        assert all(state != ROOT_STATE for state in job.end_states[4:])
@@ -0,0 +1,98 @@
+"""Tests for the editor decoration compositor."""
+
+import pytest
+
+try:
+    from PySide6.QtGui import QColor, QTextCharFormat
+    from PySide6.QtWidgets import QApplication, QPlainTextEdit
+
+    QT_AVAILABLE = True
+except ImportError:
+    QT_AVAILABLE = False
+
+from viloedit.decorations import DecorationCompositor
+
+LINE = "x = value\n"
+
+
+def _format(color):
+    fmt = QTextCharFormat()
+    fmt.setBackground(QColor(color))
+    return fmt
+
+
+@pytest.mark.skipif(not QT_AVAILABLE, reason="Qt not available")
+class TestDecorationCompositor:
+    """Test merging decoration sets into extra selections."""
+
+    @classmethod
+    def setup_class(cls):
+        """Setup Qt application."""
+        if not QApplication.instance():
+            cls.app = QApplication([])
+
+    def setup_method(self):
+        """Setup an editor taller than its viewport."""
+        self.editor = QPlainTextEdit(LINE * 200)
+        self.editor.resize(300, 100)
+        self.decorations = DecorationCompositor.for_editor(self.editor)
+
+    def teardown_method(self):
+        """Cleanup test environment."""
+        self.editor.close()
+
+    def _colors(self):
+        return [s.format.background().color().name() for s in self.editor.extraSelections()]
+
+    def test_sets_merge_in_priority_order(self):
+        """Test that sets do not replace each other and stack by priority."""
+        self.decorations.set_ranges("top", [(0, 1)], _format("#ff0000"), priority=10)
+        self.decorations.set_ranges("bottom", [(2, 3)], _format("#00ff00"))
+        self.decorations.refresh()
+        assert self._colors() == ["#00ff00", "#ff0000"]
+        assert DecorationCompositor.for_editor(self.editor) is self.decorations
+
+        self.decorations.clear("bottom")
+        self.decorations.refresh()
+        assert self._colors() == ["#ff0000"]
+
+    def test_only_visible_ranges_materialized(self):
+        """Test that ranges outside the viewport do not become selections."""
+        ranges = [(i * len(LINE), i * len(LINE) + 1) for i in range(200)]
+        self.decorations.set_ranges("all", reversed(ranges), _format("#ff0000"))
+        self.decorations.refresh()
+
+        visible = [s.cursor.selectionStart() for s in self.editor.extraSelections()]
+        assert 0 < len(visible) < 50
+        assert visible[0] == 0
+
+        self.editor.verticalScrollBar().setValue(150)
+        self.decorations.refresh()
+        assert self.editor.extraSelections()[0].cursor.blockNumber() == 150
+
+    def test_unchanged_sets_are_reused(self):
+        """Test that changing one set leaves the others' selections alone."""
+        self.decorations.set_ranges("matches", [(0, 1), (10, 11)], _format("#ff0000"))
+        self.decorations.set_ranges("line", [(0, 0)], _format("#00ff00"))
+        self.decorations.refresh()
+        matches = self.decorations._sets["matches"].selections
+
+        self.decorations.set_ranges("line", [(10, 10)], _format("#00ff00"))
+        self.decorations.refresh()
+        assert self.decorations._sets["matches"].selections is matches
+        assert self.editor.extraSelections()[-1].cursor.position() == 10
+
+    def test_provider_asked_for_visible_blocks(self):
+        """Test that providers only compute the visible blocks."""
+        requested = []
+
+        def provider(first, last):
+            requested.append((first, last))
+            return [(0, 1)]
+
+        self.decorations.set_provider("lazy", provider, _format("#ff0000"))
+        self.decorations.refresh()
+
+        first, last = requested[0]
+        assert first == 0 and 0 < last < 50
+        assert len(self.editor.extraSelections()) == 1
@@ -92,6 +92,27 @@ class TestCodeEditor:
         # Check block count
         assert self.editor.blockCount() == 4  # 3 lines + 1 empty
 
+    def test_gutter_caches_numbers_and_markers(self):
+        """Test that painting lays out each line number once and shows markers."""
+        self.editor.setPlainText("Line\n" * 20)
+        self.editor.resize(300, 200)
+        width = self.editor.line_number_area_width()
+
+        self.editor.define_gutter_marker("warning", "#cca700")
+        self.editor.define_gutter_marker("error", "#f14c4c", priority=1)
+        self.editor.set_gutter_markers("warning", [1, 2])
+        self.editor.set_gutter_markers("error", [2])
+        assert self.editor.line_number_area_width() > width
+        assert self.editor.gutter.marker_at(1) == "warning"
+        assert self.editor.gutter.marker_at(2) == "error"
+        assert self.editor.gutter.marker_at(3) is None
+
+        self.editor.line_number_area.grab()
+        cached = dict(self.editor.gutter._numbers)
+        self.editor.line_number_area.grab()
+        assert 1 in cached and 21 not in cached
+        assert all(self.editor.gutter._numbers[n] is cached[n] for n in cached)
+
     def test_cursor_position_signal(self):
         """Test cursor position changed signal."""
         signal_received = []
@@ -0,0 +1,275 @@
+"""Tests for incremental loading and atomic saving."""
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+try:
+    from PySide6.QtCore import QCoreApplication, QEvent, QObject
+    from PySide6.QtGui import QTextCursor, QTextDocument
+    from PySide6.QtWidgets import QApplication
+
+    QT_AVAILABLE = True
+except ImportError:
+    QT_AVAILABLE = False
+
+from viloedit import file_io
+from viloedit.editor import CodeEditor
+from viloedit.file_io import ChunkedFileLoader, apply_text_diff, diff_lines, save_document
+from viloedit.file_watcher import FileWatcher
+
+CONTENT = "first line\r\nsecond — ünïcode 🙂\nthird\n" * 2
+
+
+def _wait(predicate, timeout=5.0):
+    """Process events until predicate is false."""
+    deadline = time.monotonic() + timeout
+    while predicate() and time.monotonic() < deadline:
+        QApplication.processEvents()
+
+
+@pytest.mark.skipif(not QT_AVAILABLE, reason="Qt not available")
+class TestFileIO:
+    """Test chunked loading and streaming saves."""
+
+    @classmethod
+    def setup_class(cls):
+        """Setup Qt application."""
+        if not QApplication.instance():
+            cls.app = QApplication([])
+
+    def test_chunked_load(self, tmp_path, monkeypatch):
+        """Test that chunks split inside characters and line endings decode correctly."""
+        monkeypatch.setattr(file_io, "LOAD_CHUNK_SIZE", 7)
+        file_path = tmp_path / "large.txt"
+        file_path.write_bytes(CONTENT.encode("utf-8"))
+        document = QTextDocument()
+        loader = ChunkedFileLoader(document, str(file_path))
+        loaded = []
+        loader.finished.connect(loaded.append)
+
+        loader.start()
+        assert loader.loading
+        _wait(lambda: loader.loading)
+
+        assert loaded == [str(file_path)]
+        assert document.toPlainText() == CONTENT.replace("\r\n", "\n")
+        assert not document.isUndoAvailable()
+        assert document.isUndoRedoEnabled()
+
+    def test_editor_read_only_while_loading(self, tmp_path, monkeypatch):
+        """Test that a partially loaded file can be neither edited nor saved."""
+        monkeypatch.setattr("viloedit.editor.LARGE_FILE_THRESHOLD", 0)
+        monkeypatch.setattr(file_io, "LOAD_CHUNK_SIZE", 32)
+        file_path = tmp_path / "large.txt"
+        file_path.write_text(CONTENT)
+        editor = CodeEditor()
+
+        editor.load_file(str(file_path))
+        assert editor.is_loading()
+        assert editor.isReadOnly()
+        assert editor.save_file() is False
+
+        _wait(editor.is_loading)
+        assert not editor.isReadOnly()
+        assert file_path.read_text() == CONTENT.replace("\r\n", "\n")
+        editor.close()
+
+    def test_streaming_save(self, tmp_path, monkeypatch):
+        """Test that saving in chunks does not split surrogate pairs."""
+        monkeypatch.setattr(file_io, "SAVE_CHUNK_SIZE", 5)
+        file_path = tmp_path / "out.txt"
+        file_path.write_text("old")
+        os.chmod(file_path, 0o640)
+
+        save_document(QTextDocument(CONTENT.replace("\r\n", "\n")), file_path)
+
+        assert file_path.read_bytes().decode("utf-8") == CONTENT.replace("\r\n", "\n")
+        assert os.stat(file_path).st_mode & 0o777 == 0o640
+        assert [p.name for p in tmp_path.iterdir()] == ["out.txt"]
+
+    def test_failed_save_keeps_original(self, tmp_path):
+        """Test that a failed save leaves the original file untouched."""
+        file_path = tmp_path / "out.txt"
+        file_path.write_text("original")
+
+        failing_replace = patch("viloedit.file_io.os.replace", side_effect=OSError("disk full"))
+        with failing_replace, pytest.raises(OSError):
+            save_document(QTextDocument("new content"), file_path)
+
+        assert file_path.read_text() == "original"
+        assert [p.name for p in tmp_path.iterdir()] == ["out.txt"]
+
+    def test_save_through_symlink(self, tmp_path):
+        """Test that saving to a symlink writes its target and keeps the link."""
+        target = tmp_path / "target.txt"
+        target.write_text("old")
+        link = tmp_path / "link.txt"
+        link.symlink_to(target)
+
+        save_document(QTextDocument("new"), link)
+
+        assert link.is_symlink()
+        assert target.read_text() == "new"
+
+    @pytest.mark.parametrize("large_file", [False, True])
+    def test_editor_keeps_line_endings(self, tmp_path, monkeypatch, large_file):
+        """Test that a CRLF file is saved with CRLF line endings."""
+        if large_file:
+            monkeypatch.setattr("viloedit.editor.LARGE_FILE_THRESHOLD", 0)
+        file_path = tmp_path / "crlf.txt"
+        file_path.write_bytes(b"one\r\ntwo\r\n")
+        editor = CodeEditor()
+
+        editor.load_file(str(file_path))
+        _wait(editor.is_loading)
+        QTextCursor(editor.document()).insertText("zero\n")
+        assert editor.save_file()
+
+        assert file_path.read_bytes() == b"zero\r\none\r\ntwo\r\n"
+        editor.close()
+
+
+def _rewrite(file_path, text):
+    """Write a file with a modification time that differs from the last write."""
+    mtime = os.stat(file_path).st_mtime_ns
+    file_path.write_text(text)
+    os.utime(file_path, ns=(mtime + 10**9, mtime + 10**9))
+
+
+@pytest.mark.skipif(not QT_AVAILABLE, reason="Qt not available")
+class TestReload:
+    """Test reloading files changed on disk."""
+
+    @classmethod
+    def setup_class(cls):
+        """Setup Qt application."""
+        if not QApplication.instance():
+            cls.app = QApplication([])
+
+    def test_diff_lines(self, monkeypatch):
+        """Test that changes are found around lines unique to both sides."""
+        old = ["}", "a", "}", "b", "}", "c"]
+        new = ["}", "a", "x", "}", "c", "}"]
+        assert diff_lines(old, new) == [(2, 4, 2, 3), (6, 6, 5, 6)]
+
+        # Without unique lines, large gaps are replaced whole
+        monkeypatch.setattr(file_io, "DIFF_LINE_LIMIT", 1)
+        assert diff_lines(["}", "}", "a"], ["b", "}", "}"]) == [(0, 3, 0, 3)]
+
+    def test_apply_text_diff(self):
+        """Test that only changed lines are edited, as one undo step."""
+        document = QTextDocument("a\nb\nc\nd\n")
+        cursor = QTextCursor(document)
+        cursor.setPosition(6)  # Start of "d"
+
+        assert apply_text_diff(document, "a\nB\nc\nd\ne") == 2
+        assert document.toPlainText() == "a\nB\nc\nd\ne"
+        assert cursor.position() == 6
+        assert apply_text_diff(document, "a\nB\nc\nd\ne") == 0
+
+        document.undo()
+        assert document.toPlainText() == "a\nb\nc\nd\n"
+
+    def test_editor_follows_external_changes(self, tmp_path):
+        """Test that unmodified editors reload and modified ones refuse to overwrite."""
+        file_path = tmp_path / "watched.txt"
+        file_path.write_text("one\ntwo\n")
+        editor = CodeEditor()
+        editor.load_file(str(file_path))
+        watcher = FileWatcher.get_instance()
+        changed = []
+        editor.file_changed_on_disk.connect(changed.append)
+        assert watcher.is_watched(str(file_path))
+
+        _rewrite(file_path, "one\n2\n")
+        watcher._on_file_changed(str(file_path))
+        watcher._check_pending()
+        assert editor.toPlainText() == "one\n2\n"
+        assert not editor.document().isModified()
+
+        editor.insertPlainText("local ")
+        _rewrite(file_path, "external\n")
+        watcher._on_file_changed(str(file_path))
+        watcher._check_pending()
+        assert changed == [str(file_path)]
+        assert editor.save_file() is False
+        assert editor.save_file(overwrite=True) is True
+        assert file_path.read_text() == editor.toPlainText()
+
+        editor.deleteLater()
+
+    def test_save_over_external_change_prompts(self, tmp_path, monkeypatch):
+        """Test that saving over a changed or removed file asks to overwrite or reload."""
+        from PySide6.QtWidgets import QMessageBox
+
+        from viloedit.widget import EditorWidgetFactory
+
+        file_path = tmp_path / "watched.txt"
+        file_path.write_text("one\n")
+        factory = EditorWidgetFactory()
+        editor = factory.create_instance("editor-1")
+        editor.load_file(str(file_path))
+        save = {"instance_id": "editor-1"}
+
+        replies = []
+        monkeypatch.setattr(QMessageBox, "question", lambda *args: replies.pop(0))
+
+        editor.insertPlainText("local ")
+        _rewrite(file_path, "external\n")
+        replies.append(QMessageBox.Cancel)
+        assert factory.handle_command("save_file", save) is False
+        assert file_path.read_text() == "external\n"
+
+        replies.append(QMessageBox.Save)
+        assert factory.handle_command("save_file", save) is True
+        assert file_path.read_text() == "local one\n"
+
+        editor.insertPlainText("again ")
+        _rewrite(file_path, "external\n")
+        replies.append(QMessageBox.Discard)
+        assert factory.handle_command("save_file", save) is True
+        assert editor.toPlainText() == "external\n"
+
+        editor.insertPlainText("kept ")
+        file_path.unlink()
+        replies.append(QMessageBox.Save)
+        assert factory.handle_command("save_file", save) is True
+        assert file_path.read_text() == editor.toPlainText()
+        assert not replies
+
+        factory.destroy_instance("editor-1")
+
+    def test_owner_outliving_watcher(self, tmp_path, monkeypatch):
+        """Test that owners destroyed after the watcher do not call back into it."""
+        errors = []
+        monkeypatch.setattr("sys.excepthook", lambda *args: errors.append(args))
+        file_path = tmp_path / "watched.txt"
+        file_path.write_text("one\n")
+        parent = QObject()
+        watcher = FileWatcher(parent)
+        owner = QObject()
+        watcher.watch(str(file_path), owner)
+
+        parent.deleteLater()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        owner.deleteLater()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+        assert errors == []
+
+    def test_unwatch_disconnects_owner(self, tmp_path):
+        """Test that an owner that stopped watching is not tracked until destroyed."""
+        file_path = tmp_path / "watched.txt"
+        file_path.write_text("one\n")
+        watcher = FileWatcher()
+        owner = QObject()
+
+        watcher.watch(str(file_path), owner)
+        assert watcher._connections
+        watcher.unwatch(str(file_path), owner)
+
+        assert not watcher._connections
+        assert not watcher.is_watched(str(file_path))
@@ -0,0 +1,120 @@
+"""Tests for the incremental syntax highlighter."""
+
+import pytest
+
+try:
+    from PySide6.QtGui import QTextCursor, QTextDocument
+    from PySide6.QtWidgets import QApplication
+
+    QT_AVAILABLE = True
+except ImportError:
+    QT_AVAILABLE = False
+
+from pygments.lexers import PythonLexer
+from pygments.token import Token
+
+from viloedit.syntax import ROOT_STATE, LineLexer, SyntaxHighlighter
+
+
+class CountingHighlighter(SyntaxHighlighter):
+    """Highlighter that counts highlighted blocks."""
+
+    def __init__(self, document, lexer=None):
+        self.calls = 0
+        super().__init__(document, lexer)
+
+    def highlightBlock(self, text):
+        self.calls += 1
+        super().highlightBlock(text)
+
+
+class TestLineLexer:
+    """Test stateful line lexing."""
+
+    def test_state_carried_across_lines(self):
+        """Test that a multi-line string continues on the next line."""
+        lexer = LineLexer(PythonLexer())
+
+        _, stack = lexer.lex_line('x = """start')
+        assert stack != ROOT_STATE
+
+        tokens, stack = lexer.lex_line("still a string", stack)
+        assert all(token_type in Token.String for _, _, token_type in tokens)
+
+        _, stack = lexer.lex_line('end"""', stack)
+        assert stack == ROOT_STATE
+
+    def test_tokens_cover_line(self):
+        """Test that tokens stay within the line text."""
+        tokens, _ = LineLexer(PythonLexer()).lex_line("def foo(): # comment")
+        assert tokens[0] == (0, 3, Token.Keyword)
+        start, length, _ = tokens[-1]
+        assert start + length == len("def foo(): # comment")
+
+
+@pytest.mark.skipif(not QT_AVAILABLE, reason="Qt not available")
+class TestSyntaxHighlighter:
+    """Test incremental highlighting."""
+
+    @classmethod
+    def setup_class(cls):
+        """Setup Qt application."""
+        if not QApplication.instance():
+            cls.app = QApplication([])
+
+    def setup_method(self):
+        """Setup a highlighted document."""
+        self.document = QTextDocument()
+        # Documents only report changes to the highlighter once they have a layout
+        self.document.documentLayout()
+        self.document.setPlainText("\n".join(f"value_{i} = {i}" for i in range(20)))
+        self.highlighter = CountingHighlighter(self.document, PythonLexer())
+        # The initial highlight is deferred to the event loop
+        QApplication.processEvents()
+        self.highlighter.calls = 0
+
+    def teardown_method(self):
+        """Detach the highlighter before the document is garbage collected."""
+        self.highlighter.setDocument(None)
+
+    def _in_string(self, line):
+        """Whether a line ends inside a multi-line string."""
+        state = self.document.findBlockByNumber(line).userState()
+        return self.highlighter._states[state] != ROOT_STATE
+
+    def _insert(self, line, column, text):
+        cursor = QTextCursor(self.document.findBlockByNumber(line))
+        cursor.movePosition(QTextCursor.Right, QTextCursor.MoveAnchor, column)
+        cursor.insertText(text)
+
+    def test_edit_rehighlights_only_changed_block(self):
+        """Test that an edit that does not change state stays local."""
+        self._insert(15, 0, "x")
+        assert self.highlighter.calls <= 2
+
+    def test_state_change_propagates(self):
+        """Test that opening a string re-highlights following lines."""
+        self._insert(5, 0, '"""')
+
+        assert self.highlighter.calls > 10
+        assert self._in_string(18)
+
+    def test_closed_string_converges(self):
+        """Test that highlighting stops once block states match again."""
+        self._insert(5, 0, '"""')
+        self._insert(10, 0, '"""')
+        assert self._in_string(8)
+        assert not self._in_string(18)
+
+        self.highlighter.calls = 0
+        self._insert(7, 0, "x")
+
+        assert self.highlighter.calls <= 2
+        assert self._in_string(7)
+
+    def test_format_lookup_cached(self):
+        """Test that subtypes resolve to their parent's format and are cached."""
+        keyword_format = self.highlighter.get_format_for_token(Token.Keyword.Namespace)
+        assert keyword_format is self.highlighter.formats["keyword"]
+        assert Token.Keyword.Namespace in self.highlighter._format_cache
+        assert self.highlighter.get_format_for_token(Token.Punctuation) is None
@@ -1,14 +1,85 @@
 #!/usr/bin/env python3
 """
 Terminal Asset Bundler
-Loads and bundles terminal JavaScript and CSS assets for inline embedding.
+Loads terminal JavaScript and CSS assets, either inlined into or linked from the page.
 """
 
+import hashlib
 import logging
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Scripts loaded by the terminal page, relative to the static directory
+LIBRARY_SCRIPTS = [
+    "js/socket.io.min.js",
+    "js/xterm.js",
+    "js/xterm-addon-fit.js",
+    "js/xterm-addon-web-links.js",
+]
+
+# Addons providing an xterm.js renderer; renderers without an entry are
+# built into xterm.js 4.x
+RENDERER_ADDONS = {"webgl": "js/xterm-addon-webgl.js"}
+
+# Scripts loaded when they are bundled, the page works without them
+OPTIONAL_SCRIPTS = list(RENDERER_ADDONS.values())
+
+# Renderer selection shared by the terminal and benchmark pages. The WebGL
+# addon replaces the built-in renderer and falls back to it on failure or
+# context loss; the canvas renderer falls back to the DOM renderer.
+RENDERER_SCRIPT = """
+        let webglAddon = null;
+        window.currentRenderer = null;
+
+        function canvasSupported() {
+            try {
+                return !!document.createElement('canvas').getContext('2d');
+            } catch (e) {
+                return false;
+            }
+        }
+
+        function baseRenderer(renderer) {
+            return renderer === 'dom' || !canvasSupported() ? 'dom' : 'canvas';
+        }
+
+        window.setTerminalRenderer = function(renderer) {
+            if (!term) {
+                return;
+            }
+            if (webglAddon) {
+                webglAddon.dispose();
+                webglAddon = null;
+            }
+            term.setOption('rendererType', baseRenderer(renderer));
+            window.currentRenderer = term.getOption('rendererType');
+
+            if (renderer !== 'webgl') {
+                return;
+            }
+            if (typeof WebglAddon === 'undefined') {
+                console.warn('WebGL addon not bundled, using the ' + window.currentRenderer + ' renderer');
+                return;
+            }
+            try {
+                const addon = new WebglAddon.WebglAddon();
+                addon.onContextLoss(() => {
+                    console.warn('WebGL context lost, falling back to the canvas renderer');
+                    addon.dispose();
+                    webglAddon = null;
+                    window.currentRenderer = term.getOption('rendererType');
+                });
+                term.loadAddon(addon);
+                webglAddon = addon;
+                window.currentRenderer = 'webgl';
+            } catch (e) {
+                console.warn('WebGL renderer unavailable, using the ' + window.currentRenderer + ' renderer', e);
+            }
+        };
+"""
+
 
 class TerminalAssetBundler:
     """Bundles terminal assets (JS/CSS) for inline embedding in HTML."""
@@ -18,6 +89,7 @@ class TerminalAssetBundler:
         self.base_dir = Path(__file__).parent
         self.static_dir = self.base_dir / "static"
         self._cache: dict[str, str] = {}
+        self._asset_version: Optional[str] = None
 
     def _load_file(self, path: Path) -> str:
         """Load a file from disk with caching."""
@@ -52,23 +124,71 @@ class TerminalAssetBundler:
         """Get socket.io.min.js content."""
         return self._load_file(self.static_dir / "js" / "socket.io.min.js")
 
-    def get_bundled_html(self, session_id: str, port: int) -> str:
+    def get_library_scripts(self) -> List[str]:
+        """Get the scripts the terminal page loads, including bundled optional ones."""
+        optional = [name for name in OPTIONAL_SCRIPTS if (self.static_dir / name).exists()]
+        return LIBRARY_SCRIPTS + optional
+
+    def has_renderer(self, renderer: str) -> bool:
+        """Check whether a renderer is built in or its addon is bundled."""
+        addon = RENDERER_ADDONS.get(renderer)
+        return addon is None or (self.static_dir / addon).exists()
+
+    def get_asset_version(self) -> str:
+        """Get a version string that changes whenever a static asset changes."""
+        if self._asset_version is None:
+            digest = hashlib.sha1()
+            for name in ["css/xterm.css", *self.get_library_scripts()]:
+                try:
+                    stat = (self.static_dir / name).stat()
+                    digest.update(f"{name}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+                except OSError:
+                    digest.update(f"{name}:missing;".encode())
+            self._asset_version = digest.hexdigest()[:12]
+        return self._asset_version
+
+    def _get_asset_tags(self, linked: bool) -> Tuple[str, str]:
+        """
+        Get the style and script tags that load the terminal assets.
+
+        Args:
+            linked: Reference the assets under /static instead of inlining them
+
+        Returns:
+            Tuple of (style tags, script tags)
+        """
+        if linked:
+            version = self.get_asset_version()
+            xterm_styles = f'<link rel="stylesheet" href="/static/css/xterm.css?v={version}" />'
+            library_scripts = "\n    ".join(
+                f'<script src="/static/{name}?v={version}"></script>'
+                for name in self.get_library_scripts()
+            )
+        else:
+            xterm_styles = f"<style>\n{self.get_xterm_css()}\n</style>"
+            library_scripts = "\n    ".join(
+                f"<script>\n{self._load_file(self.static_dir / name)}\n</script>"
+                for name in self.get_library_scripts()
+            )
+        return xterm_styles, library_scripts
+
+    def get_bundled_html(
+        self, session_id: str, port: int, linked: bool = False, renderer: str = "canvas"
+    ) -> str:
         """
         Generate complete HTML with all assets bundled inline.
 
         Args:
             session_id: Terminal session ID
             port: Flask server port for Socket.IO connection
+            linked: Reference the assets under /static instead of inlining them,
+                so the browser caches them (and their compiled code) across pages
+            renderer: xterm.js renderer to start with (webgl, canvas or dom)
 
         Returns:
             Complete HTML string with embedded assets
         """
-        # Load all assets
-        xterm_css = self.get_xterm_css()
-        xterm_js = self.get_xterm_js()
-        addon_fit_js = self.get_addon_fit_js()
-        addon_weblinks_js = self.get_addon_weblinks_js()
-        socketio_js = self.get_socketio_js()
+        xterm_styles, library_scripts = self._get_asset_tags(linked)
 
         # Generate HTML with bundled assets
         html = f"""<!DOCTYPE html>
@@ -106,30 +226,14 @@ class TerminalAssetBundler:
         .xterm-viewport::-webkit-scrollbar-thumb:hover {{
             background: #5a5a5c !important;
         }}
-
-        /* Bundled xterm.css */
-        {xterm_css}
     </style>
+    {xterm_styles}
 </head>
 <body>
     <div id="terminal"></div>
 
-    <!-- Bundled JavaScript libraries -->
-    <script>
-        // Socket.IO
-        {socketio_js}
-    </script>
-
-    <script>
-        // xterm.js core
-        {xterm_js}
-    </script>
-
-    <script>
-        // xterm addons
-        {addon_fit_js}
-        {addon_weblinks_js}
-    </script>
+    <!-- JavaScript libraries: Socket.IO, xterm.js and its addons -->
+    {library_scripts}
 
     <!-- QWebChannel for Qt communication -->
     <script src="qrc:///qtwebchannel/qwebchannel.js"></script>
@@ -138,11 +242,15 @@ class TerminalAssetBundler:
     <script>
         const SESSION_ID = '{session_id}';
         const SERVER_PORT = {port};
+        const RENDERER = '{renderer}';
 
         // Terminal instance (global for theme updates)
         let term = null;
         let fitAddon = null;
 
+        // Renderer selection with fallback
+        {RENDERER_SCRIPT}
+
         // Current theme data (will be updated via QWebChannel)
         let currentTheme = {{
             background: '#1e1e1e',
@@ -177,6 +285,11 @@ class TerminalAssetBundler:
             }}
         }};
 
+        // Merge changed palette entries into the current theme
+        window.updateTerminalTheme = function(changes) {{
+            window.applyTerminalTheme(Object.assign({{}}, currentTheme, changes));
+        }};
+
         // Terminal configuration (can be updated via QWebChannel)
         window.terminalConfig = {{
             cursorBlink: true,
@@ -201,9 +314,7 @@ class TerminalAssetBundler:
                 term = new Terminal({{
                     ...window.terminalConfig,
                     theme: currentTheme,
-                    // Use DOM renderer to avoid Canvas2D warnings
-                    // DOM renderer is more compatible and doesn't trigger getImageData warnings
-                    rendererType: 'dom',
+                    rendererType: baseRenderer(RENDERER),
                     allowTransparency: false
                 }});
 
@@ -213,8 +324,9 @@ class TerminalAssetBundler:
                 term.loadAddon(fitAddon);
                 term.loadAddon(webLinksAddon);
 
-                // Open terminal
+                // Open terminal, the WebGL addon can only attach to an open terminal
                 term.open(document.getElementById("terminal"));
+                window.setTerminalRenderer(RENDERER);
 
                 // Connect to server via Socket.IO
                 const socket = io.connect('http://127.0.0.1:' + SERVER_PORT + '/terminal', {{
@@ -419,6 +531,124 @@ class TerminalAssetBundler:
 
         return html
 
+    def get_benchmark_html(self, renderer: str = "canvas", megabytes: int = 8) -> str:
+        """
+        Generate a page that measures renderer throughput.
+
+        The page streams generated log output into a terminal and reports
+        how long it took and how many frames the renderer drew per MB of output in
+        window.benchmarkResult, the page title and the console.
+
+        Args:
+            renderer: xterm.js renderer to measure (webgl, canvas or dom)
+            megabytes: Amount of output to stream
+
+        Returns:
+            Complete HTML string
+        """
+        xterm_styles, library_scripts = self._get_asset_tags(linked=True)
+
+        return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="utf-8" />
+    <title>Terminal benchmark - {renderer}</title>
+    <style>
+        body {{
+            margin: 0;
+            overflow: hidden;
+            background: #1e1e1e;
+            color: #d4d4d4;
+            font-family: monospace;
+        }}
+        #terminal {{
+            width: 100%;
+            height: calc(100vh - 2em);
+        }}
+        #result {{
+            height: 2em;
+            line-height: 2em;
+            padding: 0 8px;
+        }}
+    </style>
+    {xterm_styles}
+</head>
+<body>
+    <div id="result">Running...</div>
+    <div id="terminal"></div>
+
+    {library_scripts}
+
+    <script>
+        const RENDERER = '{renderer}';
+        const MEGABYTES = {megabytes};
+        let term = null;
+
+        {RENDERER_SCRIPT}
+
+        // About 64 KB of colored log lines
+        function makeChunk() {{
+            const levels = ['\\x1b[32mINFO \\x1b[0m', '\\x1b[33mWARN \\x1b[0m', '\\x1b[31mERROR\\x1b[0m'];
+            const lines = [];
+            let size = 0;
+            for (let i = 0; size < 64 * 1024; i++) {{
+                const line = levels[i % 3] + ' ' + String(i).padStart(6, '0') +
+                    ' the quick brown fox jumps over the lazy dog \\x1b[1m' + i * 7919 + '\\x1b[0m\\r\\n';
+                lines.push(line);
+                size += line.length;
+            }}
+            return lines.join('');
+        }}
+
+        function runBenchmark() {{
+            term = new Terminal({{ rendererType: baseRenderer(RENDERER), scrollback: 1000 }});
+            term.open(document.getElementById('terminal'));
+            window.setTerminalRenderer(RENDERER);
+
+            const chunk = makeChunk();
+            const total = MEGABYTES * 1024 * 1024;
+            let written = 0;
+            let frames = 0;
+
+            // Count the frames the renderer actually drew rather than
+            // animation frames, which run whether or not it redraws
+            const renderListener = term.onRender(() => {{
+                frames++;
+            }});
+
+            const start = performance.now();
+            function writeNext() {{
+                if (written >= total) {{
+                    renderListener.dispose();
+                    const seconds = (performance.now() - start) / 1000;
+                    const megabytesWritten = written / (1024 * 1024);
+                    window.benchmarkResult = {{
+                        renderer: window.currentRenderer,
+                        megabytes: megabytesWritten,
+                        seconds: seconds,
+                        megabytesPerSecond: megabytesWritten / seconds,
+                        frames: frames,
+                        framesPerMegabyte: frames / megabytesWritten
+                    }};
+                    const result = window.benchmarkResult;
+                    document.getElementById('result').textContent =
+                        result.renderer + ': ' + result.megabytesPerSecond.toFixed(2) + ' MB/s, ' +
+                        result.framesPerMegabyte.toFixed(1) + ' frames/MB';
+                    document.title = 'Terminal benchmark - done';
+                    console.log('Terminal benchmark: ' + JSON.stringify(result));
+                    return;
+                }}
+                written += chunk.length;
+                term.write(chunk, writeNext);
+            }}
+            writeNext();
+        }}
+
+        window.addEventListener('load', runBenchmark);
+    </script>
+</body>
+</html>"""
+
 
 # Singleton instance
 terminal_asset_bundler = TerminalAssetBundler()
@@ -0,0 +1,204 @@
+"""Output buffering for terminals whose view is suspended."""
+
+import logging
+import re
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Sequences after which nothing written earlier is visible in the terminal:
+# a full reset, and the home/clear screen/clear scrollback emitted by `clear`.
+SCREEN_RESET_SEQUENCES = ("\x1bc", "\x1b[H\x1b[2J\x1b[3J")
+
+# Clears the visible screen; on the alternate screen, which has no
+# scrollback, nothing drawn before it is visible anymore
+CLEAR_SCREEN = "\x1b[2J"
+CURSOR_HOME = "\x1b[H"
+
+# Private modes that switch to the alternate screen used by full-screen apps
+ALTERNATE_SCREEN_MODES = ("47", "1047", "1049")
+
+# Default amount of output kept for a suspended terminal, roughly what the
+# xterm.js scrollback can show anyway
+DEFAULT_MAX_SIZE = 256 * 1024
+
+# SGR sequences replayed at most; attributes set longer ago than that are
+# almost always overridden
+MAX_SGR_SEQUENCES = 16
+
+# Sequences that change how later output is interpreted or shown: ANSI and
+# private modes (h/l), SGR attributes (m), the scroll region (r), character
+# set designations, keypad modes and the full reset
+_STATE_SEQUENCE = re.compile(r"\x1b(?:\[(\??)([0-9;]*)([hlmr])|([()*+])([0-9A-Za-z])|([=>c]))")
+
+
+def _mode_changes(match: "re.Match") -> List[str]:
+    """Get the mode keys a mode sequence sets or resets."""
+    private, params = match.group(1), match.group(2)
+    return [f"{private}{param}" for param in params.split(";") if param]
+
+
+def terminal_state(output: str) -> str:
+    """
+    Get the sequences that recreate the terminal state left by some output.
+
+    Only state that affects how later output is shown is tracked: modes
+    such as the alternate screen, cursor visibility, mouse tracking or
+    bracketed paste, the scroll region, text attributes and character sets.
+
+    Args:
+        output: Terminal output
+
+    Returns:
+        Sequences to write to a fresh terminal before the output following it
+    """
+    modes: Dict[str, str] = {}
+    designations: Dict[str, str] = {}
+    keypad = ""
+    scroll_region = ""
+    sgr: List[str] = []
+
+    for match in _STATE_SEQUENCE.finditer(output):
+        sequence = match.group(0)
+        final = match.group(3)
+        if match.group(1) and final in ("m", "r"):
+            # Not SGR or a scroll region, e.g. XTRESTORE
+            continue
+        if final in ("h", "l"):
+            for mode in _mode_changes(match):
+                # Keep modes in the order they were last changed
+                modes.pop(mode, None)
+                modes[mode] = final
+        elif final == "m":
+            params = match.group(2).split(";")
+            if not params[0].strip("0"):
+                # Starts with a reset, possibly followed by new attributes
+                sgr = [sequence] if any(param.strip("0") for param in params[1:]) else []
+            else:
+                sgr = [*sgr[-(MAX_SGR_SEQUENCES - 1) :], sequence]
+        elif final == "r":
+            scroll_region = sequence
+        elif match.group(4):
+            designations[match.group(4)] = sequence
+        elif match.group(6) == "c":
+            # A full reset restores every default
+            modes, designations, keypad, scroll_region, sgr = {}, {}, "", "", []
+        else:
+            keypad = sequence
+
+    return "".join(
+        [
+            *designations.values(),
+            keypad,
+            *(f"\x1b[{mode}{final}" for mode, final in modes.items()),
+            scroll_region,
+            *sgr,
+        ]
+    )
+
+
+def _alternate_screen_start(output: str) -> int:
+    """Get where the alternate screen active at the end of output was entered, or -1."""
+    start = -1
+    for match in _STATE_SEQUENCE.finditer(output):
+        if match.group(3) not in ("h", "l") or match.group(1) != "?":
+            continue
+        if any(mode[1:] in ALTERNATE_SCREEN_MODES for mode in _mode_changes(match)):
+            if match.group(3) == "l":
+                start = -1
+            elif start == -1:
+                start = match.start()
+    return start
+
+
+def compact_output(output: str, max_size: int = DEFAULT_MAX_SIZE) -> str:
+    """
+    Reduce terminal output to what still affects the screen.
+
+    Output before the last screen reset is dropped, and if the rest is still
+    too large only its tail is kept, starting at a line boundary so no escape
+    sequence is cut in half. Full-screen apps draw by cursor position rather
+    than by line, so while one is on the alternate screen its output is only
+    cut where it cleared the screen. Modes, the scroll region and text
+    attributes set by dropped output are replayed in front of what is kept.
+
+    Args:
+        output: Terminal output
+        max_size: Maximum number of characters to keep, exceeded only by the
+            replayed state and the drawing of a full-screen app since its last
+            screen clear
+
+    Returns:
+        Compacted output
+    """
+    start = max(0, max(output.rfind(sequence) for sequence in SCREEN_RESET_SEQUENCES))
+
+    if len(output) - start > max_size:
+        alternate = _alternate_screen_start(output)
+        if alternate != -1:
+            clear = output.rfind(CLEAR_SCREEN, max(start, alternate))
+            if clear != -1 and output.endswith(CURSOR_HOME, 0, clear):
+                clear -= len(CURSOR_HOME)
+            start = max(start, alternate, clear)
+        else:
+            newline = output.find("\n", len(output) - max_size)
+            start = newline + 1 if newline != -1 else len(output) - max_size
+
+    if start == 0:
+        return output
+    return terminal_state(output[:start]) + output[start:]
+
+
+class SuspendedOutput:
+    """
+    Output collected for a terminal while its view is suspended.
+
+    Chunks are appended as the session produces them and compacted whenever
+    they outgrow the size limit, so a hidden terminal tailing a log holds a
+    bounded amount of memory and is replayed in a single write on resume.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Initialize the buffer.
+
+        Args:
+            max_size: Maximum number of characters kept
+        """
+        self.max_size = max_size
+        self.suspended = True
+        self._chunks: List[str] = []
+        self._size = 0
+        self._compact_size = max_size * 2
+        self.dropped = 0
+
+    def append(self, output: str) -> None:
+        """Add output produced while suspended."""
+        self._chunks.append(output)
+        self._size += len(output)
+
+        # Compact lazily so appending stays cheap for chatty sessions
+        if self._size > self._compact_size:
+            self._compact()
+
+    def drain(self) -> str:
+        """Get the compacted output and empty the buffer."""
+        self._compact()
+        output = "".join(self._chunks)
+        self._chunks = []
+        self._size = 0
+        self._compact_size = self.max_size * 2
+        return output
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _compact(self) -> None:
+        """Collapse the chunks into the output still visible on screen."""
+        output = "".join(self._chunks)
+        compacted = compact_output(output, self.max_size)
+        self.dropped += len(output) - len(compacted)
+        self._chunks = [compacted] if compacted else []
+        self._size = len(compacted)
+        # A full-screen app's drawing may not shrink; wait for it to double
+        self._compact_size = max(self.max_size, self._size) * 2
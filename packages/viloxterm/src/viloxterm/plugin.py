@@ -8,7 +8,8 @@ from viloapp_sdk import IPlugin, PluginMetadata, PluginCapability, IPluginContex
 from .widget import TerminalWidgetFactory
 from .server import terminal_server
 from .features import TerminalProfileManager, TerminalSessionManager, TerminalSearch
-from .settings import TerminalSettingsManager
+from .settings import TerminalSettingsManager, terminal_theme_changes
+from .web_engine import terminal_web_engine
 
 logger = logging.getLogger(__name__)
 
@@ -45,12 +46,17 @@ class TerminalPlugin(IPlugin):
                 "onCommand:terminal.new",
                 "onCommand:terminal.open",
                 "onView:terminal",
-                "onStartup",
+                "onWidget:terminal",
             ],
             capabilities=[PluginCapability.WIDGETS, PluginCapability.COMMANDS],
             contributes={
                 "widgets": [
-                    {"id": "terminal", "factory": "viloxterm.widget:TerminalWidgetFactory"}
+                    {
+                        "id": "terminal",
+                        "title": "Terminal",
+                        "icon": "terminal",
+                        "factory": "viloxterm.widget:TerminalWidgetFactory",
+                    }
                 ],
                 "commands": [
                     {"id": "terminal.new", "title": "New Terminal", "category": "Terminal"},
@@ -127,6 +133,17 @@ class TerminalPlugin(IPlugin):
         config_service = context.get_service("config")
         self.settings_manager = TerminalSettingsManager(config_service)
 
+        # Pick the xterm.js renderer for new terminal pages
+        terminal_server.renderer_type = self.settings_manager.get_renderer()
+        logger.info(f"Terminal renderer: {terminal_server.renderer_type}")
+
+        # Renderer flags are set by the application before Qt WebEngine starts
+        if not terminal_web_engine.renderer_flags_active(
+            process_per_site=self.settings_manager.settings.share_renderer_process,
+            renderer_process_limit=self.settings_manager.settings.renderer_process_limit,
+        ):
+            logger.info("Terminal renderer process settings apply after restart")
+
         # Notify activation
         notification_service = context.get_service("notification")
         if notification_service:
@@ -234,6 +251,11 @@ class TerminalPlugin(IPlugin):
         # Subscribe to settings changes
         self.context.subscribe_event(EventType.SETTINGS_CHANGED, self._on_settings_changed)
 
+        # Push only changed palette entries to open terminals, e.g. during theme preview
+        theme_service = self.context.get_service("theme")
+        if theme_service and hasattr(theme_service, "on_colors_changed"):
+            theme_service.on_colors_changed(self._on_theme_colors_changed)
+
     def _on_theme_changed(self, event):
         """Handle theme change event."""
         logger.debug(f"Theme changed: {event.data}")
@@ -241,6 +263,15 @@ class TerminalPlugin(IPlugin):
         if self.settings_manager:
             self.settings_manager.sync_with_theme(event.data)
 
+    def _on_theme_colors_changed(self, changed_colors: Dict[str, Any]):
+        """Update open terminals with the theme colors that changed."""
+        changes = terminal_theme_changes(changed_colors)
+        if not changes or not self.settings_manager:
+            return
+
+        for widget in self.widget_factory.get_instances():
+            self.settings_manager.push_theme_changes(widget, changes)
+
     def _on_settings_changed(self, event):
         """Handle settings change event."""
         if "terminal" in event.data:
@@ -19,6 +19,8 @@ from PySide6.QtCore import QObject, Signal
 
 from .backends import TerminalBackendFactory, TerminalSession
 from .assets import terminal_asset_bundler
+from .output_buffer import SuspendedOutput
+from .settings import available_renderers
 
 logging.getLogger("werkzeug").setLevel(logging.ERROR)
 logger = logging.getLogger(__name__)
@@ -60,6 +62,11 @@ class TerminalServerManager(QObject):
         self.running = False
         self.max_sessions = 20
         self.backend = None
+        self.renderer_type = "canvas"  # xterm.js renderer for new terminal pages
+        # Output of sessions whose view is suspended, and sessions with a client
+        self._suspended_output: dict[str, SuspendedOutput] = {}
+        self._connected_sessions: set[str] = set()
+        self._output_lock = threading.Lock()
         self._setup_flask_app()
         self._initialized = True
 
@@ -72,6 +79,8 @@ class TerminalServerManager(QObject):
         """Setup Flask application with SocketIO."""
         self.app = Flask(__name__)
         self.app.config["SECRET_KEY"] = "terminal_server_secret!"
+        # Static assets are requested with a version query, so they can be cached for good
+        self.app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 365 * 24 * 60 * 60
         self.socketio = SocketIO(self.app, cors_allowed_origins="*", async_mode="threading")
 
         @self.app.route("/terminal/<session_id>")
@@ -79,7 +88,18 @@ class TerminalServerManager(QObject):
             """Serve terminal page for a specific session."""
             if session_id not in self.sessions:
                 return "Session not found", 404
-            return terminal_asset_bundler.get_bundled_html(session_id, self.port)
+            return terminal_asset_bundler.get_bundled_html(
+                session_id, self.port, linked=True, renderer=self.renderer_type
+            )
+
+        @self.app.route("/benchmark")
+        def benchmark_page():
+            """Serve the renderer benchmark page."""
+            renderer = request.args.get("renderer", self.renderer_type)
+            if renderer not in available_renderers():
+                return "Renderer not available", 400
+            megabytes = min(max(request.args.get("mb", 8, type=int), 1), 256)
+            return terminal_asset_bundler.get_benchmark_html(renderer, megabytes)
 
         @self.socketio.on("connect", namespace="/terminal")
         def handle_connect(auth=None):
@@ -91,6 +111,13 @@ class TerminalServerManager(QObject):
             join_room(session_id)
             logger.info(f"Client connected to session {session_id}")
 
+            # A suspended page may have lost its connection, flush once it is back
+            with self._output_lock:
+                self._connected_sessions.add(session_id)
+                buffer = self._suspended_output.get(session_id)
+                if buffer and not buffer.suspended:
+                    self._flush_suspended_output(session_id)
+
             # Start terminal if not already started
             session = self.sessions[session_id]
             if not session.child_pid:
@@ -110,6 +137,8 @@ class TerminalServerManager(QObject):
             session_id = request.args.get("session_id")
             if session_id:
                 leave_room(session_id)
+                with self._output_lock:
+                    self._connected_sessions.discard(session_id)
                 logger.info(f"Client disconnected from session {session_id}")
 
         @self.socketio.on("pty-input", namespace="/terminal")
@@ -171,12 +200,7 @@ class TerminalServerManager(QObject):
                 if self.backend.poll_process(session, timeout=0.01):
                     output = self.backend.read_output(session)
                     if output:
-                        self.socketio.emit(
-                            "pty-output",
-                            {"output": output, "session_id": session_id},
-                            namespace="/terminal",
-                            room=session_id,
-                        )
+                        self._forward_output(session_id, output)
 
                 # Check if process is still alive
                 if not self.backend.is_process_alive(session):
@@ -193,6 +217,76 @@ class TerminalServerManager(QObject):
 
             self.socketio.sleep(0.01)
 
+    def _forward_output(self, session_id: str, output: str):
+        """Send output to the session's client, or buffer it while suspended."""
+        with self._output_lock:
+            buffer = self._suspended_output.get(session_id)
+            if buffer is not None:
+                buffer.append(output)
+                return
+            self._emit_output(session_id, output)
+
+    def _emit_output(self, session_id: str, output: str):
+        """Emit output to the session's client."""
+        self.socketio.emit(
+            "pty-output",
+            {"output": output, "session_id": session_id},
+            namespace="/terminal",
+            room=session_id,
+        )
+
+    def _flush_suspended_output(self, session_id: str):
+        """Emit the compacted output of a resumed session (caller holds the output lock)."""
+        buffer = self._suspended_output.pop(session_id)
+        output = buffer.drain()
+        if output:
+            self._emit_output(session_id, output)
+        logger.debug(
+            f"Flushed {len(output)} chars for session {session_id} ({buffer.dropped} compacted away)"
+        )
+
+    def suspend_output(self, session_id: str):
+        """
+        Buffer a session's output instead of sending it to its view.
+
+        The process keeps running and its output keeps being read, but nothing
+        is sent until resume_output() flushes what is still visible.
+
+        Args:
+            session_id: Terminal session ID
+        """
+        with self._output_lock:
+            if session_id not in self.sessions:
+                return
+            buffer = self._suspended_output.get(session_id)
+            if buffer is None:
+                self._suspended_output[session_id] = SuspendedOutput()
+            else:
+                buffer.suspended = True
+
+    def resume_output(self, session_id: str):
+        """
+        Send a session's buffered output to its view and stop buffering.
+
+        If the client lost its connection while suspended, the output is
+        flushed when it reconnects.
+
+        Args:
+            session_id: Terminal session ID
+        """
+        with self._output_lock:
+            buffer = self._suspended_output.get(session_id)
+            if buffer is None:
+                return
+            buffer.suspended = False
+            if session_id in self._connected_sessions:
+                self._flush_suspended_output(session_id)
+
+    def is_output_suspended(self, session_id: str) -> bool:
+        """Check whether a session's output is being buffered."""
+        buffer = self._suspended_output.get(session_id)
+        return buffer is not None and buffer.suspended
+
     def create_session(
         self, command: str = "bash", cmd_args: str = "", cwd: Optional[str] = None
     ) -> str:
@@ -229,6 +323,9 @@ class TerminalServerManager(QObject):
             return
 
         session.active = False
+        with self._output_lock:
+            self._suspended_output.pop(session_id, None)
+            self._connected_sessions.discard(session_id)
 
         # Use backend to clean up the session
         if self.backend:
@@ -308,6 +405,20 @@ class TerminalServerManager(QObject):
 
         logger.info("Terminal server shutdown complete")
 
+    def get_benchmark_url(self, renderer: Optional[str] = None, megabytes: int = 8) -> str:
+        """
+        Get the URL of the renderer benchmark page.
+
+        Args:
+            renderer: Renderer to measure, defaults to the one used for terminals
+            megabytes: Amount of output to stream
+
+        Returns:
+            Benchmark page URL
+        """
+        renderer = renderer or self.renderer_type
+        return f"http://{self.host}:{self.port}/benchmark?renderer={renderer}&mb={megabytes}"
+
     def get_session_url(self, session_id: str) -> str:
         """Get the URL for a terminal session."""
         if session_id not in self.sessions:
@@ -321,6 +432,9 @@ class TerminalServerManager(QObject):
 
         sessions_to_remove = []
         for session_id, session in self.sessions.items():
+            # Suspended views send no heartbeats, their sessions are still in use
+            if self.is_output_suspended(session_id):
+                session.last_activity = current_time
             # Clean up inactive sessions
             if current_time - session.last_activity > timeout_seconds:
                 sessions_to_remove.append(session_id)
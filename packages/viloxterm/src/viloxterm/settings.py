@@ -1,11 +1,112 @@
 """Terminal settings management."""
 
+import json
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
 from dataclasses import dataclass, asdict
 
+from .assets import terminal_asset_bundler
+
 logger = logging.getLogger(__name__)
 
+# Application theme color keys and the xterm.js theme entries they set
+TERMINAL_THEME_KEYS = {
+    "terminal.background": "background",
+    "terminal.foreground": "foreground",
+    "terminal.cursor": "cursor",
+    "terminalCursor.foreground": "cursor",
+    "terminalCursor.background": "cursorAccent",
+    "terminal.selection": "selection",
+    "terminal.selectionBackground": "selection",
+    "terminal.ansiBlack": "black",
+    "terminal.ansiRed": "red",
+    "terminal.ansiGreen": "green",
+    "terminal.ansiYellow": "yellow",
+    "terminal.ansiBlue": "blue",
+    "terminal.ansiMagenta": "magenta",
+    "terminal.ansiCyan": "cyan",
+    "terminal.ansiWhite": "white",
+    "terminal.ansiBrightBlack": "brightBlack",
+    "terminal.ansiBrightRed": "brightRed",
+    "terminal.ansiBrightGreen": "brightGreen",
+    "terminal.ansiBrightYellow": "brightYellow",
+    "terminal.ansiBrightBlue": "brightBlue",
+    "terminal.ansiBrightMagenta": "brightMagenta",
+    "terminal.ansiBrightCyan": "brightCyan",
+    "terminal.ansiBrightWhite": "brightWhite",
+}
+
+
+def terminal_theme_changes(colors: Dict[str, Any]) -> Dict[str, str]:
+    """Get the xterm.js theme entries set by the given theme colors."""
+    return {
+        TERMINAL_THEME_KEYS[key]: value
+        for key, value in colors.items()
+        if key in TERMINAL_THEME_KEYS and value
+    }
+
+
+# xterm.js renderers, fastest first; the page falls back along this order
+RENDERER_TYPES = ("webgl", "canvas", "dom")
+
+
+def _detect_environment():
+    """Get the host environment, None when not running inside ViloApp."""
+    try:
+        from viloapp.core.environment_detector import EnvironmentDetector
+    except ImportError:
+        return None
+    return EnvironmentDetector.current()
+
+
+def available_renderers() -> List[str]:
+    """Get the renderers the bundled assets provide, fastest first."""
+    return [
+        renderer for renderer in RENDERER_TYPES if terminal_asset_bundler.has_renderer(renderer)
+    ]
+
+
+def resolve_renderer(renderer_type: str, env_info=None, available=None) -> str:
+    """
+    Get the xterm.js renderer to use for a renderer setting.
+
+    "auto" picks WebGL when the GPU can be used directly, and the canvas
+    renderer on WSL, remote sessions or without GPU acceleration, where
+    WebGL would fall back to slow software rendering. Renderers whose addon
+    is not bundled are never picked.
+
+    Args:
+        renderer_type: Renderer setting, "auto" or one of RENDERER_TYPES
+        env_info: Environment info, detected when not given
+        available: Renderers to choose from, the bundled ones when not given
+
+    Returns:
+        Renderer type
+    """
+    if available is None:
+        available = available_renderers()
+
+    if renderer_type in available:
+        return renderer_type
+    if renderer_type in RENDERER_TYPES:
+        logger.warning(
+            f"Terminal renderer '{renderer_type}' is not bundled, choosing automatically"
+        )
+    elif renderer_type != "auto":
+        logger.warning(f"Unknown terminal renderer '{renderer_type}', choosing automatically")
+
+    if env_info is None:
+        env_info = _detect_environment()
+
+    preferred = "canvas"
+    if env_info is not None:
+        remote = env_info.is_wsl or env_info.is_ssh or env_info.is_remote_desktop
+        if env_info.gpu_available and not remote:
+            preferred = "webgl"
+
+    fallbacks = RENDERER_TYPES[RENDERER_TYPES.index(preferred) :]
+    return next((renderer for renderer in fallbacks if renderer in available), "dom")
+
 
 @dataclass
 class TerminalSettings:
@@ -44,7 +145,9 @@ class TerminalSettings:
     paste_on_middle_click: bool = True
 
     # Performance
-    renderer_type: str = "canvas"  # canvas, dom, webgl
+    renderer_type: str = "auto"  # auto or one of available_renderers()
+    share_renderer_process: bool = True  # All terminal pages share one renderer process
+    renderer_process_limit: int = 0  # Maximum renderer processes, 0 for Chromium's default
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -95,6 +198,10 @@ class TerminalSettingsManager:
             setattr(self.settings, key, value)
             self.save_settings()
 
+    def get_renderer(self) -> str:
+        """Get the xterm.js renderer for the current settings."""
+        return resolve_renderer(self.settings.renderer_type)
+
     def apply_to_terminal(self, terminal_widget):
         """Apply settings to a terminal widget."""
         if not terminal_widget or not terminal_widget.web_view:
@@ -117,7 +224,9 @@ class TerminalSettingsManager:
                 term.options.scrollback = {self.settings.scrollback_lines};
 
                 // Renderer
-                term.options.rendererType = '{self.settings.renderer_type}';
+                if (window.setTerminalRenderer) {{
+                    window.setTerminalRenderer('{self.get_renderer()}');
+                }}
 
                 // Colors (if not using theme)
                 if (!{str(self.settings.use_theme_colors).lower()}) {{
@@ -153,3 +262,14 @@ class TerminalSettingsManager:
         for theme_key, setting_key in color_mapping.items():
             if theme_key in theme_colors:
                 setattr(self.settings, setting_key, theme_colors[theme_key])
+
+    def push_theme_changes(self, terminal_widget, changes: Dict[str, str]):
+        """Send changed palette entries to a terminal without resending its whole theme."""
+        if not self.settings.use_theme_colors or not changes:
+            return
+        if not terminal_widget or not terminal_widget.web_view:
+            return
+
+        terminal_widget.web_view.page().runJavaScript(
+            f"window.updateTerminalTheme && window.updateTerminalTheme({json.dumps(changes)});"
+        )
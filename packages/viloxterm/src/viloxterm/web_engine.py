@@ -0,0 +1,82 @@
+"""Shared QtWebEngine setup for terminal views."""
+
+import logging
+import os
+from typing import Optional
+
+from PySide6.QtCore import QObject
+from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile
+from PySide6.QtWidgets import QApplication
+
+from viloapp.core.environment_detector import CHROMIUM_FLAGS_VARIABLE, merge_chromium_flags
+
+logger = logging.getLogger(__name__)
+
+# Named profiles are disk based, so the HTTP cache, and with it V8's code
+# cache for the terminal scripts, survives restarts
+PROFILE_NAME = "viloxterm-terminal"
+HTTP_CACHE_SIZE = 64 * 1024 * 1024
+
+
+class TerminalWebEngine:
+    """
+    Owns the web engine profile shared by all terminal views.
+
+    Every terminal page is created in the same profile and loaded from the
+    same local server, so with process-per-site they share one renderer
+    process and its cached scripts instead of each starting their own.
+    """
+
+    def __init__(self):
+        self._profile: Optional[QWebEngineProfile] = None
+
+    def renderer_flags_active(
+        self, process_per_site: bool = True, renderer_process_limit: int = 0
+    ) -> bool:
+        """
+        Check whether renderer process settings are in effect.
+
+        Chromium reads its flags once, when Qt WebEngine starts, so the
+        application sets them before creating the QApplication. Settings
+        changed later only apply after a restart.
+
+        Args:
+            process_per_site: Let all terminal pages share a renderer process
+            renderer_process_limit: Maximum renderer processes, 0 for Chromium's default
+
+        Returns:
+            True if the Chromium flags already include the settings
+        """
+        flags = os.environ.get(CHROMIUM_FLAGS_VARIABLE, "").split()
+        merged = merge_chromium_flags(" ".join(flags), process_per_site, renderer_process_limit)
+        return merged == " ".join(flags)
+
+    def profile(self) -> QWebEngineProfile:
+        """Get the shared terminal profile, creating it on first use."""
+        if self._profile is None:
+            # Parented to the application so it outlives every terminal page
+            profile = QWebEngineProfile(PROFILE_NAME, QApplication.instance())
+            profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.DiskHttpCache)
+            profile.setHttpCacheMaximumSize(HTTP_CACHE_SIZE)
+            profile.setPersistentCookiesPolicy(
+                QWebEngineProfile.PersistentCookiesPolicy.NoPersistentCookies
+            )
+            self._profile = profile
+            logger.info(f"Created terminal web engine profile at {profile.cachePath()}")
+        return self._profile
+
+    def create_page(self, parent: Optional[QObject] = None) -> QWebEnginePage:
+        """
+        Create a page in the shared terminal profile.
+
+        Args:
+            parent: Owner of the page, usually its view
+
+        Returns:
+            New page
+        """
+        return QWebEnginePage(self.profile(), parent)
+
+
+# Create singleton instance
+terminal_web_engine = TerminalWebEngine()
@@ -1,14 +1,16 @@
 """Terminal widget implementation for ViloxTerm plugin."""
 
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from PySide6.QtWidgets import QWidget, QVBoxLayout
+from PySide6.QtWebEngineCore import QWebEnginePage
 from PySide6.QtWebEngineWidgets import QWebEngineView
 from PySide6.QtCore import QUrl, Signal
 from viloapp_sdk import IWidget
 
 from .server import terminal_server
+from .web_engine import terminal_web_engine
 from .features import TerminalSearch
 
 logger = logging.getLogger(__name__)
@@ -26,6 +28,7 @@ class TerminalWidget(QWidget):
         super().__init__(parent)
         self.session_id = None
         self.web_view = None
+        self.rendering_suspended = False
         self.search = TerminalSearch()
         self.setup_ui()
 
@@ -35,8 +38,9 @@ class TerminalWidget(QWidget):
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(0)
 
-        # Create web view for terminal (no toolbar)
+        # Create web view for terminal (no toolbar), its page lives in the shared profile
         self.web_view = QWebEngineView()
+        self.web_view.setPage(terminal_web_engine.create_page(self.web_view))
         layout.addWidget(self.web_view)
 
         self.setLayout(layout)
@@ -106,6 +110,31 @@ class TerminalWidget(QWidget):
             escaped = text.replace("\\", "\\\\").replace("'", "\\'")
             self.web_view.page().runJavaScript(f"term.write('{escaped}')")
 
+    def suspend_rendering(self):
+        """Freeze the hidden terminal page and buffer its output on the server."""
+        if self.rendering_suspended:
+            return
+        self.rendering_suspended = True
+
+        if self.session_id:
+            terminal_server.suspend_output(self.session_id)
+
+        # Chromium only freezes pages that are not visible
+        if self.web_view and not self.web_view.isVisible():
+            self.web_view.page().setLifecycleState(QWebEnginePage.LifecycleState.Frozen)
+
+    def resume_rendering(self):
+        """Unfreeze the terminal page and replay the output it missed."""
+        if not self.rendering_suspended:
+            return
+        self.rendering_suspended = False
+
+        if self.web_view:
+            self.web_view.page().setLifecycleState(QWebEnginePage.LifecycleState.Active)
+
+        if self.session_id:
+            terminal_server.resume_output(self.session_id)
+
     def _on_search_requested(self, pattern: str):
         """Handle search request."""
         self.search.search_in_terminal(self, pattern)
@@ -145,6 +174,10 @@ class TerminalWidgetFactory(IWidget):
 
         return widget
 
+    def get_instances(self) -> List[TerminalWidget]:
+        """Get all live terminal widgets."""
+        return list(self._instances.values())
+
     def destroy_instance(self, instance_id: str) -> None:
         """Destroy widget instance and clean up resources."""
         if instance_id in self._instances:
@@ -153,6 +186,18 @@ class TerminalWidgetFactory(IWidget):
             widget.deleteLater()
             del self._instances[instance_id]
 
+    def suspend_instance(self, instance_id: str) -> None:
+        """Stop rendering a hidden terminal while its shell keeps running."""
+        widget = self._instances.get(instance_id)
+        if widget:
+            widget.suspend_rendering()
+
+    def resume_instance(self, instance_id: str) -> None:
+        """Resume rendering a terminal that is shown again."""
+        widget = self._instances.get(instance_id)
+        if widget:
+            widget.resume_rendering()
+
     def handle_command(self, command: str, args: Dict[str, Any]) -> Any:
         """Handle widget-specific commands."""
         if command == "create_terminal":
@@ -2,6 +2,7 @@
 
 from unittest.mock import Mock
 import platform
+from types import SimpleNamespace
 
 from viloxterm.features import (
     TerminalProfile,
@@ -9,7 +10,15 @@ from viloxterm.features import (
     TerminalSessionManager,
     TerminalSearch,
 )
-from viloxterm.settings import TerminalSettings, TerminalSettingsManager
+from viloxterm.assets import TerminalAssetBundler
+from viloxterm.output_buffer import SuspendedOutput, compact_output
+from viloxterm.settings import (
+    TerminalSettings,
+    TerminalSettingsManager,
+    resolve_renderer,
+    terminal_theme_changes,
+)
+from viloxterm.web_engine import TerminalWebEngine
 
 
 class TestTerminalProfile:
@@ -261,3 +270,157 @@ class TestTerminalSettingsManager:
 
         assert self.manager.settings.background == "#000000"
         assert self.manager.settings.foreground == "#ffffff"
+
+    def test_push_theme_changes(self):
+        """Test that only changed palette entries are sent to a terminal."""
+        mock_terminal = Mock()
+        mock_page = Mock()
+        mock_terminal.web_view.page.return_value = mock_page
+
+        changes = terminal_theme_changes(
+            {"terminal.ansiRed": "#ff0000", "editor.background": "#111111"}
+        )
+        assert changes == {"red": "#ff0000"}
+
+        # Keys used by themes such as Solarized Dark
+        assert terminal_theme_changes(
+            {"terminal.cursor": "#93a1a1", "terminal.selection": "#073642"}
+        ) == {"cursor": "#93a1a1", "selection": "#073642"}
+
+        self.manager.push_theme_changes(mock_terminal, changes)
+
+        call_args = mock_page.runJavaScript.call_args[0][0]
+        assert "updateTerminalTheme" in call_args
+        assert '{"red": "#ff0000"}' in call_args
+
+
+class TestSuspendedOutput:
+    """Test output buffering for suspended terminals."""
+
+    def test_output_before_screen_reset_is_dropped(self):
+        """Test that output cleared from the screen is not replayed."""
+        output = "old line\n\x1b[H\x1b[2J\x1b[3Jnew line\n"
+
+        assert compact_output(output) == "\x1b[H\x1b[2J\x1b[3Jnew line\n"
+        assert compact_output("plain output\n") == "plain output\n"
+
+    def test_buffer_stays_bounded(self):
+        """Test that a chatty hidden terminal keeps only the recent tail."""
+        buffer = SuspendedOutput(max_size=100)
+        for i in range(1000):
+            buffer.append(f"log line {i}\n")
+
+        assert len(buffer) <= 200
+
+        output = buffer.drain()
+        assert len(output) <= 100
+        assert output.startswith("log line")
+        assert output.endswith("log line 999\n")
+        assert buffer.drain() == ""
+
+    def test_dropped_modes_are_replayed(self):
+        """Test that modes and attributes set by dropped output still apply."""
+        output = "\x1b[?2004h\x1b[?25l\x1b[2;20r\x1b[1;32m" + "log line\n" * 100 + "tail\n"
+
+        compacted = compact_output(output, max_size=50)
+
+        assert compacted.startswith("\x1b[?2004h\x1b[?25l\x1b[2;20r\x1b[1;32m")
+        assert compacted.endswith("log line\ntail\n")
+        assert len(compacted) < 100
+
+    def test_full_screen_app_is_kept_from_last_clear(self):
+        """Test that a full-screen app's drawing is only cut where it cleared the screen."""
+        frame = "\x1b[H\x1b[2J" + "".join(
+            f"\x1b[{row};1H\x1b[7mrow {row}\x1b[m" for row in range(1, 25)
+        )
+        output = (
+            "$ htop\n"
+            + "\x1b[?1049h\x1b[?1000h\x1b[?25l\x1b[1;24r"
+            + frame * 10
+            + "".join(f"\x1b[{row};10Hupdate" for row in range(1, 25)) * 5
+        )
+        buffer = SuspendedOutput(max_size=100)
+        for i in range(0, len(output), 64):
+            buffer.append(output[i : i + 64])
+
+        replay = buffer.drain()
+
+        assert replay == compact_output(output, max_size=100)
+        # Modes first, then the whole last frame with the updates drawn over it
+        assert replay == "\x1b[?1049h\x1b[?1000h\x1b[?25l\x1b[1;24r" + output[output.rfind(frame) :]
+
+        # Once the app exits, the main screen output is cut by line again
+        exited = output + "\x1b[?1049l\x1b[?25h\x1b[r" + "$ ls\n" * 100
+        compacted = compact_output(exited, max_size=100)
+        assert len(compacted) < 200
+        assert compacted.endswith("$ ls\n")
+        assert "\x1b[?1049l" in compacted and "\x1b[?1049h" not in compacted
+
+
+class TestTerminalWebEngine:
+    """Test sharing of web engine resources between terminals."""
+
+    def test_renderer_flags_active(self, monkeypatch):
+        """Test that renderer settings are only reported active once in the flags."""
+        engine = TerminalWebEngine()
+
+        monkeypatch.setenv("QTWEBENGINE_CHROMIUM_FLAGS", "--disable-gpu")
+        assert not engine.renderer_flags_active()
+        assert engine.renderer_flags_active(process_per_site=False)
+
+        monkeypatch.setenv("QTWEBENGINE_CHROMIUM_FLAGS", "--process-per-site")
+        assert engine.renderer_flags_active()
+        assert not engine.renderer_flags_active(renderer_process_limit=2)
+
+    def test_resolve_renderer(self):
+        """Test that the renderer follows the environment unless set explicitly."""
+
+        def environment(gpu_available=True, is_wsl=False, is_ssh=False, is_remote_desktop=False):
+            return SimpleNamespace(
+                gpu_available=gpu_available,
+                is_wsl=is_wsl,
+                is_ssh=is_ssh,
+                is_remote_desktop=is_remote_desktop,
+            )
+
+        bundled = ["webgl", "canvas", "dom"]
+        assert resolve_renderer("auto", environment(), bundled) == "webgl"
+        assert resolve_renderer("auto", environment(gpu_available=False), bundled) == "canvas"
+        assert resolve_renderer("auto", environment(is_wsl=True), bundled) == "canvas"
+        assert resolve_renderer("auto", environment(is_remote_desktop=True), bundled) == "canvas"
+        assert resolve_renderer("dom", environment(), bundled) == "dom"
+
+        # Without the WebGL addon it is never picked, even when asked for
+        built_in = ["canvas", "dom"]
+        assert resolve_renderer("auto", environment(), built_in) == "canvas"
+        assert resolve_renderer("webgl", environment(), built_in) == "canvas"
+
+    def test_available_renderers_follow_bundled_assets(self, tmp_path, monkeypatch):
+        """Test that renderers needing an addon are only offered when it is bundled."""
+        from viloxterm.assets import terminal_asset_bundler
+        from viloxterm.settings import available_renderers
+
+        monkeypatch.setattr(terminal_asset_bundler, "static_dir", tmp_path)
+        assert available_renderers() == ["canvas", "dom"]
+
+        (tmp_path / "js").mkdir()
+        (tmp_path / "js" / "xterm-addon-webgl.js").write_text("")
+        assert available_renderers() == ["webgl", "canvas", "dom"]
+
+    def test_benchmark_page(self):
+        """Test that the benchmark page streams output with the chosen renderer."""
+        html = TerminalAssetBundler().get_benchmark_html("webgl", megabytes=4)
+
+        assert "const RENDERER = 'webgl';" in html
+        assert "const MEGABYTES = 4;" in html
+        assert "framesPerMegabyte" in html
+
+    def test_linked_assets_are_cacheable(self):
+        """Test that terminal pages reference versioned assets instead of inlining them."""
+        bundler = TerminalAssetBundler()
+        version = bundler.get_asset_version()
+
+        html = bundler.get_bundled_html("session_123", 5000, linked=True)
+        assert f'src="/static/js/xterm.js?v={version}"' in html
+        assert bundler.get_xterm_js() not in html
+        assert len(html) < len(bundler.get_bundled_html("session_123", 5000))